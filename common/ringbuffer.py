@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Ringpuffer fester Größe auf Basis von array.array plus Rolling-Statistik
+(min/max/mean/p50/p99).
+
+Kein Python-Objekt pro Sample: die Werte liegen als C-Integer bzw.
+-Doubles im array. NumPy wird für die Perzentile verwendet, wenn es
+installiert ist, sonst reicht sorted().
+"""
+import math
+from array import array
+from typing import NamedTuple, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional
+    np = None
+
+
+class Stats(NamedTuple):
+    count: int
+    min: float
+    max: float
+    mean: float
+    p50: float
+    p99: float
+
+
+def percentile_sorted(vals: Sequence[float], p: float) -> float:
+    """Perzentil (lineare Interpolation) auf bereits sortierten Werten."""
+    if not vals:
+        return math.nan
+    k = (len(vals) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(vals) - 1)
+    return vals[lo] + (vals[hi] - vals[lo]) * (k - lo)
+
+
+def percentiles(values, ps, scale: float = 1.0):
+    """Liste der Perzentile ps (0..100) von values, NaN wenn leer."""
+    if len(values) == 0:
+        return [math.nan for _ in ps]
+    if np is not None:
+        res = np.percentile(np.asarray(values, dtype=np.float64), list(ps))
+        return [float(v) * scale for v in res]
+    s = sorted(values)
+    return [percentile_sorted(s, p) * scale for p in ps]
+
+
+def compute_stats(values, scale: float = 1.0) -> Optional[Stats]:
+    """
+    Statistik über eine Folge von Zahlen (array, list, ...).
+    scale wird auf alle Ergebnisse multipliziert (z.B. kHz → MHz).
+    """
+    n = len(values)
+    if n == 0:
+        return None
+
+    if np is not None:
+        a = np.asarray(values, dtype=np.float64)
+        p50, p99 = np.percentile(a, (50, 99))
+        return Stats(
+            n,
+            float(a.min()) * scale,
+            float(a.max()) * scale,
+            float(a.mean()) * scale,
+            float(p50) * scale,
+            float(p99) * scale,
+        )
+
+    s = sorted(values)
+    return Stats(
+        n,
+        s[0] * scale,
+        s[-1] * scale,
+        math.fsum(s) / n * scale,
+        percentile_sorted(s, 50) * scale,
+        percentile_sorted(s, 99) * scale,
+    )
+
+
+class RingBuffer:
+    """
+    Ringpuffer fester Kapazität.
+
+    typecode wie bei array.array: "I" (uint32, z.B. kHz), "i", "d" (double).
+    """
+
+    __slots__ = ("capacity", "_data", "_pos", "_count")
+
+    def __init__(self, capacity: int, typecode: str = "I"):
+        if capacity <= 0:
+            raise ValueError("capacity muss > 0 sein")
+        self.capacity = capacity
+        self._data = array(typecode, [0]) * capacity
+        self._pos = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value) -> None:
+        self._data[self._pos] = value
+        self._pos += 1
+        if self._pos == self.capacity:
+            self._pos = 0
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._count = 0
+
+    def last(self):
+        if self._count == 0:
+            return None
+        return self._data[self._pos - 1]
+
+    def values(self) -> array:
+        """Kopie der gültigen Werte in zeitlicher Reihenfolge (alt → neu)."""
+        if self._count < self.capacity:
+            return self._data[: self._count]
+        return self._data[self._pos :] + self._data[: self._pos]
+
+    def tail(self, n: int) -> array:
+        """Die letzten n Werte (alt → neu)."""
+        vals = self.values()
+        return vals[-n:] if n < len(vals) else vals
+
+    def stats(self, scale: float = 1.0) -> Optional[Stats]:
+        return compute_stats(self.values(), scale)
@@ -0,0 +1,729 @@
+#!/usr/bin/env python3
+"""
+Headless-Recorder für alle Sensoren plus Replay für die TUIs.
+
+Gesampelt werden alle hwmon-Attribute (temp/fan/pwm/in/curr/power/freq),
+scaling_cur_freq aller CPUs und gpu_busy_percent/mem_busy_percent der
+DRM-Karten – mit fester Rate über dauerhaft offene Deskriptoren
+(SysfsSampler).
+
+Dateiformat (nur Anhängen, per mmap lesbar, little endian):
+
+    Header   8 Byte Magic, u32 Länge der Metadaten, u32 reserviert,
+             Metadaten als JSON (Kanäle mit Pfad, Art, Skalierung, ...),
+             aufgefüllt auf ein Vielfaches von 8 Byte
+    Daten    Blöcke aus je index_every Records plus einem Index-Block
+    Record   u32 Millisekunden seit Start + int16 pro Kanal
+             (Wert = Rohwert / scale, -32768 = fehlt)
+    Index    b"IDX\\0", u32 Blocknummer, u32 erste ms, u32 letzte ms,
+             int16 Minimum pro Kanal, int16 Maximum pro Kanal
+
+Weil alle Blöcke gleich groß sind, liegt Record i an einer berechenbaren
+Stelle; Suchen nach Zeit ist eine Bisektion über die mmap. Ein
+abgebrochener letzter Record (Absturz, Stromausfall) wird ignoriert.
+
+    ./sensor_recorder.py record run.rec --rate 10
+    ./sensor_recorder.py info run.rec
+    ./sensor_recorder.py export run.rec --start 3600 --end 3900 > vorfall.csv
+
+Abspielen in den TUIs:
+
+    ../temperatures+fan/temp_monitor_tui.py --replay run.rec
+    ../temperatures+fan/fanctl_tui.py --replay run.rec
+    ../cpu/cpu_freq_table.py --replay run.rec
+"""
+import argparse
+import csv
+import json
+import mmap
+import os
+import re
+import signal
+import socket
+import struct
+import sys
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sysfs_sampler import SysfsSampler
+
+HWMON_BASE = "/sys/class/hwmon"
+CPU_BASE = "/sys/devices/system/cpu"
+DRM_BASE = "/sys/class/drm"
+
+MAGIC = b"SNSREC\x00\x01"
+HEADER = struct.Struct("<8sII")
+INDEX_MAGIC = b"IDX\x00"
+INDEX_HEAD = struct.Struct("<4sIII")
+MS = struct.Struct("<I")
+
+MISSING = -32768
+INT16_MAX = 32767
+
+DEFAULT_RATE_HZ = 10.0
+DEFAULT_INDEX_EVERY = 600  # 1 Minute bei 10 Hz
+FLUSH_INTERVAL = 1.0  # Sekunden, so viel geht bei einem Absturz höchstens verloren
+
+# Art → (scale = Rohwert pro gespeicherter Einheit, Einheit, Rohwert pro Einheit)
+KINDS = {
+    "temp": (100, "°C", 1000),  # m°C → 0.1 °C Auflösung
+    "fan": (1, "RPM", 1),
+    "pwm": (1, "", 1),
+    "pwm_enable": (1, "", 1),
+    "in": (1, "mV", 1),
+    "curr": (10, "A", 1000),  # mA → 10 mA Auflösung, bis 327 A
+    "power": (100000, "W", 1000000),  # µW → 0.1 W Auflösung
+    "freq": (1000000, "MHz", 1000000),  # Hz → MHz (amdgpu freq1_input)
+    "cpufreq": (1000, "MHz", 1000),  # kHz → MHz
+    "busy": (1, "%", 1),
+}
+
+_HWMON_ATTR = re.compile(r"^(temp|fan|in|curr|power|freq)(\d+)_(input|average)$")
+_PWM_ATTR = re.compile(r"^pwm(\d+)(_enable)?$")
+_CPU_FREQ = re.compile(r"/cpu(\d+)/cpufreq/")
+
+
+class Channel(NamedTuple):
+    path: str
+    kind: str
+    device: str  # hwmon-Name, "cpufreq" oder DRM-Karte
+    label: str
+    scale: int
+    unit: str
+    unit_scale: int
+
+    def to_unit(self, raw: int) -> float:
+        return raw / self.unit_scale
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _natural_key(name: str):
+    return [int(p) if p.isdigit() else p for p in re.split(r"(\d+)", name)]
+
+
+def _channel(path: str, kind: str, device: str, label: str) -> Channel:
+    scale, unit, unit_scale = KINDS[kind]
+    return Channel(path, kind, device, label, scale, unit, unit_scale)
+
+
+def discover_channels(cpufreq: bool = True, drm: bool = True) -> List[Channel]:
+    """Alle lesbaren Sensor-Attribute, einmal beim Start ermittelt."""
+    channels: List[Channel] = []
+    try:
+        hwmons = sorted(os.listdir(HWMON_BASE), key=_natural_key)
+    except OSError:
+        hwmons = []
+    for entry in hwmons:
+        hwmon_dir = os.path.join(HWMON_BASE, entry)
+        name = _read(os.path.join(hwmon_dir, "name")) or entry
+        try:
+            files = sorted(os.listdir(hwmon_dir), key=_natural_key)
+        except OSError:
+            continue
+        for fname in files:
+            m = _HWMON_ATTR.match(fname)
+            if m:
+                prefix, idx = m.group(1), m.group(2)
+                kind = prefix
+                label = _read(os.path.join(hwmon_dir, f"{prefix}{idx}_label")) or f"{prefix}{idx}"
+            else:
+                m = _PWM_ATTR.match(fname)
+                if not m:
+                    continue
+                kind = "pwm_enable" if m.group(2) else "pwm"
+                label = fname
+            channels.append(_channel(os.path.join(hwmon_dir, fname), kind, name, label))
+
+    if cpufreq:
+        try:
+            cpus = sorted(
+                (e for e in os.listdir(CPU_BASE) if e.startswith("cpu") and e[3:].isdigit()),
+                key=_natural_key,
+            )
+        except OSError:
+            cpus = []
+        for entry in cpus:
+            path = os.path.join(CPU_BASE, entry, "cpufreq", "scaling_cur_freq")
+            if os.path.exists(path):
+                channels.append(_channel(path, "cpufreq", "cpufreq", entry))
+
+    if drm:
+        try:
+            cards = sorted((e for e in os.listdir(DRM_BASE) if re.match(r"^card\d+$", e)), key=_natural_key)
+        except OSError:
+            cards = []
+        for card in cards:
+            for attr in ("gpu_busy_percent", "mem_busy_percent"):
+                path = os.path.join(DRM_BASE, card, "device", attr)
+                if os.path.exists(path):
+                    channels.append(_channel(path, "busy", card, attr))
+    return channels
+
+
+# --- Schreiben --------------------------------------------------------------
+
+
+def _encode(raw: Optional[int], scale: int) -> int:
+    if raw is None:
+        return MISSING
+    q = int(round(raw / scale))
+    if q > INT16_MAX:
+        return INT16_MAX
+    if q < -INT16_MAX:
+        return -INT16_MAX
+    return q
+
+
+class SensorRecorder:
+    """
+    Schreibt Records an eine neue Datei (O_EXCL, nie überschreiben).
+    Gepuffert, geschrieben wird spätestens alle FLUSH_INTERVAL Sekunden
+    und am Ende jedes Blocks.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        channels: Sequence[Channel],
+        rate_hz: float = DEFAULT_RATE_HZ,
+        index_every: int = DEFAULT_INDEX_EVERY,
+    ):
+        if index_every <= 0:
+            raise ValueError("index_every muss > 0 sein")
+        self.path = path
+        self.channels = list(channels)
+        self.index_every = index_every
+        self.start_time = time.time()
+        self._t0 = time.monotonic()
+        self._scales = [c.scale for c in self.channels]
+        n = len(self.channels)
+        self._record = struct.Struct(f"<I{n}h")
+        self._minmax = struct.Struct(f"<{2 * n}h")
+        self.count = 0
+        self._chunk_first_ms = 0
+        self._chunk_min = [INT16_MAX] * n
+        self._chunk_max = [-INT16_MAX] * n
+        self._buf = bytearray()
+        self._last_flush = self._t0
+
+        meta = {
+            "format": 1,
+            "start_time": self.start_time,
+            "rate_hz": rate_hz,
+            "index_every": index_every,
+            "host": socket.gethostname(),
+            "channels": [c._asdict() for c in self.channels],
+        }
+        blob = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        pad = (-(HEADER.size + len(blob))) % 8
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND | os.O_CLOEXEC, 0o644)
+        os.write(self.fd, HEADER.pack(MAGIC, len(blob), 0) + blob + b"\0" * pad)
+
+    def append(self, raw_values: Sequence[Optional[int]]) -> None:
+        """Ein Record mit Rohwerten (sysfs-Einheiten, None = fehlt) zum aktuellen Zeitpunkt."""
+        now = time.monotonic()
+        ms = int((now - self._t0) * 1000)
+        vals = [_encode(v, s) for v, s in zip(raw_values, self._scales)]
+        self._buf += self._record.pack(ms, *vals)
+
+        if self.count % self.index_every == 0:
+            self._chunk_first_ms = ms
+        lo, hi = self._chunk_min, self._chunk_max
+        for i, v in enumerate(vals):
+            if v == MISSING:
+                continue
+            if v < lo[i]:
+                lo[i] = v
+            if v > hi[i]:
+                hi[i] = v
+        self.count += 1
+
+        if self.count % self.index_every == 0:
+            self._write_index(ms)
+            self.flush()
+        elif now - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def _write_index(self, last_ms: int) -> None:
+        chunk_no = self.count // self.index_every - 1
+        self._buf += INDEX_HEAD.pack(INDEX_MAGIC, chunk_no, self._chunk_first_ms, last_ms)
+        self._buf += self._minmax.pack(*self._chunk_min, *self._chunk_max)
+        n = len(self.channels)
+        self._chunk_min = [INT16_MAX] * n
+        self._chunk_max = [-INT16_MAX] * n
+
+    def flush(self) -> None:
+        if self._buf:
+            os.write(self.fd, self._buf)
+            self._buf = bytearray()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            self.flush()
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def record(
+    path: str,
+    channels: Sequence[Channel],
+    rate_hz: float,
+    duration: Optional[float] = None,
+    index_every: int = DEFAULT_INDEX_EVERY,
+) -> int:
+    """Nimmt bis duration bzw. Ctrl+C/SIGTERM auf, gibt die Anzahl Records zurück."""
+    stop = []
+    signal.signal(signal.SIGTERM, lambda *_: stop.append(True))
+    paths = [c.path for c in channels]
+    period = 1.0 / rate_hz
+    overruns = 0
+
+    with SysfsSampler() as sampler, SensorRecorder(path, channels, rate_hz, index_every) as rec:
+        read_int = sampler.read_int
+        t_end = time.monotonic() + duration if duration else None
+        next_t = time.monotonic()
+        try:
+            while not stop:
+                rec.append([read_int(p) for p in paths])
+                next_t += period
+                now = time.monotonic()
+                if t_end is not None and now >= t_end:
+                    break
+                delay = next_t - now
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    missed = int(-delay / period)
+                    overruns += missed
+                    next_t += missed * period
+        except KeyboardInterrupt:
+            pass
+        count = rec.count
+    if overruns:
+        print(f"Hinweis: {overruns} Ticks verpasst (--rate zu hoch?)", file=sys.stderr)
+    return count
+
+
+# --- Lesen ------------------------------------------------------------------
+
+
+class ChunkIndex(NamedTuple):
+    chunk_no: int
+    first_ms: int
+    last_ms: int
+    mins: Tuple[int, ...]
+    maxs: Tuple[int, ...]
+
+
+class Recording:
+    """Lesezugriff auf eine Aufnahme über mmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "rb")
+        try:
+            head = self._f.read(HEADER.size)
+            if len(head) < HEADER.size:
+                raise ValueError(f"{path}: zu kurz für eine Aufnahme")
+            magic, meta_len, _ = HEADER.unpack(head)
+            if magic != MAGIC:
+                raise ValueError(f"{path}: keine Sensor-Aufnahme (Magic {magic!r})")
+            self.meta = json.loads(self._f.read(meta_len).decode("utf-8"))
+        except Exception:
+            self._f.close()
+            raise
+        self.channels = [Channel(**c) for c in self.meta["channels"]]
+        self.start_time: float = self.meta["start_time"]
+        self.rate_hz: float = self.meta["rate_hz"]
+        self.index_every: int = self.meta["index_every"]
+        self.data_offset = HEADER.size + meta_len + (-(HEADER.size + meta_len)) % 8
+
+        n = len(self.channels)
+        self._record = struct.Struct(f"<I{n}h")
+        self._minmax = struct.Struct(f"<{2 * n}h")
+        self.record_size = self._record.size
+        self.index_size = INDEX_HEAD.size + self._minmax.size
+        self.chunk_size = self.index_every * self.record_size + self.index_size
+        self._by_path = {c.path: i for i, c in enumerate(self.channels)}
+        self._mm: Optional[mmap.mmap] = None
+        self.n_records = 0
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Dateigröße neu lesen (Aufnahme läuft noch), gibt n_records zurück."""
+        size = os.fstat(self._f.fileno()).st_size
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        data = max(0, size - self.data_offset)
+        full, rest = divmod(data, self.chunk_size)
+        self.n_records = full * self.index_every + min(rest // self.record_size, self.index_every)
+        return self.n_records
+
+    def __len__(self) -> int:
+        return self.n_records
+
+    def channel_index(self, path: str) -> Optional[int]:
+        return self._by_path.get(path)
+
+    def _offset(self, i: int) -> int:
+        chunk, pos = divmod(i, self.index_every)
+        return self.data_offset + chunk * self.chunk_size + pos * self.record_size
+
+    def time_ms(self, i: int) -> int:
+        return MS.unpack_from(self._mm, self._offset(i))[0]
+
+    def record(self, i: int) -> Tuple[int, Tuple[int, ...]]:
+        """(ms, gespeicherte Werte) von Record i."""
+        vals = self._record.unpack_from(self._mm, self._offset(i))
+        return vals[0], vals[1:]
+
+    @property
+    def duration_ms(self) -> int:
+        return self.time_ms(self.n_records - 1) if self.n_records else 0
+
+    def find(self, ms: float) -> int:
+        """Index des letzten Records mit Zeit <= ms (0, wenn ms davor liegt)."""
+        lo, hi = 0, self.n_records
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.time_ms(mid) <= ms:
+                lo = mid + 1
+            else:
+                hi = mid
+        return max(0, lo - 1)
+
+    def decode(self, ch: int, stored: int) -> Optional[int]:
+        """Gespeicherten Wert zurück in sysfs-Rohwert (None = fehlte)."""
+        if stored == MISSING:
+            return None
+        return stored * self.channels[ch].scale
+
+    def chunks(self) -> Iterator[ChunkIndex]:
+        """Die Index-Blöcke aller vollständigen Blöcke."""
+        n = len(self.channels)
+        for chunk in range(self.n_records // self.index_every):
+            off = self.data_offset + chunk * self.chunk_size + self.index_every * self.record_size
+            magic, chunk_no, first, last = INDEX_HEAD.unpack_from(self._mm, off)
+            if magic != INDEX_MAGIC:
+                raise ValueError(f"{self.path}: Index-Block {chunk} beschädigt")
+            mm = self._minmax.unpack_from(self._mm, off + INDEX_HEAD.size)
+            yield ChunkIndex(chunk_no, first, last, mm[:n], mm[n:])
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class ReplaySampler:
+    """
+    Liefert Werte einer Aufnahme über dieselbe Schnittstelle wie
+    SysfsSampler (read_int(path) in sysfs-Einheiten), Schlüssel ist der
+    aufgenommene Pfad. Die Position läuft mit der Uhr (speed-fach) und
+    lässt sich pausieren und verschieben.
+
+    Mehrere Threads dürfen denselben ReplaySampler lesen; close() lässt
+    die Aufnahme offen, die gehört dem Aufrufer.
+    """
+
+    SEEK_STEP_S = 10.0
+    SPEEDS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, recording: Recording, speed: float = 1.0):
+        self.recording = recording
+        self.speed = speed
+        self.paused = False
+        self._pos_ms = float(recording.time_ms(0)) if len(recording) else 0.0
+        self._t_ref = time.monotonic()
+        # (Index, ab ms, bis ms, Werte) – als ein Tupel, damit Threads nie
+        # einen halb aktualisierten Cache sehen
+        self._cache: Tuple[int, float, float, Tuple[int, ...]] = (-1, 0.0, -1.0, ())
+
+    # --- Position ---
+
+    def position_ms(self) -> float:
+        pos = self._pos_ms
+        if not self.paused:
+            pos += (time.monotonic() - self._t_ref) * 1000.0 * self.speed
+        end = self.recording.duration_ms
+        return end if pos > end else pos
+
+    def _rebase(self) -> None:
+        self._pos_ms = self.position_ms()
+        self._t_ref = time.monotonic()
+
+    def toggle_pause(self) -> None:
+        self._rebase()
+        self.paused = not self.paused
+
+    def seek(self, delta_s: float) -> None:
+        self._rebase()
+        self._pos_ms = min(max(0.0, self._pos_ms + delta_s * 1000.0), float(self.recording.duration_ms))
+
+    def seek_to(self, ms: float) -> None:
+        self._rebase()
+        self._pos_ms = min(max(0.0, ms), float(self.recording.duration_ms))
+
+    def change_speed(self, step: int) -> None:
+        self._rebase()
+        faster = [s for s in self.SPEEDS if s > self.speed]
+        slower = [s for s in self.SPEEDS if s < self.speed]
+        if step > 0 and faster:
+            self.speed = faster[0]
+        elif step < 0 and slower:
+            self.speed = slower[-1]
+
+    def handle_key(self, key: int) -> bool:
+        """
+        Gemeinsame Replay-Tasten aller TUIs: Leertaste Pause, ←/→ ±10 s,
+        Bild↑/Bild↓ ±5 min, </> Tempo, Pos1/Ende Anfang/Ende.
+        Gibt True zurück, wenn die Taste verbraucht wurde.
+        """
+        import curses
+
+        if key == ord(" "):
+            self.toggle_pause()
+        elif key == curses.KEY_LEFT:
+            self.seek(-self.SEEK_STEP_S)
+        elif key == curses.KEY_RIGHT:
+            self.seek(self.SEEK_STEP_S)
+        elif key == curses.KEY_PPAGE:
+            self.seek(-300)
+        elif key == curses.KEY_NPAGE:
+            self.seek(300)
+        elif key in (ord("<"), ord(",")):
+            self.change_speed(-1)
+        elif key in (ord(">"), ord(".")):
+            self.change_speed(1)
+        elif key == curses.KEY_HOME:
+            self.seek_to(0)
+        elif key == curses.KEY_END:
+            self.seek_to(self.recording.duration_ms)
+        else:
+            return False
+        return True
+
+    def status(self) -> str:
+        pos = self.position_ms()
+        wall = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.recording.start_time + pos / 1000.0))
+        state = "Pause" if self.paused else f"x{self.speed:g}"
+        return (
+            f"Replay {os.path.basename(self.recording.path)} {wall} "
+            f"[{_fmt_elapsed(pos)} / {_fmt_elapsed(self.recording.duration_ms)}] {state}"
+        )
+
+    # --- SysfsSampler-Schnittstelle ---
+
+    def _current(self) -> Tuple[int, ...]:
+        rec = self.recording
+        if rec.n_records == 0:
+            return ()
+        pos = self.position_ms()
+        idx, lo, hi, vals = self._cache
+        if lo <= pos < hi:
+            return vals
+        if idx >= 0 and idx + 1 < rec.n_records and rec.time_ms(idx + 1) <= pos:
+            idx += 1
+            if idx + 1 < rec.n_records and rec.time_ms(idx + 1) <= pos:
+                idx = rec.find(pos)
+        else:
+            idx = rec.find(pos)
+        t, vals = rec.record(idx)
+        nxt = rec.time_ms(idx + 1) if idx + 1 < rec.n_records else float("inf")
+        self._cache = (idx, float(t), float(nxt), vals)
+        return vals
+
+    def read_int(self, path: str) -> Optional[int]:
+        ch = self.recording.channel_index(path)
+        if ch is None:
+            return None
+        vals = self._current()
+        if not vals:
+            return None
+        return self.recording.decode(ch, vals[ch])
+
+    def read_ints(self, paths) -> List[Optional[int]]:
+        return [self.read_int(p) for p in paths]
+
+    def read_str(self, path: str) -> Optional[str]:
+        val = self.read_int(path)
+        return None if val is None else str(val)
+
+    def forget(self, path: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def cpufreq_paths(recording: Recording) -> Dict[int, str]:
+    """{cpu_id: Pfad} der aufgenommenen scaling_cur_freq-Kanäle."""
+    out = {}
+    for ch in recording.channels:
+        m = _CPU_FREQ.search(ch.path) if ch.kind == "cpufreq" else None
+        if m:
+            out[int(m.group(1))] = ch.path
+    return out
+
+
+def open_replay(path: str, speed: float = 1.0) -> ReplaySampler:
+    """Aufnahme öffnen und einen ReplaySampler darauf liefern."""
+    rec = Recording(path)
+    if len(rec) == 0:
+        rec.close()
+        raise ValueError(f"{path}: Aufnahme enthält keine Records")
+    return ReplaySampler(rec, speed)
+
+
+# --- CLI --------------------------------------------------------------------
+
+
+def _fmt_elapsed(ms: float) -> str:
+    s = int(ms // 1000)
+    return f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}"
+
+
+def _fmt_size(n: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+    return str(n)
+
+
+def cmd_record(args) -> int:
+    channels = discover_channels(cpufreq=not args.no_cpufreq, drm=not args.no_drm)
+    if not channels:
+        print("Keine Sensoren gefunden.", file=sys.stderr)
+        return 1
+    rec_bytes = 4 + 2 * len(channels)
+    per_day = rec_bytes * args.rate * 86400
+    print(
+        f"{len(channels)} Kanäle, {args.rate:g} Hz → {rec_bytes} Byte/Record, "
+        f"ca. {_fmt_size(int(per_day))} pro 24 h. Stop mit Ctrl+C.",
+        file=sys.stderr,
+    )
+    try:
+        count = record(args.file, channels, args.rate, args.duration, args.index_every)
+    except FileExistsError:
+        print(f"{args.file} existiert bereits, Aufnahmen werden nie überschrieben.", file=sys.stderr)
+        return 1
+    print(f"{count} Records nach {args.file} geschrieben.", file=sys.stderr)
+    return 0
+
+
+def cmd_info(args) -> int:
+    with Recording(args.file) as rec:
+        size = os.path.getsize(args.file)
+        start = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(rec.start_time))
+        print(f"Datei     : {args.file} ({_fmt_size(size)})")
+        print(f"Host      : {rec.meta.get('host', '?')}")
+        print(f"Start     : {start}")
+        print(f"Dauer     : {_fmt_elapsed(rec.duration_ms)} ({len(rec)} Records, {rec.rate_hz:g} Hz)")
+        print(f"Record    : {rec.record_size} Byte, Index alle {rec.index_every} Records")
+
+        n = len(rec.channels)
+        lo = [INT16_MAX] * n
+        hi = [-INT16_MAX] * n
+        covered = 0
+        for chunk in rec.chunks():
+            covered += rec.index_every
+            for i in range(n):
+                lo[i] = min(lo[i], chunk.mins[i])
+                hi[i] = max(hi[i], chunk.maxs[i])
+        # Rest ohne Index-Block direkt lesen
+        for r in range(covered, len(rec)):
+            _, vals = rec.record(r)
+            for i, v in enumerate(vals):
+                if v != MISSING:
+                    lo[i] = min(lo[i], v)
+                    hi[i] = max(hi[i], v)
+
+        print()
+        print(f"{'Gerät':<14} {'Kanal':<22} {'Min':>10} {'Max':>10}  Einheit")
+        for i, ch in enumerate(rec.channels):
+            if lo[i] > hi[i]:
+                rng = ("-", "-")
+            else:
+                rng = tuple(f"{ch.to_unit(v * ch.scale):.1f}" for v in (lo[i], hi[i]))
+            print(f"{ch.device:<14.14} {ch.label:<22.22} {rng[0]:>10} {rng[1]:>10}  {ch.unit}")
+    return 0
+
+
+def cmd_export(args) -> int:
+    with Recording(args.file) as rec:
+        first = rec.find(args.start * 1000.0) if args.start else 0
+        last = len(rec) if args.end is None else rec.find(args.end * 1000.0) + 1
+        writer = csv.writer(sys.stdout, lineterminator="\n")
+        writer.writerow(["t_s"] + [f"{c.device}/{c.label} [{c.unit}]" if c.unit else f"{c.device}/{c.label}"
+                                   for c in rec.channels])
+        for r in range(first, last):
+            ms, vals = rec.record(r)
+            row = [f"{ms / 1000.0:.3f}"]
+            for i, v in enumerate(vals):
+                raw = rec.decode(i, v)
+                row.append("" if raw is None else f"{rec.channels[i].to_unit(raw):g}")
+            writer.writerow(row)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sensor-Recorder (hwmon, cpufreq, amdgpu) mit Binärformat.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_rec = sub.add_parser("record", help="alle Sensoren aufnehmen")
+    p_rec.add_argument("file", help="neue Aufnahmedatei")
+    p_rec.add_argument("--rate", type=float, default=DEFAULT_RATE_HZ, help="Samples pro Sekunde (Standard 10)")
+    p_rec.add_argument("--duration", type=float, help="nach so vielen Sekunden aufhören (Standard: bis Ctrl+C)")
+    p_rec.add_argument("--index-every", type=int, default=DEFAULT_INDEX_EVERY,
+                       help=f"Index-Block alle N Records (Standard {DEFAULT_INDEX_EVERY})")
+    p_rec.add_argument("--no-cpufreq", action="store_true", help="scaling_cur_freq nicht aufnehmen")
+    p_rec.add_argument("--no-drm", action="store_true", help="gpu_busy_percent/mem_busy_percent nicht aufnehmen")
+
+    p_info = sub.add_parser("info", help="Metadaten und Min/Max pro Kanal")
+    p_info.add_argument("file")
+
+    p_exp = sub.add_parser("export", help="als CSV (Einheiten wie in info) nach stdout")
+    p_exp.add_argument("file")
+    p_exp.add_argument("--start", type=float, help="ab Sekunde")
+    p_exp.add_argument("--end", type=float, help="bis Sekunde")
+
+    args = parser.parse_args()
+    if args.command == "record" and args.rate <= 0:
+        parser.error("--rate muss > 0 sein")
+    handler = {"record": cmd_record, "info": cmd_info, "export": cmd_export}[args.command]
+    sys.exit(handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Gemeinsamer sysfs-Leser für alle TUIs.
+
+Statt pro Wert open/read/close (plus Python-File-Objekt) zu machen, bleibt
+für jedes Attribut ein Dateideskriptor offen. Gelesen wird mit pread() ab
+Offset 0 in einen wiederverwendeten Puffer – sysfs erzeugt den Inhalt dabei
+jedes Mal neu. Verschwindet das Gerät (Hotplug, Modul entladen), wird der
+Deskriptor beim nächsten Zugriff transparent neu geöffnet.
+
+Einbinden aus einem Unterverzeichnis:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+    from sysfs_sampler import SysfsSampler
+"""
+import errno
+import os
+from typing import Dict, Iterable, List, Optional
+
+# Fehler, bei denen sich ein Neu-Öffnen lohnt (Gerät weg / neu angelegt)
+REOPEN_ERRNOS = {errno.ENODEV, errno.ENOENT, errno.ESTALE, errno.EBADF, errno.ENXIO}
+
+DEFAULT_BUF_SIZE = 128
+
+_HAS_PREADV = hasattr(os, "preadv")
+
+
+class SysfsAttr:
+    """Ein einzelnes sysfs-Attribut mit dauerhaft offenem Deskriptor."""
+
+    __slots__ = ("path", "fd")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = -1
+
+    def _open(self) -> bool:
+        try:
+            self.fd = os.open(self.path, os.O_RDONLY | os.O_CLOEXEC)
+            return True
+        except OSError:
+            self.fd = -1
+            return False
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+            self.fd = -1
+
+    def read_into(self, buf: bytearray) -> int:
+        """
+        Liest den Inhalt nach buf und gibt die Länge zurück, -1 bei Fehler.
+        Bei "Gerät weg"-Fehlern wird genau einmal neu geöffnet.
+        """
+        for attempt in (0, 1):
+            if self.fd < 0 and not self._open():
+                return -1
+            try:
+                if _HAS_PREADV:
+                    return os.preadv(self.fd, (buf,), 0)
+                data = os.pread(self.fd, len(buf), 0)
+                buf[: len(data)] = data
+                return len(data)
+            except OSError as e:
+                self.close()
+                if attempt or e.errno not in REOPEN_ERRNOS:
+                    return -1
+        return -1
+
+
+class SysfsSampler:
+    """
+    Verwaltet offene sysfs-Attribute, Schlüssel ist der Pfad.
+
+    Nicht thread-safe (gemeinsamer Lesepuffer) – pro Thread einen
+    eigenen Sampler verwenden.
+    """
+
+    def __init__(self, buf_size: int = DEFAULT_BUF_SIZE):
+        self._attrs: Dict[str, SysfsAttr] = {}
+        self._buf = bytearray(buf_size)
+
+    def attr(self, path: str) -> SysfsAttr:
+        a = self._attrs.get(path)
+        if a is None:
+            a = SysfsAttr(path)
+            self._attrs[path] = a
+        return a
+
+    def read_bytes(self, path: str) -> Optional[bytes]:
+        a = self.attr(path)
+        n = a.read_into(self._buf)
+        # Puffer voll → Inhalt evtl. abgeschnitten, größer nochmal lesen
+        while n == len(self._buf):
+            self._buf = bytearray(2 * len(self._buf))
+            n = a.read_into(self._buf)
+        if n < 0:
+            return None
+        return bytes(self._buf[:n])
+
+    def read_str(self, path: str) -> Optional[str]:
+        data = self.read_bytes(path)
+        if data is None:
+            return None
+        return data.decode("utf-8", "replace").strip()
+
+    def read_int(self, path: str) -> Optional[int]:
+        n = self.attr(path).read_into(self._buf)
+        if n <= 0:
+            return None
+        try:
+            # int() akzeptiert bytes inkl. Whitespace/Newline
+            return int(self._buf[:n])
+        except ValueError:
+            return None
+
+    def read_ints(self, paths: Iterable[str]) -> List[Optional[int]]:
+        return [self.read_int(p) for p in paths]
+
+    def forget(self, path: str) -> None:
+        a = self._attrs.pop(path, None)
+        if a is not None:
+            a.close()
+
+    def close(self) -> None:
+        for a in self._attrs.values():
+            a.close()
+        self._attrs.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def write_int(path: str, value: int) -> bool:
+    """
+    Schreibt einen Integer nach sysfs (eigener Deskriptor, Schreiben ist
+    selten). Offene Lese-Deskriptoren sehen den neuen Wert beim nächsten
+    pread() automatisch.
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CLOEXEC)
+    except OSError:
+        return False
+    try:
+        os.write(fd, str(value).encode())
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
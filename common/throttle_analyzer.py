@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+"""
+Throttle-Analyse für CPU und GPU.
+
+Liest den höchsten CPU-Kerntakt (cpu/freq_sampler.py) und den GPU-Takt
+(gpu/gpu_monitor.py) mit hoher Rate, erkennt anhaltende Takteinbrüche
+und ordnet jeden Einbruch einer Ursache zu:
+
+    thermal   Temperatur an der Schwelle (CPU Tctl/Package, GPU Hotspot)
+    power     Leistung ≥ 95 % der Cap (GPU power1_cap, CPU RAPL-Limit)
+    current   Strom ≥ 95 % des Limits (hwmon currN_max/currN_crit, nur
+              wo der Treiber das anbietet)
+
+Ein Einbruch ist ein Abschnitt, in dem der Takt unter Last mindestens
+--drop MHz (Standard 100) unter der Referenz liegt und das länger als
+--min-duration. Referenz ist bei der GPU das höchste sclk-Level, bei der
+CPU --cpu-ref oder sonst das p95 der letzten 30 s ohne Einbruch. Für
+jeden Einbruch wird die verlorene Taktmenge Σ (Referenz − Takt) · dt in
+MHz·s festgehalten – die Zahl, an der man sieht, ob sich eine Kühlungs-
+oder PPT-Änderung gelohnt hat.
+
+Das Ereignis-Log ist JSON-Lines: eine Kopfzeile ("run"), ein Objekt pro
+Einbruch ("event") und eine Schlusszeile ("end") mit der Laufzeit.
+
+    ./throttle_analyzer.py run --duration 600            # Log in throttle_logs/
+    ./throttle_analyzer.py run --no-cpu --log gpu.jsonl
+    ./throttle_analyzer.py summary vorher.jsonl nachher.jsonl
+"""
+import argparse
+import bisect
+import glob
+import json
+import os
+import socket
+import sys
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+# cpu/ und gpu/ werden erst in run() bzw. für die Prüfung von --cpu-rate importiert
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "..", "cpu"))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "..", "gpu"))
+from ringbuffer import percentiles  # noqa: E402
+from sysfs_sampler import SysfsSampler  # noqa: E402
+
+LOG_VERSION = 1
+DEFAULT_LOG_DIR = os.path.join(SCRIPT_DIR, "throttle_logs")
+
+DEFAULT_DROP_MHZ = 100.0
+DEFAULT_MIN_DURATION_S = 0.5
+BASELINE_WINDOW_S = 30.0
+BASELINE_MIN_S = 2.0  # so viel Historie braucht die rollende Referenz mindestens
+BASELINE_REFRESH_S = 0.5
+LIMIT_SHARE = 0.95  # Leistung/Strom ab diesem Anteil des Limits gilt als "am Limit"
+CAUSE_MIN_SHARE = 0.5  # Ursache, wenn die Bedingung in ≥ 50 % des Einbruchs galt
+MAX_GAP_S = 1.0  # längere Lücken zwischen Samples zählen nicht zu MHz·s
+
+DEFAULT_CPU_TEMP_C = 95.0
+DEFAULT_GPU_TEMP_C = 100.0
+DEFAULT_MIN_BUSY = 50.0
+ANALYSIS_INTERVAL = 0.1  # so oft werden neue Samples abgeholt
+
+CAUSES = ("thermal", "power", "current")
+CAUSE_NAMES = {
+    "thermal": "Temperatur",
+    "power": "Power-Cap",
+    "current": "Strom/EDC",
+    "unknown": "unbekannt",
+}
+
+HWMON_BASE = "/sys/class/hwmon"
+POWERCAP_BASE = "/sys/class/powercap"
+CPU_CHIPS = ("k10temp", "zenpower", "coretemp")
+
+
+class Context(NamedTuple):
+    """Randbedingungen zu einem Sample, None = nicht verfügbar."""
+
+    temp_c: Optional[float] = None
+    temp_limit_c: Optional[float] = None
+    power_w: Optional[float] = None
+    power_cap_w: Optional[float] = None
+    current_a: Optional[float] = None
+    current_limit_a: Optional[float] = None
+
+
+def limit_hits(ctx: Context) -> Tuple[Optional[bool], Optional[bool], Optional[bool]]:
+    """(thermal, power, current) – True/False, None wenn nicht messbar."""
+    thermal = None
+    if ctx.temp_c is not None and ctx.temp_limit_c is not None:
+        thermal = ctx.temp_c >= ctx.temp_limit_c
+    power = None
+    if ctx.power_w is not None and ctx.power_cap_w:
+        power = ctx.power_w >= LIMIT_SHARE * ctx.power_cap_w
+    current = None
+    if ctx.current_a is not None and ctx.current_limit_a:
+        current = ctx.current_a >= LIMIT_SHARE * ctx.current_limit_a
+    return thermal, power, current
+
+
+class ThrottleEvent(NamedTuple):
+    domain: str  # "cpu" / "gpu"
+    start: float  # Sekunden seit Beginn der Analyse
+    duration: float
+    ref_mhz: float
+    min_mhz: float
+    mean_mhz: float
+    lost_mhz_s: float
+    cause: str  # "thermal", "power", "current", Kombination mit "+" oder "unknown"
+    shares: Dict[str, Optional[float]]  # Anteil des Einbruchs am jeweiligen Limit
+    temp_max_c: Optional[float]
+    power_mean_w: Optional[float]
+
+    def to_json(self) -> dict:
+        def r(v, nd=1):
+            if v is None:
+                return None
+            return round(v) if nd == 0 else round(v, nd)
+
+        return {
+            "type": "event",
+            "domain": self.domain,
+            "t": r(self.start, 2),
+            "dur": r(self.duration, 2),
+            "ref": r(self.ref_mhz, 0),
+            "min": r(self.min_mhz, 0),
+            "mean": r(self.mean_mhz, 0),
+            "lost": r(self.lost_mhz_s),
+            "cause": self.cause,
+            "share": {k: r(v, 2) for k, v in self.shares.items()},
+            "temp_max": r(self.temp_max_c),
+            "power_mean": r(self.power_mean_w),
+        }
+
+    @classmethod
+    def from_json(cls, obj: dict) -> "ThrottleEvent":
+        return cls(obj["domain"], obj["t"], obj["dur"], obj["ref"], obj["min"], obj["mean"],
+                   obj["lost"], obj["cause"], obj.get("share", {}), obj.get("temp_max"), obj.get("power_mean"))
+
+
+def format_event(ev: ThrottleEvent) -> str:
+    shares = [f"{CAUSE_NAMES[c]} {ev.shares[c] * 100:.0f} %" for c in CAUSES if ev.shares.get(c)]
+    extra = []
+    if ev.temp_max_c is not None:
+        extra.append(f"max {ev.temp_max_c:.1f} °C")
+    if ev.power_mean_w is not None:
+        extra.append(f"Ø {ev.power_mean_w:.1f} W")
+    cause = "+".join(CAUSE_NAMES.get(c, c) for c in ev.cause.split("+"))
+    return (f"{ev.domain:<3} t={ev.start:8.2f} s  {ev.duration:6.2f} s  Ref {ev.ref_mhz:.0f} MHz, "
+            f"min {ev.min_mhz:.0f}, Ø {ev.mean_mhz:.0f} → {ev.lost_mhz_s:8.1f} MHz·s  "
+            f"Ursache: {cause}" + (f" ({', '.join(shares)})" if shares else "")
+            + (f"  [{', '.join(extra)}]" if extra else ""))
+
+
+class _OpenEvent:
+    __slots__ = ("start", "last_t", "last_mhz", "ref", "min", "sum", "n", "lost", "hits", "measured",
+                 "temp_max", "power_sum", "power_n")
+
+    def __init__(self, t: float, ref: float):
+        self.start = t
+        self.last_t = t
+        self.last_mhz = ref
+        self.ref = ref
+        self.min = float("inf")
+        self.sum = 0.0
+        self.n = 0
+        self.lost = 0.0
+        self.hits = [0, 0, 0]
+        self.measured = [0, 0, 0]
+        self.temp_max: Optional[float] = None
+        self.power_sum = 0.0
+        self.power_n = 0
+
+
+class DropDetector:
+    """
+    Erkennt anhaltende Takteinbrüche in einem Strom von Samples.
+
+    feed() bekommt pro Sample Zeit, Takt, ob die Komponente ausgelastet
+    ist, optional eine feste Referenz (z.B. höchstes sclk-Level) und die
+    Randbedingungen. Ohne feste Referenz dient das p95 der letzten
+    baseline_s Sekunden außerhalb von Einbrüchen als Referenz; während
+    eines Einbruchs bleibt sie eingefroren. Ein Einbruch endet, wenn der
+    Takt wieder auf weniger als drop/2 an die Referenz heranrückt oder die
+    Last wegfällt.
+    """
+
+    def __init__(
+        self,
+        domain: str,
+        drop_mhz: float = DEFAULT_DROP_MHZ,
+        min_duration: float = DEFAULT_MIN_DURATION_S,
+        baseline_s: float = BASELINE_WINDOW_S,
+    ):
+        self.domain = domain
+        self.drop_mhz = drop_mhz
+        self.min_duration = min_duration
+        self.baseline_s = baseline_s
+        self._history: deque = deque()  # (t, mhz) für die rollende Referenz
+        self._baseline: Optional[float] = None
+        self._baseline_t = float("-inf")
+        self._ev: Optional[_OpenEvent] = None
+        self._prev_t: Optional[float] = None
+
+    def baseline(self, t: float) -> Optional[float]:
+        hist = self._history
+        while hist and hist[0][0] < t - self.baseline_s:
+            hist.popleft()
+        if not hist or hist[-1][0] - hist[0][0] < BASELINE_MIN_S:
+            return None
+        if t - self._baseline_t >= BASELINE_REFRESH_S:
+            self._baseline = percentiles([m for _t, m in hist], (95,))[0]
+            self._baseline_t = t
+        return self._baseline
+
+    def feed(
+        self,
+        t: float,
+        mhz: Optional[float],
+        active: bool = True,
+        ref: Optional[float] = None,
+        ctx: Optional[Context] = None,
+    ) -> Optional[ThrottleEvent]:
+        prev_t, self._prev_t = self._prev_t, t
+        if mhz is None or not active:
+            return self._close()
+
+        ev = self._ev
+        if ev is None:
+            if ref is None:
+                ref = self.baseline(t)
+                self._history.append((t, mhz))
+            if ref is None or mhz >= ref - self.drop_mhz:
+                return None
+            ev = self._ev = _OpenEvent(t, ref)
+        else:
+            if ref is None:
+                ref = ev.ref  # eingefroren
+            dt = t - prev_t if prev_t is not None else 0.0
+            if dt > MAX_GAP_S:
+                dt = 0.0
+            # Intervall bis zu diesem Sample zählt mit dem Takt an seinem Anfang
+            ev.lost += (ref - ev.last_mhz) * dt
+            ev.last_t = t
+            if mhz >= ref - self.drop_mhz / 2:
+                return self._close()
+
+        ev.ref = ref
+        ev.last_mhz = mhz
+        ev.n += 1
+        ev.sum += mhz
+        if mhz < ev.min:
+            ev.min = mhz
+        if ctx is not None:
+            for i, hit in enumerate(limit_hits(ctx)):
+                if hit is not None:
+                    ev.measured[i] += 1
+                    ev.hits[i] += hit
+            if ctx.temp_c is not None and (ev.temp_max is None or ctx.temp_c > ev.temp_max):
+                ev.temp_max = ctx.temp_c
+            if ctx.power_w is not None:
+                ev.power_sum += ctx.power_w
+                ev.power_n += 1
+        return None
+
+    def _close(self) -> Optional[ThrottleEvent]:
+        ev, self._ev = self._ev, None
+        if ev is None or ev.last_t - ev.start < self.min_duration:
+            return None
+        shares = {
+            cause: (ev.hits[i] / ev.measured[i] if ev.measured[i] else None)
+            for i, cause in enumerate(CAUSES)
+        }
+        causes = [c for c in CAUSES if (shares[c] or 0.0) >= CAUSE_MIN_SHARE]
+        return ThrottleEvent(
+            domain=self.domain,
+            start=ev.start,
+            duration=ev.last_t - ev.start,
+            ref_mhz=ev.ref,
+            min_mhz=ev.min,
+            mean_mhz=ev.sum / ev.n,
+            lost_mhz_s=ev.lost,
+            cause="+".join(causes) or "unknown",
+            shares=shares,
+            temp_max_c=ev.temp_max,
+            power_mean_w=ev.power_sum / ev.power_n if ev.power_n else None,
+        )
+
+    def finish(self) -> Optional[ThrottleEvent]:
+        """Offenen Einbruch am Ende der Messung abschließen."""
+        return self._close()
+
+
+# --- Randbedingungen lesen ---
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def hwmon_dirs(names) -> List[str]:
+    return [d for d in sorted(glob.glob(os.path.join(HWMON_BASE, "hwmon*")))
+            if _read(os.path.join(d, "name")) in names]
+
+
+def current_channels(dirs: List[str]) -> List[Tuple[str, str]]:
+    """(currN_input, currN_max oder currN_crit) für alle Kanäle mit Limit."""
+    out = []
+    for d in dirs:
+        for inp in sorted(glob.glob(os.path.join(d, "curr*_input"))):
+            base = inp[: -len("_input")]
+            for suffix in ("_max", "_crit"):
+                if os.path.exists(base + suffix):
+                    out.append((inp, base + suffix))
+                    break
+    return out
+
+
+class CurrentReader:
+    """Strom des Kanals, der seinem Limit am nächsten ist (A, Limit A)."""
+
+    def __init__(self, channels: List[Tuple[str, str]], sampler: SysfsSampler):
+        self.channels = channels
+        self.sampler = sampler
+
+    def read(self) -> Tuple[Optional[float], Optional[float]]:
+        best = (None, None)
+        best_ratio = -1.0
+        for inp, lim in self.channels:
+            cur = self.sampler.read_int(inp)
+            limit = self.sampler.read_int(lim)
+            if cur is None or not limit:
+                continue
+            if cur / limit > best_ratio:
+                best_ratio = cur / limit
+                best = (cur / 1000.0, limit / 1000.0)  # hwmon: mA
+        return best
+
+
+class RaplReader:
+    """
+    CPU-Paketleistung aus dem powercap-Zähler (intel-rapl, auf neueren
+    Kerneln auch AMD) und das Langzeit-Limit. energy_uj ist oft nur für
+    root lesbar – dann bleibt die Leistung None.
+    """
+
+    def __init__(self, sampler: SysfsSampler, base: Optional[str] = None):
+        self.sampler = sampler
+        self.base = base or self._find()
+        self._prev: Optional[Tuple[float, int]] = None
+        self.max_range = None
+        if self.base:
+            rng = _read(os.path.join(self.base, "max_energy_range_uj"))
+            self.max_range = int(rng) if rng and rng.isdigit() else None
+
+    @staticmethod
+    def _find() -> Optional[str]:
+        for d in sorted(glob.glob(os.path.join(POWERCAP_BASE, "*-rapl:[0-9]"))):
+            if (_read(os.path.join(d, "name")) or "").startswith("package"):
+                return d
+        return None
+
+    def read(self) -> Tuple[Optional[float], Optional[float]]:
+        if not self.base:
+            return None, None
+        cap = self.sampler.read_int(os.path.join(self.base, "constraint_0_power_limit_uw"))
+        energy = self.sampler.read_int(os.path.join(self.base, "energy_uj"))
+        now = time.perf_counter()
+        power = None
+        if energy is not None:
+            if self._prev is not None and now > self._prev[0]:
+                delta = energy - self._prev[1]
+                if delta < 0 and self.max_range:
+                    delta += self.max_range  # Zählerüberlauf
+                if delta >= 0:
+                    power = delta / 1e6 / (now - self._prev[0])
+            self._prev = (now, energy)
+        return power, (cap / 1e6 if cap else None)
+
+
+# --- Ereignis-Log ---
+
+
+class EventLog:
+    """JSON-Lines-Datei: run-Kopf, event pro Einbruch, end mit Laufzeit."""
+
+    def __init__(self, path: str, header: dict):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.f = open(path, "w", encoding="utf-8")
+        self._write(dict({"type": "run", "v": LOG_VERSION}, **header))
+
+    def _write(self, obj: dict) -> None:
+        self.f.write(json.dumps(obj, separators=(",", ":"), ensure_ascii=False) + "\n")
+        self.f.flush()  # Log soll auch bei Abbruch vollständig sein
+
+    def event(self, ev: ThrottleEvent) -> None:
+        self._write(ev.to_json())
+
+    def close(self, duration: float) -> None:
+        self._write({"type": "end", "duration": round(duration, 2)})
+        self.f.close()
+
+
+class LoadedLog(NamedTuple):
+    path: str
+    header: dict
+    events: List[ThrottleEvent]
+    duration: Optional[float]  # None, wenn die end-Zeile fehlt (Abbruch)
+
+
+def load_log(path: str) -> LoadedLog:
+    header: dict = {}
+    events = []
+    duration = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            obj = json.loads(line)
+            kind = obj.get("type")
+            if kind == "run":
+                if obj.get("v") != LOG_VERSION:
+                    raise ValueError(f"{path}: Log-Version {obj.get('v')!r} statt {LOG_VERSION}")
+                header = obj
+            elif kind == "event":
+                events.append(ThrottleEvent.from_json(obj))
+            elif kind == "end":
+                duration = obj["duration"]
+    if duration is None and events:
+        duration = max(ev.start + ev.duration for ev in events)
+    return LoadedLog(path, header, events, duration)
+
+
+class DomainSummary(NamedTuple):
+    events: int
+    seconds: float
+    lost_mhz_s: float
+    by_cause: Dict[str, float]  # verlorene MHz·s je Ursache
+
+
+def summarize(events: List[ThrottleEvent], domains=()) -> Dict[str, DomainSummary]:
+    out: Dict[str, DomainSummary] = {}
+    for domain in sorted(set(domains) | {ev.domain for ev in events}):
+        evs = [ev for ev in events if ev.domain == domain]
+        by_cause: Dict[str, float] = {}
+        for ev in evs:
+            by_cause[ev.cause] = by_cause.get(ev.cause, 0.0) + ev.lost_mhz_s
+        out[domain] = DomainSummary(len(evs), sum(ev.duration for ev in evs),
+                                    sum(ev.lost_mhz_s for ev in evs), by_cause)
+    return out
+
+
+def format_summary(log: LoadedLog) -> List[str]:
+    dur = log.duration or 0.0
+    lines = [f"{log.path}: {log.header.get('host', '?')} {log.header.get('started', '')}, "
+             f"Laufzeit {dur:.0f} s, {len(log.events)} Einbrüche"]
+    for domain, s in summarize(log.events, log.header.get("domains", ())).items():
+        per_min = s.lost_mhz_s / dur * 60 if dur > 0 else 0.0
+        share = s.seconds / dur * 100 if dur > 0 else 0.0
+        causes = ", ".join(f"{'+'.join(CAUSE_NAMES.get(c, c) for c in cause.split('+'))} {lost:.0f}"
+                           for cause, lost in sorted(s.by_cause.items(), key=lambda kv: -kv[1]))
+        lines.append(f"  {domain:<3} {s.events:4d} × {s.seconds:7.1f} s ({share:4.1f} %)  "
+                     f"{s.lost_mhz_s:9.0f} MHz·s = {per_min:7.1f} MHz·s/min   [{causes}]")
+    return lines
+
+
+# --- Live-Analyse ---
+
+
+def _since(series, t_last: float):
+    """Zeilen einer Zeitreihe (t als erstes Feld) mit t > t_last."""
+    i = bisect.bisect_right([row[0] for row in series], t_last)
+    return series[i:]
+
+
+def run(args) -> int:
+    sampler = SysfsSampler()
+    detectors: Dict[str, DropDetector] = {}
+    cpu = gpu = None
+    cpu_load = None
+
+    if not args.no_cpu:
+        from cpu_load import ProcStatReader
+        from freq_sampler import FreqSampler, list_cpu_freq_paths
+
+        paths = list_cpu_freq_paths()
+        if paths:
+            temp_paths = [p for d in hwmon_dirs(CPU_CHIPS) for p in sorted(glob.glob(os.path.join(d, "temp*_input")))]
+            cpu = FreqSampler(paths, args.cpu_rate, 5.0, temp_paths)
+            cpu_load = ProcStatReader()
+            cpu_current = CurrentReader(current_channels(hwmon_dirs(CPU_CHIPS)), sampler)
+            rapl = RaplReader(sampler)
+            detectors["cpu"] = DropDetector("cpu", args.drop, args.min_duration)
+        else:
+            print("Keine CPU-Frequenzdaten (cpufreq), CPU wird übersprungen.", file=sys.stderr)
+
+    if not args.no_gpu:
+        from gpu_monitor import GpuMonitor, discover
+
+        gpaths = discover(args.card)
+        if gpaths.hwmon is not None and os.path.exists(gpaths.sclk):
+            gpu = GpuMonitor(gpaths, args.gpu_rate, 5.0)
+            gpu_current = CurrentReader(current_channels([gpaths.hwmon]), sampler)
+            detectors["gpu"] = DropDetector("gpu", args.drop, args.min_duration)
+        else:
+            print(f"Keine AMD-GPU gefunden ({gpaths.card}), GPU wird übersprungen.", file=sys.stderr)
+
+    if not detectors:
+        print("Weder CPU- noch GPU-Takt lesbar.", file=sys.stderr)
+        return 1
+
+    log_path = args.log or os.path.join(DEFAULT_LOG_DIR, f"throttle_{time.strftime('%Y-%m-%d_%H-%M-%S')}.jsonl")
+    header = {
+        "host": socket.gethostname(),
+        "started": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "domains": sorted(detectors),
+        "drop_mhz": args.drop,
+        "min_duration": args.min_duration,
+        "cpu_ref": args.cpu_ref,
+        "cpu_temp": args.cpu_temp,
+        "gpu_temp": args.gpu_temp,
+        "min_busy": args.min_busy,
+    }
+    log = EventLog(log_path, header)
+    print(f"Analyse: {', '.join(sorted(detectors))}, Log {log_path}  (Ctrl+C beendet)", file=sys.stderr)
+
+    t0 = time.perf_counter()
+    last = {"cpu": float("-inf"), "gpu": float("-inf")}
+    events: List[ThrottleEvent] = []
+
+    def emit(ev: Optional[ThrottleEvent]) -> None:
+        if ev is not None:
+            events.append(ev)
+            log.event(ev)
+            print(format_event(ev), flush=True)
+
+    for s in (cpu, gpu):
+        if s is not None:
+            s.start()
+    t_end = t0 + args.duration if args.duration else None
+    next_t = time.perf_counter()
+    try:
+        while t_end is None or time.perf_counter() < t_end:
+            if cpu is not None:
+                busy = max(cpu_load.sample().values(), default=None)
+                power, cap = rapl.read()
+                amps, amps_limit = cpu_current.read()
+                offset = cpu.t0 - t0
+                active = busy is None or busy >= args.min_busy
+                rows = _since(cpu.series(), last["cpu"])
+                for t, peak, _mean, temp in rows:
+                    ctx = Context(temp, args.cpu_temp, power, cap, amps, amps_limit)
+                    emit(detectors["cpu"].feed(t + offset, peak, active, args.cpu_ref, ctx))
+                if rows:
+                    last["cpu"] = rows[-1][0]
+            if gpu is not None:
+                amps, amps_limit = gpu_current.read()
+                offset = gpu.t0 - t0
+                rows = _since(gpu.series(), last["gpu"])
+                for t, sclk, top, busy, power, cap, hotspot in rows:
+                    active = busy is None or busy >= args.min_busy
+                    ctx = Context(hotspot, args.gpu_temp, power, cap, amps, amps_limit)
+                    emit(detectors["gpu"].feed(t + offset, sclk, active, top, ctx))
+                if rows:
+                    last["gpu"] = rows[-1][0]
+
+            next_t += ANALYSIS_INTERVAL
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_t = time.perf_counter()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for s in (cpu, gpu):
+            if s is not None:
+                s.stop()
+        for det in detectors.values():
+            emit(det.finish())
+        log.close(time.perf_counter() - t0)
+        sampler.close()
+        if cpu_load is not None:
+            cpu_load.sampler.close()
+
+    for line in format_summary(load_log(log_path)):
+        print(line)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Anhaltende Takteinbrüche von CPU und GPU erkennen und zuordnen.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="live messen und Ereignis-Log schreiben")
+    p_run.add_argument("--duration", type=float, help="Messdauer in s (Standard: bis Ctrl+C)")
+    p_run.add_argument("--log", help="Ereignis-Log (Standard: throttle_logs/throttle_<Zeit>.jsonl)")
+    p_run.add_argument("--no-cpu", action="store_true", help="CPU nicht analysieren")
+    p_run.add_argument("--no-gpu", action="store_true", help="GPU nicht analysieren")
+    p_run.add_argument("--card", help="DRM-Karte der GPU (Standard: erste AMD-Karte)")
+    p_run.add_argument("--cpu-rate", type=float, default=100.0, help="Samples/s für die CPU (max 1000, Standard 100)")
+    p_run.add_argument("--gpu-rate", type=float, default=20.0, help="Samples/s für die GPU (10–50, Standard 20)")
+    p_run.add_argument("--drop", type=float, default=DEFAULT_DROP_MHZ,
+                       help=f"Einbruch ab so vielen MHz unter der Referenz (Standard {DEFAULT_DROP_MHZ:.0f})")
+    p_run.add_argument("--min-duration", type=float, default=DEFAULT_MIN_DURATION_S,
+                       help=f"Mindestdauer eines Einbruchs in s (Standard {DEFAULT_MIN_DURATION_S:g})")
+    p_run.add_argument("--cpu-ref", type=float,
+                       help="feste CPU-Referenz in MHz (Standard: p95 der letzten 30 s); für Vergleiche zwischen Läufen setzen")
+    p_run.add_argument("--cpu-temp", type=float, default=DEFAULT_CPU_TEMP_C,
+                       help=f"CPU-Temperaturschwelle in °C (Standard {DEFAULT_CPU_TEMP_C:.0f})")
+    p_run.add_argument("--gpu-temp", type=float, default=DEFAULT_GPU_TEMP_C,
+                       help=f"GPU-Hotspot-Schwelle in °C (Standard {DEFAULT_GPU_TEMP_C:.0f})")
+    p_run.add_argument("--min-busy", type=float, default=DEFAULT_MIN_BUSY,
+                       help=f"nur bei mindestens so viel %% Last auswerten (Standard {DEFAULT_MIN_BUSY:.0f})")
+
+    p_sum = sub.add_parser("summary", help="Logs zusammenfassen (z.B. vor/nach einer Änderung)")
+    p_sum.add_argument("logs", nargs="+")
+    p_sum.add_argument("--events", action="store_true", help="alle Einbrüche einzeln auflisten")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if not 10 <= args.gpu_rate <= 50:
+            parser.error("--gpu-rate muss zwischen 10 und 50 liegen")
+        from freq_sampler import MAX_RATE_HZ
+
+        if not 0 < args.cpu_rate <= MAX_RATE_HZ:
+            parser.error(f"--cpu-rate muss zwischen 0 und {MAX_RATE_HZ:.0f} liegen")
+        sys.exit(run(args))
+
+    for path in args.logs:
+        try:
+            log = load_log(path)
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            sys.exit(1)
+        for line in format_summary(log):
+            print(line)
+        if args.events:
+            for ev in log.events:
+                print("    " + format_event(ev))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Differenzielles Zeichnen für die curses-TUIs.
+
+Ein Frame ist eine Liste von Zellen (row, col, text, attr). FrameRenderer
+merkt sich den zuletzt gezeichneten Frame und schreibt nur Zellen, deren
+Text oder Attribut sich geändert hat – und davon nur den geänderten
+Abschnitt. Weggefallene Zellen werden mit Leerzeichen überschrieben.
+Kein erase() pro Tick: weniger Flackern und über SSH nur die Bytes der
+geänderten Werte.
+
+Alles wird auf die aktuelle Fenstergröße beschnitten (die letzte Spalte
+bleibt frei, curses wirft dort sonst curses.error). Ändert sich die Größe
+oder das Layout (layout-Signatur), wird einmal komplett neu gezeichnet.
+
+    renderer = FrameRenderer(stdscr)
+    frame = Frame()
+    frame.add(0, 0, "Titel", curses.A_BOLD)
+    frame.add(2, 4, f"{temp:5.1f} °C")
+    renderer.render(frame)
+"""
+import curses
+from typing import Dict, List, Optional, Tuple
+
+Cell = Tuple[int, int, str, int]
+
+
+class Frame(list):
+    """Liste von Zellen (row, col, text, attr) mit Komfort-Methoden."""
+
+    def add(self, row: int, col: int, text: str, attr: int = curses.A_NORMAL) -> None:
+        self.append((row, col, text, attr))
+
+    def lines(self, row: int, texts: List[str], col: int = 0, attr: int = curses.A_NORMAL) -> int:
+        """Mehrere Zeilen ab row; gibt die nächste freie Zeile zurück."""
+        for text in texts:
+            self.append((row, col, text, attr))
+            row += 1
+        return row
+
+
+def _changed_span(old: str, new: str) -> Tuple[int, int]:
+    """[start, end) des Bereichs von new, der sich gegenüber old geändert hat."""
+    n = min(len(old), len(new))
+    start = 0
+    while start < n and old[start] == new[start]:
+        start += 1
+    end_old, end_new = len(old), len(new)
+    while end_old > start and end_new > start and old[end_old - 1] == new[end_new - 1]:
+        end_old -= 1
+        end_new -= 1
+    return start, end_new
+
+
+class FrameRenderer:
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+        self._cells: Dict[Tuple[int, int], Tuple[str, int]] = {}
+        self._size: Optional[Tuple[int, int]] = None
+        self._layout = None
+        self.full_redraws = 0
+        self.writes = 0  # addstr-Aufrufe insgesamt (für Messungen)
+
+    def invalidate(self) -> None:
+        """Nächstes render() zeichnet alles neu (z.B. nach KEY_RESIZE)."""
+        self._size = None
+
+    def _put(self, row: int, col: int, text: str, attr: int) -> None:
+        try:
+            self.stdscr.addstr(row, col, text, attr)
+        except curses.error:
+            # z.B. Fenster zwischen getmaxyx() und addstr() verkleinert
+            self._size = None
+        self.writes += 1
+
+    def render(self, frame: List[Cell], layout=None) -> None:
+        stdscr = self.stdscr
+        max_y, max_x = stdscr.getmaxyx()
+        if (max_y, max_x) != self._size or layout != self._layout:
+            self._size = (max_y, max_x)
+            self._layout = layout
+            self._cells = {}
+            stdscr.erase()
+            self.full_redraws += 1
+
+        new_cells: Dict[Tuple[int, int], Tuple[str, int]] = {}
+        for row, col, text, attr in frame:
+            if row < 0 or col < 0 or row >= max_y or col >= max_x - 1:
+                continue
+            new_cells[(row, col)] = (text[: max_x - 1 - col], attr)
+
+        for (row, col), (text, _attr) in self._cells.items():
+            if (row, col) not in new_cells:
+                self._put(row, col, " " * len(text), curses.A_NORMAL)
+
+        for (row, col), (text, attr) in new_cells.items():
+            old = self._cells.get((row, col))
+            if old == (text, attr):
+                continue
+            if old is None or old[1] != attr:
+                out, start = text, 0
+            else:
+                start, end = _changed_span(old[0], text)
+                out = text[start:end]
+            if old is not None and len(old[0]) > len(text):
+                # kürzer geworden: Rest der alten Zelle löschen
+                out = text[start:] + " " * (len(old[0]) - len(text))
+            if out:
+                self._put(row, col + start, out, attr)
+
+        self._cells = new_cells
+        stdscr.refresh()
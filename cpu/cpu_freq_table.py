@@ -1,85 +1,409 @@
 #!/usr/bin/env python3
+import argparse
 import os
+import sys
 import time
 import curses
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from sensor_recorder import cpufreq_paths, open_replay  # noqa: E402
+from tui_render import FrameRenderer  # noqa: E402
+from freq_sampler import (  # noqa: E402
+    DEFAULT_RATE_HZ,
+    DEFAULT_WINDOW_S,
+    MAX_RATE_HZ,
+    CPU_BASE,
+    FreqSampler,
+    list_cpu_freq_paths,
+)
+from cpu_topology import GROUP_KEYS, group_cpus, read_topology  # noqa: E402
+from cpu_load import LoadSampler  # noqa: E402
 
-def read_core_freqs():
-    freqs = {}
-    base_path = "/sys/devices/system/cpu"
 
-    for entry in sorted(os.listdir(base_path)):
-        if not entry.startswith("cpu"):
-            continue
-        suffix = entry[3:]
-        if not suffix.isdigit():
-            continue
+# --- Layout ---------------------------------------------------------------
 
-        cpu_id = int(suffix)
-        freq_path = os.path.join(
-            base_path,
-            entry,
-            "cpufreq",
-            "scaling_cur_freq",
-        )
+MODES = ["auto", "table", "compact", "heatmap"]
+HEAT_GLYPHS = " ▁▂▃▄▅▆▇█"
+COL_GAP = 2
+HEADER_ROWS = 4  # Titel, Status, Spaltenkopf/Legende, Leerzeile
+
+
+def stat_line(label, cur, st, label_w=6):
+    cur_str = f"{cur:7.1f}" if cur is not None else f"{'?':>7}"
+    if st is None:
+        return f"{label:<{label_w}} {cur_str}"
+    return (
+        f"{label:<{label_w}} {cur_str} {st.min:7.1f} {st.max:7.1f} {st.mean:7.1f} "
+        f"{st.p50:7.1f} {st.p99:7.1f}"
+    )
+
+
+def table_header(label_w):
+    return (
+        f"{'CPU':<{label_w}} {'aktuell':>7} {'min':>7} {'max':>7} {'mittel':>7} "
+        f"{'p50':>7} {'p99':>7}"
+    )
+
+
+def load_header(label_w):
+    return f"{'CPU':<{label_w}} {'busy':>6} {'eff':>7} {'avg':>7} {'cpufreq':>7}"
+
+
+def load_line(label, load, cpufreq, label_w=6):
+    """busy %, effektiver Takt (aktiv), Mittel inkl. Idle, cpufreq-Wert."""
+    def mhz(v):
+        return f"{v:7.1f}" if v is not None else f"{'-':>7}"
 
+    busy = f"{load.busy_pct:5.1f}%" if load is not None else f"{'?':>6}"
+    eff = load.eff_mhz if load is not None else None
+    avg = load.avg_mhz if load is not None else None
+    return f"{label:<{label_w}} {busy} {mhz(eff)} {mhz(avg)} {mhz(cpufreq)}"
+
+
+def read_freq_limits(cpu_id):
+    """cpuinfo_min/max_freq in MHz für die Heatmap-Skala, sonst None."""
+    base = os.path.join(CPU_BASE, f"cpu{cpu_id}", "cpufreq")
+    limits = []
+    for name in ("cpuinfo_min_freq", "cpuinfo_max_freq"):
         try:
-            with open(freq_path, "r", encoding="utf-8") as f:
-                kHz = int(f.read().strip() or "0")
-                freqs[cpu_id] = kHz / 1000.0  # MHz
-        except (FileNotFoundError, ValueError, OSError):
-            continue
+            with open(os.path.join(base, name), "r") as f:
+                limits.append(int(f.read().strip()) / 1000.0)
+        except (OSError, ValueError):
+            return None
+    return tuple(limits)
 
-    return freqs
 
+def plan_grid(groups, cell_w, n_rows_avail, max_x):
+    """
+    Verteilt die CPUs jeder Gruppe zeilenweise auf so viele Spalten wie
+    nebeneinander passen. Gibt [(rel_row, col, cpu | Gruppenlabel)] zurück
+    oder None, wenn nicht alles auf den Schirm passt.
+    """
+    ncols = max(1, (max_x - 1 + COL_GAP) // (cell_w + COL_GAP))
+    items = []
+    row = 0
+    show_labels = len(groups) > 1
+    for label, cpus in groups:
+        if show_labels:
+            items.append((row, 0, label))
+            row += 1
+        for i, cpu in enumerate(cpus):
+            items.append((row + i // ncols, (i % ncols) * (cell_w + COL_GAP), cpu))
+        row += -(-len(cpus) // ncols)
+    if row > n_rows_avail:
+        return None
+    return items, ncols
 
-def draw_freqs(stdscr):
-    curses.curs_set(0)
-    stdscr.nodelay(True)
 
-    rows_per_block = 6
-    blocks_per_row = 4
-    block_width = 16  # chars
+class FreqTableView:
+    """
+    Baut pro Tick einen Frame [(row, col, text, attr)]; gezeichnet wird
+    über tui_render.FrameRenderer (nur geänderte Zellen).
+    """
+
+    def __init__(self, stdscr, topo, freq_limits):
+        self.stdscr = stdscr
+        self.topo = topo
+        self.freq_limits = freq_limits
+        self.mode = "auto"
+        self.group_key = "ccx"
+        self.metric = "freq"  # "freq": cpufreq + Statistik, "load": /proc/stat + MSR
+        self.label_w = 3 + max(2, len(str(max(topo) if topo else 0)))
+        self.renderer = FrameRenderer(stdscr)
+        self.used_mode = None
+        self.colors = []
+        if curses.has_colors():
+            curses.start_color()
+            try:
+                curses.use_default_colors()
+                bg = -1
+            except curses.error:
+                bg = curses.COLOR_BLACK
+            for idx, fg in enumerate(
+                (curses.COLOR_BLUE, curses.COLOR_GREEN, curses.COLOR_YELLOW, curses.COLOR_RED),
+                start=1,
+            ):
+                curses.init_pair(idx, fg, bg)
+                self.colors.append(curses.color_pair(idx))
 
-    while True:
-        ch = stdscr.getch()
-        if ch in (ord("q"), 27):  # q oder ESC
-            break
+    # --- Zustand ---
 
-        freqs = read_core_freqs()
-        stdscr.erase()
+    def cycle_mode(self):
+        self.mode = MODES[(MODES.index(self.mode) + 1) % len(MODES)]
 
-        if not freqs:
-            stdscr.addstr(0, 0, "Keine CPU-Frequenzdaten gefunden (cpufreq).")
-            stdscr.refresh()
-            time.sleep(0.5)
-            continue
+    def toggle_metric(self):
+        self.metric = "load" if self.metric == "freq" else "freq"
 
-        stdscr.addstr(0, 0, "Aktuelle Kernfrequenzen (MHz) – q/ESC beendet")
+    def cycle_group(self):
+        keys = list(GROUP_KEYS)
+        self.group_key = keys[(keys.index(self.group_key) + 1) % len(keys)]
 
-        cores = sorted(freqs.keys())
-        max_cores = rows_per_block * blocks_per_row
-        cores = cores[:max_cores]
+    # --- Hilfen ---
 
-        for idx, cpu_id in enumerate(cores):
-            block_idx = idx // rows_per_block
-            row_in_block = idx % rows_per_block
+    def _level(self, mhz, lo, hi):
+        if hi <= lo:
+            return 1.0
+        return min(1.0, max(0.0, (mhz - lo) / (hi - lo)))
 
-            col_block = block_idx  # eine Blockreihe, 4 nebeneinander
+    def _heat_attr(self, level):
+        if not self.colors:
+            return curses.A_NORMAL
+        return self.colors[min(len(self.colors) - 1, int(level * len(self.colors)))]
 
-            col = col_block * block_width
-            row = 2 + row_in_block
+    # --- Frames ---
 
-            label = f"CPU{cpu_id:02d}"
-            val = f"{freqs[cpu_id]:6.1f}"
-            stdscr.addstr(row, col, f"{label}: {val}")
+    def _frame_grid(self, groups, freqs, core_stats, loads, compact, avail, max_x):
+        lw = self.label_w
+        load_view = loads is not None
+        header = load_header(lw) if load_view else table_header(lw)
+        if compact:
+            cell_w = lw + (13 if load_view else 8)
+        else:
+            cell_w = len(header)
+        plan = plan_grid(groups, cell_w, avail, max_x)
+        if plan is None:
+            return None
+        items, ncols = plan
+        frame = []
+        if compact:
+            hint = "CPU-Nummer + busy % + Takt (MHz)" if load_view else "CPU-Nummer + aktuelle Frequenz (MHz)"
+            frame.append((2, 0, hint, curses.A_DIM))
+        else:
+            for c in range(ncols):
+                frame.append((2, c * (cell_w + COL_GAP), header, curses.A_BOLD))
+        for rel_row, col, what in items:
+            row = HEADER_ROWS + rel_row
+            if isinstance(what, str):
+                frame.append((row, 0, f"[{what}]", curses.A_BOLD))
+                continue
+            cur = freqs.get(what)
+            label = f"CPU{what:0{lw - 3}d}"
+            if load_view:
+                load = loads.get(what)
+                if compact:
+                    busy = f"{load.busy_pct:3.0f}%" if load is not None else f"{'?':>4}"
+                    mhz = load.eff_mhz if load is not None and load.eff_mhz is not None else cur
+                    mhz_str = f"{mhz:7.1f}" if mhz is not None else f"{'?':>7}"
+                    text = f"{label} {busy} {mhz_str}"
+                else:
+                    text = load_line(label, load, cur, lw)
+            elif compact:
+                text = f"{label} {cur:7.1f}" if cur is not None else f"{label} {'?':>7}"
+            else:
+                text = stat_line(label, cur, core_stats.get(what), lw)
+            frame.append((row, col, text, curses.A_NORMAL))
+        return frame
 
-        stdscr.refresh()
-        time.sleep(0.1)
+    def _frame_heatmap(self, groups, freqs, max_x):
+        if self.freq_limits is not None:
+            lo, hi = self.freq_limits
+        elif freqs:
+            lo, hi = min(freqs.values()), max(freqs.values())
+        else:
+            lo = hi = 0.0
+        label_w = max([len(label or "Alle") for label, _ in groups] + [4]) + 1
+        tail_w = 10  # " 4321 MHz"
+        width = max(8, max_x - 1 - label_w - tail_w)
+
+        frame = [(2, 0, f"Heatmap: ' '={lo:.0f} MHz … '█'={hi:.0f} MHz, Spalten = CPUs aufsteigend",
+                  curses.A_DIM)]
+        row = HEADER_ROWS
+        for label, cpus in groups:
+            vals = [freqs[c] for c in cpus if c in freqs]
+            avg = sum(vals) / len(vals) if vals else 0.0
+            frame.append((row, 0, label or "Alle", curses.A_BOLD))
+            for i, cpu in enumerate(cpus):
+                r = row + i // width
+                c = label_w + i % width
+                mhz = freqs.get(cpu)
+                if mhz is None:
+                    frame.append((r, c, "?", curses.A_DIM))
+                    continue
+                level = self._level(mhz, lo, hi)
+                glyph = HEAT_GLYPHS[round(level * (len(HEAT_GLYPHS) - 1))]
+                frame.append((r, c, glyph, self._heat_attr(level)))
+            frame.append((row, label_w + min(len(cpus), width) + 1, f"{avg:5.0f} MHz", curses.A_NORMAL))
+            row += -(-len(cpus) // width)
+        return frame
+
+    def build(self, freqs, core_stats, all_stats, status, max_y, max_x, loads=None):
+        """loads: {cpu: CoreLoad} für die Auslastungsansicht, sonst None."""
+        groups = group_cpus(self.topo, self.group_key)
+        avail = max_y - HEADER_ROWS - 1
+        heat_freqs = freqs
+        if loads is not None:
+            # Heatmap nach effektivem Takt, wo MSR verfügbar
+            heat_freqs = dict(freqs)
+            for cpu, load in loads.items():
+                if load.eff_mhz is not None:
+                    heat_freqs[cpu] = load.eff_mhz
+
+        frame = None
+        used_mode = self.mode
+        candidates = ["table", "compact", "heatmap"] if self.mode == "auto" else [self.mode]
+        for mode in candidates:
+            if mode == "heatmap":
+                frame = self._frame_heatmap(groups, heat_freqs, max_x)
+            else:
+                frame = self._frame_grid(
+                    groups, freqs, core_stats, loads, mode == "compact", avail, max_x
+                )
+            if frame is not None:
+                used_mode = mode
+                break
+        if frame is None:
+            # erzwungener Modus passt nicht → Heatmap als letzte Rettung
+            used_mode = "heatmap"
+            frame = self._frame_heatmap(groups, heat_freqs, max_x)
+        self.used_mode = used_mode
+
+        group_title = GROUP_KEYS[self.group_key][1] or "keine"
+        mode_str = used_mode if self.mode != "auto" else f"auto→{used_mode}"
+        what = "Auslastung/eff. Takt" if loads is not None else "Kernfrequenzen (MHz)"
+        title = (
+            f"{what} – {len(freqs)} CPUs, Ansicht {mode_str}, Gruppen {group_title}"
+            " – m: Ansicht, g: Gruppen, e: Auslastung, r: Reset, q/ESC beendet"
+        )
+        frame.append((0, 0, title, curses.A_NORMAL))
+        if loads is not None:
+            busy_avg = sum(ld.busy_pct for ld in loads.values()) / len(loads) if loads else 0.0
+            summary = f"Mittel busy {busy_avg:5.1f}%"
+        else:
+            summary = stat_line("Alle", max(freqs.values()) if freqs else None, all_stats, 4)
+        frame.append((1, 0, status + "  " + summary, curses.A_NORMAL))
+        return frame
+
+    def draw(self, frame):
+        # Layout geändert → einmal komplett neu zeichnen, Größe prüft der Renderer
+        self.renderer.render(frame, layout=(self.used_mode, self.group_key, self.metric))
+
+
+def draw_freqs(stdscr, args):
+    curses.curs_set(0)
+    stdscr.nodelay(True)
+
+    replay = args.replay
+    if replay is not None:
+        paths = cpufreq_paths(replay.recording)
+        freq_sampler = FreqSampler(paths, args.rate, args.window, sampler_factory=lambda: replay)
+    else:
+        paths = list_cpu_freq_paths()
+        freq_sampler = FreqSampler(paths, args.rate, args.window)
+    freq_sampler.start()
+    cpu_ids = sorted(paths)
+    view = FreqTableView(
+        stdscr,
+        read_topology(cpu_ids),
+        read_freq_limits(cpu_ids[0]) if cpu_ids else None,
+    )
+    view.mode = args.mode
+    view.group_key = args.group
+    view.metric = args.view
+    load_sampler = None
+    loads = {}
+
+    stats_interval = 0.5  # Perzentile sind teurer als der aktuelle Wert
+    last_stats = 0.0
+    core_stats = {}
+    all_stats = None
+
+    try:
+        while True:
+            ch = stdscr.getch()
+            if ch in (ord("q"), 27):  # q oder ESC
+                break
+            if ch in (ord("r"), ord("R")):
+                freq_sampler.reset()
+            elif ch in (ord("m"), ord("M")):
+                view.cycle_mode()
+            elif ch in (ord("g"), ord("G")):
+                view.cycle_group()
+            elif ch in (ord("e"), ord("E")):
+                # /proc/stat und MSR sind nicht in der Aufnahme
+                if replay is None:
+                    view.toggle_metric()
+            elif replay is not None and replay.handle_key(ch):
+                if ch not in (ord(" "), ord("<"), ord(">"), ord(","), ord(".")):
+                    freq_sampler.reset()  # Statistik nicht über einen Sprung mitteln
+
+            freqs = freq_sampler.current()
+
+            if not freqs:
+                view.renderer.render([(0, 0, "Keine CPU-Frequenzdaten gefunden (cpufreq).", curses.A_NORMAL)])
+                time.sleep(0.5)
+                continue
+
+            if view.metric == "load" and load_sampler is None:
+                load_sampler = LoadSampler(cpu_ids, use_msr=not args.no_msr)
+                last_stats = 0.0
+
+            now = time.time()
+            if now - last_stats >= stats_interval:
+                last_stats = now
+                core_stats = freq_sampler.core_stats()
+                all_stats = freq_sampler.all_stats()
+                if view.metric == "load":
+                    # ein /proc/stat-Read für alle Kerne (+ MSR, falls lesbar)
+                    loads = load_sampler.sample()
+
+            if view.metric == "load":
+                status = f"Takt-Quelle {load_sampler.source}, Intervall {stats_interval:.1f} s"
+            else:
+                status = f"{args.rate:.0f} Hz, Fenster {args.window:.0f} s"
+            if replay is not None:
+                status = f"{replay.status()}, {status}"
+            if freq_sampler.overruns:
+                status += f", {freq_sampler.overruns} Ticks verpasst"
+
+            max_y, max_x = stdscr.getmaxyx()
+            frame = view.build(
+                freqs, core_stats, all_stats, status, max_y, max_x,
+                loads if view.metric == "load" else None,
+            )
+            view.draw(frame)
+            time.sleep(0.1)
+    finally:
+        freq_sampler.stop()
+        if load_sampler is not None:
+            load_sampler.close()
 
 
 def main():
-    curses.wrapper(draw_freqs)
+    parser = argparse.ArgumentParser(description="Kernfrequenzen als curses-Tabelle.")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_HZ,
+                        help=f"Sampling-Rate in Hz (max {MAX_RATE_HZ:.0f}, Standard {DEFAULT_RATE_HZ:.0f})")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW_S,
+                        help="Länge des Statistik-Fensters in Sekunden (Standard 10)")
+    parser.add_argument("--mode", choices=MODES, default="auto",
+                        help="Ansicht: table, compact, heatmap oder auto (passt sich der Terminalgröße an)")
+    parser.add_argument("--group", choices=list(GROUP_KEYS), default="ccx",
+                        help="CPUs gruppieren nach ccx (L3), ccd (Die), node (NUMA), package oder none")
+    parser.add_argument("--view", choices=["freq", "load"], default="freq",
+                        help="freq: cpufreq + Statistik, load: busy %% aus /proc/stat und "
+                             "effektiver Takt aus APERF/MPERF (root + msr-Modul)")
+    parser.add_argument("--no-msr", action="store_true",
+                        help="MSR nicht verwenden, Takt immer aus cpufreq")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="Aufnahme von common/sensor_recorder.py abspielen (Leertaste Pause, "
+                             "←/→ ±10 s, Bild↑/↓ ±5 min, </> Tempo)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Abspieltempo für --replay (Standard 1.0)")
+    args = parser.parse_args()
+    if not 0 < args.rate <= MAX_RATE_HZ:
+        parser.error(f"--rate muss zwischen 0 und {MAX_RATE_HZ:.0f} liegen")
+    if args.replay:
+        if args.view == "load":
+            parser.error("--view load geht nicht mit --replay (keine /proc/stat-Daten in der Aufnahme)")
+        try:
+            args.replay = open_replay(args.replay, args.speed)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    try:
+        curses.wrapper(draw_freqs, args)
+    finally:
+        if args.replay is not None:
+            args.replay.recording.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Auslastung und effektiver Takt pro Kern.
+
+- Auslastung: ein einziger Lesevorgang von /proc/stat pro Tick (alle Kerne
+  auf einmal), Differenz der busy-/total-Jiffies zum vorherigen Tick.
+- Effektiver Takt: APERF/MPERF/TSC aus /dev/cpu/N/msr (wie turbostat):
+      Bzy_MHz = TSC_MHz * dAPERF / dMPERF   (Takt während der Kern aktiv war)
+      Avg_MHz = dAPERF / dt                 (über das ganze Intervall)
+  Braucht root und das Modul `msr` (modprobe msr). Ist das nicht lesbar,
+  wird auf scaling_cur_freq (cpufreq) zurückgefallen.
+"""
+import os
+import struct
+import sys
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from sysfs_sampler import SysfsSampler  # noqa: E402
+
+PROC_STAT = "/proc/stat"
+MSR_DEV = "/dev/cpu/{cpu}/msr"
+
+MSR_TSC = 0x10
+MSR_MPERF = 0xE7
+MSR_APERF = 0xE8
+
+_U64 = struct.Struct("<Q")
+
+
+class CoreLoad(NamedTuple):
+    busy_pct: float
+    eff_mhz: Optional[float]  # Takt während aktiv (Bzy_MHz), None ohne MSR
+    avg_mhz: Optional[float]  # Mittel über das Intervall inkl. Idle
+
+
+def parse_proc_stat(data: bytes) -> Dict[int, Tuple[int, int]]:
+    """{cpu: (busy_jiffies, total_jiffies)} aus dem Inhalt von /proc/stat."""
+    out = {}
+    for line in data.split(b"\n"):
+        if not line.startswith(b"cpu"):
+            if out:
+                break  # cpu-Zeilen stehen am Anfang, danach nichts mehr
+            continue
+        if line.startswith(b"cpu "):
+            continue  # Gesamtzeile, nur "cpuN ..." interessiert
+        fields = line.split()
+        try:
+            cpu = int(fields[0][3:])
+            # user nice system idle iowait irq softirq steal (guest ist in user enthalten)
+            vals = [int(v) for v in fields[1:9]]
+        except (ValueError, IndexError):
+            continue
+        total = sum(vals)
+        idle = vals[3] + (vals[4] if len(vals) > 4 else 0)
+        out[cpu] = (total - idle, total)
+    return out
+
+
+class ProcStatReader:
+    """Busy-Prozent pro Kern aus Deltas von /proc/stat."""
+
+    def __init__(self, sampler: Optional[SysfsSampler] = None):
+        self.sampler = sampler or SysfsSampler(4096)
+        self._prev: Dict[int, Tuple[int, int]] = {}
+
+    def sample(self) -> Dict[int, float]:
+        data = self.sampler.read_bytes(PROC_STAT)
+        if data is None:
+            return {}
+        cur = parse_proc_stat(data)
+        out = {}
+        for cpu, (busy, total) in cur.items():
+            prev = self._prev.get(cpu)
+            if prev is None:
+                continue
+            d_total = total - prev[1]
+            if d_total > 0:
+                out[cpu] = 100.0 * (busy - prev[0]) / d_total
+        self._prev = cur
+        return out
+
+
+class MsrReader:
+    """APERF/MPERF/TSC pro Kern über dauerhaft offene /dev/cpu/N/msr."""
+
+    def __init__(self, cpu_ids):
+        self.fds: Dict[int, int] = {}
+        self._prev: Dict[int, Tuple[float, int, int, int]] = {}
+        for cpu in cpu_ids:
+            try:
+                self.fds[cpu] = os.open(MSR_DEV.format(cpu=cpu), os.O_RDONLY | os.O_CLOEXEC)
+            except OSError:
+                # nicht root / kein msr-Modul / nicht x86 → komplett ohne MSR
+                self.close()
+                return
+        # Test-Lesezugriff (VMs erlauben open, aber nicht jedes MSR)
+        try:
+            for fd in self.fds.values():
+                self._read(fd, MSR_TSC)
+                self._read(fd, MSR_APERF)
+                self._read(fd, MSR_MPERF)
+                break
+        except OSError:
+            self.close()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.fds)
+
+    @staticmethod
+    def _read(fd: int, reg: int) -> int:
+        return _U64.unpack(os.pread(fd, 8, reg))[0]
+
+    def sample(self) -> Dict[int, Tuple[float, float]]:
+        """{cpu: (Bzy_MHz, Avg_MHz)} seit dem letzten Aufruf."""
+        out = {}
+        for cpu, fd in self.fds.items():
+            try:
+                t = time.perf_counter()
+                tsc = self._read(fd, MSR_TSC)
+                aperf = self._read(fd, MSR_APERF)
+                mperf = self._read(fd, MSR_MPERF)
+            except OSError:
+                continue
+            prev = self._prev.get(cpu)
+            self._prev[cpu] = (t, tsc, aperf, mperf)
+            if prev is None:
+                continue
+            dt = t - prev[0]
+            d_tsc = tsc - prev[1]
+            d_aperf = aperf - prev[2]
+            d_mperf = mperf - prev[3]
+            if dt <= 0 or d_mperf <= 0 or d_tsc <= 0:
+                continue
+            tsc_mhz = d_tsc / dt / 1e6
+            out[cpu] = (tsc_mhz * d_aperf / d_mperf, d_aperf / dt / 1e6)
+        return out
+
+    def close(self) -> None:
+        for fd in self.fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.fds = {}
+
+
+class LoadSampler:
+    """
+    Kombiniert /proc/stat und MSR. Ohne MSR bleibt eff_mhz/avg_mhz None,
+    der Aufrufer nimmt dann den cpufreq-Wert.
+    """
+
+    def __init__(self, cpu_ids, use_msr: bool = True):
+        self.stat = ProcStatReader()
+        self.msr = MsrReader(cpu_ids) if use_msr else None
+        if self.msr is not None and not self.msr.available:
+            self.msr = None
+        # erstes Sample setzt nur die Referenz
+        self.sample()
+
+    @property
+    def source(self) -> str:
+        return "APERF/MPERF" if self.msr is not None else "cpufreq"
+
+    def sample(self) -> Dict[int, CoreLoad]:
+        busy = self.stat.sample()
+        freqs = self.msr.sample() if self.msr is not None else {}
+        out = {}
+        for cpu, pct in busy.items():
+            eff, avg = freqs.get(cpu, (None, None))
+            out[cpu] = CoreLoad(pct, eff, avg)
+        return out
+
+    def close(self) -> None:
+        if self.msr is not None:
+            self.msr.close()
+        self.stat.sampler.close()
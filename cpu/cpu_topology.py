@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+CPU-Topologie aus /sys/devices/system/cpu/cpuN/{topology,cache,nodeX}.
+
+Liefert pro logischer CPU Package, Die (CCD), L3-Domäne (CCX), NUMA-Node,
+Core-ID und SMT-Geschwister. Wird einmal beim Start gelesen.
+"""
+import os
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+CPU_BASE = "/sys/devices/system/cpu"
+
+# Gruppierungen für die Anzeige: Schlüssel → (Attribut, Beschriftung)
+GROUP_KEYS = OrderedDict(
+    [
+        ("ccx", ("l3", "CCX")),
+        ("ccd", ("die", "CCD")),
+        ("node", ("node", "NUMA")),
+        ("package", ("package", "Package")),
+        ("none", (None, "")),
+    ]
+)
+
+
+class CpuTopo(NamedTuple):
+    cpu: int
+    package: int
+    die: int
+    l3: int  # L3-Domäne = CCX bei AMD
+    node: int
+    core_id: int
+    siblings: Tuple[int, ...]  # inkl. cpu selbst
+
+
+def parse_cpu_list(text: str) -> List[int]:
+    """'0-3,8,10-11' → [0, 1, 2, 3, 8, 10, 11]"""
+    cpus: List[int] = []
+    for part in text.strip().split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.extend(range(int(lo), int(hi) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _read_int(path: str, default: int = 0) -> int:
+    raw = _read(path)
+    try:
+        return int(raw) if raw is not None else default
+    except ValueError:
+        return default
+
+
+def _l3_id(cpu_dir: str) -> int:
+    cache_dir = os.path.join(cpu_dir, "cache")
+    try:
+        entries = os.listdir(cache_dir)
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.startswith("index"):
+            continue
+        idx_dir = os.path.join(cache_dir, entry)
+        if _read(os.path.join(idx_dir, "level")) != "3":
+            continue
+        raw = _read(os.path.join(idx_dir, "id"))
+        if raw is not None and raw.isdigit():
+            return int(raw)
+        # ältere Kernel ohne "id": kleinste CPU der Domäne als Schlüssel
+        shared = _read(os.path.join(idx_dir, "shared_cpu_list"))
+        if shared:
+            return min(parse_cpu_list(shared))
+    return 0
+
+
+def _node_id(cpu_dir: str) -> int:
+    try:
+        for entry in os.listdir(cpu_dir):
+            if entry.startswith("node") and entry[4:].isdigit():
+                return int(entry[4:])
+    except OSError:
+        pass
+    return 0
+
+
+def read_topology(cpu_ids) -> Dict[int, CpuTopo]:
+    topo = {}
+    for cpu in cpu_ids:
+        cpu_dir = os.path.join(CPU_BASE, f"cpu{cpu}")
+        tdir = os.path.join(cpu_dir, "topology")
+        siblings_raw = _read(os.path.join(tdir, "thread_siblings_list"))
+        siblings = tuple(parse_cpu_list(siblings_raw)) if siblings_raw else (cpu,)
+        topo[cpu] = CpuTopo(
+            cpu=cpu,
+            package=_read_int(os.path.join(tdir, "physical_package_id")),
+            die=_read_int(os.path.join(tdir, "die_id")),
+            l3=_l3_id(cpu_dir),
+            node=_node_id(cpu_dir),
+            core_id=_read_int(os.path.join(tdir, "core_id"), cpu),
+            siblings=siblings,
+        )
+    return topo
+
+
+def group_cpus(topo: Dict[int, CpuTopo], key: str) -> List[Tuple[str, List[int]]]:
+    """
+    Gruppiert CPUs nach key (siehe GROUP_KEYS). Liefert [(Label, [cpus])]
+    in aufsteigender Reihenfolge; "none" ergibt eine einzige Gruppe.
+    """
+    attr, title = GROUP_KEYS[key]
+    if attr is None:
+        return [("", sorted(topo))]
+
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    for cpu in sorted(topo):
+        t = topo[cpu]
+        # Package immer mit in den Schlüssel, IDs sind pro Package vergeben
+        gid = (t.package, getattr(t, attr)) if attr != "package" else (t.package, 0)
+        groups.setdefault(gid, []).append(cpu)
+
+    multi_pkg = len({t.package for t in topo.values()}) > 1
+    out = []
+    for (pkg, gid), cpus in sorted(groups.items()):
+        if attr == "package":
+            label = f"{title} {pkg}"
+        elif multi_pkg:
+            label = f"P{pkg} {title} {gid}"
+        else:
+            label = f"{title} {gid}"
+        out.append((label, cpus))
+    return out
+
+
+def placement_order(topo: Dict[int, CpuTopo]) -> List[int]:
+    """
+    Reihenfolge zum Belegen von Kernen: erst ein Thread pro physischem Kern,
+    CCD für CCD (innerhalb nach L3-Domäne und core_id), danach die
+    SMT-Geschwister in derselben Reihenfolge.
+    """
+
+    def key(cpu: int):
+        t = topo[cpu]
+        present = [c for c in t.siblings if c in topo] or [cpu]
+        rank = sorted(present).index(cpu) if cpu in present else 0
+        return (rank, t.package, t.die, t.l3, t.core_id, cpu)
+
+    return sorted(topo, key=key)
+
+
+def describe_placement(topo: Dict[int, CpuTopo], cpus) -> Tuple[int, int]:
+    """(Anzahl CCDs, Anzahl SMT-Zweitthreads) einer CPU-Auswahl."""
+    chosen = set(cpus)
+    ccds = {(topo[c].package, topo[c].die) for c in chosen}
+    smt = sum(1 for c in chosen if any(s < c and s in chosen for s in topo[c].siblings))
+    return len(ccds), smt
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Hochfrequentes Sampling von scaling_cur_freq pro Kern.
+
+Ein Hintergrund-Thread liest alle Kerne mit fester Rate (bis 1 kHz) über
+offene Deskriptoren (SysfsSampler) und schreibt die Werte in je einen
+Ringpuffer (array('I'), kHz). Daraus gibt es Rolling-Statistik
+(min/max/mean/p50/p99) pro Kern und über alle Kerne.
+
+Optional werden pro Tick auch Temperaturen (hwmon temp*_input) gelesen.
+Zusätzlich zu den Ringpuffern pro Kern gibt es pro Tick ausgerichtete
+Reihen (Zeit, höchster Kern, Mittel über Kerne, höchste Temperatur) für
+Zeitreihen-Dateien.
+
+Ersetzt das Zusammenspiel cpufreqs.sh + max.log/avg.log/samples.log:
+
+    ./freq_sampler.py --rate 1000 --duration 10
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from ringbuffer import RingBuffer, Stats, compute_stats, percentiles  # noqa: E402
+from sysfs_sampler import SysfsSampler  # noqa: E402
+
+MAX_RATE_HZ = 1000.0
+DEFAULT_RATE_HZ = 100.0
+DEFAULT_WINDOW_S = 10.0
+
+CPU_BASE = "/sys/devices/system/cpu"
+
+
+def list_cpu_freq_paths():
+    """
+    Liefert {cpu_id: Pfad zu scaling_cur_freq}. Wird nur einmal beim Start
+    ermittelt, danach wird pro Tick nur noch gelesen.
+    """
+    paths = {}
+    for entry in sorted(os.listdir(CPU_BASE)):
+        if not entry.startswith("cpu"):
+            continue
+        suffix = entry[3:]
+        if not suffix.isdigit():
+            continue
+
+        paths[int(suffix)] = os.path.join(
+            CPU_BASE,
+            entry,
+            "cpufreq",
+            "scaling_cur_freq",
+        )
+    return paths
+
+
+class FreqSampler:
+    """
+    Sampelt {cpu_id: Pfad} periodisch in einem Daemon-Thread.
+
+    Die Ringpuffer halten window_s Sekunden Historie. Alle Statistiken
+    werden in MHz geliefert.
+    """
+
+    def __init__(
+        self,
+        paths: Dict[int, str],
+        rate_hz: float = DEFAULT_RATE_HZ,
+        window_s: float = DEFAULT_WINDOW_S,
+        temp_paths: Optional[List[str]] = None,
+        sampler_factory=SysfsSampler,
+    ):
+        if not 0 < rate_hz <= MAX_RATE_HZ:
+            raise ValueError(f"rate_hz muss in (0, {MAX_RATE_HZ:.0f}] liegen")
+        self.paths = dict(paths)
+        self.rate_hz = rate_hz
+        self.window_s = window_s
+        capacity = max(1, int(rate_hz * window_s))
+        self.buffers: Dict[int, RingBuffer] = {
+            cpu: RingBuffer(capacity, "I") for cpu in self.paths
+        }
+        self.temp_paths = list(temp_paths or [])
+        # liefert den Leser für den Thread (z.B. ReplaySampler statt sysfs)
+        self.sampler_factory = sampler_factory
+        # pro Tick ausgerichtet (gleicher Index = gleicher Tick):
+        self.times = RingBuffer(capacity, "d")  # Sekunden seit start()
+        # höchster Kern pro Tick – entspricht dem, was cpufreqs.sh mitschrieb
+        self.peak = RingBuffer(capacity, "I")
+        self.mean = RingBuffer(capacity, "I")  # Mittel über alle Kerne, kHz
+        self.temp = RingBuffer(capacity, "i")  # höchste Temperatur, m°C
+        self.t0 = 0.0
+        self.ticks = 0
+        self.overruns = 0  # verpasste Ticks (Sampling langsamer als Rate)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Thread-Steuerung ---
+
+    def start(self) -> "FreqSampler":
+        self._stop.clear()
+        self.t0 = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="freq-sampler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _run(self) -> None:
+        sampler = self.sampler_factory()  # eigener Puffer pro Thread
+        items = [(self.buffers[cpu], path) for cpu, path in self.paths.items()]
+        temp_paths = self.temp_paths
+        read_int = sampler.read_int
+        perf_counter = time.perf_counter
+        period = 1.0 / self.rate_hz
+        next_t = perf_counter()
+
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    peak = 0
+                    total = 0
+                    n = 0
+                    for buf, path in items:
+                        val = read_int(path)
+                        if val is not None:
+                            buf.append(val)
+                            total += val
+                            n += 1
+                            if val > peak:
+                                peak = val
+                    if n:
+                        temp = -1
+                        for path in temp_paths:
+                            val = read_int(path)
+                            if val is not None and val > temp:
+                                temp = val
+                        self.times.append(perf_counter() - self.t0)
+                        self.peak.append(peak)
+                        self.mean.append(total // n)
+                        self.temp.append(temp)
+                    self.ticks += 1
+
+                # feste Deadlines statt sleep(period) → keine Drift
+                next_t += period
+                delay = next_t - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    missed = int(-delay / period)
+                    self.overruns += missed
+                    next_t += missed * period
+        finally:
+            sampler.close()
+
+    # --- Auswertung ---
+
+    def reset(self) -> None:
+        with self._lock:
+            for buf in self.buffers.values():
+                buf.clear()
+            for buf in (self.times, self.peak, self.mean, self.temp):
+                buf.clear()
+            self.ticks = 0
+            self.overruns = 0
+
+    def current(self) -> Dict[int, float]:
+        """Letzter Wert pro Kern in MHz."""
+        with self._lock:
+            out = {}
+            for cpu, buf in self.buffers.items():
+                last = buf.last()
+                if last is not None:
+                    out[cpu] = last / 1000.0
+            return out
+
+    def core_stats(self) -> Dict[int, Stats]:
+        with self._lock:
+            snapshot = {cpu: buf.values() for cpu, buf in self.buffers.items()}
+        out = {}
+        for cpu, vals in snapshot.items():
+            st = compute_stats(vals, 0.001)
+            if st is not None:
+                out[cpu] = st
+        return out
+
+    def all_stats(self) -> Optional[Stats]:
+        """Statistik über alle Samples aller Kerne zusammen."""
+        with self._lock:
+            merged = None
+            for buf in self.buffers.values():
+                vals = buf.values()
+                if merged is None:
+                    merged = vals
+                else:
+                    merged.extend(vals)
+        if merged is None:
+            return None
+        return compute_stats(merged, 0.001)
+
+    def peak_stats(self) -> Optional[Stats]:
+        """Statistik über den jeweils höchsten Kern pro Tick."""
+        with self._lock:
+            vals = self.peak.values()
+        return compute_stats(vals, 0.001)
+
+    def peak_percentiles(self, ps) -> List[float]:
+        """Beliebige Perzentile (z.B. (1, 99)) des höchsten Kerns, MHz."""
+        with self._lock:
+            vals = self.peak.values()
+        return percentiles(vals, ps, 0.001)
+
+    def max_temp(self) -> Optional[float]:
+        """Höchste gemessene Temperatur in °C, None ohne Temperaturquellen."""
+        with self._lock:
+            vals = self.temp.values()
+        valid = [v for v in vals if v >= 0]
+        return max(valid) / 1000.0 if valid else None
+
+    def series(self):
+        """
+        Zeitreihe [(t_s, peak_mhz, mean_mhz, temp_c | None)] aller Ticks im
+        Fenster, für Zeitreihen-Dateien.
+        """
+        with self._lock:
+            cols = [b.values() for b in (self.times, self.peak, self.mean, self.temp)]
+        return [
+            (t, peak / 1000.0, mean / 1000.0, temp / 1000.0 if temp >= 0 else None)
+            for t, peak, mean, temp in zip(*cols)
+        ]
+
+
+def format_stats(st: Optional[Stats]) -> str:
+    if st is None:
+        return "keine Samples"
+    return (
+        f"min {st.min:7.1f}  max {st.max:7.1f}  avg {st.mean:7.1f}  "
+        f"p50 {st.p50:7.1f}  p99 {st.p99:7.1f} MHz  (n={st.count})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Kernfrequenzen mit hoher Rate sampeln und Statistik ausgeben."
+    )
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_HZ,
+                        help=f"Samples pro Sekunde (max {MAX_RATE_HZ:.0f}, Standard {DEFAULT_RATE_HZ:.0f})")
+    parser.add_argument("--duration", type=float, default=DEFAULT_WINDOW_S,
+                        help="Messdauer in Sekunden (Standard 10)")
+    parser.add_argument("--per-core", action="store_true",
+                        help="Statistik zusätzlich pro Kern ausgeben")
+    args = parser.parse_args()
+    if not 0 < args.rate <= MAX_RATE_HZ:
+        parser.error(f"--rate muss zwischen 0 und {MAX_RATE_HZ:.0f} liegen")
+
+    paths = list_cpu_freq_paths()
+    if not paths:
+        print("Keine CPU-Frequenzdaten gefunden (cpufreq).", file=sys.stderr)
+        sys.exit(1)
+
+    sampler = FreqSampler(paths, args.rate, args.duration)
+    with sampler:
+        time.sleep(args.duration)
+
+    if args.per_core:
+        for cpu, st in sorted(sampler.core_stats().items()):
+            print(f"CPU{cpu:02d}: {format_stats(st)}")
+    print(f"Alle : {format_stats(sampler.all_stats())}")
+    print(f"Ticks: {sampler.ticks}  verpasst: {sampler.overruns}")
+
+
+if __name__ == "__main__":
+    main()
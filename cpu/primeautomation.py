@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Benchmark + Frequenz-/Temperatur-Telemetrie in einem Prozess.
+
+Ersetzt primeautomation.sh + cpufreqs.sh: statt eines Hintergrund-Skripts,
+das jede Sekunde mit grep/awk/bc max.log/avg.log/samples.log umschreibt,
+läuft hier ein Sampler-Thread (FreqSampler) mit konfigurierbarer Rate im
+selben Prozess wie die Benchmark-Steuerung. Die Worker (primebench.py)
+sind eigene, gepinnte Prozesse.
+
+Pro Lauf wird eine Zeile an primeresults.csv angehängt: die bisherigen
+Spalten plus p1/p99 der Frequenz, die höchste CPU-Temperatur und der
+Kernel. Optional schreibt --timeseries DIR pro Lauf eine CSV-Zeitreihe.
+
+--sweep misst statt Single/All die Skalierungskurve mit 1, 2, 4, ..., N
+Kernen. Belegt wird topologiebewusst (cpu_topology.placement_order):
+erst physische Kerne, CCD für CCD, dann die SMT-Geschwister. Pro Schritt
+kommen Durchsatz pro Kern und Skalierungseffizienz (relativ zu 1 Kern)
+in die CSV, dazu wie viele CCDs und SMT-Threads beteiligt waren.
+
+    ./primeautomation.py -m TPU 60
+    ./primeautomation.py --rate 500 --timeseries runs/ 30
+    ./primeautomation.py --sweep 20
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from typing import List, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "..", "temperatures+fan"))
+
+from cpu_topology import describe_placement, placement_order, read_topology  # noqa: E402
+from freq_sampler import MAX_RATE_HZ, FreqSampler, list_cpu_freq_paths  # noqa: E402
+from primebench import (  # noqa: E402
+    KERNELS,
+    TELEMETRY_FIELDS,
+    append_result_row,
+    fmt_freq,
+    run_benchmark,
+    timestamp,
+)
+from temp_monitor_tui import find_temp_sensors  # noqa: E402
+
+DEFAULT_RESULTS = os.path.join(SCRIPT_DIR, "primeresults.csv")
+DEFAULT_RATE_HZ = 100.0
+
+# neue Spalten werden hinten angehängt, ältere Zeilen bleiben gültig
+SCALING_FIELDS = TELEMETRY_FIELDS + ["primes_per_s_core", "scaling_eff", "ccds", "smt_threads"]
+
+
+def cpu_temp_paths() -> List[str]:
+    """temp*_input aller hwmon-Geräte der Kategorie CPU (k10temp, coretemp, ...)."""
+    paths = []
+    for category, hwmon_name, hwmon_dir, temps in find_temp_sensors():
+        if category != "CPU":
+            continue
+        for idx in temps:
+            paths.append(os.path.join(hwmon_dir, f"temp{idx}_input"))
+    return paths
+
+
+def allowed_cpus() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def sweep_steps(n: int) -> List[int]:
+    """1, 2, 4, ... bis n; n selbst ist immer der letzte Schritt."""
+    steps = []
+    k = 1
+    while k < n:
+        steps.append(k)
+        k *= 2
+    steps.append(n)
+    return steps
+
+
+def write_timeseries(path: str, series) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["t_s", "peak_freq_mhz", "mean_freq_mhz", "max_temp_c"])
+        for t, peak, mean, temp in series:
+            writer.writerow(
+                [f"{t:.4f}", f"{peak:.1f}", f"{mean:.1f}", "" if temp is None else f"{temp:.1f}"]
+            )
+
+
+def measured_run(
+    label: str,
+    cpus: List[int],
+    args,
+    freq_paths,
+    temp_paths,
+    extra: Optional[dict] = None,
+    base_rate: Optional[float] = None,
+) -> dict:
+    """
+    Ein Benchmark-Lauf mit laufendem Sampler. Gibt die CSV-Zeile als dict
+    zurück (bereits angehängt an args.results). base_rate ist der Durchsatz
+    pro Kern (Primzahlen/s) des 1-Kern-Laufs, Bezug für scaling_eff.
+    """
+    sampler = FreqSampler(
+        freq_paths,
+        rate_hz=args.rate,
+        window_s=args.duration + 5,  # ganzer Lauf bleibt im Puffer
+        temp_paths=temp_paths,
+    )
+    try:
+        result = run_benchmark(
+            cpus,
+            duration=args.duration,
+            kernel=args.kernel,
+            mode=args.mode,
+            on_start=sampler.start,
+        )
+    finally:
+        sampler.stop()
+
+    peak = sampler.peak_stats()
+    p1, p99 = sampler.peak_percentiles((1, 99))
+    max_temp = sampler.max_temp()
+    rate = result.primes_total / result.elapsed_s / len(cpus) if result.elapsed_s > 0 else 0.0
+
+    row = {
+        "label": label,
+        "cores": len(cpus),
+        "duration_s": f"{args.duration:g}",
+        "primes_total": result.primes_total,
+        "max_number": result.max_number,
+        "max_freq_mhz": fmt_freq(peak.max if peak else None),
+        "avg_freq_mhz": fmt_freq(peak.mean if peak else None),
+        "timestamp": timestamp(),
+        "notes": args.notes,
+        "p1_freq_mhz": fmt_freq(p1 if peak else None),
+        "p99_freq_mhz": fmt_freq(p99 if peak else None),
+        "max_temp_c": f"{max_temp:.1f}" if max_temp is not None else "",
+        "kernel": f"{args.kernel}-{args.mode}" if args.kernel == "trial" else args.kernel,
+        "primes_per_s_core": f"{rate:.1f}",
+        "scaling_eff": f"{rate / base_rate:.3f}" if base_rate else "1.000",
+    }
+    if extra:
+        row.update(extra)
+    append_result_row(args.results, row, args.fields)
+
+    if args.timeseries:
+        os.makedirs(args.timeseries, exist_ok=True)
+        stamp = time.strftime("%Y-%m-%d_%H-%M-%S")
+        path = os.path.join(args.timeseries, f"timeseries_{label}_{stamp}.csv")
+        write_timeseries(path, sampler.series())
+        row["timeseries"] = path
+
+    if sampler.overruns:
+        print(
+            f"  Hinweis: Sampler hat {sampler.overruns} von {sampler.ticks + sampler.overruns}"
+            f" Ticks verpasst (--rate {args.rate:g} zu hoch?)",
+            file=sys.stderr,
+        )
+    return row
+
+
+def print_row(title: str, row: dict) -> None:
+    temp = f" max_temp={row['max_temp_c']}°C" if row.get("max_temp_c") else ""
+    print(
+        f"{title}: primes={row['primes_total']} max_number={row['max_number']} "
+        f"max_freq={row['max_freq_mhz']}MHz avg_freq={row['avg_freq_mhz']}MHz "
+        f"p1={row['p1_freq_mhz']}MHz p99={row['p99_freq_mhz']}MHz{temp}"
+    )
+
+
+def placement_columns(topo, cpus) -> dict:
+    ccds, smt = describe_placement(topo, cpus)
+    return {"ccds": ccds, "smt_threads": smt}
+
+
+def run_sweep(order, topo, args, freq_paths, temp_paths) -> None:
+    base_rate = None
+    for n in sweep_steps(len(order)):
+        cpus = order[:n]
+        extra = placement_columns(topo, cpus)
+        print(
+            f"=== Sweep: {n} Kern{'e' if n > 1 else ''} "
+            f"({extra['ccds']} CCD, {extra['smt_threads']} SMT, {args.kernel}) ==="
+        )
+        row = measured_run("sweep", cpus, args, freq_paths, temp_paths,
+                           extra=extra, base_rate=base_rate)
+        if base_rate is None:
+            base_rate = float(row["primes_per_s_core"])
+        print_row(f"{n:>4} Kern{'e' if n > 1 else ''}", row)
+        print(f"      {row['primes_per_s_core']} Primzahlen/s pro Kern, Effizienz {row['scaling_eff']}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Prime-Benchmark (1 Kern + alle Kerne) mit Frequenz-/Temperatur-Telemetrie."
+    )
+    parser.add_argument("duration", nargs="?", type=float, default=60,
+                        help="Laufzeit pro Lauf in Sekunden (Standard 60)")
+    parser.add_argument("-m", "--notes", default="default",
+                        help="Freitext für die CSV-Spalte notes (Standard: default)")
+    parser.add_argument("--kernel", choices=KERNELS, default="trial",
+                        help="Benchmark-Kernel (Standard: trial, wie primebench.sh)")
+    parser.add_argument("--mode", choices=("fast", "slow"), default="fast",
+                        help="Modus für --kernel trial (Standard: fast)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_HZ,
+                        help=f"Sampling-Rate für Frequenz/Temperatur in Hz (max {MAX_RATE_HZ:.0f}, Standard 100)")
+    parser.add_argument("--results", default=DEFAULT_RESULTS,
+                        help="Ergebnis-CSV (Standard: primeresults.csv neben dem Skript)")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Skalierungskurve 1, 2, 4, ..., N Kerne statt Single/All")
+    parser.add_argument("--timeseries", metavar="DIR",
+                        help="pro Lauf eine Zeitreihe (t, Frequenz, Temperatur) als CSV nach DIR schreiben")
+    return parser
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    if not 0 < args.rate <= MAX_RATE_HZ:
+        parser.error(f"--rate muss zwischen 0 und {MAX_RATE_HZ:.0f} liegen")
+    args.fields = SCALING_FIELDS
+
+    freq_paths = list_cpu_freq_paths()
+    temp_paths = cpu_temp_paths()
+    if not temp_paths:
+        print("Hinweis: keine CPU-Temperatursensoren gefunden, max_temp_c bleibt leer.",
+              file=sys.stderr)
+
+    topo = read_topology(allowed_cpus())
+    order = placement_order(topo)
+
+    if args.sweep:
+        run_sweep(order, topo, args, freq_paths, temp_paths)
+    else:
+        print(f"=== Starte Single-Core-Lauf (1 Kern, {args.kernel}) ===")
+        row = measured_run("single", order[:1], args, freq_paths, temp_paths,
+                           extra=placement_columns(topo, order[:1]))
+        print_row("Single-Core Ergebnis", row)
+        base_rate = float(row["primes_per_s_core"])
+
+        print(f"=== Starte All-Core-Lauf ({len(order)} Kerne, {args.kernel}) ===")
+        row = measured_run("all", order, args, freq_paths, temp_paths,
+                           extra=placement_columns(topo, order), base_rate=base_rate)
+        print_row("All-Core Ergebnis", row)
+
+    print(f"Fertig. Ergebnisse in {args.results} gespeichert.")
+
+
+if __name__ == "__main__":
+    main()
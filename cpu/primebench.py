@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Prime-Benchmark (CPU-X-Nachbau) als Python-Engine.
+
+Ersetzt die Bash-Schleife aus primebench.sh, die vor allem den
+Bash-Interpreter misst. Zwei Kernel:
+
+- trial: klassische Probedivision wie primebench.sh / CPU-X (fast: bis
+  sqrt(n), slow: bis n). Zahlen 2, 3, 4, ... werden der Reihe nach geprüft.
+- sieve: segmentiertes Sieb des Eratosthenes. Mit NumPy vektorisiert,
+  sonst über bytearray-Slices (ebenfalls ohne Python-Schleife pro Zahl).
+
+Pro Kern läuft ein Worker-Prozess, gepinnt mit os.sched_setaffinity. Die
+Zwischenstände (Primzahlen, höchste Zahl) landen in Shared Memory, damit
+der Aufrufer sie auch während des Laufs lesen kann.
+
+Zeitbasiert (--duration): jeder Worker zählt unabhängig ab 2, wie beim
+Bash-Skript; primes_total ist die Summe, max_number das Maximum.
+Arbeitsbasiert (--limit N): die Zahlen bis N werden auf die Worker
+aufgeteilt, primes_total ist dann genau pi(N).
+
+Aufruf wie primebench.sh:
+
+    ./primebench.py 60 fast
+    ./primebench.py 10 --kernel sieve --cores all
+    ./primebench.py --limit 100000000 --kernel sieve --cores 0-7
+"""
+import argparse
+import csv
+import itertools
+import math
+import multiprocessing
+import os
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional
+    np = None
+
+from cpu_topology import parse_cpu_list
+
+CSV_FIELDS = [
+    "label",
+    "cores",
+    "duration_s",
+    "primes_total",
+    "max_number",
+    "max_freq_mhz",
+    "avg_freq_mhz",
+    "timestamp",
+    "notes",
+]
+# neue Spalten werden hinten angehängt, ältere Zeilen bleiben gültig
+TELEMETRY_FIELDS = CSV_FIELDS + ["p1_freq_mhz", "p99_freq_mhz", "max_temp_c", "kernel"]
+
+KERNELS = ("trial", "sieve")
+
+# Shared-Memory-Slots pro Worker
+SLOT_PRIMES = 0
+SLOT_MAX_NUMBER = 1
+SLOT_DONE = 2
+SLOTS = 3
+
+TRIAL_CHUNK = 2048  # so viele Zahlen zwischen zwei Zeitabfragen
+SIEVE_SEGMENT = 1 << 18  # Zahlen pro Sieb-Segment
+
+
+class WorkerResult(NamedTuple):
+    cpu: int
+    primes: int
+    max_number: int
+
+
+class BenchResult(NamedTuple):
+    kernel: str
+    mode: str
+    cpus: List[int]
+    duration_s: float  # angefordert (zeitbasiert) bzw. gemessen (arbeitsbasiert)
+    elapsed_s: float
+    primes_total: int
+    max_number: int
+    workers: List[WorkerResult]
+
+
+# --- Kernel: Probedivision -------------------------------------------------
+
+
+def is_prime_fast(n: int) -> bool:
+    if n < 2:
+        return False
+    i = 2
+    while i * i <= n:
+        if n % i == 0:
+            return False
+        i += 1
+    return True
+
+
+def is_prime_slow(n: int) -> bool:
+    if n < 2:
+        return False
+    i = 2
+    while i <= n:
+        if n % i == 0:
+            break
+        i += 1
+    return i == n
+
+
+def trial_kernel(shared, base, deadline, numbers, mode):
+    """numbers: range der zu prüfenden Zahlen (Schrittweite = Aufteilung)."""
+    check = is_prime_fast if mode == "fast" else is_prime_slow
+    primes = 0
+    last = 0
+    it = iter(numbers)
+    while True:
+        chunk_done = True
+        for _ in range(TRIAL_CHUNK):
+            n = next(it, None)
+            if n is None:
+                chunk_done = False
+                break
+            if check(n):
+                primes += 1
+            last = n
+        shared[base + SLOT_PRIMES] = primes
+        shared[base + SLOT_MAX_NUMBER] = last
+        if not chunk_done or (deadline is not None and time.monotonic() >= deadline):
+            return
+
+
+# --- Kernel: segmentiertes Sieb --------------------------------------------
+
+
+def simple_sieve(limit: int) -> List[int]:
+    """Alle Primzahlen <= limit (für die Basisprimzahlen der Segmente)."""
+    if limit < 2:
+        return []
+    flags = bytearray([1]) * (limit + 1)
+    flags[0] = flags[1] = 0
+    for p in range(2, math.isqrt(limit) + 1):
+        if flags[p]:
+            flags[p * p :: p] = bytes(len(range(p * p, limit + 1, p)))
+    return [i for i, f in enumerate(flags) if f]
+
+
+def count_segment(lo: int, hi: int, base_primes: Sequence[int]) -> int:
+    """Anzahl Primzahlen in [lo, hi)."""
+    size = hi - lo
+    if size <= 0:
+        return 0
+    if np is not None:
+        seg = np.ones(size, dtype=np.bool_)
+        for p in base_primes:
+            if p * p >= hi:
+                break
+            start = max(p * p, -(-lo // p) * p)
+            seg[start - lo :: p] = False
+        if lo < 2:
+            seg[: 2 - lo] = False
+        return int(np.count_nonzero(seg))
+
+    seg = bytearray([1]) * size
+    for p in base_primes:
+        if p * p >= hi:
+            break
+        start = max(p * p, -(-lo // p) * p)
+        seg[start - lo :: p] = bytes(len(range(start - lo, size, p)))
+    if lo < 2:
+        seg[: 2 - lo] = bytes(2 - lo)
+    return seg.count(1)
+
+
+def sieve_kernel(shared, base, deadline, segments):
+    """segments: Iterable von (lo, hi)-Paaren, die dieser Worker siebt."""
+    primes = 0
+    base_primes: List[int] = []
+    base_limit = 1
+    for lo, hi in segments:
+        need = math.isqrt(hi - 1) + 1
+        if need > base_limit:
+            base_limit = max(need, 2 * base_limit)
+            base_primes = simple_sieve(base_limit)
+        primes += count_segment(lo, hi, base_primes)
+        shared[base + SLOT_PRIMES] = primes
+        shared[base + SLOT_MAX_NUMBER] = hi - 1
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+
+
+def endless_segments(start: int = 0, step: int = 1, segment: int = SIEVE_SEGMENT):
+    k = start
+    while True:
+        yield k * segment, (k + 1) * segment
+        k += step
+
+
+def limited_segments(limit: int, start: int, step: int, segment: int = SIEVE_SEGMENT):
+    k = start
+    while k * segment <= limit:
+        yield k * segment, min((k + 1) * segment, limit + 1)
+        k += step
+
+
+# --- Worker-Prozesse --------------------------------------------------------
+
+
+def _worker(idx, cpu, n_workers, kernel, mode, duration, limit, shared, start_evt, start_time):
+    base = idx * SLOTS
+    try:
+        if cpu is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+        start_evt.wait()
+        deadline = start_time.value + duration if duration is not None else None
+
+        if kernel == "trial":
+            if limit is not None:
+                numbers = range(2 + idx, limit + 1, n_workers)
+            else:
+                numbers = itertools.count(2)
+            trial_kernel(shared, base, deadline, numbers, mode)
+        else:
+            if limit is not None:
+                segments = limited_segments(limit, idx, n_workers)
+            else:
+                segments = endless_segments()
+            sieve_kernel(shared, base, deadline, segments)
+    finally:
+        shared[base + SLOT_DONE] = 1
+
+
+def run_benchmark(
+    cpus: Sequence[Optional[int]],
+    duration: Optional[float] = None,
+    limit: Optional[int] = None,
+    kernel: str = "trial",
+    mode: str = "fast",
+    on_start: Optional[Callable[[], None]] = None,
+) -> BenchResult:
+    """
+    Startet je einen Worker pro Eintrag in cpus (None = nicht pinnen).
+    Genau eins von duration (Sekunden) und limit (höchste Zahl) angeben.
+    on_start wird direkt vor dem gemeinsamen Startsignal aufgerufen.
+    """
+    if (duration is None) == (limit is None):
+        raise ValueError("genau eins von duration und limit angeben")
+    if kernel not in KERNELS:
+        raise ValueError(f"unbekannter Kernel: {kernel}")
+
+    ctx = multiprocessing.get_context("fork")
+    n = len(cpus)
+    shared = ctx.RawArray("q", n * SLOTS)
+    start_time = ctx.RawValue("d", 0.0)
+    start_evt = ctx.Event()
+
+    procs = []
+    for idx, cpu in enumerate(cpus):
+        p = ctx.Process(
+            target=_worker,
+            args=(idx, cpu, n, kernel, mode, duration, limit, shared, start_evt, start_time),
+            daemon=True,
+        )
+        p.start()
+        procs.append(p)
+
+    try:
+        if on_start is not None:
+            on_start()
+        t0 = time.monotonic()
+        start_time.value = t0
+        start_evt.set()
+        for p in procs:
+            p.join()
+        elapsed = time.monotonic() - t0
+    finally:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+                p.join()
+
+    workers = [
+        WorkerResult(
+            cpu if cpu is not None else -1,
+            shared[i * SLOTS + SLOT_PRIMES],
+            shared[i * SLOTS + SLOT_MAX_NUMBER],
+        )
+        for i, cpu in enumerate(cpus)
+    ]
+    return BenchResult(
+        kernel=kernel,
+        mode=mode,
+        cpus=[c for c in cpus if c is not None],
+        duration_s=duration if duration is not None else elapsed,
+        elapsed_s=elapsed,
+        primes_total=sum(w.primes for w in workers),
+        max_number=max((w.max_number for w in workers), default=0),
+        workers=workers,
+    )
+
+
+# --- CSV (gleiches Schema wie primeautomation.sh) ---------------------------
+
+
+def append_result_row(path: str, row: Dict[str, object], fields: Sequence[str] = CSV_FIELDS) -> None:
+    """
+    Hängt eine Zeile an. Der Header wird nur geschrieben, wenn die Datei neu
+    ist – ältere Zeilen bleiben unverändert, wie bei primeautomation.sh.
+    """
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        if new_file:
+            writer.writerow(fields)
+        writer.writerow(["" if row.get(k) is None else row.get(k) for k in fields])
+
+
+def fmt_freq(mhz: Optional[float]) -> str:
+    return f"{mhz:.3f}" if mhz is not None else "0"
+
+
+def timestamp() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def parse_cores(spec: str) -> List[int]:
+    """'all', eine Anzahl ('4' = die ersten 4 erlaubten CPUs) oder eine Liste ('0-3,8')."""
+    allowed = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(
+        range(os.cpu_count() or 1)
+    )
+    if spec == "all":
+        return allowed
+    if spec.isdigit():
+        n = int(spec)
+        if n < 1 or n > len(allowed):
+            raise ValueError(f"{n} Kerne angefordert, verfügbar: {len(allowed)}")
+        return allowed[:n]
+    return parse_cpu_list(spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prime-Benchmark (CPU-X-Nachbau) mit einem gepinnten Prozess pro Kern."
+    )
+    parser.add_argument("duration", nargs="?", type=float, default=60,
+                        help="Laufzeit in Sekunden (Standard 60)")
+    parser.add_argument("mode", nargs="?", default="fast",
+                        help="fast oder slow (nur für --kernel trial, wie primebench.sh)")
+    parser.add_argument("--kernel", choices=KERNELS, default="trial",
+                        help="trial (CPU-X-kompatibel) oder sieve (segmentiertes Sieb)")
+    parser.add_argument("--cores", default="1",
+                        help="'all', Anzahl Kerne (ab CPU 0) oder Liste wie '0-3,8' (Standard: 1)")
+    parser.add_argument("--limit", type=int,
+                        help="arbeitsbasiert: alle Zahlen bis LIMIT prüfen statt Zeitlimit")
+    parser.add_argument("--csv", metavar="FILE",
+                        help="Ergebnis zusätzlich als Zeile an FILE anhängen (primeresults.csv-Schema)")
+    parser.add_argument("--label", help="CSV-Spalte label (Standard: single/all/Nc)")
+    parser.add_argument("-m", "--notes", default="default", help="CSV-Spalte notes")
+    args = parser.parse_args()
+
+    mode = args.mode.lower()
+    if mode not in ("fast", "slow"):
+        parser.error(f"Unknown mode: {args.mode}")
+    try:
+        cpus = parse_cores(args.cores)
+    except ValueError as e:
+        parser.error(str(e))
+
+    freq_sampler = None
+    if args.csv:
+        # wie cpufreqs.sh: höchster Kern pro Sample, daraus max und Mittel
+        from freq_sampler import FreqSampler, list_cpu_freq_paths
+
+        paths = list_cpu_freq_paths()
+        if paths:
+            window = args.duration if args.limit is None else 3600
+            freq_sampler = FreqSampler(paths, rate_hz=10, window_s=window + 5)
+
+    result = run_benchmark(
+        cpus,
+        duration=None if args.limit is not None else args.duration,
+        limit=args.limit,
+        kernel=args.kernel,
+        mode=mode,
+        on_start=freq_sampler.start if freq_sampler is not None else None,
+    )
+    if freq_sampler is not None:
+        freq_sampler.stop()
+
+    print(f"Kernel     : {result.kernel}")
+    print(f"Mode       : {result.mode}")
+    print(f"Cores      : {len(result.workers)}")
+    print(f"Duration   : {result.duration_s:g}s")
+    print(f"Max number : {result.max_number}")
+    print(f"Primes     : {result.primes_total}")
+
+    if args.csv:
+        peak = freq_sampler.peak_stats() if freq_sampler is not None else None
+        p1, p99 = freq_sampler.peak_percentiles((1, 99)) if peak else (None, None)
+        n = len(result.workers)
+        label = args.label or ("single" if n == 1 else "all" if n == (os.cpu_count() or n) else f"{n}c")
+        append_result_row(
+            args.csv,
+            {
+                "label": label,
+                "cores": n,
+                "duration_s": f"{result.duration_s:g}",
+                "primes_total": result.primes_total,
+                "max_number": result.max_number,
+                "max_freq_mhz": fmt_freq(peak.max if peak else None),
+                "avg_freq_mhz": fmt_freq(peak.mean if peak else None),
+                "timestamp": timestamp(),
+                "notes": args.notes,
+                "p1_freq_mhz": fmt_freq(p1),
+                "p99_freq_mhz": fmt_freq(p99),
+                "max_temp_c": "",
+                "kernel": f"{result.kernel}-{result.mode}" if result.kernel == "trial" else result.kernel,
+            },
+            TELEMETRY_FIELDS,
+        )
+
+
+if __name__ == "__main__":
+    main()
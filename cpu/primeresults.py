@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Auswertung von primeresults.csv.
+
+Die CSV wächst seit primeautomation.sh nur nach hinten, der Header wurde
+nie angepasst. Welches Schema eine Zeile hat, ergibt sich deshalb aus
+ihrer Länge:
+
+     8 Spalten  primeautomation.sh (alt, ohne avg_freq_mhz)
+     9 Spalten  primeautomation.sh
+    13 Spalten  primeautomation.py / primebench.py --csv (+ p1/p99, max_temp_c, kernel)
+    17 Spalten  primeautomation.py mit Skalierungsspalten
+
+Die Zeilen landen spaltenweise in array.array (Zahlen als double, NaN =
+fehlt; Texte als Index in eine Vokabelliste), gruppiert wird nach
+label/cores/notes/kernel. Pro Gruppe: n, Mittel, Standardabweichung,
+Konfidenzintervall (Student-t). `compare` vergleicht zwei Konfigurationen
+(notes) mit Welch-t-Test und meldet signifikante Verbesserungen und
+Regressionen.
+
+    ./primeresults.py summary
+    ./primeresults.py summary --metric avg_freq_mhz --label all
+    ./primeresults.py compare conservative pbo
+"""
+import argparse
+import csv
+import math
+import os
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from primeautomation import SCALING_FIELDS
+from primebench import CSV_FIELDS, TELEMETRY_FIELDS
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS = os.path.join(SCRIPT_DIR, "primeresults.csv")
+
+LEGACY_FIELDS = [f for f in CSV_FIELDS if f != "avg_freq_mhz"]
+
+# Zeilenlänge → Spaltennamen
+SCHEMAS = {len(f): f for f in (LEGACY_FIELDS, CSV_FIELDS, TELEMETRY_FIELDS, SCALING_FIELDS)}
+
+TEXT_COLUMNS = ("label", "notes", "kernel")
+NUMERIC_COLUMNS = tuple(
+    f for f in SCALING_FIELDS if f not in TEXT_COLUMNS and f != "timestamp"
+) + ("primes_per_s",)
+
+GROUP_BY = ("label", "cores", "notes", "kernel")
+
+# Kennzahlen für summary/compare: Name → (Einheit, höher ist besser)
+METRICS = OrderedDict(
+    [
+        ("primes_per_s", ("1/s", True)),
+        ("primes_total", ("", True)),
+        ("max_number", ("", True)),
+        ("primes_per_s_core", ("1/s", True)),
+        ("scaling_eff", ("", True)),
+        ("max_freq_mhz", ("MHz", True)),
+        ("avg_freq_mhz", ("MHz", True)),
+        ("p1_freq_mhz", ("MHz", True)),
+        ("p99_freq_mhz", ("MHz", True)),
+        ("max_temp_c", ("°C", False)),
+    ]
+)
+
+# primeautomation.sh hat immer "primebench.sh DURATION fast" gestartet
+LEGACY_KERNEL = "bash-fast"
+
+
+# --- spaltenweiser Speicher -------------------------------------------------
+
+
+class ResultStore:
+    """
+    Alle Läufe spaltenweise: numeric[name] ist ein array("d") mit NaN für
+    fehlende Werte, codes[name] ein array("I") mit Indizes in vocab[name].
+    """
+
+    def __init__(self):
+        self.numeric: Dict[str, array] = {name: array("d") for name in NUMERIC_COLUMNS}
+        self.codes: Dict[str, array] = {name: array("I") for name in TEXT_COLUMNS}
+        self.vocab: Dict[str, List[str]] = {name: [] for name in TEXT_COLUMNS}
+        self._lookup: Dict[str, Dict[str, int]] = {name: {} for name in TEXT_COLUMNS}
+        self.timestamps = array("d")
+        self.skipped = 0
+        self._plans: Dict[int, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _code(self, column: str, text: str) -> int:
+        lookup = self._lookup[column]
+        code = lookup.get(text)
+        if code is None:
+            code = lookup[text] = len(self.vocab[column])
+            self.vocab[column].append(text)
+        return code
+
+    def append_row(self, row: Sequence[str], fields: Sequence[str]) -> None:
+        """Eine CSV-Zeile mit den Spaltennamen fields anhängen."""
+        plan = self._plans.get(id(fields))
+        if plan is None:
+            plan = self._plans[id(fields)] = self._plan(fields)
+        numeric_plan, text_plan, ts_pos = plan
+        for col, pos in numeric_plan:
+            col.append(_to_float(row[pos]) if pos is not None else math.nan)
+        n = len(self.timestamps)
+        dur = self.numeric["duration_s"][n]
+        total = self.numeric["primes_total"][n]
+        self.numeric["primes_per_s"][n] = total / dur if dur > 0 else math.nan
+        for name, pos, default in text_plan:
+            self.codes[name].append(self._code(name, row[pos] if pos is not None else default))
+        self.timestamps.append(_parse_timestamp(row[ts_pos]) if ts_pos is not None else math.nan)
+
+    def _plan(self, fields: Sequence[str]):
+        pos = {name: i for i, name in enumerate(fields)}
+        numeric_plan = [(self.numeric[name], pos.get(name)) for name in NUMERIC_COLUMNS]
+        # ohne kernel-Spalte stammt die Zeile aus primeautomation.sh
+        text_plan = [
+            (name, pos.get(name), LEGACY_KERNEL if name == "kernel" else "")
+            for name in TEXT_COLUMNS
+        ]
+        return numeric_plan, text_plan, pos.get("timestamp")
+
+    def text(self, column: str, i: int) -> str:
+        return self.vocab[column][self.codes[column][i]]
+
+    def key(self, i: int, keys: Sequence[str] = GROUP_BY) -> Tuple:
+        out = []
+        for name in keys:
+            if name in self.codes:
+                out.append(self.text(name, i))
+            else:
+                v = self.numeric[name][i]
+                out.append(int(v) if v == v and v.is_integer() else v)
+        return tuple(out)
+
+    def select(self, **where) -> List[int]:
+        """Zeilenindizes, deren Textspalten/cores den Filterwerten entsprechen (None = egal)."""
+        checks = []
+        for name, want in where.items():
+            if want is None:
+                continue
+            if name in self.codes:
+                code = self._lookup[name].get(want)
+                if code is None:
+                    return []
+                checks.append((self.codes[name], code))
+            else:
+                checks.append((self.numeric[name], float(want)))
+        return [i for i in range(len(self)) if all(col[i] == v for col, v in checks)]
+
+    def groups(self, rows: Sequence[int], keys: Sequence[str] = GROUP_BY) -> "OrderedDict[Tuple, List[int]]":
+        out: "OrderedDict[Tuple, List[int]]" = OrderedDict()
+        for i in rows:
+            out.setdefault(self.key(i, keys), []).append(i)
+        return out
+
+    def values(self, metric: str, rows: Sequence[int]) -> List[float]:
+        col = self.numeric[metric]
+        return [col[i] for i in rows if col[i] == col[i]]
+
+
+def _to_float(raw: Optional[str]) -> float:
+    if raw is None or raw == "":
+        return math.nan
+    try:
+        return float(raw)
+    except ValueError:
+        return math.nan
+
+
+def _parse_timestamp(raw: str) -> float:
+    """'YYYY-MM-DD HH:MM:SS' (Ortszeit) → Epoch, ohne das langsame strptime."""
+    try:
+        return time.mktime(
+            (int(raw[0:4]), int(raw[5:7]), int(raw[8:10]),
+             int(raw[11:13]), int(raw[14:16]), int(raw[17:19]), 0, 0, -1)
+        )
+    except (ValueError, OverflowError):
+        return math.nan
+
+
+def load_results(path: str) -> ResultStore:
+    """Liest die CSV; Zeilen mit unbekannter Länge werden gezählt und übersprungen."""
+    store = ResultStore()
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header: List[str] = []
+        for row in reader:
+            if not row:
+                continue
+            if row[0] == "label":
+                header = SCHEMAS.get(len(row), row)  # gleiche Liste → gleicher Plan
+                continue
+            # passt die Zeile zum Header, gilt der, sonst entscheidet die Länge
+            fields = header if len(row) == len(header) else SCHEMAS.get(len(row))
+            if fields is None:
+                store.skipped += 1
+                continue
+            store.append_row(row, fields)
+    return store
+
+
+# --- Statistik --------------------------------------------------------------
+
+
+class Summary(NamedTuple):
+    n: int
+    mean: float
+    stddev: float  # Stichproben-Standardabweichung (n-1), NaN bei n < 2
+    ci_lo: float
+    ci_hi: float
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Kettenbruch der unvollständigen Betafunktion (Numerical Recipes)."""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 200):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-12:
+            break
+    return h
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularisierte unvollständige Betafunktion I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    ln_front = (
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+        + a * math.log(x) + b * math.log1p(-x)
+    )
+    front = math.exp(ln_front)
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def t_pvalue(t: float, df: float) -> float:
+    """Zweiseitiger p-Wert der Student-t-Verteilung."""
+    if math.isnan(t) or df <= 0:
+        return math.nan
+    if math.isinf(t):
+        return 0.0
+    return _betainc(df / 2.0, 0.5, df / (df + t * t))
+
+
+def t_critical(df: float, conf: float = 0.95) -> float:
+    """t-Quantil für ein zweiseitiges Intervall mit Niveau conf (Bisektion)."""
+    alpha = 1.0 - conf
+    lo, hi = 0.0, 1.0
+    while t_pvalue(hi, df) > alpha:
+        hi *= 2.0
+    for _ in range(60):
+        mid = (lo + hi) / 2.0
+        if t_pvalue(mid, df) > alpha:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2.0
+
+
+def summarize(values: Sequence[float], conf: float = 0.95) -> Optional[Summary]:
+    n = len(values)
+    if n == 0:
+        return None
+    mean = math.fsum(values) / n
+    if n < 2:
+        return Summary(n, mean, math.nan, math.nan, math.nan)
+    var = math.fsum((v - mean) ** 2 for v in values) / (n - 1)
+    sd = math.sqrt(var)
+    half = t_critical(n - 1, conf) * sd / math.sqrt(n)
+    return Summary(n, mean, sd, mean - half, mean + half)
+
+
+def welch_test(a: Summary, b: Summary) -> Tuple[float, float, float]:
+    """(t, df, p) für den Unterschied der Mittelwerte b - a (Welch, ungleiche Varianzen)."""
+    if a.n < 2 or b.n < 2:
+        return math.nan, math.nan, math.nan
+    va, vb = a.stddev ** 2 / a.n, b.stddev ** 2 / b.n
+    se2 = va + vb
+    diff = b.mean - a.mean
+    if se2 == 0.0:
+        return (math.inf if diff else 0.0), math.inf, (0.0 if diff else 1.0)
+    t = diff / math.sqrt(se2)
+    df = se2 ** 2 / (va ** 2 / (a.n - 1) + vb ** 2 / (b.n - 1))
+    return t, df, t_pvalue(t, df)
+
+
+class Comparison(NamedTuple):
+    key: Tuple  # (label, cores, kernel)
+    a: Summary
+    b: Summary
+    delta_pct: float
+    p: float
+    verdict: str  # "besser", "schlechter", "gleich", "n<2"
+
+
+def compare(
+    store: ResultStore,
+    notes_a: str,
+    notes_b: str,
+    metric: str = "primes_per_s",
+    alpha: float = 0.05,
+    label: Optional[str] = None,
+    cores: Optional[int] = None,
+) -> List[Comparison]:
+    """
+    Vergleicht Konfiguration notes_b gegen notes_a für jede Kombination aus
+    label/cores/kernel, die in beiden vorkommt.
+    """
+    keys = ("label", "cores", "kernel")
+    higher_better = METRICS[metric][1]
+    ga = store.groups(store.select(notes=notes_a, label=label, cores=cores), keys)
+    gb = store.groups(store.select(notes=notes_b, label=label, cores=cores), keys)
+
+    out = []
+    for key, rows_a in ga.items():
+        rows_b = gb.get(key)
+        if rows_b is None:
+            continue
+        sa = summarize(store.values(metric, rows_a))
+        sb = summarize(store.values(metric, rows_b))
+        if sa is None or sb is None:
+            continue
+        delta = (sb.mean - sa.mean) / sa.mean * 100.0 if sa.mean else math.nan
+        _, _, p = welch_test(sa, sb)
+        if math.isnan(p):
+            verdict = "n<2"
+        elif p >= alpha:
+            verdict = "gleich"
+        elif (sb.mean > sa.mean) == higher_better:
+            verdict = "besser"
+        else:
+            verdict = "schlechter"
+        out.append(Comparison(key, sa, sb, delta, p, verdict))
+    return out
+
+
+# --- CLI --------------------------------------------------------------------
+
+
+def _fmt(v: float, digits: int = 1) -> str:
+    return "-" if math.isnan(v) else f"{v:.{digits}f}"
+
+
+def cmd_summary(store: ResultStore, args) -> int:
+    rows = store.select(label=args.label, cores=args.cores, notes=args.notes)
+    unit = METRICS[args.metric][0]
+    print(f"{args.metric}{f' [{unit}]' if unit else ''}, {int(args.conf * 100)}%-Konfidenzintervall")
+    print(f"{'label':<8} {'cores':>5} {'notes':<14} {'kernel':<10} {'n':>3} "
+          f"{'mean':>11} {'stddev':>9} {'ci':>23}")
+    for (label, cores, notes, kernel), idx in store.groups(rows).items():
+        s = summarize(store.values(args.metric, idx), args.conf)
+        if s is None:
+            continue
+        ci = f"[{_fmt(s.ci_lo)}, {_fmt(s.ci_hi)}]" if s.n > 1 else "-"
+        print(f"{label:<8} {cores:>5} {notes:<14} {kernel:<10} {s.n:>3} "
+              f"{_fmt(s.mean):>11} {_fmt(s.stddev):>9} {ci:>23}")
+    return 0
+
+
+def cmd_compare(store: ResultStore, args) -> int:
+    results = compare(store, args.a, args.b, args.metric, args.alpha, args.label, args.cores)
+    if not results:
+        print(f"Keine gemeinsamen Läufe für '{args.a}' und '{args.b}'.", file=sys.stderr)
+        return 2
+    print(f"{args.metric}: {args.b} gegen {args.a} (Welch-t-Test, alpha={args.alpha:g})")
+    print(f"{'label':<8} {'cores':>5} {'kernel':<10} {'n_a':>3} {'mean_a':>11} "
+          f"{'n_b':>3} {'mean_b':>11} {'delta':>8} {'p':>7}  Ergebnis")
+    regression = False
+    for c in results:
+        label, cores, kernel = c.key
+        regression |= c.verdict == "schlechter"
+        print(f"{label:<8} {cores:>5} {kernel:<10} {c.a.n:>3} {_fmt(c.a.mean):>11} "
+              f"{c.b.n:>3} {_fmt(c.b.mean):>11} {_fmt(c.delta_pct, 2):>7}% "
+              f"{_fmt(c.p, 4):>7}  {c.verdict}")
+    # Exit-Code 1 bei Regression, damit sich compare in Skripten nutzen lässt
+    return 1 if regression else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--csv", default=DEFAULT_RESULTS,
+                        help="Ergebnis-CSV (Standard: primeresults.csv neben dem Skript)")
+    common.add_argument("--metric", choices=list(METRICS), default="primes_per_s",
+                        help="Kennzahl (Standard: primes_per_s = primes_total / duration_s)")
+    common.add_argument("--label", help="nur dieses label (single, all, sweep)")
+    common.add_argument("--cores", type=int, help="nur Läufe mit dieser Kernanzahl")
+
+    parser = argparse.ArgumentParser(description="Auswertung und Vergleich von primeresults.csv.")
+    sub = parser.add_subparsers(dest="command")
+
+    p_sum = sub.add_parser("summary", parents=[common], help="Mittel/Streuung/Konfidenzintervall pro Gruppe")
+    p_sum.add_argument("--notes", help="nur diese Konfiguration")
+    p_sum.add_argument("--conf", type=float, default=0.95, help="Konfidenzniveau (Standard 0.95)")
+
+    p_cmp = sub.add_parser("compare", parents=[common], help="zwei Konfigurationen (notes) vergleichen")
+    p_cmp.add_argument("a", help="Referenz, z.B. default")
+    p_cmp.add_argument("b", help="Kandidat, z.B. pbo")
+    p_cmp.add_argument("--alpha", type=float, default=0.05, help="Signifikanzniveau (Standard 0.05)")
+    return parser
+
+
+def main():
+    parser = build_parser()
+    argv = sys.argv[1:]
+    # ohne Unterbefehl: summary, Optionen gelten dann dafür
+    if not argv or argv[0] not in ("summary", "compare", "-h", "--help"):
+        argv = ["summary"] + argv
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    store = load_results(args.csv)
+    if store.skipped:
+        print(f"Hinweis: {store.skipped} Zeilen mit unbekanntem Schema übersprungen.", file=sys.stderr)
+    print(f"{len(store)} Läufe aus {args.csv} ({(time.perf_counter() - t0) * 1000:.1f} ms)\n")
+
+    if args.command == "compare":
+        sys.exit(cmd_compare(store, args))
+    sys.exit(cmd_summary(store, args))
+
+
+if __name__ == "__main__":
+    main()
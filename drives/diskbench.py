@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Laufwerks-Benchmark ohne fio: sequentiell/zufällig lesen und schreiben mit
+O_DIRECT, seitenausgerichteten mmap-Puffern und os.preadv/os.pwritev.
+
+Queue-Tiefe = Threads in einem ThreadPoolExecutor (iodepth × numjobs),
+jeder Thread macht synchrone I/O – preadv/pwritev geben die GIL ab, die
+Anfragen stehen also wirklich parallel beim Gerät. io_uring gibt es in der
+Standardbibliothek nicht; für die Latenz pro Anfrage ist das der
+fio-Engine "psync" mit mehreren Jobs vergleichbar.
+
+Latenzen landen pro Thread in einem HDR-artigen Histogramm (log-linear:
+32 Unterteilungen je Zweierpotenz, also ≤ 3 % Fehler, feste Größe, kein
+Objekt pro Anfrage) und werden am Ende zusammengeführt.
+
+Matrix, Ziele, Ergebnisdatei und "compare" sind dieselben wie bei
+fio_matrix.py; Ergebnisse haben engine "diskbench" und lassen sich direkt
+neben fio-Läufe stellen. Ohne Ziel wird eine Testdatei in /var/tmp
+verwendet (tmpfs kann kein O_DIRECT – dann gepuffert mit Warnung).
+
+    ./diskbench.py run                                   # Testdatei in /var/tmp
+    ./diskbench.py run /media/daten --rw randread --bs 4k --iodepth 1,32 --hist
+    ./diskbench.py run /dev/nvme1n1 --rw read,randread
+    ./diskbench.py compare --metric p99
+"""
+import argparse
+import concurrent.futures
+import errno
+import itertools
+import mmap
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from drive_telemetry import BenchTelemetry
+from fio_matrix import DEFAULT_RESULTS, DirStats, Job, build_matrix, resolve_target, run_matrix
+from fio_matrix import main as fio_main
+
+TEST_FILE = "diskbench_test.bin"
+DEFAULT_SIZE = "1G"
+DEFAULT_RUNTIME_S = 10
+DEFAULT_RW = "read,randread,write,randwrite,randrw70"
+DEFAULT_BS = "1M,4k"
+DEFAULT_IODEPTH = "1,32"
+DIRECT_ALIGN = 4096  # O_DIRECT: Offsets und Längen auf die logische Blockgröße (≤ 4 KiB)
+PREP_CHUNK = 1 << 20
+
+# Histogramm: SUB_BITS Bits Mantisse → 2^SUB_BITS Buckets je Zweierpotenz
+SUB_BITS = 5
+SUB_COUNT = 1 << SUB_BITS
+SUB_HALF = SUB_COUNT >> 1
+MAX_BITS = 40  # bis 2^40 ns ≈ 18 min
+BUCKETS = SUB_COUNT + (MAX_BITS - SUB_BITS) * SUB_HALF
+
+_SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?$", re.I)
+
+
+def parse_size(text: str) -> int:
+    """'4k', '1M', '8G', '512' → Bytes (Faktor 1024 wie bei fio)."""
+    m = _SIZE_RE.match(text.strip())
+    if m is None:
+        raise ValueError(f"ungültige Größe: {text!r}")
+    return int(float(m.group(1)) * 1024 ** " kmgt".index(m.group(2).lower() or " "))
+
+
+# --- Latenz-Histogramm ---
+
+
+def bucket_index(ns: int) -> int:
+    if ns < SUB_COUNT:
+        return max(ns, 0)
+    shift = ns.bit_length() - SUB_BITS
+    idx = SUB_COUNT + (shift - 1) * SUB_HALF + (ns >> shift) - SUB_HALF
+    return idx if idx < BUCKETS else BUCKETS - 1
+
+
+def bucket_bounds(idx: int) -> Tuple[int, int]:
+    """[untere, obere) Grenze eines Buckets in ns."""
+    if idx < SUB_COUNT:
+        return idx, idx + 1
+    shift = (idx - SUB_COUNT) // SUB_HALF + 1
+    mant = (idx - SUB_COUNT) % SUB_HALF + SUB_HALF
+    return mant << shift, (mant + 1) << shift
+
+
+class LatencyHistogram:
+    """Log-lineares Histogramm fester Größe (HDR-Prinzip) für Latenzen in ns."""
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.total = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int) -> None:
+        self.counts[bucket_index(ns)] += 1
+        self.total += 1
+        self.sum_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        counts = self.counts
+        for i, n in enumerate(other.counts):
+            if n:
+                counts[i] += n
+        self.total += other.total
+        self.sum_ns += other.sum_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Wert (Bucket-Mitte, ns) beim Perzentil p (0..100), None wenn leer."""
+        if not self.total:
+            return None
+        rank = max(1, int(round(self.total * p / 100.0 + 0.4999)))
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                lo, hi = bucket_bounds(idx)
+                return min((lo + hi) / 2.0, float(self.max_ns))
+        return float(self.max_ns)
+
+    def mean(self) -> float:
+        return self.sum_ns / self.total if self.total else 0.0
+
+    def buckets(self) -> Iterator[Tuple[int, int, int]]:
+        """Nicht leere Buckets: (untere ns, obere ns, Anzahl)."""
+        for idx, n in enumerate(self.counts):
+            if n:
+                lo, hi = bucket_bounds(idx)
+                yield lo, hi, n
+
+    def octaves(self) -> List[Tuple[int, int]]:
+        """Zusammengefasst je Zweierpotenz für die Anzeige: [(untere ns, Anzahl)]."""
+        out: Dict[int, int] = {}
+        for lo, _hi, n in self.buckets():
+            base = 1 << (lo.bit_length() - 1) if lo else 0
+            out[base] = out.get(base, 0) + n
+        return sorted(out.items())
+
+
+def _fmt_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.1f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.0f} µs"
+    return f"{ns:.0f} ns"
+
+
+def format_histogram(hist: LatencyHistogram, width: int = 40) -> List[str]:
+    rows = hist.octaves()
+    if not rows:
+        return []
+    peak = max(n for _lo, n in rows)
+    lines = []
+    for lo, n in rows:
+        bar = "#" * max(1, int(round(width * n / peak)))
+        lines.append(f"{'≥ ' + _fmt_ns(lo):>10} {n / hist.total * 100:6.2f} %  {bar}")
+    return lines
+
+
+def dir_stats(hist: LatencyHistogram, nbytes: int, seconds: float) -> DirStats:
+    def us(ns):
+        return None if ns is None else ns / 1000.0
+
+    return DirStats(
+        iops=hist.total / seconds,
+        bw_kib=nbytes / 1024.0 / seconds,
+        io_bytes=nbytes,
+        clat_mean_us=hist.mean() / 1000.0,
+        clat_p50_us=us(hist.percentile(50.0)),
+        clat_p99_us=us(hist.percentile(99.0)),
+        clat_p999_us=us(hist.percentile(99.9)),
+        clat_max_us=hist.max_ns / 1000.0,
+        hist=[[round(lo / 1000.0, 3), n] for lo, _hi, n in hist.buckets()],
+    )
+
+
+# --- Ausführung ---
+
+
+class WorkerResult(NamedTuple):
+    read: LatencyHistogram
+    write: LatencyHistogram
+    read_bytes: int
+    write_bytes: int
+
+
+def aligned_buffer(size: int) -> mmap.mmap:
+    """Anonymes mmap: seitenausgerichtet, damit auch für O_DIRECT gültig."""
+    return mmap.mmap(-1, max(size, mmap.PAGESIZE))
+
+
+class BenchRunner:
+    """Gleiche Schnittstelle wie fio_matrix.FioRunner (prep/run/remove)."""
+
+    engine = "diskbench"
+
+    def __init__(self, size: str = DEFAULT_SIZE, runtime_s: float = DEFAULT_RUNTIME_S, direct: bool = True,
+                 show_hist: bool = False, seed: int = 1):
+        self.size = size
+        self.size_bytes = parse_size(size)
+        self.runtime_s = runtime_s
+        self.direct = direct
+        self.show_hist = show_hist
+        self.seed = seed
+        self.dry_run = False
+        self.ioengine = "preadv-threads"
+
+    def _open(self, filename: str, flags: int) -> int:
+        if self.direct:
+            try:
+                return os.open(filename, flags | os.O_DIRECT)
+            except OSError as e:
+                if e.errno != errno.EINVAL:  # Dateisystem kann kein O_DIRECT (tmpfs)
+                    raise
+                print(f"  WARNUNG: {filename}: kein O_DIRECT möglich, ab jetzt gepuffert (Page Cache!)")
+                self.direct = False
+                self.ioengine = "preadv-threads-buffered"
+        return os.open(filename, flags)
+
+    def prep(self, filename: str) -> None:
+        """Testdatei komplett mit Zufallsdaten schreiben (wie fio --name=prep) und fsync."""
+        fd = self._open(filename, os.O_WRONLY | os.O_CREAT)
+        try:
+            buf = aligned_buffer(PREP_CHUNK)
+            buf.write(os.urandom(PREP_CHUNK))
+            off = 0
+            while off < self.size_bytes:
+                n = min(PREP_CHUNK, self.size_bytes - off)
+                if self.direct and n % DIRECT_ALIGN:
+                    n = (n // DIRECT_ALIGN + 1) * DIRECT_ALIGN
+                os.pwritev(fd, [memoryview(buf)[:n]], off)
+                off += n
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def remove(self, filename: str) -> None:
+        try:
+            os.unlink(filename)
+        except FileNotFoundError:
+            pass
+
+    def run(self, job: Job, filename: str) -> Dict[str, DirStats]:
+        bs = parse_size(job.bs)
+        if self.direct and bs % DIRECT_ALIGN:
+            raise ValueError(f"bs {job.bs}: mit O_DIRECT ein Vielfaches von {DIRECT_ALIGN} nötig (oder --no-direct)")
+        fd = self._open(filename, os.O_RDWR if job.writes else os.O_RDONLY)
+        try:
+            size = os.lseek(fd, 0, os.SEEK_END)
+            size = min(size, self.size_bytes) if size > 0 or not job.writes else self.size_bytes
+            nblocks = size // bs
+            if nblocks < 1:
+                raise ValueError(f"{filename}: kleiner als eine Blockgröße ({job.bs})")
+            threads = job.iodepth * job.numjobs
+            seq = itertools.count()  # gemeinsamer Zähler: sequentielle Offsets über alle Threads
+            read_share = {"read": 100, "randread": 100, "write": 0, "randwrite": 0}.get(job.rw, job.rwmixread)
+            rand = job.rw.startswith("rand")
+            start = time.perf_counter_ns()
+            deadline = start + int(self.runtime_s * 1e9)
+
+            def worker(i: int) -> WorkerResult:
+                rng = random.Random(self.seed * 1000 + i)
+                buf = aligned_buffer(bs)
+                if read_share < 100:
+                    buf.write(os.urandom(bs))
+                bufs = [memoryview(buf)[:bs]]
+                rh, wh = LatencyHistogram(), LatencyHistogram()
+                rb = wb = 0
+                preadv, pwritev, now = os.preadv, os.pwritev, time.perf_counter_ns
+                randrange, rnd = rng.randrange, rng.random
+                t = now()
+                while t < deadline:
+                    off = (randrange(nblocks) if rand else next(seq) % nblocks) * bs
+                    if read_share >= 100 or (read_share > 0 and rnd() * 100 < read_share):
+                        n = preadv(fd, bufs, off)
+                        t2 = now()
+                        rh.record(t2 - t)
+                        rb += n
+                    else:
+                        n = pwritev(fd, bufs, off)
+                        t2 = now()
+                        wh.record(t2 - t)
+                        wb += n
+                    t = t2
+                return WorkerResult(rh, wh, rb, wb)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+                results = list(pool.map(worker, range(threads)))
+            seconds = (time.perf_counter_ns() - start) / 1e9
+            if job.writes:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        rh, wh = LatencyHistogram(), LatencyHistogram()
+        rb = wb = 0
+        for r in results:
+            rh.merge(r.read)
+            wh.merge(r.write)
+            rb += r.read_bytes
+            wb += r.write_bytes
+        out = {}
+        for direction, hist, nbytes in (("read", rh, rb), ("write", wh, wb)):
+            if hist.total:
+                out[direction] = dir_stats(hist, nbytes, seconds)
+                if self.show_hist:
+                    print(f"  {job.key} {direction}: Latenz, {hist.total} Anfragen")
+                    for line in format_histogram(hist):
+                        print("    " + line)
+        return out
+
+
+def default_target() -> str:
+    return "/var/tmp" if os.path.isdir("/var/tmp") else tempfile.gettempdir()
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        fio_main()  # gleiche Ergebnisdatei, gleiche Auswertung
+        return
+
+    parser = argparse.ArgumentParser(description="Laufwerks-Benchmark ohne fio (O_DIRECT, preadv/pwritev, Threads).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("run", help="Matrix ausführen")
+    p.add_argument("targets", nargs="*", help=f"Blockgerät oder Verzeichnis (Standard: {default_target()})")
+    p.add_argument("--rw", default=DEFAULT_RW, help=f"Muster, Komma-getrennt (Standard: {DEFAULT_RW})")
+    p.add_argument("--bs", default=DEFAULT_BS, help=f"Blockgrößen (Standard: {DEFAULT_BS})")
+    p.add_argument("--iodepth", default=DEFAULT_IODEPTH, help=f"Queue-Tiefen = Threads (Standard: {DEFAULT_IODEPTH})")
+    p.add_argument("--numjobs", default="1", help="Faktor auf die Threads wie bei fio (Standard: 1)")
+    p.add_argument("--size", default=DEFAULT_SIZE, help=f"Testgröße (Standard: {DEFAULT_SIZE})")
+    p.add_argument("--runtime", type=float, default=DEFAULT_RUNTIME_S,
+                   help=f"Laufzeit je Job in s (Standard: {DEFAULT_RUNTIME_S})")
+    p.add_argument("--no-direct", action="store_true", help="ohne O_DIRECT (misst den Page Cache mit)")
+    p.add_argument("--hist", action="store_true", help="Latenz-Histogramm je Job ausgeben")
+    p.add_argument("--label", help="Name des Laufs für compare (Standard: Zeitstempel)")
+    p.add_argument("--results", default=DEFAULT_RESULTS, help="Ergebnisdatei (wie fio_matrix.py)")
+    p.add_argument("--no-results", action="store_true", help="nichts in die Ergebnisdatei schreiben")
+    p.add_argument("--no-telemetry", action="store_true", help="Temperatur/Durchsatz nicht mitschreiben")
+    p.add_argument("--telemetry-rate", type=float, default=10.0, help="Telemetrie-Samples pro Sekunde (Standard: 10)")
+    p.add_argument("--allow-raw-write", action="store_true",
+                   help="schreibende Muster auch auf Blockgeräten (ZERSTÖRT DATEN)")
+    sub.add_parser("compare", help="wie fio_matrix.py compare")
+    args = parser.parse_args()
+
+    try:
+        jobs = build_matrix(args.rw, args.bs, args.iodepth, args.numjobs)
+        targets = [resolve_target(t, TEST_FILE) for t in (args.targets or [default_target()])]
+        runner = BenchRunner(args.size, args.runtime, direct=not args.no_direct, show_hist=args.hist)
+        for job in jobs:
+            if runner.direct and parse_size(job.bs) % DIRECT_ALIGN:
+                raise ValueError(f"bs {job.bs}: mit O_DIRECT ein Vielfaches von {DIRECT_ALIGN} nötig (oder --no-direct)")
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{len(jobs)} Jobs × {len(targets)} Ziel(e), je {args.runtime:g} s, {args.size}, "
+          f"{'O_DIRECT' if runner.direct else 'gepuffert'}")
+    telemetry = None if args.no_telemetry else BenchTelemetry(args.telemetry_rate, args.runtime)
+    try:
+        run_matrix(targets, jobs, runner, None if args.no_results else args.results,
+                   args.label, args.allow_raw_write, telemetry.on_job if telemetry else None)
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nabgebrochen")
+        sys.exit(130)
+    finally:
+        if telemetry is not None:
+            telemetry.close()
+    if not args.no_results:
+        print(f"Ergebnisse: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
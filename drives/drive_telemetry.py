@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Laufwerks-Telemetrie während Benchmarks: Temperaturen (NVMe-/SATA-hwmon)
+und Durchsatz aus /sys/block/<dev>/stat auf einer gemeinsamen Zeitachse.
+
+Ein Thread liest beides mit --rate Hz (Standard 10) über offene
+Deskriptoren (SysfsSampler). Pro Benchmark-Phase wird daraus eine
+Sekundenreihe (Lesen/Schreiben MB/s, höchste Temperatur) und eine kurze
+Auswertung:
+
+    thermal_at_s     erste Sekunde mit Temperatur ≥ Warnschwelle
+                     (temp1_max, bei NVMe WCTEMP)
+    drop_at_s        ab hier liegt der Durchsatz dauerhaft unter 70 % des
+                     Spitzenwerts (p90 der Sekundenwerte)
+    pre_mb_s         Median vor dem Einbruch
+    sustained_mb_s   Median danach – der Wert, der unter Dauerlast bleibt
+
+Die hwmon-Geräte kommen aus temp_monitor_tui.find_temp_sensors(); einem
+Laufwerk zugeordnet werden "nvme"- und "drivetemp"-Einträge, deren
+device-Link auf dasselbe Gerät zeigt wie /sys/block/<dev>/device.
+
+fio_matrix.py und diskbench.py nutzen das automatisch (--no-telemetry
+schaltet es ab); die Reihe steht dann im Ergebnis unter "telemetry".
+
+    ./drive_telemetry.py watch nvme1n1                   # eine Zeile pro Sekunde
+    ./drive_telemetry.py timeline --job randwrite/1M     # gespeicherte Reihe anzeigen
+"""
+import argparse
+import bisect
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "..", "common"))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "..", "temperatures+fan"))
+from ringbuffer import RingBuffer  # noqa: E402
+from sysfs_sampler import SysfsSampler  # noqa: E402
+from temp_monitor_tui import find_temp_sensors, read_file  # noqa: E402
+
+SYS_BLOCK = "/sys/block"
+DRIVE_HWMON_NAMES = ("nvme", "drivetemp")
+SECTOR_BYTES = 512  # /sys/block/*/stat zählt immer in 512-Byte-Sektoren
+STAT_READ_SECTORS = 2
+STAT_WRITE_SECTORS = 6
+
+DEFAULT_RATE_HZ = 10.0
+DEFAULT_WINDOW_S = 600.0  # Historie des Samplers, muss eine Phase abdecken
+PHASE_MARGIN_S = 60.0  # Reserve über der Job-Laufzeit (Anlauf, fsync)
+DROP_SHARE = 0.7  # Einbruch: Durchsatz < 70 % der Spitze ...
+DROP_MIN_S = 3  # ... mindestens so viele Sekunden am Stück
+
+
+class DriveChannels(NamedTuple):
+    device: str  # z.B. "nvme1n1"
+    stat: str
+    temps: List[Tuple[str, str]]  # (Label, temp*_input)
+    temp_warn_c: Optional[float]  # temp1_max (NVMe: WCTEMP)
+    temp_crit_c: Optional[float]  # temp1_crit (NVMe: CCTEMP)
+
+
+def _milli(path: str) -> Optional[float]:
+    raw = read_file(path)
+    try:
+        return int(raw) / 1000.0 if raw is not None else None
+    except ValueError:
+        return None
+
+
+def find_drive_hwmon(device: str) -> Optional[str]:
+    """hwmon-Verzeichnis (nvme/drivetemp) zum Blockgerät, None wenn keins."""
+    target = os.path.realpath(os.path.join(SYS_BLOCK, device, "device"))
+    # NVMe mit Multipath: /sys/block/nvme0n1/device zeigt aufs Subsystem,
+    # hwmon hängt am Controller nvme0
+    m = re.match(r"(nvme\d+)n\d+$", device)
+    controller = m.group(1) if m else None
+    fallback = None
+    for _category, hwmon_name, hwmon_dir, _temps in find_temp_sensors():
+        if hwmon_name not in DRIVE_HWMON_NAMES:
+            continue
+        dev_link = os.path.realpath(os.path.join(hwmon_dir, "device"))
+        if dev_link == target:
+            return hwmon_dir
+        if controller and os.path.basename(dev_link) == controller:
+            fallback = hwmon_dir
+    return fallback
+
+
+def discover_drive(device: str) -> DriveChannels:
+    hwmon = find_drive_hwmon(device)
+    temps: List[Tuple[str, str]] = []
+    warn = crit = None
+    if hwmon is not None:
+        for _category, _name, hwmon_dir, idxs in find_temp_sensors():
+            if hwmon_dir != hwmon:
+                continue
+            for idx in idxs:
+                label = read_file(os.path.join(hwmon, f"temp{idx}_label")) or f"temp{idx}"
+                temps.append((label, os.path.join(hwmon, f"temp{idx}_input")))
+        warn = _milli(os.path.join(hwmon, "temp1_max"))
+        crit = _milli(os.path.join(hwmon, "temp1_crit"))
+    return DriveChannels(device, os.path.join(SYS_BLOCK, device, "stat"), temps, warn, crit)
+
+
+class DriveSampler:
+    """
+    Sampelt ein Laufwerk in einem Daemon-Thread. Alle Reihen sind pro Tick
+    ausgerichtet; Temperaturen in m°C, -1 = fehlt. Die Ringpuffer halten
+    window_s Sekunden Historie.
+    """
+
+    def __init__(self, channels: DriveChannels, rate_hz: float = DEFAULT_RATE_HZ,
+                 window_s: float = DEFAULT_WINDOW_S, sampler_factory=SysfsSampler):
+        self.channels = channels
+        self.rate_hz = rate_hz
+        self.window_s = window_s
+        self.sampler_factory = sampler_factory
+        capacity = max(1, int(rate_hz * window_s))
+        self.times = RingBuffer(capacity, "d")  # Sekunden seit start()
+        self.read_sectors = RingBuffer(capacity, "q")
+        self.write_sectors = RingBuffer(capacity, "q")
+        self.temps = [RingBuffer(capacity, "i") for _ in channels.temps]
+        self.t0 = 0.0
+        self.overruns = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "DriveSampler":
+        self._stop.clear()
+        self.t0 = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name=f"drive-{self.channels.device}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def now(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def _run(self) -> None:
+        sampler = self.sampler_factory()
+        read_bytes, read_int = sampler.read_bytes, sampler.read_int
+        stat_path = self.channels.stat
+        temp_paths = [path for _label, path in self.channels.temps]
+        perf_counter = time.perf_counter
+        period = 1.0 / self.rate_hz
+        next_t = perf_counter()
+        try:
+            while not self._stop.is_set():
+                raw = read_bytes(stat_path)
+                fields = raw.split() if raw else ()
+                temps = [read_int(p) for p in temp_paths]
+                with self._lock:
+                    self.times.append(perf_counter() - self.t0)
+                    if len(fields) > STAT_WRITE_SECTORS:
+                        self.read_sectors.append(int(fields[STAT_READ_SECTORS]))
+                        self.write_sectors.append(int(fields[STAT_WRITE_SECTORS]))
+                    else:
+                        self.read_sectors.append(-1)
+                        self.write_sectors.append(-1)
+                    for buf, val in zip(self.temps, temps):
+                        buf.append(-1 if val is None else val)
+
+                next_t += period
+                delay = next_t - perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    missed = int(-delay / period)
+                    self.overruns += missed
+                    next_t += missed * period
+        finally:
+            sampler.close()
+
+    def seconds(self, t_start: float, t_end: float) -> List["SecondSample"]:
+        """Sekundenreihe zwischen t_start und t_end (Sekunden seit start())."""
+        with self._lock:
+            times = self.times.values().tolist()
+            rd = self.read_sectors.values().tolist()
+            wr = self.write_sectors.values().tolist()
+            temps = [buf.values().tolist() for buf in self.temps]
+        return per_second(times, rd, wr, temps, t_start, t_end)
+
+
+class SecondSample(NamedTuple):
+    t: int  # Sekunde seit Phasenbeginn
+    read_mb_s: Optional[float]
+    write_mb_s: Optional[float]
+    temp_c: Optional[float]  # höchster Kanal in dieser Sekunde
+
+
+def per_second(times: List[float], rd: List[int], wr: List[int], temps: List[List[int]],
+               t_start: float, t_end: float) -> List[SecondSample]:
+    # Durchsatz nur aus gültigen stat-Samples, damit ein einzelner
+    # Lesefehler nicht die ganze Sekunde verwirft
+    valid = [i for i, v in enumerate(rd) if v >= 0]
+    vt = [times[i] for i in valid]
+    out = []
+    k = 0
+    while t_start + k + 1 <= t_end + 1e-6:
+        lo, hi = t_start + k, t_start + k + 1
+        i, j = bisect.bisect_left(times, lo), bisect.bisect_left(times, hi)
+        if j >= len(times):
+            break
+        a, b = bisect.bisect_left(vt, lo), bisect.bisect_left(vt, hi)
+        rd_mb = wr_mb = None
+        if b < len(vt) and a < b and vt[b] > vt[a]:
+            dt = vt[b] - vt[a]
+            ia, ib = valid[a], valid[b]
+            rd_mb = (rd[ib] - rd[ia]) * SECTOR_BYTES / dt / 1e6
+            wr_mb = (wr[ib] - wr[ia]) * SECTOR_BYTES / dt / 1e6
+        vals = [v for buf in temps for v in buf[i:j] if v >= 0]
+        out.append(SecondSample(k, rd_mb, wr_mb, max(vals) / 1000.0 if vals else None))
+        k += 1
+    return out
+
+
+def analyze(seconds: List[SecondSample], warn_c: Optional[float]) -> dict:
+    """Drosselbeginn (thermisch / Durchsatz) und Durchsatz davor/danach."""
+    rows = [s for s in seconds if s.read_mb_s is not None]
+    bw = [s.read_mb_s + s.write_mb_s for s in rows]
+    temps = [s.temp_c for s in seconds if s.temp_c is not None]
+    out = {
+        "temp_max_c": max(temps) if temps else None,
+        "thermal_at_s": None,
+        "drop_at_s": None,
+        "peak_mb_s": None,
+        "pre_mb_s": None,
+        "sustained_mb_s": None,
+    }
+    if warn_c is not None:
+        for s in seconds:
+            if s.temp_c is not None and s.temp_c >= warn_c:
+                out["thermal_at_s"] = s.t
+                break
+    if not bw:
+        return out
+    peak = sorted(bw)[int(0.9 * (len(bw) - 1))]
+    out["peak_mb_s"] = peak
+    limit = DROP_SHARE * peak
+    for k in range(len(bw) - DROP_MIN_S + 1):
+        if all(v < limit for v in bw[k:k + DROP_MIN_S]) and statistics.median(bw[k:]) < limit:
+            cut = k
+            out["drop_at_s"] = rows[k].t
+            break
+    else:
+        cut = None
+    if cut is None:
+        out["pre_mb_s"] = out["sustained_mb_s"] = statistics.median(bw)
+    else:
+        out["pre_mb_s"] = statistics.median(bw[:cut]) if cut else None
+        out["sustained_mb_s"] = statistics.median(bw[cut:])
+    return out
+
+
+def _r(v: Optional[float], digits: int = 1) -> Optional[float]:
+    return None if v is None else round(v, digits)
+
+
+def format_summary(tel: dict) -> str:
+    parts = []
+    if tel.get("temp_max_c") is not None:
+        warn = f" (Warnschwelle {tel['temp_warn_c']:.0f} °C)" if tel.get("temp_warn_c") else ""
+        parts.append(f"T max {tel['temp_max_c']:.0f} °C{warn}")
+    else:
+        parts.append("keine Temperatur")
+    if tel.get("drop_at_s") is not None:
+        pre = tel.get("pre_mb_s")
+        parts.append(f"Einbruch ab {tel['drop_at_s']} s: {pre or 0:,.0f} → {tel['sustained_mb_s']:,.0f} MB/s")
+    elif tel.get("sustained_mb_s") is not None:
+        parts.append(f"kein Einbruch, Median {tel['sustained_mb_s']:,.0f} MB/s")
+    if tel.get("thermal_at_s") is not None:
+        parts.append(f"Warnschwelle erreicht ab {tel['thermal_at_s']} s")
+    return "Telemetrie: " + ", ".join(parts)
+
+
+class BenchTelemetry:
+    """
+    on_job-Hook für fio_matrix.run_matrix: startet pro Laufwerk einen
+    DriveSampler und gibt am Ende jedes Jobs {"telemetry": {...}} zurück.
+    phase_s ist die Laufzeit eines Jobs; die Historie reicht für einen Job
+    plus PHASE_MARGIN_S.
+    """
+
+    def __init__(self, rate_hz: float = DEFAULT_RATE_HZ, phase_s: float = DEFAULT_WINDOW_S - PHASE_MARGIN_S,
+                 verbose: bool = True):
+        self.rate_hz = rate_hz
+        self.window_s = phase_s + PHASE_MARGIN_S
+        self.verbose = verbose
+        self.samplers: Dict[str, DriveSampler] = {}
+        self._start: Optional[float] = None
+
+    def _sampler(self, device: str) -> DriveSampler:
+        s = self.samplers.get(device)
+        if s is None:
+            s = self.samplers[device] = DriveSampler(discover_drive(device), self.rate_hz, self.window_s).start()
+            if self.verbose and not s.channels.temps:
+                print(f"  Telemetrie: keine Temperatur für {device} (kein nvme/drivetemp-hwmon)")
+        return s
+
+    def on_job(self, target, job, phase: str) -> Optional[dict]:
+        if target.device is None:
+            return None
+        sampler = self._sampler(target.device)
+        if phase == "start":
+            self._start = sampler.now()
+            return None
+        if self._start is None:
+            return None
+        seconds = sampler.seconds(self._start, sampler.now())
+        self._start = None
+        ch = sampler.channels
+        tel = dict(analyze(seconds, ch.temp_warn_c), device=ch.device, rate_hz=self.rate_hz,
+                   temp_warn_c=ch.temp_warn_c, temp_crit_c=ch.temp_crit_c,
+                   temp_labels=[label for label, _path in ch.temps])
+        for key in ("temp_max_c", "peak_mb_s", "pre_mb_s", "sustained_mb_s"):
+            tel[key] = _r(tel[key])
+        tel["seconds"] = [[s.t, _r(s.read_mb_s), _r(s.write_mb_s), _r(s.temp_c)] for s in seconds]
+        if self.verbose:
+            print("    " + format_summary(tel), flush=True)
+        return {"telemetry": tel}
+
+    def close(self) -> None:
+        for s in self.samplers.values():
+            s.stop()
+        self.samplers.clear()
+
+
+def print_timeline(tel: dict) -> None:
+    marks = {tel.get("drop_at_s"): "← Einbruch", tel.get("thermal_at_s"): "← Warnschwelle"}
+    print(f"{'s':>4} {'Lesen MB/s':>11} {'Schreiben MB/s':>15} {'°C':>6}")
+    for t, rd, wr, temp in tel.get("seconds", []):
+        mark = " ".join(m for k, m in marks.items() if k is not None and k == t)
+        print(f"{t:>4} {'-' if rd is None else f'{rd:,.0f}':>11} {'-' if wr is None else f'{wr:,.0f}':>15} "
+              f"{'-' if temp is None else f'{temp:.0f}':>6}  {mark}")
+    print(format_summary(tel))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Laufwerkstemperatur und Durchsatz auf einer Zeitachse.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("watch", help="live: eine Zeile pro Sekunde")
+    p.add_argument("device", help="z.B. nvme1n1 oder sda")
+    p.add_argument("--rate", type=float, default=DEFAULT_RATE_HZ, help="Samples pro Sekunde (Standard: 10)")
+    p = sub.add_parser("timeline", help="Sekundenreihe aus einer Ergebnisdatei (fio_matrix/diskbench)")
+    p.add_argument("results", nargs="?", default=os.path.join(SCRIPT_DIR, "fio_results.jsonl"))
+    p.add_argument("--run", help="run-ID oder Label (Standard: letzter Lauf)")
+    p.add_argument("--job", help="nur Jobs, deren Schlüssel dies enthält")
+    args = parser.parse_args()
+
+    if args.command == "watch":
+        device = os.path.basename(args.device)
+        if not os.path.exists(os.path.join(SYS_BLOCK, device, "stat")):
+            print(f"{SYS_BLOCK}/{device}/stat nicht gefunden")
+            sys.exit(1)
+        ch = discover_drive(device)
+        labels = ", ".join(label for label, _p in ch.temps) or "keine Temperatur"
+        print(f"{device}: {labels}" + (f", Warnschwelle {ch.temp_warn_c:.0f} °C" if ch.temp_warn_c else ""))
+        sampler = DriveSampler(ch, args.rate, window_s=5.0).start()
+        print(f"{'s':>5} {'Lesen MB/s':>11} {'Schreiben MB/s':>15} {'°C':>6}")
+        try:
+            k = 0
+            while True:
+                time.sleep(max(0.0, k + 1 - sampler.now()) + 1.0 / args.rate)
+                rows = sampler.seconds(k, k + 1)
+                if rows:
+                    s = rows[0]
+                    print(f"{k:>5} {s.read_mb_s or 0:>11,.0f} {s.write_mb_s or 0:>15,.0f} "
+                          f"{'-' if s.temp_c is None else f'{s.temp_c:.0f}':>6}", flush=True)
+                k += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sampler.stop()
+        return
+
+    records = []
+    try:
+        with open(args.results, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    rec = json.loads(line)
+                    if rec.get("type") == "result" and rec.get("telemetry"):
+                        records.append(rec)
+    except OSError as e:
+        print(e)
+        sys.exit(1)
+    if args.run:
+        records = [r for r in records if args.run in (r["run"], r.get("label"))]
+    elif records:
+        last = records[-1]["run"]
+        records = [r for r in records if r["run"] == last]
+    if args.job:
+        records = [r for r in records if args.job in r["job"]["key"]]
+    if not records:
+        print("keine Ergebnisse mit Telemetrie")
+        return
+    for rec in records:
+        print(f"=== {rec.get('label') or rec['run']} {rec.get('device') or rec['target']} {rec['job']['key']} "
+              f"({rec.get('engine', 'fio')}) ===")
+        print_timeline(rec["telemetry"])
+        print()
+
+
+if __name__ == "__main__":
+    main()
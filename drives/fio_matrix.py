@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+fio-Matrix für Laufwerke (Nachfolger von speedtest-tui.sh ohne whiptail).
+
+Startet fio pro Kombination aus Muster × Blockgröße × iodepth × numjobs mit
+--output-format=json, liest IOPS, Bandbreite und clat-Perzentile aus und
+hängt sie als JSON-Lines an eine Ergebnisdatei an (Standard:
+fio_results.jsonl neben dem Skript). "compare" stellt Läufe und Geräte
+nebeneinander.
+
+Muster: read, write, randread, randwrite, rw, randrw; gemischt mit
+Leseanteil als Zahl dahinter, z.B. randrw70 (70 % lesen / 30 % schreiben).
+
+Ziele wie im Shell-Skript: ein Blockgerät (/dev/nvme1n1) oder ein
+Verzeichnis (dort wird fio_test.bin angelegt, vorbefüllt und am Ende
+gelöscht). Schreibende Muster auf Blockgeräten zerstören Daten und laufen
+nur mit --allow-raw-write.
+
+Während jedes Jobs schreibt drive_telemetry.py Laufwerkstemperatur und
+Durchsatz pro Sekunde mit (--no-telemetry schaltet das ab).
+
+    ./fio_matrix.py run /media/daten                           # Standardmatrix
+    ./fio_matrix.py run /dev/nvme1n1 --rw read,randread --bs 4k,1M --iodepth 1,32
+    ./fio_matrix.py run /mnt/a /mnt/b --rw randwrite,randrw70 --numjobs 1,4 --label neu
+    ./fio_matrix.py compare                                    # letzte Läufe
+    ./fio_matrix.py compare --metric p99 --last 6
+"""
+import argparse
+import itertools
+import json
+import os
+import re
+import shlex
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS = os.path.join(SCRIPT_DIR, "fio_results.jsonl")
+RESULTS_VERSION = 1
+TEST_FILE = "fio_test.bin"
+
+DEFAULT_RW = "read,randread,write,randwrite,randrw70"
+DEFAULT_BS = "1M,4k"
+DEFAULT_IODEPTH = "32"
+DEFAULT_NUMJOBS = "1"
+DEFAULT_SIZE = "8G"
+DEFAULT_RUNTIME_S = 15
+
+PERCENTILES = (50.0, 99.0, 99.9)
+RW_MODES = ("read", "write", "randread", "randwrite", "rw", "randrw")
+WRITE_MODES = ("write", "randwrite", "rw", "randrw")
+_RW_RE = re.compile(r"^(randrw|rw|randread|randwrite|read|write)(\d{1,3})?$")
+
+
+class Job(NamedTuple):
+    rw: str  # fio --rw
+    bs: str
+    iodepth: int
+    numjobs: int
+    rwmixread: Optional[int] = None  # nur bei rw/randrw
+
+    @property
+    def key(self) -> str:
+        mix = "" if self.rwmixread is None else str(self.rwmixread)
+        return f"{self.rw}{mix}/{self.bs}/qd{self.iodepth}/j{self.numjobs}"
+
+    @property
+    def writes(self) -> bool:
+        return self.rw in WRITE_MODES
+
+
+def parse_rw(spec: str) -> Tuple[str, Optional[int]]:
+    m = _RW_RE.match(spec.strip().lower())
+    if m is None:
+        raise ValueError(f"unbekanntes Muster {spec!r} (erlaubt: {', '.join(RW_MODES)}, gemischt z.B. randrw70)")
+    rw, mix = m.group(1), m.group(2)
+    if mix is not None and rw not in ("rw", "randrw"):
+        raise ValueError(f"Leseanteil nur bei rw/randrw: {spec!r}")
+    if mix is not None and not 0 <= int(mix) <= 100:
+        raise ValueError(f"Leseanteil 0..100: {spec!r}")
+    if mix is None and rw in ("rw", "randrw"):
+        mix = "50"
+    return rw, None if mix is None else int(mix)
+
+
+def _csv(text: str) -> List[str]:
+    return [s.strip() for s in text.split(",") if s.strip()]
+
+
+def build_matrix(rws: str, bss: str, iodepths: str, numjobs: str) -> List[Job]:
+    """Kreuzprodukt in der Reihenfolge Muster → bs → iodepth → numjobs."""
+    jobs = []
+    for rw_spec, bs, qd, nj in itertools.product(_csv(rws), _csv(bss), _csv(iodepths), _csv(numjobs)):
+        rw, mix = parse_rw(rw_spec)
+        jobs.append(Job(rw, bs, int(qd), int(nj), mix))
+    return jobs
+
+
+# --- Ziele ---
+
+
+class Target(NamedTuple):
+    name: str  # wie angegeben
+    filename: str  # --filename für fio
+    raw: bool  # Blockgerät
+    device: Optional[str]  # z.B. "nvme1n1" (ganze Platte, keine Partition)
+    model: Optional[str]
+    temp_file: bool  # fio_test.bin, wird angelegt und wieder gelöscht
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def block_device_for(path: str) -> Optional[str]:
+    """Name der Platte unter /sys/block, auf der path liegt (Partition → Platte)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    dev = st.st_rdev if stat.S_ISBLK(st.st_mode) else st.st_dev
+    sys_path = os.path.realpath(f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}")
+    if not os.path.exists(sys_path):
+        return None
+    if os.path.exists(os.path.join(sys_path, "partition")):
+        sys_path = os.path.dirname(sys_path)
+    name = os.path.basename(sys_path)
+    return name if os.path.isdir(os.path.join("/sys/block", name)) else None
+
+
+def device_model(device: Optional[str]) -> Optional[str]:
+    if device is None:
+        return None
+    return _read_text(f"/sys/block/{device}/device/model")
+
+
+def resolve_target(name: str, test_file: str = TEST_FILE) -> Target:
+    try:
+        st = os.stat(name)
+    except OSError as e:
+        raise ValueError(f"{name}: {e.strerror}") from None
+    device = block_device_for(name)
+    if stat.S_ISBLK(st.st_mode):
+        return Target(name, name, True, device, device_model(device), False)
+    if stat.S_ISDIR(st.st_mode):
+        return Target(name, os.path.join(name, test_file), False, device, device_model(device), True)
+    if stat.S_ISREG(st.st_mode):
+        return Target(name, name, False, device, device_model(device), False)
+    raise ValueError(f"{name}: weder Blockgerät noch Verzeichnis/Datei")
+
+
+# --- fio ---
+
+
+class DirStats(NamedTuple):
+    """Ergebnis einer Richtung (read/write); Latenzen in µs, Bandbreite in KiB/s."""
+
+    iops: float
+    bw_kib: float
+    io_bytes: int
+    clat_mean_us: float
+    clat_p50_us: Optional[float]
+    clat_p99_us: Optional[float]
+    clat_p999_us: Optional[float]
+    clat_max_us: float
+    hist: Optional[list] = None  # [[untere Grenze µs, Anzahl], ...], nur diskbench
+
+    def to_json(self) -> dict:
+        return {k: (round(v, 3) if isinstance(v, float) else v) for k, v in self._asdict().items()
+                if v is not None or k != "hist"}
+
+
+def _percentile(pcts: Dict[str, float], p: float) -> Optional[float]:
+    for key, val in pcts.items():
+        if abs(float(key) - p) < 1e-6:
+            return val / 1000.0
+    return None
+
+
+def parse_fio_json(text: str) -> Dict[str, DirStats]:
+    """fio --output-format=json → {"read": DirStats, "write": DirStats} (nur Richtungen mit I/O)."""
+    start = text.find("{")  # fio schreibt Warnungen manchmal vor das JSON
+    if start < 0:
+        raise ValueError("keine JSON-Ausgabe von fio")
+    data = json.loads(text[start:])
+    jobs = data.get("jobs") or []
+    if not jobs:
+        raise ValueError("fio-Ausgabe ohne jobs")
+    job = jobs[0]  # --group_reporting: ein Eintrag für alle numjobs
+    if job.get("error"):
+        raise ValueError(f"fio meldet Fehler {job['error']}")
+    out = {}
+    for direction in ("read", "write"):
+        d = job.get(direction) or {}
+        if not d.get("io_bytes"):
+            continue
+        clat = d.get("clat_ns") or {}
+        pcts = clat.get("percentile") or {}
+        out[direction] = DirStats(
+            iops=float(d.get("iops", 0.0)),
+            bw_kib=float(d.get("bw", 0.0)),
+            io_bytes=int(d["io_bytes"]),
+            clat_mean_us=float(clat.get("mean", 0.0)) / 1000.0,
+            clat_p50_us=_percentile(pcts, 50.0),
+            clat_p99_us=_percentile(pcts, 99.0),
+            clat_p999_us=_percentile(pcts, 99.9),
+            clat_max_us=float(clat.get("max", 0.0)) / 1000.0,
+        )
+    return out
+
+
+def detect_ioengine(fio: str) -> str:
+    """io_uring, wenn fio es kennt, sonst libaio (wie speedtest-tui.sh)."""
+    try:
+        res = subprocess.run([fio, "--enghelp"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return "libaio"
+    return "io_uring" if "io_uring" in res.stdout else "libaio"
+
+
+class FioRunner:
+    engine = "fio"
+
+    def __init__(self, fio: str = "fio", ioengine: str = "auto", size: str = DEFAULT_SIZE,
+                 runtime_s: int = DEFAULT_RUNTIME_S, use_sudo: bool = True, dry_run: bool = False):
+        self.fio = fio
+        self.ioengine = detect_ioengine(fio) if ioengine == "auto" and not dry_run else ioengine
+        if self.ioengine == "auto":
+            self.ioengine = "libaio"
+        self.size = size
+        self.runtime_s = runtime_s
+        self.prefix = ["sudo"] if use_sudo and os.geteuid() != 0 else []
+        self.dry_run = dry_run
+
+    def command(self, job: Job, filename: str) -> List[str]:
+        cmd = self.prefix + [
+            self.fio,
+            f"--name={job.key.replace('/', '_')}",
+            f"--filename={filename}",
+            f"--rw={job.rw}",
+            f"--bs={job.bs}",
+            f"--iodepth={job.iodepth}",
+            f"--numjobs={job.numjobs}",
+            "--direct=1",
+            f"--ioengine={self.ioengine}",
+            f"--size={self.size}",
+            "--time_based",
+            f"--runtime={self.runtime_s}",
+            "--group_reporting",
+            "--percentile_list=" + ":".join(f"{p:g}" for p in PERCENTILES),
+            "--output-format=json",
+        ]
+        if job.rwmixread is not None:
+            cmd.append(f"--rwmixread={job.rwmixread}")
+        return cmd
+
+    def prep(self, filename: str) -> None:
+        """Testdatei einmal komplett schreiben, damit Lesetests echte Daten lesen."""
+        cmd = self.prefix + [self.fio, "--name=prep", f"--filename={filename}", "--rw=write",
+                             "--bs=1M", "--iodepth=32", "--numjobs=1", "--direct=1",
+                             f"--ioengine={self.ioengine}", f"--size={self.size}",
+                             "--end_fsync=1", "--output-format=json"]
+        self._exec(cmd)
+
+    def run(self, job: Job, filename: str) -> Dict[str, DirStats]:
+        out = self._exec(self.command(job, filename))
+        return {} if self.dry_run else parse_fio_json(out)
+
+    def remove(self, filename: str) -> None:
+        if self.dry_run:
+            print(shlex.join(self.prefix + ["rm", "-f", filename]))
+            return
+        subprocess.run(self.prefix + ["rm", "-f", filename], check=False)
+
+    def _exec(self, cmd: List[str]) -> str:
+        if self.dry_run:
+            print(shlex.join(cmd))
+            return ""
+        res = subprocess.run(cmd, capture_output=True, text=True)
+        if res.returncode != 0:
+            err = (res.stderr or res.stdout).strip().splitlines()
+            raise RuntimeError(f"fio Exit {res.returncode}: {err[-1] if err else ''}")
+        return res.stdout
+
+
+# --- Ergebnisdatei ---
+
+
+def make_record(run_id: str, label: Optional[str], target: Target, job: Job, runner,
+                stats: Dict[str, DirStats], extra: Optional[dict] = None) -> dict:
+    rec = {
+        "type": "result",
+        "v": RESULTS_VERSION,
+        "engine": runner.engine,
+        "run": run_id,
+        "label": label,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": socket.gethostname(),
+        "kernel": os.uname().release,
+        "target": target.name,
+        "device": target.device,
+        "model": target.model,
+        "job": dict(job._asdict(), key=job.key, size=runner.size, runtime=runner.runtime_s,
+                    ioengine=runner.ioengine),
+    }
+    for direction, st in stats.items():
+        rec[direction] = st.to_json()
+    if extra:
+        rec.update(extra)
+    return rec
+
+
+def append_record(path: str, rec: dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(rec, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+
+def load_records(paths: Sequence[str]) -> List[dict]:
+    out = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                if rec.get("type") != "result":
+                    continue
+                if rec.get("v") != RESULTS_VERSION:
+                    raise ValueError(f"{path}:{lineno}: Version {rec.get('v')!r} statt {RESULTS_VERSION}")
+                out.append(rec)
+    return out
+
+
+# --- Ausgabe ---
+
+METRICS = {
+    # Name: (Feld, Überschrift, Format)
+    "iops": ("iops", "IOPS", "{:,.0f}"),
+    "bw": ("bw_kib", "MB/s", None),
+    "mean": ("clat_mean_us", "clat Ø µs", "{:,.0f}"),
+    "p50": ("clat_p50_us", "clat p50 µs", "{:,.0f}"),
+    "p99": ("clat_p99_us", "clat p99 µs", "{:,.0f}"),
+    "p999": ("clat_p999_us", "clat p99.9 µs", "{:,.0f}"),
+}
+
+
+def metric_text(rec: dict, direction: str, metric: str) -> str:
+    d = rec.get(direction)
+    if not d:
+        return "-"
+    field, _title, fmt = METRICS[metric]
+    val = d.get(field)
+    if val is None:
+        return "-"
+    if metric == "bw":
+        return f"{val * 1024 / 1e6:,.0f}"
+    return fmt.format(val)
+
+
+def column_key(rec: dict) -> Tuple[str, Optional[str], str]:
+    return rec["run"], rec.get("label"), rec["target"]
+
+
+def column_title(rec: dict) -> str:
+    dev = rec.get("device") or rec["target"]
+    return f"{rec.get('label') or rec['run']} {dev}"
+
+
+def comparison_rows(records: List[dict], metric: str) -> Tuple[List[str], List[List[str]]]:
+    """Zeilen = Job × Richtung, Spalten = (Lauf, Ziel) in Reihenfolge des Auftretens."""
+    columns: Dict[tuple, str] = {}
+    cells: Dict[tuple, Dict[tuple, str]] = {}
+    for rec in records:
+        col = column_key(rec)
+        columns.setdefault(col, column_title(rec))
+        for direction in ("read", "write"):
+            if direction in rec:
+                row = (rec["job"]["key"], direction[0].upper())
+                cells.setdefault(row, {})[col] = metric_text(rec, direction, metric)
+    header = ["Job", ""] + list(columns.values())
+    rows = [[key, d] + [vals.get(col, "") for col in columns] for (key, d), vals in cells.items()]
+    return header, rows
+
+
+def format_table(header: List[str], rows: List[List[str]]) -> Iterator[str]:
+    widths = [max(len(r[i]) for r in [header] + rows) for i in range(len(header))]
+    yield "  ".join(h.ljust(w) if i < 2 else h.rjust(w) for i, (h, w) in enumerate(zip(header, widths)))
+    for r in rows:
+        yield "  ".join(c.ljust(w) if i < 2 else c.rjust(w) for i, (c, w) in enumerate(zip(r, widths)))
+
+
+def format_result_line(job: Job, stats: Dict[str, DirStats]) -> str:
+    parts = []
+    for direction, st in stats.items():
+        p99 = "-" if st.clat_p99_us is None else f"{st.clat_p99_us:,.0f}"
+        parts.append(f"{direction[0].upper()} {st.iops:>9,.0f} IOPS {st.bw_kib * 1024 / 1e6:>7,.0f} MB/s "
+                     f"p99 {p99:>7} µs")
+    return f"{job.key:<24} " + " | ".join(parts)
+
+
+# --- Ablauf ---
+
+
+def run_matrix(targets: List[Target], jobs: List[Job], runner: FioRunner, results: Optional[str],
+               label: Optional[str] = None, allow_raw_write: bool = False, on_job=None) -> List[dict]:
+    """
+    Alle Jobs auf allen Zielen. on_job(target, job, phase) wird vor ("start")
+    und nach ("end") jedem Job aufgerufen und darf ein dict zurückgeben, das
+    beim Ende in den Ergebnisdatensatz übernommen wird.
+
+    runner ist ein FioRunner oder etwas mit derselben Schnittstelle (engine,
+    size, runtime_s, ioengine, dry_run, prep/run/remove), z.B. der Runner
+    aus diskbench.py.
+    """
+    run_id = time.strftime("%Y-%m-%d_%H-%M-%S")
+    records = []
+    for target in targets:
+        info = ", ".join(x for x in (target.device, target.model) if x)
+        print(f"=== {target.name}" + (f" ({info})" if info else "") + " ===")
+        todo = jobs
+        if target.raw and not allow_raw_write:
+            todo = [j for j in jobs if not j.writes]
+            if len(todo) < len(jobs):
+                print(f"  {len(jobs) - len(todo)} schreibende Jobs übersprungen (Blockgerät, --allow-raw-write fehlt)")
+        try:
+            if target.temp_file and todo:
+                print("  Vorbereitung: Testdatei schreiben ...")
+                runner.prep(target.filename)
+            for job in todo:
+                if on_job is not None:
+                    on_job(target, job, "start")
+                try:
+                    stats = runner.run(job, target.filename)
+                except BaseException:
+                    if on_job is not None:
+                        on_job(target, job, "end")
+                    raise
+                if not runner.dry_run:
+                    print("  " + format_result_line(job, stats), flush=True)
+                extra = on_job(target, job, "end") if on_job is not None else None
+                if runner.dry_run:
+                    continue
+                rec = make_record(run_id, label, target, job, runner, stats, extra)
+                records.append(rec)
+                if results:
+                    append_record(results, rec)
+        finally:
+            if target.temp_file:
+                runner.remove(target.filename)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fio-Matrix mit JSON-Auswertung und Vergleich über Läufe.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="Matrix auf einem oder mehreren Zielen ausführen")
+    p.add_argument("targets", nargs="+", help="Blockgerät (/dev/...) oder Verzeichnis")
+    p.add_argument("--rw", default=DEFAULT_RW, help=f"Muster, Komma-getrennt (Standard: {DEFAULT_RW})")
+    p.add_argument("--bs", default=DEFAULT_BS, help=f"Blockgrößen (Standard: {DEFAULT_BS})")
+    p.add_argument("--iodepth", default=DEFAULT_IODEPTH, help=f"Queue-Tiefen (Standard: {DEFAULT_IODEPTH})")
+    p.add_argument("--numjobs", default=DEFAULT_NUMJOBS, help=f"parallele Jobs (Standard: {DEFAULT_NUMJOBS})")
+    p.add_argument("--size", default=DEFAULT_SIZE, help=f"Testgröße (Standard: {DEFAULT_SIZE})")
+    p.add_argument("--runtime", type=int, default=DEFAULT_RUNTIME_S,
+                   help=f"Laufzeit je Job in s (Standard: {DEFAULT_RUNTIME_S})")
+    p.add_argument("--ioengine", default="auto", help="auto (io_uring, sonst libaio) oder fio-Engine")
+    p.add_argument("--label", help="Name des Laufs für compare (Standard: Zeitstempel)")
+    p.add_argument("--results", default=DEFAULT_RESULTS, help="Ergebnisdatei (JSON-Lines, wird ergänzt)")
+    p.add_argument("--allow-raw-write", action="store_true",
+                   help="schreibende Muster auch auf Blockgeräten (ZERSTÖRT DATEN)")
+    p.add_argument("--no-sudo", action="store_true", help="fio nicht über sudo starten")
+    p.add_argument("--dry-run", action="store_true", help="nur die fio-Aufrufe ausgeben")
+    p.add_argument("--fio", default="fio", help="Pfad zu fio")
+    p.add_argument("--no-telemetry", action="store_true", help="Temperatur/Durchsatz nicht mitschreiben")
+    p.add_argument("--telemetry-rate", type=float, default=10.0, help="Telemetrie-Samples pro Sekunde (Standard: 10)")
+
+    p = sub.add_parser("compare", help="Läufe/Geräte nebeneinander")
+    p.add_argument("results", nargs="*", help=f"Ergebnisdateien (Standard: {os.path.basename(DEFAULT_RESULTS)})")
+    p.add_argument("--metric", choices=sorted(METRICS), default="iops", help="Kennzahl (Standard: iops)")
+    p.add_argument("--last", type=int, default=4, help="nur die letzten N Läufe (Standard: 4, 0 = alle)")
+    p.add_argument("--run", action="append", help="nur diese Läufe (run-ID oder Label), mehrfach möglich")
+    p.add_argument("--device", help="nur dieses Gerät (z.B. nvme1n1)")
+    p.add_argument("--job", help="nur Jobs, deren Schlüssel dies enthält (z.B. randread/4k)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        try:
+            jobs = build_matrix(args.rw, args.bs, args.iodepth, args.numjobs)
+            targets = [resolve_target(t) for t in args.targets]
+        except ValueError as e:
+            parser.error(str(e))
+        if not args.dry_run and shutil.which(args.fio) is None:
+            print(f"Fehlt: {args.fio}")
+            sys.exit(1)
+        runner = FioRunner(args.fio, args.ioengine, args.size, args.runtime,
+                           use_sudo=not args.no_sudo, dry_run=args.dry_run)
+        print(f"{len(jobs)} Jobs × {len(targets)} Ziel(e), je {args.runtime} s, {runner.ioengine}, {args.size}")
+        telemetry = None
+        if not (args.dry_run or args.no_telemetry):
+            from drive_telemetry import BenchTelemetry
+            telemetry = BenchTelemetry(args.telemetry_rate, args.runtime)
+        try:
+            run_matrix(targets, jobs, runner, None if args.dry_run else args.results,
+                       args.label, args.allow_raw_write, telemetry.on_job if telemetry else None)
+        except (RuntimeError, ValueError) as e:
+            print(f"Fehler: {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print("\nabgebrochen")
+            sys.exit(130)
+        finally:
+            if telemetry is not None:
+                telemetry.close()
+        if not args.dry_run:
+            print(f"Ergebnisse: {args.results}")
+        return
+
+    try:
+        records = load_records(args.results or [DEFAULT_RESULTS])
+    except (OSError, ValueError) as e:
+        print(e)
+        sys.exit(1)
+    if args.device:
+        records = [r for r in records if r.get("device") == args.device or r["target"] == args.device]
+    if args.job:
+        records = [r for r in records if args.job in r["job"]["key"]]
+    if args.run:
+        records = [r for r in records if r["run"] in args.run or r.get("label") in args.run]
+    elif args.last:
+        runs = list(dict.fromkeys(r["run"] for r in records))[-args.last:]
+        records = [r for r in records if r["run"] in runs]
+    if not records:
+        print("keine Ergebnisse")
+        return
+    header, rows = comparison_rows(records, args.metric)
+    print(METRICS[args.metric][1])
+    for line in format_table(header, rows):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,4 +25,4 @@ cat $CARD/pp_dpm_socclk | sed 's/^/  /'
 echo
 echo "Hinweis:"
 echo "Die Karte läuft jetzt mit maximalem Boost-Profil."
-echo "Beobachte 'gpu_watch.sh' für Power, Hotspot und Takt."
+echo "Beobachte 'gpu_monitor.py' (oder 'gpu_watch.sh') für Power, Hotspot und Takt."
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
-import sys, struct
+import sys
+
+from pptable import PPTable
 
 if len(sys.argv) != 3:
     print("Usage: ./patch_ppt.py <input_pp_table.bin> <new_PPT_in_watts>")
@@ -7,17 +9,14 @@ if len(sys.argv) != 3:
 
 inp = sys.argv[1]
 ppt_watts = int(sys.argv[2])
-ppt_uW = ppt_watts * 1000000
-
-data = bytearray(open(inp, "rb").read())
 
-# PPT befindet sich in RDNA2 PowerPlay Tables immer bei offset 0x1e4 (PPT)
-# Format: 4 Bytes, little-endian, in µW.
-offset = 0x1e4
+table = PPTable.load(inp)
 
-old = struct.unpack_from("<I", data, offset)[0]
-struct.pack_into("<I", data, offset, ppt_uW)
+# PPT = SocketPowerLimitAc/Dc[0] in PPTable_t (smc_pptable), 16 Bit, in Watt.
+# Offset kommt aus dem Schema in pptable.py, nicht mehr fest verdrahtet.
+old = table.set("smc_pptable/SocketPowerLimitAc/0", ppt_watts)
+table.set("smc_pptable/SocketPowerLimitDc/0", ppt_watts)
 
-open("pp_table_mod.bin", "wb").write(data)
+table.save("pp_table_mod.bin")
 
-print(f"Done. PPT {old/1e6:.1f} W -> {ppt_watts} W")
+print(f"Done. PPT {old} W -> {ppt_watts} W")
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
-import sys, struct, glob
+import sys, glob
+
+from ppt_tool import diff_tables, print_changes, print_issues, read_cap_max_w, validate, LEVEL_ERROR
+from pptable import PPTable
 
 CARD = "card1"  # bei dir fest
 
@@ -19,25 +22,25 @@ if len(sys.argv) != 3:
 
 inp = sys.argv[1]
 ppt_w = int(sys.argv[2])
-ppt_uw_new = ppt_w * 1_000_000
 
 ppt_uw_old, cap_path = find_power_cap_uw()
 print(f"Aktueller PPT laut {cap_path}: {ppt_uw_old/1e6:.1f} W")
 
-# Original lesen
-data = bytearray(open(inp, "rb").read())
+# Original lesen; PPT über den Feldnamen setzen statt nach dem Cap-Wert
+# (µW) in den Bytes zu suchen – die Tabelle speichert ihn in W (16 Bit).
+orig = PPTable.load(inp)
+table = PPTable(bytes(orig))
+table.set("smc_pptable/SocketPowerLimitAc/0", ppt_w)
+table.set("smc_pptable/SocketPowerLimitDc/0", ppt_w)
 
-needle = struct.pack("<I", ppt_uw_old)
-repl = struct.pack("<I", ppt_uw_new)
+print_changes(diff_tables(orig, table))
 
-count = 0
-for i in range(len(data) - 3):
-    if data[i:i+4] == needle:
-        data[i:i+4] = repl
-        count += 1
+issues = validate(table, cap_max_w=read_cap_max_w(CARD), ref=orig)
+print_issues(issues)
 
-open("pp_table_mod.bin", "wb").write(data)
+table.save("pp_table_mod.bin")
 
-print(f"Gefundene Stellen: {count}")
-print(f"PPT {ppt_uw_old/1e6:.1f} W -> {ppt_w} W in pp_table_mod.bin")
+print(f"PPT -> {ppt_w} W in pp_table_mod.bin")
+if any(i.level == LEVEL_ERROR for i in issues):
+    print("ACHTUNG: validate meldet Fehler (siehe oben).")
 print("\nFERTIG — *NICHT* ins Kernel-pp_table geschrieben.")
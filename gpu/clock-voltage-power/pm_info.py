@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Leser für amdgpu_pm_info (debugfs) ohne "sudo cat" pro Aufruf.
+
+Ist /sys/kernel/debug/dri/N/amdgpu_pm_info lesbar (root), bleibt der
+Deskriptor offen und wird per pread neu gelesen (SysfsSampler) – damit
+sind 10+ Hz möglich. Sonst wird wie bisher einmal "sudo cat" aufgerufen.
+
+Der Inhalt wird in einem Durchgang mit vorkompilierten Mustern zerlegt:
+
+    GFX Clocks and Power:
+            1000 MHz (MCLK)
+            2615 MHz (SCLK)
+            1150 mV (VDDGFX)
+            212.00 W (average SoC)
+
+    GPU Temperature: 65 C
+    GPU Load: 99 %
+    MEM Load: 42 %
+
+Alle "<Wert> <Einheit> (<Name>)"-Zeilen landen in PmInfo.values, die
+bekannten zusätzlich in eigenen Feldern; jede Leistungszeile (average
+SoC, current SoC, average GFX, ...) steht in PmInfo.rails. Die
+Lüfterdrehzahl kommt aus hwmon (fan1_input), pm_info selbst enthält sie
+nicht.
+
+    ./pm_info.py                       # einmal, alle Felder
+    ./pm_info.py --raw                 # Rohtext
+    ./pm_info.py --watch --rate 10     # eine Zeile pro Sample
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from sysfs_sampler import SysfsSampler  # noqa: E402
+
+from smu_edit import find_amd_card, find_hwmon  # noqa: E402
+
+DEBUGFS_DRI = "/sys/kernel/debug/dri"
+DRM_BASE = "/sys/class/drm"
+DEFAULT_RATE_HZ = 10.0
+
+# "	1150 mV (VDDGFX)", "	212.00 W (average SoC)"
+_VALUE_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(MHz|mV|W|%|RPM|C)\s*\(([^)]+)\)\s*$")
+# "GPU Load: 99 %", "UVD: Disabled", "	Graphics Medium Grain Clock Gating: On"
+_KEY_RE = re.compile(r"^(\s*)([^:]+?):\s*(.*?)\s*$")
+_NUMBER_RE = re.compile(r"^(-?\d+(?:\.\d+)?)\s*(C|%|RPM)?$")
+
+
+class PmInfo(NamedTuple):
+    sclk_mhz: Optional[int]
+    mclk_mhz: Optional[int]
+    pstate_sclk_mhz: Optional[int]
+    pstate_mclk_mhz: Optional[int]
+    vddgfx_mv: Optional[int]
+    vddnb_mv: Optional[int]  # nur APUs
+    power_avg_w: Optional[float]  # "average SoC"/"average GPU"
+    power_input_w: Optional[float]  # "current SoC"/"current GPU" (neuere Kernel)
+    rails: Dict[str, float]  # alle Leistungszeilen, Name → W
+    temp_c: Optional[int]
+    gpu_load: Optional[int]  # %
+    mem_load: Optional[int]  # %
+    vcn_load: Optional[int]  # %
+    fan_rpm: Optional[int]
+    smc_feature_mask: Optional[int]
+    clock_gating: Dict[str, bool]
+    blocks: Dict[str, str]  # UVD/VCE/VCN → "Enabled"/"Disabled"
+    values: Dict[str, Tuple[float, str]]  # alle "(Name)"-Zeilen: Name → (Wert, Einheit)
+
+
+def _num(text: str):
+    return float(text) if "." in text else int(text)
+
+
+def parse_pm_info(text: str) -> PmInfo:
+    """Inhalt von amdgpu_pm_info → PmInfo (ein Durchgang über die Zeilen)."""
+    values: Dict[str, Tuple[float, str]] = {}
+    rails: Dict[str, float] = {}
+    gating: Dict[str, bool] = {}
+    blocks: Dict[str, str] = {}
+    keyed: Dict[str, object] = {}
+    mask = None
+    in_gating = False
+
+    value_match = _VALUE_RE.match
+    key_match = _KEY_RE.match
+    for line in text.splitlines():
+        m = value_match(line)
+        if m:
+            val, unit, name = _num(m.group(1)), m.group(2), m.group(3)
+            values[name] = (val, unit)
+            if unit == "W":
+                rails[name] = float(val)
+            continue
+        m = key_match(line)
+        if m is None:
+            continue
+        indent, key, rest = m.groups()
+        if key.startswith("Clock Gating Flags"):
+            in_gating = True
+            continue
+        if in_gating and indent:
+            gating[key] = rest == "On"
+            continue
+        in_gating = False
+        if key == "SMC Feature Mask":
+            try:
+                mask = int(rest, 16)
+            except ValueError:
+                pass
+        elif rest in ("Enabled", "Disabled"):
+            blocks[key] = rest
+        else:
+            n = _NUMBER_RE.match(rest)
+            if n:
+                keyed[key] = _num(n.group(1))
+
+    def clk(name: str) -> Optional[int]:
+        v = values.get(name)
+        return int(v[0]) if v is not None else None
+
+    def rail(prefix: str) -> Optional[float]:
+        for name, watts in rails.items():
+            if name.startswith(prefix):
+                return watts
+        return None
+
+    fan = next((int(v) for name, (v, unit) in values.items() if unit == "RPM"), None)
+    return PmInfo(
+        sclk_mhz=clk("SCLK"),
+        mclk_mhz=clk("MCLK"),
+        pstate_sclk_mhz=clk("PSTATE_SCLK"),
+        pstate_mclk_mhz=clk("PSTATE_MCLK"),
+        vddgfx_mv=clk("VDDGFX"),
+        vddnb_mv=clk("VDDNB"),
+        power_avg_w=rail("average"),
+        power_input_w=rail("current"),
+        rails=rails,
+        temp_c=keyed.get("GPU Temperature"),
+        gpu_load=keyed.get("GPU Load"),
+        mem_load=keyed.get("MEM Load"),
+        vcn_load=keyed.get("VCN Load"),
+        fan_rpm=fan,
+        smc_feature_mask=mask,
+        clock_gating=gating,
+        blocks=blocks,
+        values=values,
+    )
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def find_pm_info_path(card: str) -> str:
+    """
+    debugfs-Pfad zu einer DRM-Karte. Die Nummer unter dri/ muss nicht
+    zur cardN passen, daher wird über die PCI-Adresse in dri/N/name
+    zugeordnet; ohne Treffer (z.B. debugfs nicht lesbar) gilt N = cardN.
+    """
+    pci = os.path.basename(os.path.realpath(os.path.join(DRM_BASE, card, "device")))
+    for name_file in sorted(glob.glob(os.path.join(DEBUGFS_DRI, "*", "name"))):
+        if f"dev={pci}" in (_read(name_file) or ""):
+            return os.path.join(os.path.dirname(name_file), "amdgpu_pm_info")
+    return os.path.join(DEBUGFS_DRI, card.replace("card", ""), "amdgpu_pm_info")
+
+
+class PmInfoReader:
+    """
+    Wiederholtes Lesen von amdgpu_pm_info. direct ist True, solange der
+    Deskriptor offen gelesen werden kann; mit use_sudo=False wird nie
+    ein Subprozess gestartet.
+    """
+
+    def __init__(self, card: Optional[str] = None, path: Optional[str] = None, use_sudo: bool = True):
+        self.card = card or find_amd_card()
+        self.path = path or find_pm_info_path(self.card)
+        self.use_sudo = use_sudo
+        self.sampler = SysfsSampler(4096)
+        hwmon = find_hwmon(self.card)
+        fan = os.path.join(hwmon, "fan1_input") if hwmon else None
+        self.fan_path = fan if fan and os.path.exists(fan) else None
+        self.direct = os.access(self.path, os.R_OK)
+
+    def read_text(self) -> str:
+        """Rohtext; OSError, wenn weder direkt noch per sudo lesbar."""
+        if self.direct:
+            data = self.sampler.read_bytes(self.path)
+            if data is not None:
+                return data.decode("utf-8", "replace")
+            self.direct = False
+        if not self.use_sudo:
+            raise OSError(f"{self.path} nicht lesbar (root nötig)")
+        try:
+            return subprocess.check_output(["sudo", "cat", self.path], text=True, stderr=subprocess.PIPE)
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise OSError(f"Fehler beim Lesen von {self.path}: {e}") from e
+
+    def read(self) -> PmInfo:
+        info = parse_pm_info(self.read_text())
+        if info.fan_rpm is None and self.fan_path:
+            info = info._replace(fan_rpm=self.sampler.read_int(self.fan_path))
+        return info
+
+    def samples(self, rate_hz: float = DEFAULT_RATE_HZ, duration: Optional[float] = None) -> Iterator[Tuple[float, PmInfo]]:
+        """(Sekunden seit Start, PmInfo) mit festen Deadlines; ohne duration endlos."""
+        period = 1.0 / rate_hz
+        t0 = time.perf_counter()
+        next_t = t0
+        while duration is None or next_t - t0 < duration:
+            yield time.perf_counter() - t0, self.read()
+            next_t += period
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_t = time.perf_counter()
+
+    def close(self) -> None:
+        self.sampler.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def format_line(info: PmInfo) -> str:
+    parts = []
+    if info.sclk_mhz is not None:
+        parts.append(f"sclk {info.sclk_mhz:4d} MHz")
+    if info.mclk_mhz is not None:
+        parts.append(f"mclk {info.mclk_mhz:4d} MHz")
+    if info.vddgfx_mv is not None:
+        parts.append(f"{info.vddgfx_mv:4d} mV")
+    for name, watts in info.rails.items():
+        parts.append(f"{watts:6.2f} W ({name})")
+    if info.temp_c is not None:
+        parts.append(f"{info.temp_c} °C")
+    if info.gpu_load is not None:
+        parts.append(f"GPU {info.gpu_load:3d} %")
+    if info.mem_load is not None:
+        parts.append(f"MEM {info.mem_load:3d} %")
+    if info.fan_rpm is not None:
+        parts.append(f"Lüfter {info.fan_rpm} rpm")
+    return "  ".join(parts)
+
+
+def print_info(info: PmInfo) -> None:
+    rows = [
+        ("SCLK", info.sclk_mhz, "MHz"),
+        ("MCLK", info.mclk_mhz, "MHz"),
+        ("PSTATE_SCLK", info.pstate_sclk_mhz, "MHz"),
+        ("PSTATE_MCLK", info.pstate_mclk_mhz, "MHz"),
+        ("VDDGFX", info.vddgfx_mv, "mV"),
+        ("VDDNB", info.vddnb_mv, "mV"),
+        ("GPU Temp", info.temp_c, "°C"),
+        ("GPU Load", info.gpu_load, "%"),
+        ("MEM Load", info.mem_load, "%"),
+        ("VCN Load", info.vcn_load, "%"),
+        ("Lüfter", info.fan_rpm, "rpm"),
+    ]
+    for label, val, unit in rows:
+        if val is not None:
+            print(f"  {label + ':':<15}{val} {unit}")
+    for name, watts in info.rails.items():
+        print(f"  {'Leistung:':<15}{watts:.2f} W ({name})")
+    for name, state in info.blocks.items():
+        print(f"  {name + ':':<15}{state}")
+    if info.smc_feature_mask is not None:
+        print(f"  {'SMC-Features:':<15}0x{info.smc_feature_mask:016x}")
+    if info.clock_gating:
+        on = sum(info.clock_gating.values())
+        print(f"  {'Clock Gating:':<15}{on}/{len(info.clock_gating)} aktiv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="amdgpu_pm_info (debugfs) lesen und zerlegen.")
+    parser.add_argument("--card", help="DRM-Karte, z.B. card1 (Standard: erste AMD-Karte)")
+    parser.add_argument("--path", help="Pfad zu amdgpu_pm_info (Standard: über die PCI-Adresse)")
+    parser.add_argument("--raw", action="store_true", help="Rohtext ausgeben")
+    parser.add_argument("--json", action="store_true", help="Felder als JSON ausgeben")
+    parser.add_argument("--watch", action="store_true", help="wiederholt lesen, eine Zeile pro Sample")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_HZ,
+                        help=f"Samples/s für --watch (Standard {DEFAULT_RATE_HZ:g})")
+    parser.add_argument("--duration", type=float, help="Dauer für --watch in s (Standard: bis Ctrl+C)")
+    parser.add_argument("--no-sudo", action="store_true", help="nie sudo aufrufen (nur direktes Lesen)")
+    args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate muss > 0 sein")
+
+    with PmInfoReader(args.card, args.path, use_sudo=not args.no_sudo) as reader:
+        if args.watch and not reader.direct:
+            print(f"{reader.path} ist nicht direkt lesbar – für --watch als root starten.", file=sys.stderr)
+            sys.exit(1)
+        try:
+            if args.watch:
+                for t, info in reader.samples(args.rate, args.duration):
+                    if args.json:
+                        print(json.dumps(dict(info._asdict(), t=round(t, 3))), flush=True)
+                    else:
+                        print(f"{t:8.2f}  {format_line(info)}", flush=True)
+            elif args.raw:
+                print(reader.read_text(), end="")
+            else:
+                info = reader.read()
+                if args.json:
+                    print(json.dumps(info._asdict(), indent=2))
+                else:
+                    print(f"{reader.path}:")
+                    print_info(info)
+        except OSError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
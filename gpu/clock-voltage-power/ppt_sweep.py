@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Effizienzkurve: power1_cap schrittweise zwischen power1_cap_min und
+power1_cap_max verstellen und pro Schritt Leistung, Takt, Last und
+Temperaturen messen (gpu_monitor, 50 Hz).
+
+Pro Schritt:
+  1. Cap schreiben
+  2. warten, bis der Zustand stabil ist: Mittelwert von Leistung und sclk
+     zweier aufeinanderfolgender Fenster weichen um höchstens --tolerance ab
+     (spätestens nach --settle-timeout, dann als "nicht stabil" markiert)
+  3. --measure Sekunden messen
+
+Last: ein externer Befehl (--cmd), der während des ganzen Sweeps läuft –
+Standard ist glmark2 ohne Fenster. Leistungsmaß ist dann der effektive
+Takt (sclk-Mittel × Auslastung), also MHz pro W. Mit --score-regex wird
+der Befehl stattdessen pro Schritt einmal komplett ausgeführt und die
+Punktzahl aus seiner Ausgabe genommen (Punkte pro W).
+
+Die ursprünglichen Caps (alle power*_cap der Karte) werden immer
+zurückgeschrieben – auch bei Ctrl+C, SIGTERM oder Fehlern. Braucht root.
+
+    sudo ./ppt_sweep.py                               # cap_min..cap_max, 10 W Schritte
+    sudo ./ppt_sweep.py --min 150 --max 210 --step 5 --csv sweep.csv
+    sudo ./ppt_sweep.py --cmd "vkmark --run-forever"
+    sudo ./ppt_sweep.py --cmd "glmark2 --off-screen -b build" --score-regex "Score: (\\d+)"
+"""
+import argparse
+import atexit
+import csv
+import glob
+import os
+import re
+import shlex
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_HERE, ".."))
+from gpu_monitor import MAX_RATE_HZ, GpuMonitor, GpuPaths, WindowStats, classify, discover  # noqa: E402
+
+DEFAULT_CMD = "glmark2 --off-screen --run-forever"
+DEFAULT_STEP_W = 10.0
+DEFAULT_WINDOW_S = 2.0
+DEFAULT_TOLERANCE = 0.02
+DEFAULT_SETTLE_MIN_S = 3.0
+DEFAULT_SETTLE_TIMEOUT_S = 30.0
+DEFAULT_MEASURE_S = 5.0
+CAP_MIN_FALLBACK = 0.5  # manche Karten melden power1_cap_min 0: dann 50 % von power1_cap_default
+
+CSV_FIELDS = ("cap_w", "steady", "settle_s", "power_w", "sclk_mhz", "busy_pct", "eff_mhz",
+              "perf", "perf_per_w", "edge_c", "hotspot_max_c", "vram_c", "throttle")
+
+
+class PowerCaps:
+    """
+    power*_cap der Karte: merkt sich beim Anlegen alle Werte und schreibt
+    sie bei restore() zurück (idempotent, auch aus atexit/Signalhandlern).
+    """
+
+    def __init__(self, hwmon: str):
+        self.hwmon = hwmon
+        self.path = os.path.join(hwmon, "power1_cap")
+        self.original: Dict[str, int] = {}
+        for path in sorted(glob.glob(os.path.join(hwmon, "power*_cap"))):
+            val = _read_int(path)
+            if val is not None:
+                self.original[path] = val
+        if self.path not in self.original:
+            raise OSError(f"{self.path} nicht lesbar")
+        self.min_uw = _read_int(self.path + "_min") or 0
+        self.max_uw = _read_int(self.path + "_max") or self.original[self.path]
+        self.default_uw = _read_int(self.path + "_default") or self.original[self.path]
+        self._dirty = False
+
+    def set_w(self, watts: float) -> None:
+        uw = int(round(watts * 1e6))
+        if not self.min_uw <= uw <= self.max_uw:
+            raise ValueError(f"{watts:.1f} W außerhalb [{self.min_uw / 1e6:.1f}, {self.max_uw / 1e6:.1f}] W")
+        self._dirty = True
+        _write_int(self.path, uw)
+
+    def restore(self) -> None:
+        if not self._dirty:
+            return
+        for path, val in self.original.items():
+            try:
+                _write_int(path, val)
+            except OSError as e:
+                print(f"WARNUNG: {path} nicht zurückgesetzt ({e}), Sollwert {val}", file=sys.stderr)
+        self._dirty = False
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_int(path: str, value: int) -> None:
+    with open(path, "w") as f:
+        f.write(f"{value}\n")
+
+
+def _raise_exit(signum, _frame):
+    raise SystemExit(128 + signum)
+
+
+class Step(NamedTuple):
+    cap_w: float
+    steady: bool
+    settle_s: float
+    power_w: Optional[float]
+    sclk_mhz: Optional[float]
+    busy_pct: Optional[float]
+    eff_mhz: Optional[float]  # sclk-Mittel × Auslastung
+    perf: Optional[float]  # eff_mhz oder Punktzahl (--score-regex)
+    perf_per_w: Optional[float]
+    edge_c: Optional[float]
+    hotspot_max_c: Optional[float]
+    vram_c: Optional[float]
+    throttle: str
+
+
+def cap_steps(lo_w: float, hi_w: float, step_w: float) -> List[float]:
+    if step_w <= 0:
+        raise ValueError("--step muss > 0 sein")
+    if lo_w > hi_w:
+        raise ValueError(f"--min {lo_w:g} W > --max {hi_w:g} W")
+    steps = []
+    w = lo_w
+    while w < hi_w - 1e-9:
+        steps.append(round(w, 3))
+        w += step_w
+    steps.append(hi_w)
+    return steps
+
+
+def _rel(a: float, b: float) -> float:
+    return abs(a - b) / max(abs(b), 1e-9)
+
+
+def wait_steady(mon: GpuMonitor, window_s: float, tolerance: float, min_s: float, timeout_s: float,
+                check=None) -> Tuple[bool, float]:
+    """
+    Wartet, bis Leistung und sclk zweier Fenster (Abstand window_s / 2)
+    innerhalb der Toleranz liegen. Gibt (stabil, Wartezeit) zurück.
+    """
+    t0 = time.monotonic()
+    prev: Optional[WindowStats] = None
+    while True:
+        time.sleep(window_s / 2)
+        if check is not None:
+            check()
+        elapsed = time.monotonic() - t0
+        ws = mon.window(window_s)
+        if (elapsed >= max(min_s, window_s) and prev is not None
+                and ws.power and prev.power and ws.sclk and prev.sclk
+                and _rel(ws.power.mean, prev.power.mean) <= tolerance
+                and _rel(ws.sclk.mean, prev.sclk.mean) <= tolerance):
+            return True, elapsed
+        if elapsed >= timeout_s:
+            return False, elapsed
+        prev = ws
+
+
+def make_step(cap_w: float, steady: bool, settle_s: float, ws: WindowStats,
+              score: Optional[float] = None) -> Step:
+    power = ws.power.mean if ws.power else None
+    sclk = ws.sclk.mean if ws.sclk else None
+    busy = ws.busy.mean if ws.busy else None
+    eff = sclk * busy / 100.0 if sclk is not None and busy is not None else sclk
+    perf = score if score is not None else eff
+    return Step(
+        cap_w=cap_w,
+        steady=steady,
+        settle_s=settle_s,
+        power_w=power,
+        sclk_mhz=sclk,
+        busy_pct=busy,
+        eff_mhz=eff,
+        perf=perf,
+        perf_per_w=perf / power if perf is not None and power else None,
+        edge_c=ws.edge.mean if ws.edge else None,
+        hotspot_max_c=ws.hotspot.max if ws.hotspot else None,
+        vram_c=ws.vram.mean if ws.vram else None,
+        throttle=classify(ws).state,
+    )
+
+
+class Workload:
+    """Externer Lastbefehl, läuft während des ganzen Sweeps (eigene Prozessgruppe)."""
+
+    def __init__(self, cmd: List[str], log_path: Optional[str] = None):
+        self.cmd = cmd
+        self.log = open(log_path or os.devnull, "wb")
+        self.proc: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        self.proc = subprocess.Popen(self.cmd, stdout=self.log, stderr=subprocess.STDOUT,
+                                     stdin=subprocess.DEVNULL, start_new_session=True)
+
+    def check(self) -> None:
+        if self.proc is not None and self.proc.poll() is not None:
+            raise RuntimeError(f"Lastbefehl beendet (Exit {self.proc.returncode}): {shlex.join(self.cmd)}")
+
+    def stop(self) -> None:
+        if self.proc is not None and self.proc.poll() is None:
+            os.killpg(self.proc.pid, signal.SIGTERM)
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.proc.pid, signal.SIGKILL)
+                self.proc.wait()
+        self.proc = None
+        self.log.close()
+
+
+def run_scored(cmd: List[str], pattern: "re.Pattern[str]") -> Tuple[float, float]:
+    """Befehl einmal ausführen; (Punktzahl, Laufzeit in s)."""
+    t0 = time.monotonic()
+    res = subprocess.run(cmd, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    elapsed = time.monotonic() - t0
+    m = pattern.search(res.stdout + res.stderr)
+    if res.returncode != 0 or m is None:
+        raise RuntimeError(f"keine Punktzahl (Exit {res.returncode}, Muster {pattern.pattern!r})")
+    return float(m.group(1)), elapsed
+
+
+def sweep(paths: GpuPaths, caps: PowerCaps, watts: List[float], args, on_step=None) -> List[Step]:
+    results: List[Step] = []
+    pattern = re.compile(args.score_regex) if args.score_regex else None
+    cmd = shlex.split(args.cmd)
+    workload = None if pattern is not None else Workload(cmd, args.workload_log)
+    mon = GpuMonitor(paths, rate_hz=MAX_RATE_HZ)
+    try:
+        mon.start()
+        if workload is not None:
+            workload.start()
+        for cap_w in watts:
+            caps.set_w(cap_w)
+            if pattern is None:
+                steady, settle = wait_steady(mon, args.window, args.tolerance, args.settle_min,
+                                             args.settle_timeout, workload.check)
+                time.sleep(args.measure)
+                workload.check()
+                step = make_step(cap_w, steady, settle, mon.window(args.measure))
+            else:
+                time.sleep(args.settle_min)
+                score, elapsed = run_scored(cmd, pattern)
+                step = make_step(cap_w, True, 0.0, mon.window(elapsed), score)
+            results.append(step)
+            if on_step is not None:
+                on_step(step)
+    finally:
+        if workload is not None:
+            workload.stop()
+        mon.stop()
+        caps.restore()
+    return results
+
+
+def _f(val: Optional[float], digits: int = 1) -> str:
+    return "-" if val is None else f"{val:.{digits}f}"
+
+
+HEADER = f"{'Cap W':>6} {'Leist. W':>8} {'sclk':>6} {'Last %':>6} {'Perf':>8} {'Perf/W':>7} {'Hotspot':>7}  Status"
+
+
+def format_step(s: Step) -> str:
+    status = s.throttle if s.steady else f"{s.throttle}, nicht stabil nach {s.settle_s:.0f} s"
+    return (f"{s.cap_w:>6.0f} {_f(s.power_w):>8} {_f(s.sclk_mhz, 0):>6} {_f(s.busy_pct, 0):>6} "
+            f"{_f(s.perf, 0):>8} {_f(s.perf_per_w, 2):>7} {_f(s.hotspot_max_c):>7}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="power1_cap-Sweep: Leistung pro Watt je Power-Limit (schreibt power1_cap, braucht root)."
+    )
+    parser.add_argument("--card", help="z.B. card1 (Standard: erste AMD-Karte)")
+    parser.add_argument("--min", type=float, help="kleinste Cap in W (Standard: power1_cap_min)")
+    parser.add_argument("--max", type=float, help="größte Cap in W (Standard: power1_cap_max)")
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP_W, help="Schrittweite in W (Standard: 10)")
+    parser.add_argument("--cmd", default=DEFAULT_CMD, help=f"Lastbefehl (Standard: {DEFAULT_CMD})")
+    parser.add_argument("--score-regex",
+                        help="Befehl pro Schritt einmal ausführen, Punktzahl = erste Gruppe dieses Musters")
+    parser.add_argument("--workload-log", help="Ausgabe des Lastbefehls hierhin (Standard: verwerfen)")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW_S,
+                        help="Fenster für die Stabilitätsprüfung in s (Standard: 2)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE * 100,
+                        help="erlaubte Abweichung zwischen zwei Fenstern in %% (Standard: 2)")
+    parser.add_argument("--settle-min", type=float, default=DEFAULT_SETTLE_MIN_S,
+                        help="Mindestwartezeit nach dem Cap-Wechsel in s (Standard: 3)")
+    parser.add_argument("--settle-timeout", type=float, default=DEFAULT_SETTLE_TIMEOUT_S,
+                        help="höchstens so lange auf Stabilität warten in s (Standard: 30)")
+    parser.add_argument("--measure", type=float, default=DEFAULT_MEASURE_S,
+                        help="Messdauer pro Schritt in s (Standard: 5, max. 60)")
+    parser.add_argument("--csv", metavar="FILE", help="Ergebnis zusätzlich als CSV")
+    args = parser.parse_args()
+    args.tolerance /= 100.0
+    if not 0 < args.measure <= 60 or args.window <= 0:
+        parser.error("--measure muss in (0, 60] liegen, --window > 0")
+
+    paths = discover(args.card)
+    if paths.hwmon is None:
+        print(f"Konnte hwmon für {paths.card} nicht finden.")
+        sys.exit(1)
+    try:
+        caps = PowerCaps(paths.hwmon)
+    except OSError as e:
+        print(e)
+        sys.exit(1)
+    if not os.access(caps.path, os.W_OK):
+        print(f"{caps.path} ist nicht schreibbar – als root starten.")
+        sys.exit(1)
+
+    lo_uw = caps.min_uw or int(caps.default_uw * CAP_MIN_FALLBACK)
+    try:
+        watts = cap_steps(args.min if args.min is not None else lo_uw / 1e6,
+                          args.max if args.max is not None else caps.max_uw / 1e6, args.step)
+        for w in (watts[0], watts[-1]):
+            if not caps.min_uw <= w * 1e6 <= caps.max_uw:
+                raise ValueError(f"{w:g} W außerhalb [{caps.min_uw / 1e6:.1f}, {caps.max_uw / 1e6:.1f}] W")
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Caps auch bei SIGTERM/SIGHUP und unerwartetem Ende zurückschreiben
+    atexit.register(caps.restore)
+    for sig in (signal.SIGTERM, signal.SIGHUP):
+        signal.signal(sig, _raise_exit)
+
+    print(f"Karte {paths.card}, Cap bisher {caps.original[caps.path] / 1e6:.1f} W, "
+          f"{len(watts)} Schritte {watts[0]:g}–{watts[-1]:g} W")
+    print(f"Last: {args.cmd}" + (f" (Punktzahl: {args.score_regex})" if args.score_regex else ""))
+    # CSV zeilenweise, damit bei Abbruch die schon gemessenen Schritte bleiben
+    csv_file = writer = None
+    if args.csv:
+        try:
+            csv_file = open(args.csv, "w", newline="")
+        except OSError as e:
+            print(f"Fehler: {e}")
+            sys.exit(1)
+        writer = csv.writer(csv_file, lineterminator="\n")
+        writer.writerow(CSV_FIELDS)
+
+    def on_step(step: Step) -> None:
+        print(format_step(step), flush=True)
+        if writer is not None:
+            writer.writerow(["" if v is None else (f"{v:.3f}" if isinstance(v, float) else v) for v in step])
+            csv_file.flush()
+
+    print(HEADER)
+    try:
+        results = sweep(paths, caps, watts, args, on_step=on_step)
+    except KeyboardInterrupt:
+        print("\nabgebrochen")
+        sys.exit(130)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Fehler: {e}")
+        sys.exit(1)
+    finally:
+        print(f"Caps zurückgesetzt: {', '.join(f'{os.path.basename(p)}={v / 1e6:.1f} W' for p, v in caps.original.items())}")
+        if csv_file is not None:
+            csv_file.close()
+            print(f"CSV: {args.csv}")
+
+    rated = [s for s in results if s.perf_per_w is not None]
+    if rated:
+        best = max(rated, key=lambda s: s.perf_per_w)
+        print(f"Beste Effizienz: {best.cap_w:g} W Cap ({_f(best.perf_per_w, 2)} pro W, "
+              f"{_f(best.power_w)} W gemessen)")
+
+
+if __name__ == "__main__":
+    main()
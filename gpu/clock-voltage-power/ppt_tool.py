@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+PowerPlay-Tabellen vergleichen, prüfen und im Stapel patchen (auf Basis von
+pptable.py).
+
+diff      Feld-für-Feld-Vergleich mit Namen. Binär gegen binär in einem
+          Durchlauf über die Bytes (NumPy, falls installiert, sonst ein XOR
+          über die ganze Tabelle als große Ganzzahl); nur geänderte Offsets
+          werden den Feldern zugeordnet. Text (dump/upp) geht auch.
+validate  Sicherheitsgrenzen: PPT gegen power1_cap_max der Karte, Takte
+          gegen die Overdrive-Grenzen, Spannungen, Temperaturen, optional
+          maximale Erhöhung gegenüber einer Referenztabelle.
+apply     Patch-Datei auf beliebig viele Tabellen anwenden.
+
+Patch-Datei (eine Anweisung pro Zeile, # leitet Kommentare ein):
+
+    # nur Karten mit dieser Tabelle anfassen
+    golden_pp_id == 2511
+    smc_pptable/SocketPowerLimitAc/0 = 230
+    smc_pptable/SocketPowerLimitDc/0 = 230
+    smc_pptable/FreqTableGfx/* == 2725       (Platzhalter wie bei fnmatch)
+
+"=" setzt, "==" verlangt den Wert (sonst wird die Tabelle übersprungen).
+
+    ./ppt_tool.py diff pp_table_original.bin pp_table_mod.bin
+    ./ppt_tool.py diff pp_decoded.txt.bak pp_decoded.txt
+    ./ppt_tool.py validate pp_table_mod.bin --ref pp_table_original.bin
+    ./ppt_tool.py apply profil.ppt tables/*.bin -o out/ --validate
+"""
+import argparse
+import bisect
+import fnmatch
+import os
+import re
+import sys
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from pptable import NAVI2X_LAYOUT, Layout, Leaf, PPTable, Value, format_value, parse_text, parse_value
+
+try:
+    import numpy as np
+except ImportError:  # optional
+    np = None
+
+LEVEL_ERROR = "FEHLER"
+LEVEL_WARN = "WARNUNG"
+
+# Grenzen der Referenzkarte (Navi21, Stock-Tabelle): 1200 mV GFX, 1150 mV SoC
+VGFX_MAX_MV = 1200
+VSOC_MAX_MV = 1150
+VOLTAGE_SCALE = 4  # MinVoltage*/MaxVoltage* in PPTable_t: mV * 4 (SVI2-Schritte)
+
+OD_GFXCLKFMAX = 0
+OD_UCLKFMAX = 7
+
+# Felder, die gegenüber --ref höchstens um --max-increase steigen dürfen
+LIMIT_PATTERNS = (
+    "smc_pptable/SocketPowerLimit*",
+    "smc_pptable/TdcLimit/*",
+    "smc_pptable/MaxVoltage*",
+    "smc_pptable/FreqTable*",
+    "smc_pptable/DcModeMaxFreq/*",
+    "smc_pptable/TemperatureLimit/*",
+    "overdrive_table/max/*",
+    "software_shutdown_temp",
+)
+
+
+# --- diff ---
+
+
+class Change(NamedTuple):
+    path: str
+    old: str
+    new: str
+    label: str = ""
+
+
+def changed_offsets(a: bytes, b: bytes) -> List[int]:
+    """Byte-Offsets, an denen a und b sich unterscheiden (gleiche Länge)."""
+    if np is not None:
+        diff = np.frombuffer(a, dtype=np.uint8) != np.frombuffer(b, dtype=np.uint8)
+        return np.flatnonzero(diff).tolist()
+    x = int.from_bytes(a, "little") ^ int.from_bytes(b, "little")
+    out = []
+    while x:
+        bit = (x & -x).bit_length() - 1
+        byte = bit >> 3
+        out.append(byte)
+        x &= ~(0xFF << (byte << 3))
+    return out
+
+
+def changed_leaves(layout: Layout, offsets: Sequence[int]) -> List[Leaf]:
+    """Offsets → betroffene Felder (jedes Feld einmal, in Tabellenreihenfolge)."""
+    leaves: List[Leaf] = []
+    for off in offsets:
+        leaf = layout.leaves[bisect.bisect_right(layout.offsets, off) - 1]
+        if not leaves or leaves[-1] is not leaf:
+            leaves.append(leaf)
+    return leaves
+
+
+def diff_tables(a: PPTable, b: PPTable) -> List[Change]:
+    if len(a.buf) != len(b.buf):
+        raise ValueError(f"unterschiedliche Größe: {len(a.buf)} / {len(b.buf)} Byte")
+    changes = []
+    for leaf in changed_leaves(a.layout, changed_offsets(a.buf, b.buf)):
+        changes.append(Change(leaf.path, format_value(a.read(leaf), leaf.fmt).strip(),
+                              format_value(b.read(leaf), leaf.fmt).strip(), leaf.label))
+    return changes
+
+
+def diff_texts(a: str, b: str) -> List[Change]:
+    va, vb = parse_text(a), parse_text(b)
+    changes = [Change(path, old, vb.get(path, "-")) for path, old in va.items() if vb.get(path) != old]
+    changes += [Change(path, "-", new) for path, new in vb.items() if path not in va]
+    return changes
+
+
+def is_binary(path: str) -> bool:
+    with open(path, "rb") as f:
+        head = f.read(4)
+    return b"\0" in head  # Tabellen beginnen mit structuresize (u16) und format_revision, Text nie mit NUL
+
+
+def load_pair(a_path: str, b_path: str) -> List[Change]:
+    """diff für beliebige Kombination aus .bin und dump-Text."""
+    a_bin, b_bin = is_binary(a_path), is_binary(b_path)
+    if not a_bin and not b_bin:
+        with open(a_path, encoding="utf-8") as fa, open(b_path, encoding="utf-8") as fb:
+            return diff_texts(fa.read(), fb.read())
+    base = PPTable.load(a_path if a_bin else b_path)
+    if a_bin and b_bin:
+        other = PPTable.load(b_path)
+    else:
+        other = PPTable(bytes(base.buf))
+        with open(b_path if a_bin else a_path, encoding="utf-8") as f:
+            other.apply_text(f.read())
+    return diff_tables(base, other) if a_bin else diff_tables(other, base)
+
+
+def print_changes(changes: List[Change]) -> None:
+    if not changes:
+        print("  keine Unterschiede")
+        return
+    width = max(len(c.path) for c in changes)
+    for c in changes:
+        label = f"  ({c.label})" if c.label else ""
+        print(f"  {c.path:<{width}}  {c.old:>12} -> {c.new:<12}{label}")
+
+
+# --- validate ---
+
+
+class Issue(NamedTuple):
+    level: str
+    path: str
+    message: str
+
+
+def read_cap_max_w(card: Optional[str] = None) -> Optional[float]:
+    """power1_cap_max der Karte in W, None wenn nicht lesbar."""
+    from smu_edit import find_amd_card, find_hwmon, read_int
+
+    hwmon = find_hwmon(card or find_amd_card())
+    if hwmon is None:
+        return None
+    cap_max = read_int(os.path.join(hwmon, "power1_cap_max"))
+    return cap_max / 1e6 if cap_max else None
+
+
+def _matches(path: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatchcase(path, p) for p in patterns)
+
+
+def validate(table: PPTable, cap_max_w: Optional[float] = None, ref: Optional[PPTable] = None,
+             max_increase: float = 0.25, vgfx_max_mv: float = VGFX_MAX_MV,
+             vsoc_max_mv: float = VSOC_MAX_MV) -> List[Issue]:
+    issues: List[Issue] = []
+    get = table.get
+
+    def err(path, msg):
+        issues.append(Issue(LEVEL_ERROR, path, msg))
+
+    def warn(path, msg):
+        issues.append(Issue(LEVEL_WARN, path, msg))
+
+    # Leistung
+    for name in ("SocketPowerLimitAc", "SocketPowerLimitDc"):
+        path = f"smc_pptable/{name}/0"
+        ppt = get(path)
+        if ppt == 0:
+            err(path, "PPT ist 0")
+        elif cap_max_w is None:
+            warn(path, f"{ppt} W, power1_cap_max unbekannt (--cap-max)")
+        elif ppt > cap_max_w:
+            err(path, f"{ppt} W > power1_cap_max {cap_max_w:.1f} W")
+
+    # Takte gegen die Overdrive-Grenzen
+    gfx_max = get(f"overdrive_table/max/{OD_GFXCLKFMAX}")
+    uclk_max = get(f"overdrive_table/max/{OD_UCLKFMAX}")
+    for leaf in table.layout.leaves:
+        if leaf.path.startswith("smc_pptable/FreqTableGfx/") or leaf.path == "smc_pptable/DcModeMaxFreq/0":
+            v = table.read(leaf)
+            if v > gfx_max:
+                err(leaf.path, f"{v} MHz > GFXCLKFMAX {gfx_max} MHz")
+        elif leaf.path.startswith("smc_pptable/FreqTableUclk/"):
+            v = table.read(leaf)
+            if v > uclk_max:
+                err(leaf.path, f"{v} MHz > UCLKFMAX {uclk_max} MHz")
+    for i in range(min(get("overdrive_table/setting_count"), 64)):
+        lo, hi = get(f"overdrive_table/min/{i}"), get(f"overdrive_table/max/{i}")
+        if lo > hi:
+            leaf = table.layout.resolve(f"overdrive_table/min/{i}")
+            err(leaf.path, f"min {lo} > max {hi} ({leaf.label or i})")
+
+    # Spannungen
+    for dom, limit in (("Gfx", vgfx_max_mv), ("Soc", vsoc_max_mv)):
+        vmax, vmin = get(f"smc_pptable/MaxVoltage{dom}"), get(f"smc_pptable/MinVoltage{dom}")
+        if vmax / VOLTAGE_SCALE > limit:
+            err(f"smc_pptable/MaxVoltage{dom}", f"{vmax / VOLTAGE_SCALE:.0f} mV > {limit:.0f} mV")
+        if vmin > vmax:
+            err(f"smc_pptable/MinVoltage{dom}", f"MinVoltage {vmin} > MaxVoltage {vmax}")
+
+    # Temperaturen
+    shutdown = get("software_shutdown_temp")
+    for i in range(10):
+        path = f"smc_pptable/TemperatureLimit/{i}"
+        t = get(path)
+        if t > shutdown:
+            err(path, f"{t} °C > software_shutdown_temp {shutdown} °C")
+
+    # Erhöhung gegenüber der Referenz
+    if ref is not None:
+        for c in diff_tables(ref, table):
+            if not _matches(c.path, LIMIT_PATTERNS):
+                continue
+            old, new = float(c.old), float(c.new)
+            if old > 0 and new > old * (1 + max_increase):
+                err(c.path, f"{c.old} -> {c.new}: mehr als +{max_increase * 100:.0f} % gegenüber Referenz")
+            elif new > old:
+                warn(c.path, f"{c.old} -> {c.new} (erhöht)")
+    return issues
+
+
+def print_issues(issues: List[Issue]) -> None:
+    if not issues:
+        print("  OK")
+    for issue in issues:
+        print(f"  {issue.level:<8} {issue.path}: {issue.message}")
+
+
+# --- apply ---
+
+
+class PatchOp(NamedTuple):
+    op: str  # "=" setzen, "==" verlangen
+    pattern: str
+    value: str
+    lineno: int
+
+
+_PATCH_RE = re.compile(r"^(\S+)\s*(==|=)\s*(\S+)$")
+
+
+def parse_patch(text: str) -> List[PatchOp]:
+    ops = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        m = _PATCH_RE.match(line)
+        if m is None:
+            raise ValueError(f"Zeile {lineno}: erwartet 'PFAD = WERT' oder 'PFAD == WERT': {line!r}")
+        ops.append(PatchOp(m.group(2), m.group(1).strip("/"), m.group(3), lineno))
+    return ops
+
+
+class Patch:
+    """Patch-Datei, einmal gegen das Layout aufgelöst: [(op, Leaf, Wert)]."""
+
+    def __init__(self, ops: List[PatchOp], layout: Layout = NAVI2X_LAYOUT):
+        self.steps: List[Tuple[str, Leaf, Value]] = []
+        for op in ops:
+            if any(ch in op.pattern for ch in "*?["):
+                leaves = [leaf for leaf in layout.leaves if fnmatch.fnmatchcase(leaf.path, op.pattern)]
+            else:
+                leaves = [layout.resolve(op.pattern)]
+            if not leaves:
+                raise ValueError(f"Zeile {op.lineno}: kein Feld passt zu {op.pattern}")
+            for leaf in leaves:
+                try:
+                    value = parse_value(op.value, leaf.fmt)
+                except ValueError:
+                    raise ValueError(f"Zeile {op.lineno}: {op.value!r} ist kein Wert für {leaf.path}") from None
+                self.steps.append((op.op, leaf, value))
+
+    @classmethod
+    def load(cls, path: str) -> "Patch":
+        with open(path, encoding="utf-8") as f:
+            return cls(parse_patch(f.read()))
+
+    def apply(self, table: PPTable) -> List[Tuple[str, Value, Value]]:
+        """Erst alle "=="-Bedingungen prüfen, dann setzen. ValueError, wenn eine nicht passt."""
+        for op, leaf, value in self.steps:
+            if op == "==" and table.read(leaf) != value:
+                raise ValueError(f"{leaf.path} ist {table.read(leaf)}, verlangt {value}")
+        changes = []
+        for op, leaf, value in self.steps:
+            if op == "=":
+                old = table.read(leaf)
+                table.write(leaf, value)
+                if old != table.read(leaf):
+                    changes.append((leaf.path, old, table.read(leaf)))
+        return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PowerPlay-Tabellen vergleichen, prüfen und patchen.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("diff", help="Tabellen Feld für Feld vergleichen (.bin oder dump-Text)")
+    p.add_argument("base")
+    p.add_argument("others", nargs="+")
+
+    limits = argparse.ArgumentParser(add_help=False)
+    limits.add_argument("--cap-max", type=float, help="power1_cap_max in W (Standard: von der Karte lesen)")
+    limits.add_argument("--card", help="Karte für power1_cap_max (Standard: erste AMD-Karte)")
+    limits.add_argument("--ref", help="Referenztabelle (.bin) für die maximale Erhöhung")
+    limits.add_argument("--max-increase", type=float, default=25.0,
+                        help="maximale Erhöhung gegenüber --ref in %% (Standard: 25)")
+    limits.add_argument("--vgfx-max", type=float, default=VGFX_MAX_MV, help="max. GFX-Spannung in mV")
+    limits.add_argument("--vsoc-max", type=float, default=VSOC_MAX_MV, help="max. SoC-Spannung in mV")
+
+    p = sub.add_parser("validate", parents=[limits], help="Tabellen gegen Sicherheitsgrenzen prüfen")
+    p.add_argument("tables", nargs="+")
+
+    p = sub.add_parser("apply", parents=[limits], help="Patch-Datei auf mehrere Tabellen anwenden")
+    p.add_argument("patch")
+    p.add_argument("tables", nargs="+")
+    out = p.add_mutually_exclusive_group(required=True)
+    out.add_argument("-o", "--out-dir", help="Ergebnisse hierhin (gleicher Dateiname)")
+    out.add_argument("--in-place", action="store_true", help="Eingabedateien überschreiben")
+    p.add_argument("--validate", action="store_true", help="nur schreiben, wenn validate keine Fehler findet")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "diff":
+            for other in args.others:
+                changes = load_pair(args.base, other)
+                print(f"{args.base} -> {other}: {len(changes)} Feld(er)")
+                print_changes(changes)
+            return
+
+        cap_max = args.cap_max if args.cap_max is not None else read_cap_max_w(args.card)
+        ref = PPTable.load(args.ref) if args.ref else None
+        check = dict(cap_max_w=cap_max, ref=ref, max_increase=args.max_increase / 100.0,
+                     vgfx_max_mv=args.vgfx_max, vsoc_max_mv=args.vsoc_max)
+
+        if args.command == "validate":
+            failed = 0
+            for path in args.tables:
+                issues = validate(PPTable.load(path), **check)
+                print(path)
+                print_issues(issues)
+                failed += any(i.level == LEVEL_ERROR for i in issues)
+            sys.exit(1 if failed else 0)
+
+        patch = Patch.load(args.patch)
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+        t0 = time.perf_counter()
+        written = skipped = 0
+        for path in args.tables:
+            try:
+                table = PPTable.load(path)
+                changes = patch.apply(table)
+            except (OSError, ValueError) as e:
+                print(f"{path}: übersprungen – {e}")
+                skipped += 1
+                continue
+            if args.validate:
+                errors = [i for i in validate(table, **check) if i.level == LEVEL_ERROR]
+                if errors:
+                    print(f"{path}: übersprungen – {len(errors)} Fehler:")
+                    print_issues(errors)
+                    skipped += 1
+                    continue
+            target = path if args.in_place else os.path.join(args.out_dir, os.path.basename(path))
+            table.save(target)
+            written += 1
+            print(f"{path} -> {target}: {len(changes)} Feld(er) geändert")
+        ms = (time.perf_counter() - t0) * 1000
+        print(f"{written} geschrieben, {skipped} übersprungen in {ms:.1f} ms")
+        sys.exit(1 if skipped else 0)
+    except (OSError, KeyError, ValueError) as e:
+        print(e.args[0] if isinstance(e, KeyError) else e, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+PowerPlay-Tabelle (pp_table) für Navi2x (SMU 11.0.7, Sienna Cichlid –
+RX 6800/6900) lesen, ändern und schreiben – ohne upp.
+
+Das Layout steht hier als Schema (smu_11_0_7_powerplay_table inkl.
+PPTable_t aus dem Kernel). Daraus wird einmal eine flache Liste aller
+Felder mit Offset und struct-Format berechnet; gelesen und geschrieben wird
+direkt im Puffer (struct.unpack_from/pack_into auf einem memoryview), es
+wird nichts kopiert oder neu aufgebaut. Was nicht geändert wird, bleibt
+Byte für Byte gleich.
+
+Pfade wie bei upp, Array-Index als eigenes Segment oder angehängt:
+
+    smc_pptable/SocketPowerLimitAc/0     (= smc_pptable/SocketPowerLimitAc0)
+    overdrive_table/max/8
+    smc_pptable/DpmDescriptor/0/SsCurve/a
+
+Der Text von "dump" entspricht dem von "upp dump" (pp_decoded.txt), "undump"
+übernimmt geänderte Werte aus so einem Text.
+
+    ./pptable.py dump pp_table_original.bin > pp_decoded.txt
+    ./pptable.py get pp_table_original.bin smc_pptable/SocketPowerLimitAc/0
+    ./pptable.py set pp_table_original.bin smc_pptable/SocketPowerLimitAc/0=230 -o pp_table_mod.bin
+    ./pptable.py undump pp_table_original.bin pp_decoded.txt -o pp_table_mod.bin
+    ./pptable.py verify pp_table_original.bin pp_decoded.txt.bak
+"""
+import argparse
+import re
+import struct
+import sys
+from typing import Dict, Iterator, List, NamedTuple, Tuple, Union
+
+
+class Field(NamedTuple):
+    name: str
+    type: object  # struct-Formatzeichen ("B", "H", "I", "b", "h", "f", ...) oder Struct
+    count: int = 0  # 0 = Skalar, sonst Array-Länge
+    labels: Tuple[str, ...] = ()  # Namen der Array-Elemente (Kommentar im Dump)
+
+
+class Struct:
+    """Gepackte C-Struktur (keine Ausrichtung, wie #pragma pack(1))."""
+
+    def __init__(self, name: str, fields: List[Field]):
+        self.name = name
+        self.fields = fields
+        self.size = sum(_size(f.type) * max(1, f.count) for f in fields)
+
+
+def _size(t) -> int:
+    return t.size if isinstance(t, Struct) else struct.calcsize("<" + t)
+
+
+def _f(fmt: str):
+    def make(name: str, count: int = 0, labels: Tuple[str, ...] = ()) -> Field:
+        return Field(name, fmt, count, labels)
+    return make
+
+
+u8, i8, u16, i16, u32, f32 = _f("B"), _f("b"), _f("H"), _f("h"), _f("I"), _f("f")
+
+
+def sub(name: str, st: Struct, count: int = 0) -> Field:
+    return Field(name, st, count)
+
+
+# --- Schema: smu_11_0_7_pptable.h / smu11_driver_if_sienna_cichlid.h ---
+
+CLOCKS = ("GFXCLK", "SOCCLK", "UCLK", "FCLK", "DCLK_0", "VCLK_0", "DCLK_1", "VCLK_1",
+          "DCEFCLK", "DISPCLK", "PIXCLK", "PHYCLK", "DTBCLK")
+OD_CAPS = ("GFXCLK_LIMITS", "GFXCLK_CURVE", "UCLK_LIMITS", "POWER_LIMIT", "FAN_ACOUSTIC_LIMIT",
+           "FAN_SPEED_MIN", "TEMPERATURE_FAN", "TEMPERATURE_SYSTEM", "MEMORY_TIMING_TUNE",
+           "FAN_ZERO_RPM_CONTROL", "AUTO_UV_ENGINE", "AUTO_OC_ENGINE", "AUTO_OC_MEMORY",
+           "FAN_CURVE", "SMU_11_0_ODCAP_AUTO_FAN_ACOUSTIC_LIMIT", "POWER_MODE")
+OD_SETTINGS = ("GFXCLKFMAX", "GFXCLKFMIN", "CUSTOM_GFX_VF_CURVE_A", "CUSTOM_GFX_VF_CURVE_B",
+               "CUSTOM_GFX_VF_CURVE_C", "CUSTOM_CURVE_VFT_FMIN", "UCLKFMIN", "UCLKFMAX",
+               "POWERPERCENTAGE", "FANRPMMIN", "FANRPMACOUSTICLIMIT", "FANTARGETTEMPERATURE",
+               "OPERATINGTEMPMAX", "ACTIMING", "FAN_ZERO_RPM_CONTROL", "AUTOUVENGINE",
+               "AUTOOCENGINE", "AUTOOCMEMORY", "FAN_CURVE_TEMPERATURE_1", "FAN_CURVE_SPEED_1",
+               "FAN_CURVE_TEMPERATURE_2", "FAN_CURVE_SPEED_2", "FAN_CURVE_TEMPERATURE_3",
+               "FAN_CURVE_SPEED_3", "FAN_CURVE_TEMPERATURE_4", "FAN_CURVE_SPEED_4",
+               "FAN_CURVE_TEMPERATURE_5", "FAN_CURVE_SPEED_5", "AUTO_FAN_ACOUSTIC_LIMIT", "POWER_MODE")
+
+PPCLK_COUNT = 13
+AVFS_VOLTAGE_COUNT = 2
+TEMP_COUNT = 10
+DROOP_POINTS = 5
+
+LINEAR = Struct("LinearInt_t", [f32("m"), f32("b")])
+QUADRATIC = Struct("QuadraticInt_t", [f32("a"), f32("b"), f32("c")])
+DROOP = Struct("DroopInt_t", [f32("a"), f32("b"), f32("c")])
+FREQ_RANGE = Struct("DpmFreqRange_t", [u16("Fmin"), u16("Fmax")])
+PIECEWISE_DROOP = Struct("PiecewiseLinearDroopInt_t", [f32("Fset", DROOP_POINTS), f32("Vdroop", DROOP_POINTS)])
+
+DPM_DESCRIPTOR = Struct("DpmDescriptor_t", [
+    u8("VoltageMode"), u8("SnapToDiscrete"), u8("NumDiscreteLevels"), u8("Padding"),
+    sub("ConversionToAvfsClk", LINEAR),
+    sub("SsCurve", QUADRATIC),
+    u16("SsFmin"), u16("Padding16"),
+])
+
+I2C_CONTROLLER = Struct("I2cControllerConfig_t", [
+    u8("Enabled"), u8("Speed"), u8("SlaveAddress"), u8("ControllerPort"),
+    u8("ControllerName"), u8("ThermalThrotter"), u8("I2cProtocol"), u8("PaddingConfig"),
+])
+
+PPTABLE_T = Struct("PPTable_t", [
+    u32("Version"),
+    u32("FeaturesToRun", 2),
+    u16("SocketPowerLimitAc", 4), u16("SocketPowerLimitAcTau", 4),
+    u16("SocketPowerLimitDc", 4), u16("SocketPowerLimitDcTau", 4),
+    u16("TdcLimit", 2), u16("TdcLimitTau", 2),
+    u16("TemperatureLimit", TEMP_COUNT),
+    u32("FitLimit"),
+    u8("TotalPowerConfig"), u8("TotalPowerPadding", 3),
+    u32("ApccPlusResidencyLimit"),
+    u16("SmnclkDpmFreq", 2), u16("SmnclkDpmVoltage", 2),
+    u32("PaddingAPCC"),
+    u16("PerPartDroopVsetGfxDfll", DROOP_POINTS), u16("PaddingPerPartDroop"),
+    u32("ThrottlerControlMask"),
+    u32("FwDStateMask"),
+    u16("UlvVoltageOffsetSoc"), u16("UlvVoltageOffsetGfx"),
+    u16("MinVoltageUlvGfx"), u16("MinVoltageUlvSoc"),
+    u16("SocLIVmin"), u16("PaddingLIVmin"),
+    u8("GceaLinkMgrIdleThreshold"), u8("paddingRlcUlvParams", 3),
+    u16("MinVoltageGfx"), u16("MinVoltageSoc"), u16("MaxVoltageGfx"), u16("MaxVoltageSoc"),
+    u16("LoadLineResistanceGfx"), u16("LoadLineResistanceSoc"),
+    u16("VDDGFX_TVmin"), u16("VDDSOC_TVmin"),
+    u16("VDDGFX_Vmin_HiTemp"), u16("VDDGFX_Vmin_LoTemp"),
+    u16("VDDSOC_Vmin_HiTemp"), u16("VDDSOC_Vmin_LoTemp"),
+    u16("VDDGFX_TVminHystersis"), u16("VDDSOC_TVminHystersis"),
+    sub("DpmDescriptor", DPM_DESCRIPTOR, PPCLK_COUNT),
+    u16("FreqTableGfx", 16), u16("FreqTableVclk", 8), u16("FreqTableDclk", 8),
+    u16("FreqTableSocclk", 8), u16("FreqTableUclk", 4), u16("FreqTableDcefclk", 8),
+    u16("FreqTableDispclk", 8), u16("FreqTablePixclk", 8), u16("FreqTablePhyclk", 8),
+    u16("FreqTableDtbclk", 8), u16("FreqTableFclk", 8),
+    u32("Paddingclks"),
+    sub("PerPartDroopModelGfxDfll", DROOP, DROOP_POINTS),
+    u32("DcModeMaxFreq", PPCLK_COUNT),
+    u8("FreqTableUclkDiv", 4),
+    u16("FclkBoostFreq"), u16("FclkParamPadding"),
+    u16("Mp0clkFreq", 2), u16("Mp0DpmVoltage", 2),
+    u16("MemVddciVoltage", 4), u16("MemMvddVoltage", 4),
+    u16("GfxclkFgfxoffEntry"), u16("GfxclkFinit"), u16("GfxclkFidle"),
+    u8("GfxclkSource"), u8("GfxclkPadding"),
+    u8("GfxGpoSubFeatureMask"), u8("GfxGpoEnabledWorkPolicyMask"),
+    u8("GfxGpoDisabledWorkPolicyMask"), u8("GfxGpoPadding", 1),
+    u32("GfxGpoVotingAllow"),
+    u32("GfxGpoPadding32", 4),
+    u16("GfxDcsFopt"), u16("GfxDcsFclkFopt"), u16("GfxDcsUclkFopt"),
+    u16("DcsGfxOffVoltage"), u16("DcsMinGfxOffTime"), u16("DcsMaxGfxOffTime"),
+    u32("DcsMinCreditAccum"),
+    u16("DcsExitHysteresis"), u16("DcsTimeout"),
+    u32("DcsParamPadding", 5),
+    u16("FlopsPerByteTable", 16),
+    u8("LowestUclkReservedForUlv"), u8("PaddingMem", 3),
+    u8("UclkDpmPstates", 4),
+    sub("UclkDpmSrcFreqRange", FREQ_RANGE), sub("UclkDpmTargFreqRange", FREQ_RANGE),
+    u16("UclkDpmMidstepFreq"), u16("UclkMidstepPadding"),
+    u8("PcieGenSpeed", 2), u8("PcieLaneCount", 2), u16("LclkFreq", 2),
+    u16("FanStopTemp"), u16("FanStartTemp"),
+    u16("FanGain", TEMP_COUNT),
+    u16("FanPwmMin"), u16("FanAcousticLimitRpm"), u16("FanThrottlingRpm"), u16("FanMaximumRpm"),
+    u16("MGpuFanBoostLimitRpm"), u16("FanTargetTemperature"), u16("FanTargetGfxclk"),
+    u16("FanPadding16"),
+    u8("FanTempInputSelect"), u8("FanPadding"), u8("FanZeroRpmEnable"), u8("FanTachEdgePerRev"),
+    i16("FuzzyFan_ErrorSetDelta"), i16("FuzzyFan_ErrorRateSetDelta"), i16("FuzzyFan_PwmSetDelta"),
+    u16("FuzzyFan_Reserved"),
+    u8("OverrideAvfsGb", AVFS_VOLTAGE_COUNT), u8("dBtcGbGfxDfllModelSelect"), u8("Padding8_Avfs"),
+    sub("qAvfsGb", QUADRATIC, AVFS_VOLTAGE_COUNT),
+    sub("dBtcGbGfxPll", DROOP), sub("dBtcGbGfxDfll", DROOP), sub("dBtcGbSoc", DROOP),
+    sub("qAgingGb", LINEAR, AVFS_VOLTAGE_COUNT),
+    sub("PiecewiseLinearDroopIntGfxDfll", PIECEWISE_DROOP),
+    sub("qStaticVoltageOffset", QUADRATIC, AVFS_VOLTAGE_COUNT),
+    u16("DcTol", AVFS_VOLTAGE_COUNT),
+    u8("DcBtcEnabled", AVFS_VOLTAGE_COUNT), u8("Padding8_GfxBtc", 2),
+    u16("DcBtcMin", AVFS_VOLTAGE_COUNT), u16("DcBtcMax", AVFS_VOLTAGE_COUNT),
+    u16("DcBtcGb", AVFS_VOLTAGE_COUNT),
+    u8("XgmiDpmPstates", 2), u8("XgmiDpmSpare", 2),
+    u32("DebugOverrides"),
+    sub("ReservedEquation0", QUADRATIC), sub("ReservedEquation1", QUADRATIC),
+    sub("ReservedEquation2", QUADRATIC), sub("ReservedEquation3", QUADRATIC),
+    u8("CustomerVariant"), u8("VcBtcEnabled"),
+    u16("VcBtcVminT0"), u16("VcBtcFixedVminAgingOffset"), u16("VcBtcVmin2PsmDegrationGb"),
+    f32("VcBtcPsmA"), f32("VcBtcPsmB"), f32("VcBtcVminA"), f32("VcBtcVminB"),
+    u16("LedGpio"), u16("GfxPowerStagesGpio"),
+    u32("SkuReserved", 8),
+    u32("GamingClk", 6),
+    sub("I2cControllers", I2C_CONTROLLER, 16),
+    u8("GpioScl"), u8("GpioSda"), u8("FchUsbPdSlaveAddr"), u8("I2cSpare", 1),
+    u8("VddGfxVrMapping"), u8("VddSocVrMapping"), u8("VddMem0VrMapping"), u8("VddMem1VrMapping"),
+    u8("GfxUlvPhaseSheddingMask"), u8("SocUlvPhaseSheddingMask"),
+    u8("VddciUlvPhaseSheddingMask"), u8("MvddUlvPhaseSheddingMask"),
+    u16("GfxMaxCurrent"), i8("GfxOffset"), u8("Padding_TelemetryGfx"),
+    u16("SocMaxCurrent"), i8("SocOffset"), u8("Padding_TelemetrySoc"),
+    u16("Mem0MaxCurrent"), i8("Mem0Offset"), u8("Padding_TelemetryMem0"),
+    u16("Mem1MaxCurrent"), i8("Mem1Offset"), u8("Padding_TelemetryMem1"),
+    u32("MvddRatio"),
+    u8("AcDcGpio"), u8("AcDcPolarity"), u8("VR0HotGpio"), u8("VR0HotPolarity"),
+    u8("VR1HotGpio"), u8("VR1HotPolarity"), u8("GthrGpio"), u8("GthrPolarity"),
+    u8("LedPin0"), u8("LedPin1"), u8("LedPin2"), u8("LedEnableMask"),
+    u8("LedPcie"), u8("LedError"), u8("LedSpare1", 2),
+    u8("PllGfxclkSpreadEnabled"), u8("PllGfxclkSpreadPercent"), u16("PllGfxclkSpreadFreq"),
+    u8("DfllGfxclkSpreadEnabled"), u8("DfllGfxclkSpreadPercent"), u16("DfllGfxclkSpreadFreq"),
+    u16("UclkSpreadPadding"), u16("UclkSpreadFreq"),
+    u8("FclkSpreadEnabled"), u8("FclkSpreadPercent"), u16("FclkSpreadFreq"),
+    u32("MemoryChannelEnabled"),
+    u8("DramBitWidth"), u8("PaddingMem1", 3),
+    u16("TotalBoardPower"), u16("BoardPowerPadding"),
+    u8("XgmiLinkSpeed", 4), u8("XgmiLinkWidth", 4),
+    u16("XgmiFclkFreq", 4), u16("XgmiSocVoltage", 4),
+    u8("HsrEnabled"), u8("VddqOffEnabled"), u8("PaddingUmcFlags", 2),
+    u8("UclkSpreadPercent", 16),
+    u32("BoardReserved", 11),
+    u32("MmHubPadding", 8),
+])
+
+HEADER = Struct("atom_common_table_header", [u16("structuresize"), u8("format_revision"), u8("content_revision")])
+
+POWER_SAVING_CLOCK = Struct("smu_11_0_7_power_saving_clock_table", [
+    u8("revision"), u8("reserve", 3), u32("count"),
+    u32("max", 16, CLOCKS), u32("min", 16, CLOCKS),
+])
+
+OVERDRIVE = Struct("smu_11_0_7_overdrive_table", [
+    u8("revision"), u8("reserve", 3), u32("feature_count"), u32("setting_count"),
+    u8("cap", 32, OD_CAPS), u32("max", 64, OD_SETTINGS), u32("min", 64, OD_SETTINGS),
+    i16("pm_setting", 32),
+])
+
+NAVI2X = Struct("smu_11_0_7_powerplay_table", [
+    sub("header", HEADER),
+    u8("table_revision"), u16("table_size"), u32("golden_pp_id"), u32("golden_revision"),
+    u16("format_id"), u32("platform_caps"), u8("thermal_controller_type"),
+    u16("small_power_limit1"), u16("small_power_limit2"), u16("boost_power_limit"),
+    u16("software_shutdown_temp"),
+    u16("reserve", 8),
+    sub("power_saving_clock", POWER_SAVING_CLOCK),
+    sub("overdrive_table", OVERDRIVE),
+    sub("smc_pptable", PPTABLE_T),
+])
+
+NAVI2X_FORMAT_REVISION = 16
+
+
+# --- flaches Layout ---
+
+
+class Leaf(NamedTuple):
+    path: str  # "smc_pptable/SocketPowerLimitAc/0"
+    offset: int
+    fmt: str  # struct-Formatzeichen
+    label: str  # Elementname aus labels, sonst ""
+
+
+_STRUCTS: Dict[str, struct.Struct] = {}
+
+
+def _codec(fmt: str) -> struct.Struct:
+    s = _STRUCTS.get(fmt)
+    if s is None:
+        s = _STRUCTS[fmt] = struct.Struct("<" + fmt)
+    return s
+
+
+def flatten(st: Struct, prefix: str = "", base: int = 0) -> Iterator[Leaf]:
+    off = base
+    for f in st.fields:
+        path = f"{prefix}{f.name}"
+        for i in range(max(1, f.count)):
+            p = f"{path}/{i}" if f.count else path
+            if isinstance(f.type, Struct):
+                yield from flatten(f.type, p + "/", off)
+                off += f.type.size
+            else:
+                label = f.labels[i] if i < len(f.labels) else ""
+                yield Leaf(p, off, f.type, label)
+                off += _codec(f.type).size
+
+
+class Layout:
+    """Alle Felder einer Struktur mit Offset, einmal berechnet."""
+
+    def __init__(self, st: Struct):
+        self.struct = st
+        self.size = st.size
+        self.leaves: List[Leaf] = list(flatten(st))
+        self.by_path: Dict[str, Leaf] = {leaf.path: leaf for leaf in self.leaves}
+        self.offsets = [leaf.offset for leaf in self.leaves]
+
+    def resolve(self, path: str) -> Leaf:
+        """Pfad → Leaf; "Name0" wird wie "Name/0" behandelt."""
+        path = path.strip("/")
+        leaf = self.by_path.get(path)
+        if leaf is None:
+            leaf = self.by_path.get(_DIGIT_SUFFIX.sub(r"\1/\2", path))
+        if leaf is None:
+            raise KeyError(f"unbekanntes Feld: {path}")
+        return leaf
+
+
+_DIGIT_SUFFIX = re.compile(r"([A-Za-z_])(\d+)(?=/|$)")
+
+NAVI2X_LAYOUT = Layout(NAVI2X)
+
+Value = Union[int, float]
+
+
+def format_value(value: Value, fmt: str) -> str:
+    """Wert wie upp: Floats mit kürzester float32-Darstellung, positiv mit Leerzeichen."""
+    if fmt != "f":
+        return f" {value}"
+    for digits in range(1, 10):
+        text = f"{value:.{digits}g}"
+        if struct.pack("<f", float(text)) == struct.pack("<f", value):
+            break
+    if "e" not in text and "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return text if text.startswith("-") else " " + text
+
+
+def parse_value(text: str, fmt: str) -> Value:
+    text = text.strip()
+    return float(text) if fmt == "f" else int(text, 0)
+
+
+class PPTable:
+    """
+    PowerPlay-Tabelle im Speicher. buf ist ein bytearray, view ein
+    memoryview darauf; get/set lesen und schreiben direkt an den Offsets.
+    """
+
+    def __init__(self, data: bytes, layout: Layout = NAVI2X_LAYOUT):
+        if len(data) < 4:
+            raise ValueError("zu kurz für eine PowerPlay-Tabelle")
+        size, fmt_rev = struct.unpack_from("<HB", data, 0)
+        if size != len(data) or size != layout.size or fmt_rev != NAVI2X_FORMAT_REVISION:
+            raise ValueError(
+                f"Format nicht unterstützt: structuresize {size}, format_revision {fmt_rev}, "
+                f"{len(data)} Byte (erwartet Navi2x: {layout.size} Byte, format_revision {NAVI2X_FORMAT_REVISION})")
+        self.layout = layout
+        self.buf = bytearray(data)
+        self.view = memoryview(self.buf)
+
+    @classmethod
+    def load(cls, path: str) -> "PPTable":
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def save(self, path: str) -> None:
+        # ungepuffert: ein einziges write(), nötig für sysfs pp_table
+        with open(path, "wb", buffering=0) as f:
+            f.write(self.view)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.buf)
+
+    def read(self, leaf: Leaf) -> Value:
+        return _codec(leaf.fmt).unpack_from(self.view, leaf.offset)[0]
+
+    def write(self, leaf: Leaf, value: Value) -> None:
+        try:
+            _codec(leaf.fmt).pack_into(self.view, leaf.offset, value)
+        except struct.error as e:
+            raise ValueError(f"{leaf.path}: {value!r} passt nicht in '{leaf.fmt}' ({e})") from e
+
+    def get(self, path: str) -> Value:
+        return self.read(self.layout.resolve(path))
+
+    def set(self, path: str, value: Value) -> Value:
+        """Setzt ein Feld und gibt den alten Wert zurück."""
+        leaf = self.layout.resolve(path)
+        old = self.read(leaf)
+        self.write(leaf, value)
+        return old
+
+    def items(self) -> Iterator[Tuple[Leaf, Value]]:
+        read = self.read
+        for leaf in self.layout.leaves:
+            yield leaf, read(leaf)
+
+    # --- Text wie upp dump/undump ---
+
+    def dump(self) -> str:
+        out: List[str] = []
+        self._dump(self.layout.struct, 0, 0, out)
+        return "\n".join(out) + "\n"
+
+    def _dump(self, st: Struct, base: int, depth: int, out: List[str]) -> int:
+        indent = "  " * depth
+        off = base
+        for f in st.fields:
+            if isinstance(f.type, Struct):
+                out.append(f"{indent}{f.name}:")
+                if f.count:
+                    for i in range(f.count):
+                        out.append(f"{indent}  {f.name} {i}:")
+                        off = self._dump(f.type, off, depth + 2, out)
+                else:
+                    off = self._dump(f.type, off, depth + 1, out)
+                continue
+            codec = _codec(f.type)
+            if not f.count:
+                out.append(f"{indent}{f.name}:{format_value(codec.unpack_from(self.view, off)[0], f.type)}")
+                off += codec.size
+                continue
+            out.append(f"{indent}{f.name}:")
+            for i in range(f.count):
+                val = format_value(codec.unpack_from(self.view, off)[0], f.type)
+                label = f" ({f.labels[i]})" if i < len(f.labels) else ""
+                out.append(f"{indent}  {f.name} {i}:{val}{label}")
+                off += codec.size
+        return off
+
+    def apply_text(self, text: str) -> List[Tuple[str, Value, Value]]:
+        """
+        Werte aus einem dump-Text übernehmen. Geschrieben wird nur, was sich
+        in der Textform unterscheidet – unveränderte Floats bleiben so
+        bitgenau erhalten. Gibt [(Pfad, alt, neu)] zurück.
+        """
+        changes = []
+        for path, raw in parse_text(text).items():
+            leaf = self.layout.resolve(path)
+            old = self.read(leaf)
+            if format_value(old, leaf.fmt).strip() == raw:
+                continue
+            new = parse_value(raw, leaf.fmt)
+            self.write(leaf, new)
+            changes.append((leaf.path, old, self.read(leaf)))
+        return changes
+
+
+_LINE_RE = re.compile(r"^( *)(.+?):(.*)$")
+_LABEL_RE = re.compile(r"\s*\([^)]*\)\s*$")
+
+
+def parse_text(text: str) -> Dict[str, str]:
+    """dump-Text (upp-Format) → {Pfad: Wert als Text}."""
+    out: Dict[str, str] = {}
+    stack: List[Tuple[int, str]] = []  # (Einrückung, Segment)
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        m = _LINE_RE.match(line)
+        if m is None:
+            raise ValueError(f"Zeile {lineno}: kein 'Name: Wert': {line!r}")
+        indent, name, rest = len(m.group(1)), m.group(2).strip(), m.group(3)
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        # Array-Element "Name 3" → Segment "3"
+        parent = stack[-1][1] if stack else None
+        if parent is not None and name.startswith(parent + " ") and name[len(parent) + 1:].isdigit():
+            name = name[len(parent) + 1:]
+        value = _LABEL_RE.sub("", rest).strip()
+        if value:
+            out["/".join([s for _i, s in stack] + [name])] = value
+        else:
+            stack.append((indent, name))
+    return out
+
+
+def verify_text(table: PPTable, text: str) -> List[str]:
+    """Abweichungen zwischen Tabelle und dump-Text (leer = identisch)."""
+    problems = []
+    seen = set()
+    for path, raw in parse_text(text).items():
+        try:
+            leaf = table.layout.resolve(path)
+        except KeyError:
+            problems.append(f"{path}: im Schema unbekannt")
+            continue
+        seen.add(leaf.path)
+        have = format_value(table.read(leaf), leaf.fmt).strip()
+        if have != raw:
+            problems.append(f"{path}: Tabelle {have}, Text {raw}")
+    for leaf in table.layout.leaves:
+        if leaf.path not in seen:
+            problems.append(f"{leaf.path}: fehlt im Text")
+    return problems
+
+
+def parse_assignment(text: str) -> Tuple[str, str]:
+    path, sep, value = text.partition("=")
+    if not sep:
+        raise ValueError(f"erwartet PFAD=WERT: {text!r}")
+    return path.strip(), value.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Navi2x PowerPlay-Tabelle lesen/ändern (ohne upp).")
+    sub_p = parser.add_subparsers(dest="command", required=True)
+
+    p = sub_p.add_parser("dump", help="Tabelle als Text (Format wie upp dump)")
+    p.add_argument("table")
+
+    p = sub_p.add_parser("get", help="einzelne Felder ausgeben")
+    p.add_argument("table")
+    p.add_argument("paths", nargs="+")
+
+    for name, help_text in (("set", "Felder setzen: PFAD=WERT ..."),
+                            ("undump", "geänderte Werte aus einem dump-Text übernehmen")):
+        p = sub_p.add_parser(name, help=help_text)
+        p.add_argument("table")
+        if name == "set":
+            p.add_argument("assignments", nargs="+", metavar="PFAD=WERT")
+        else:
+            p.add_argument("text")
+        out = p.add_mutually_exclusive_group(required=True)
+        out.add_argument("-o", "--out", help="Ergebnis in diese Datei")
+        out.add_argument("--write", action="store_true",
+                         help="zurück in die Eingabe schreiben (z.B. /sys/class/drm/card1/device/pp_table)")
+
+    p = sub_p.add_parser("verify", help="prüfen, ob ein dump-Text zur Tabelle passt (Exit 1 bei Abweichung)")
+    p.add_argument("table")
+    p.add_argument("text")
+    args = parser.parse_args()
+
+    try:
+        table = PPTable.load(args.table)
+    except (OSError, ValueError) as e:
+        print(f"{args.table}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.command == "dump":
+            sys.stdout.write(table.dump())
+        elif args.command == "get":
+            for path in args.paths:
+                leaf = table.layout.resolve(path)
+                print(f"{leaf.path}:{format_value(table.read(leaf), leaf.fmt)}")
+        elif args.command in ("set", "undump"):
+            if args.command == "set":
+                changes = []
+                for item in args.assignments:
+                    path, raw = parse_assignment(item)
+                    leaf = table.layout.resolve(path)
+                    old = table.set(leaf.path, parse_value(raw, leaf.fmt))
+                    if old != table.read(leaf):
+                        changes.append((leaf.path, old, table.read(leaf)))
+            else:
+                with open(args.text, encoding="utf-8") as f:
+                    changes = table.apply_text(f.read())
+            for path, old, new in changes:
+                print(f"{path}: {old} -> {new}")
+            if not changes and args.write:
+                # --write zeigt meist auf das pp_table im sysfs; unverändert
+                # zurückschreiben würde die Tabelle trotzdem neu laden
+                print(f"keine Änderungen, {args.table} nicht geschrieben")
+                return
+            target = args.table if args.write else args.out
+            table.save(target)
+            print(f"{len(changes)} Feld(er) geändert, geschrieben nach {target}")
+        elif args.command == "verify":
+            with open(args.text, encoding="utf-8") as f:
+                text = f.read()
+            problems = verify_text(table, text)
+            for line in problems:
+                print(line)
+            if text == table.dump():
+                print("Text und Tabelle identisch (auch die Formatierung).")
+            elif not problems:
+                print("Alle Werte stimmen, Formatierung weicht ab.")
+            sys.exit(1 if problems else 0)
+    except (KeyError, ValueError) as e:
+        print(e.args[0] if e.args else e, file=sys.stderr)
+        sys.exit(1)
+    except OSError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,3 @@
-sudo -E env "PATH=$PATH"   upp --pp-file=/sys/class/drm/card1/device/pp_table   undump -d pp_decoded.txt --write
-
+# pp_decoded.txt (Format wie "upp dump") auf die GPU schreiben – ohne upp,
+# nur geänderte Felder werden übernommen (siehe pptable.py).
+sudo ./pptable.py undump /sys/class/drm/card1/device/pp_table pp_decoded.txt --write
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import argparse, glob, os, re, subprocess, textwrap
+import argparse, glob, os, textwrap
 
 def find_amd_card():
     for c in glob.glob("/sys/class/drm/card*"):
@@ -26,34 +26,6 @@ def read_int(path):
     except Exception:
         return None
 
-def read_pm_info(card_index=1):
-    path = f"/sys/kernel/debug/dri/{card_index}/amdgpu_pm_info"
-    try:
-        out = subprocess.check_output(["sudo", "cat", path], text=True)
-        return out
-    except Exception as e:
-        return f"(Fehler beim Lesen von {path}: {e})"
-
-def parse_pm_info_block(text):
-    avg_power = None
-    gfx_clk = None
-    mclk = None
-    temp = None
-    for line in text.splitlines():
-        m = re.search(r"(\d+\.\d+)\s*W\s*\(average SoC\)", line)
-        if m:
-            avg_power = float(m.group(1))
-        m = re.search(r"(\d+)\s*MHz\s*\(SCLK\)", line)
-        if m:
-            gfx_clk = int(m.group(1))
-        m = re.search(r"(\d+)\s*MHz\s*\(MCLK\)", line)
-        if m:
-            mclk = int(m.group(1))
-        m = re.search(r"GPU Temperature:\s*(\d+)\s*C", line)
-        if m:
-            temp = int(m.group(1))
-    return avg_power, gfx_clk, mclk, temp
-
 def main():
     parser = argparse.ArgumentParser(
         description="SMU/Power-Info für AMD-GPU (READ-ONLY / DRY-RUN)."
@@ -91,21 +63,17 @@ def main():
         print(f"power1_cap_max:  {cap_max} µW  ({cap_max/1e6:.1f} W)")
     print()
 
-    pm_info = read_pm_info(card_index=int(card.replace("card", "")))
-    avg_power, gfx_clk, mclk, temp = parse_pm_info_block(pm_info) if "Fehler" not in pm_info else (None, None, None, None)
+    # erst hier importieren: pm_info nutzt selbst find_amd_card/find_hwmon
+    from pm_info import PmInfoReader, print_info
 
-    if "Fehler" not in pm_info:
-        print("Auszug aus amdgpu_pm_info (sudo):")
-        if gfx_clk is not None:
-            print(f"  SCLK:      {gfx_clk} MHz")
-        if mclk is not None:
-            print(f"  MCLK:      {mclk} MHz")
-        if avg_power is not None:
-            print(f"  avg SoC:   {avg_power:.1f} W")
-        if temp is not None:
-            print(f"  GPU Temp:  {temp} °C")
-    else:
-        print(pm_info)
+    with PmInfoReader(card) as reader:
+        try:
+            info = reader.read()
+        except OSError as e:
+            print(f"({e})")
+        else:
+            print(f"Auszug aus amdgpu_pm_info ({'direkt' if reader.direct else 'sudo'}):")
+            print_info(info)
     print()
 
     if args.set:
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+GPU-Monitor für AMD-Karten (Ersatz für gpu_watch.sh).
+
+Ein Hintergrund-Thread liest Takt (pp_dpm_sclk/pp_dpm_mclk), Auslastung,
+Leistung, Power-Cap und die drei Temperaturen (edge/junction/mem) mit
+10–50 Hz über offene Deskriptoren (SysfsSampler) in Ringpuffer – ohne
+einen einzigen Subprozess pro Takt. Karte und hwmon werden wie in
+clock-voltage-power/smu_edit.py gefunden.
+
+Die Throttle-Einstufung (THERMAL / PWR-LIMIT / POSSIBLE) schaut nicht auf
+einen einzelnen Wert, sondern auf ein Fenster (Standard 2 s):
+
+    THERMAL    Hotspot im Median ≥ 100 °C
+    PWR-LIMIT  mittlere Leistung ≥ 95 % der Power-Cap
+    POSSIBLE   Median des Abstands zum höchsten sclk-Level > 100 MHz,
+               während die GPU im Median ≥ 50 % ausgelastet ist
+
+Ein einzelner Ausreißer schaltet den Zustand so nicht um, und im Leerlauf
+(niedriger Takt, weil nichts zu tun ist) gibt es kein POSSIBLE mehr.
+
+    ./gpu_monitor.py                     # curses, 20 Hz
+    ./gpu_monitor.py --rate 50 --window 1
+    ./gpu_monitor.py --plain             # eine Textzeile pro Sekunde
+    ./gpu_monitor.py --once              # ein Fenster messen, ausgeben
+"""
+import argparse
+import curses
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_HERE, "..", "common"))
+sys.path.insert(0, os.path.join(_HERE, "clock-voltage-power"))
+from ringbuffer import RingBuffer, Stats, compute_stats, percentiles  # noqa: E402
+from sysfs_sampler import SysfsSampler  # noqa: E402
+from tui_render import Frame, FrameRenderer  # noqa: E402
+
+from smu_edit import find_amd_card, find_hwmon  # noqa: E402
+
+MAX_RATE_HZ = 50.0
+MIN_RATE_HZ = 10.0
+DEFAULT_RATE_HZ = 20.0
+DEFAULT_WINDOW_S = 2.0
+HISTORY_S = 60.0  # so viel Historie halten die Ringpuffer
+
+# Schwellen wie in gpu_watch.sh
+HOTSPOT_THROTTLE_C = 100.0
+HOTSPOT_WARN_C = 90.0
+POWER_LIMIT_SHARE = 0.95
+CLOCK_DEFICIT_MHZ = 100
+BUSY_MIN_PERCENT = 50
+
+DRM_BASE = "/sys/class/drm"
+
+# Reihen der Ringpuffer; fehlende Werte werden als -1 abgelegt
+SERIES = ("sclk", "sclk_max", "mclk", "busy", "power", "cap", "edge", "hotspot", "vram")
+
+
+def parse_dpm(data: Optional[bytes]):
+    """
+    Inhalt von pp_dpm_sclk/pp_dpm_mclk → (aktueller Takt, höchstes Level)
+    in MHz, jeweils None falls nicht ermittelbar.
+
+        0: 500Mhz
+        1: 1200Mhz
+        2: 2615Mhz *
+
+    Es wird nur die mit "*" markierte und die letzte Zeile zerlegt, nicht
+    die ganze Tabelle.
+    """
+    if not data:
+        return None, None
+    cur = None
+    star = data.find(b"*")
+    if star >= 0:
+        cur = _level_mhz(data, data.rfind(b"\n", 0, star) + 1, star)
+    end = len(data.rstrip())
+    top = _level_mhz(data, data.rfind(b"\n", 0, end) + 1, end)
+    return cur, top
+
+
+def _level_mhz(data: bytes, start: int, end: int) -> Optional[int]:
+    """'N: 1234Mhz' zwischen start und end → 1234."""
+    colon = data.find(b":", start, end)
+    field = data[colon + 1 : end].split()
+    if not field:
+        return None
+    digits = field[0].rstrip(b"MHhzZ")
+    try:
+        return int(digits)
+    except ValueError:
+        return None
+
+
+class GpuPaths(NamedTuple):
+    card: str
+    hwmon: Optional[str]
+    sclk: str
+    mclk: str
+    busy: str
+    power: Optional[str]  # power1_average, sonst power1_input (neuere Kernel)
+    cap: Optional[str]
+    temps: List[Optional[str]]  # edge, junction (Hotspot), mem
+
+
+def discover(card: Optional[str] = None) -> GpuPaths:
+    card = card or find_amd_card()
+    device = os.path.join(DRM_BASE, card, "device")
+    hwmon = find_hwmon(card)
+
+    def hw(name: str) -> Optional[str]:
+        if hwmon is None:
+            return None
+        path = os.path.join(hwmon, name)
+        return path if os.path.exists(path) else None
+
+    return GpuPaths(
+        card=card,
+        hwmon=hwmon,
+        sclk=os.path.join(device, "pp_dpm_sclk"),
+        mclk=os.path.join(device, "pp_dpm_mclk"),
+        busy=os.path.join(device, "gpu_busy_percent"),
+        power=hw("power1_average") or hw("power1_input"),
+        cap=hw("power1_cap"),
+        temps=[hw(f"temp{i}_input") for i in (1, 2, 3)],
+    )
+
+
+class Throttle(NamedTuple):
+    state: str  # "OK", "THERMAL", "PWR-LIMIT", "POSSIBLE" oder "?" (zu wenig Daten)
+    reason: str
+
+
+class WindowStats(NamedTuple):
+    """Statistik eines Fensters; Takte in MHz, Leistung in W, Temperaturen in °C."""
+
+    samples: int
+    seconds: float
+    sclk: Optional[Stats]
+    sclk_max: Optional[int]
+    mclk: Optional[Stats]
+    busy: Optional[Stats]
+    power: Optional[Stats]
+    cap: Optional[float]
+    edge: Optional[Stats]
+    hotspot: Optional[Stats]
+    vram: Optional[Stats]
+    deficit_p50: Optional[float]  # Median von (höchstes Level − aktueller Takt)
+
+
+def _valid(vals) -> list:
+    return [v for v in vals if v >= 0]
+
+
+def window_stats(cols: Dict[str, list], times: list) -> WindowStats:
+    """cols: Rohreihen (wie in den Ringpuffern, -1 = fehlt) eines Fensters."""
+    sclk = cols["sclk"]
+    top = cols["sclk_max"]
+    deficits = [m - c for c, m in zip(sclk, top) if c >= 0 and m >= 0]
+    caps = _valid(cols["cap"])
+    tops = _valid(top)
+    return WindowStats(
+        samples=len(times),
+        seconds=times[-1] - times[0] if len(times) > 1 else 0.0,
+        sclk=compute_stats(_valid(sclk)),
+        sclk_max=tops[-1] if tops else None,
+        mclk=compute_stats(_valid(cols["mclk"])),
+        busy=compute_stats(_valid(cols["busy"])),
+        power=compute_stats(_valid(cols["power"]), 1e-6),
+        cap=caps[-1] / 1e6 if caps else None,
+        edge=compute_stats(_valid(cols["edge"]), 0.001),
+        hotspot=compute_stats(_valid(cols["hotspot"]), 0.001),
+        vram=compute_stats(_valid(cols["vram"]), 0.001),
+        deficit_p50=percentiles(deficits, (50,))[0] if deficits else None,
+    )
+
+
+def classify(ws: WindowStats) -> Throttle:
+    """Throttle-Zustand aus der Fensterstatistik, Reihenfolge wie gpu_watch.sh."""
+    if ws.samples == 0:
+        return Throttle("?", "keine Samples")
+    if ws.hotspot is not None and ws.hotspot.p50 >= HOTSPOT_THROTTLE_C:
+        return Throttle("THERMAL", f"Hotspot p50 {ws.hotspot.p50:.1f} °C ≥ {HOTSPOT_THROTTLE_C:.0f} °C")
+    if ws.power is not None and ws.cap:
+        share = ws.power.mean / ws.cap
+        if share >= POWER_LIMIT_SHARE:
+            return Throttle("PWR-LIMIT", f"Leistung Ø {ws.power.mean:.1f} W = {share * 100:.0f} % der Cap")
+    if ws.deficit_p50 is not None and ws.deficit_p50 > CLOCK_DEFICIT_MHZ:
+        busy = ws.busy.p50 if ws.busy is not None else None
+        if busy is None or busy >= BUSY_MIN_PERCENT:
+            load = "" if busy is None else f" bei {busy:.0f} % Last"
+            return Throttle("POSSIBLE", f"sclk p50 {ws.deficit_p50:.0f} MHz unter Max{load}")
+    return Throttle("OK", "")
+
+
+class GpuMonitor:
+    """
+    Sampelt eine AMD-GPU periodisch in einem Daemon-Thread.
+
+    Alle Reihen sind pro Tick ausgerichtet (gleicher Index = gleicher
+    Tick). Rohwerte: Takte MHz, busy %, Leistung/Cap µW, Temperaturen m°C.
+    """
+
+    def __init__(
+        self,
+        paths: GpuPaths,
+        rate_hz: float = DEFAULT_RATE_HZ,
+        history_s: float = HISTORY_S,
+        sampler_factory=SysfsSampler,
+    ):
+        if not MIN_RATE_HZ <= rate_hz <= MAX_RATE_HZ:
+            raise ValueError(f"rate_hz muss in [{MIN_RATE_HZ:.0f}, {MAX_RATE_HZ:.0f}] liegen")
+        self.paths = paths
+        self.rate_hz = rate_hz
+        capacity = max(1, int(rate_hz * history_s))
+        self.times = RingBuffer(capacity, "d")  # Sekunden seit start()
+        self.buffers: Dict[str, RingBuffer] = {name: RingBuffer(capacity, "i") for name in SERIES}
+        self.sampler_factory = sampler_factory
+        self.t0 = 0.0
+        self.ticks = 0
+        self.overruns = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Thread-Steuerung ---
+
+    def start(self) -> "GpuMonitor":
+        self._stop.clear()
+        self.t0 = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="gpu-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _run(self) -> None:
+        sampler = self.sampler_factory()
+        p = self.paths
+        read_int = sampler.read_int
+        read_bytes = sampler.read_bytes
+        b = self.buffers
+        ints = [
+            (b["busy"], p.busy),
+            (b["power"], p.power),
+            (b["cap"], p.cap),
+            (b["edge"], p.temps[0]),
+            (b["hotspot"], p.temps[1]),
+            (b["vram"], p.temps[2]),
+        ]
+        sclk, sclk_max, mclk = b["sclk"], b["sclk_max"], b["mclk"]
+        perf_counter = time.perf_counter
+        period = 1.0 / self.rate_hz
+        next_t = perf_counter()
+
+        try:
+            while not self._stop.is_set():
+                cur, top = parse_dpm(read_bytes(p.sclk))
+                mcur, _ = parse_dpm(read_bytes(p.mclk))
+                vals = [read_int(path) if path else None for _buf, path in ints]
+                with self._lock:
+                    self.times.append(perf_counter() - self.t0)
+                    sclk.append(-1 if cur is None else cur)
+                    sclk_max.append(-1 if top is None else top)
+                    mclk.append(-1 if mcur is None else mcur)
+                    for (buf, _path), val in zip(ints, vals):
+                        buf.append(-1 if val is None else val)
+                    self.ticks += 1
+
+                next_t += period
+                delay = next_t - perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    missed = int(-delay / period)
+                    self.overruns += missed
+                    next_t += missed * period
+        finally:
+            sampler.close()
+
+    # --- Auswertung ---
+
+    def last(self) -> Dict[str, Optional[int]]:
+        """Letzter Rohwert pro Reihe (None = fehlt)."""
+        with self._lock:
+            out = {}
+            for name, buf in self.buffers.items():
+                val = buf.last()
+                out[name] = None if val is None or val < 0 else val
+            return out
+
+    def window(self, seconds: float = DEFAULT_WINDOW_S) -> WindowStats:
+        n = max(1, int(round(seconds * self.rate_hz)))
+        with self._lock:
+            times = self.times.tail(n)
+            cols = {name: buf.tail(n) for name, buf in self.buffers.items()}
+        return window_stats(cols, times)
+
+    def series(self):
+        """
+        Zeitreihe [(t_s, sclk, sclk_max, busy, power_w, cap_w, hotspot_c)]
+        aller Ticks in der Historie, fehlende Werte als None.
+        """
+        names = ("sclk", "sclk_max", "busy", "power", "cap", "hotspot")
+        scales = (1, 1, 1, 1e-6, 1e-6, 0.001)
+        with self._lock:
+            times = self.times.values()
+            cols = [self.buffers[name].values() for name in names]
+        return [
+            (t,) + tuple(None if v < 0 else v * s for v, s in zip(row, scales))
+            for t, *row in zip(times, *cols)
+        ]
+
+
+def _fmt(st: Optional[Stats], unit: str, digits: int = 0) -> str:
+    if st is None:
+        return "-"
+    return (f"{st.mean:.{digits}f} {unit}  "
+            f"(min {st.min:.{digits}f} / p99 {st.p99:.{digits}f} / max {st.max:.{digits}f})")
+
+
+def summary_line(mon: GpuMonitor, window_s: float) -> str:
+    ws = mon.window(window_s)
+    th = classify(ws)
+    parts = [time.strftime("%H:%M:%S"), mon.paths.card]
+    if ws.sclk is not None:
+        parts.append(f"sclk {ws.sclk.p50:.0f}/{ws.sclk_max or 0} MHz")
+    if ws.busy is not None:
+        parts.append(f"busy {ws.busy.p50:.0f} %")
+    if ws.power is not None:
+        cap = f"/{ws.cap:.0f}" if ws.cap else ""
+        parts.append(f"{ws.power.mean:.1f}{cap} W")
+    if ws.hotspot is not None:
+        parts.append(f"hot {ws.hotspot.max:.1f} °C")
+    parts.append(th.state + (f" ({th.reason})" if th.reason else ""))
+    return "  ".join(parts)
+
+
+def build_frame(mon: GpuMonitor, window_s: float) -> Frame:
+    ws = mon.window(window_s)
+    th = classify(ws)
+    frame = Frame()
+    frame.add(0, 0, f"AMD GPU Monitor ({mon.paths.card})  {time.strftime('%H:%M:%S')}", curses.A_BOLD)
+    frame.add(1, 0, f"{mon.rate_hz:g} Hz, Fenster {window_s:g} s ({ws.samples} Samples), "
+                    f"verpasst {mon.overruns}   q: Quit  +/-: Fenster")
+
+    last = mon.last()
+    row = 3
+    rows = [
+        ("Clock:", f"{last['sclk'] or '-'} MHz (max {ws.sclk_max or '-'} MHz)   Ø {_fmt(ws.sclk, 'MHz')}"),
+        ("Memory:", f"{last['mclk'] or '-'} MHz"),
+        ("GPU-Load:", _fmt(ws.busy, "%")),
+        ("Edge Temp:", _fmt(ws.edge, "°C", 1)),
+        ("Hotspot:", _fmt(ws.hotspot, "°C", 1)),
+        ("VRAM Temp:", _fmt(ws.vram, "°C", 1)),
+        ("Power:", _fmt(ws.power, "W", 1) + (f"   Cap {ws.cap:.0f} W" if ws.cap else "")),
+    ]
+    for label, text in rows:
+        attr = curses.A_NORMAL
+        if label == "Hotspot:" and ws.hotspot is not None:
+            if ws.hotspot.max >= HOTSPOT_THROTTLE_C:
+                attr = curses.color_pair(1)
+            elif ws.hotspot.max >= HOTSPOT_WARN_C:
+                attr = curses.color_pair(2)
+        frame.add(row, 0, f"{label:<13}{text}", attr)
+        row += 1
+
+    row += 1
+    color = {"OK": 3, "THERMAL": 1}.get(th.state, 2)
+    frame.add(row, 0, "Throttle:")
+    frame.add(row, 13, th.state, curses.color_pair(color) | curses.A_BOLD)
+    if th.reason:
+        frame.add(row, 13 + len(th.state) + 2, th.reason)
+    return frame
+
+
+def run_curses(stdscr, mon: GpuMonitor, window_s: float, interval: float) -> None:
+    curses.curs_set(0)
+    curses.start_color()
+    curses.use_default_colors()
+    curses.init_pair(1, curses.COLOR_RED, -1)
+    curses.init_pair(2, curses.COLOR_YELLOW, -1)
+    curses.init_pair(3, curses.COLOR_GREEN, -1)
+    stdscr.timeout(int(interval * 1000))
+    renderer = FrameRenderer(stdscr)
+    while True:
+        renderer.render(build_frame(mon, window_s))
+        key = stdscr.getch()
+        if key in (ord("q"), ord("Q"), 27):
+            break
+        if key == ord("+"):
+            window_s = min(HISTORY_S, window_s * 2)
+        elif key == ord("-"):
+            window_s = max(2.0 / mon.rate_hz, window_s / 2)
+        elif key == curses.KEY_RESIZE:
+            renderer.invalidate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AMD-GPU überwachen: Takt, Last, Leistung, Temperaturen, Throttling.")
+    parser.add_argument("--card", help="DRM-Karte, z.B. card1 (Standard: erste AMD-Karte)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_HZ,
+                        help=f"Sampling-Rate in Hz ({MIN_RATE_HZ:.0f}–{MAX_RATE_HZ:.0f}, Standard {DEFAULT_RATE_HZ:.0f})")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW_S,
+                        help=f"Fenster für Statistik/Throttle in s (Standard {DEFAULT_WINDOW_S:g})")
+    parser.add_argument("--interval", type=float, default=1.0, help="Anzeigeintervall in s (Standard 1)")
+    parser.add_argument("--plain", action="store_true", help="Textzeile pro Intervall statt curses")
+    parser.add_argument("--once", action="store_true", help="ein Fenster lang messen, eine Zeile ausgeben")
+    args = parser.parse_args()
+    if not MIN_RATE_HZ <= args.rate <= MAX_RATE_HZ:
+        parser.error(f"--rate muss zwischen {MIN_RATE_HZ:.0f} und {MAX_RATE_HZ:.0f} liegen")
+    if not 0 < args.window <= HISTORY_S:
+        parser.error(f"--window muss in (0, {HISTORY_S:.0f}] liegen")
+
+    paths = discover(args.card)
+    if not os.path.isdir(os.path.join(DRM_BASE, paths.card)) or paths.hwmon is None:
+        print(f"Konnte AMD-GPU oder hwmon nicht finden. CARD={paths.card} HWMON={paths.hwmon}")
+        sys.exit(1)
+
+    mon = GpuMonitor(paths, args.rate)
+    with mon:
+        try:
+            if args.once:
+                time.sleep(args.window)
+                print(summary_line(mon, args.window))
+            elif args.plain:
+                while True:
+                    time.sleep(args.interval)
+                    print(summary_line(mon, args.window), flush=True)
+            else:
+                curses.wrapper(run_curses, mon, args.window, args.interval)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
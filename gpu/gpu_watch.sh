@@ -1,5 +1,9 @@
 #!/usr/bin/env bash
 
+# Älteres Bash-Gegenstück zu gpu_monitor.py (ein Wert pro Sekunde, Throttle
+# nur aus dem aktuellen Sample). Für höhere Raten und Fensterstatistik
+# gpu_monitor.py verwenden.
+
 RED="\033[31m"
 GREEN="\033[32m"
 YELLOW="\033[33m"
@@ -62,20 +66,48 @@ read_power_w() {
   awk "BEGIN {printf \"%.1f\", $v/1000000.0}"
 }
 
-# Cursor ausblenden, bei Abbruch wieder einblenden
+# Cursor ausblenden, Zeilenumbruch aus (lange Zeilen werden abgeschnitten),
+# bei Abbruch beides zurück
 tput civis 2>/dev/null || true
-trap 'tput cnorm 2>/dev/null || true; printf "\033[0m\n"; exit 0' INT TERM
+printf '\033[?7l'
+trap 'tput cnorm 2>/dev/null || true; printf "\033[?7h\033[0m\n"; exit 0' INT TERM
+
+# Differenzielles Zeichnen: jede Runde wird in FRAME gesammelt, geschrieben
+# werden nur Zeilen, die sich gegenüber PREV geändert haben (Cursor direkt
+# auf die Zeile, Text, Rest der Zeile löschen). Über SSH gehen so pro
+# Sekunde nur die geänderten Werte raus statt des ganzen Bildschirms.
+FRAME=()
+PREV=()
+FULL=1
+trap 'FULL=1' WINCH   # Fenstergröße geändert → einmal komplett neu
+
+out() {
+  FRAME+=("$*")
+}
 
-# einmal komplett löschen und nach oben
-printf '\033[2J\033[H'
+render() {
+  local i
+  if [ "$FULL" -eq 1 ]; then
+    printf '\033[2J'
+    PREV=()
+    FULL=0
+  fi
+  for i in "${!FRAME[@]}"; do
+    if [ "${FRAME[$i]}" != "${PREV[$i]-}" ]; then
+      printf '\033[%d;1H%b\033[K' "$((i + 1))" "${FRAME[$i]}"
+    fi
+  done
+  # Zeilen, die es in dieser Runde nicht mehr gibt, löschen
+  for ((i = ${#FRAME[@]}; i < ${#PREV[@]}; i++)); do
+    printf '\033[%d;1H\033[K' "$((i + 1))"
+  done
+  PREV=("${FRAME[@]}")
+  FRAME=()
+}
 
 while true; do
-  # Cursor nach oben links, Rest später mit \033[J gelöscht → kein hartes Flackern
-  printf '\033[H'
-
-  echo -e "${BOLD}${CYAN}AMD GPU Monitor ($CARD)${RESET}  $(date +'%H:%M:%S')"
-  echo
-
+  out "${BOLD}${CYAN}AMD GPU Monitor ($CARD)${RESET}  $(date +'%H:%M:%S')"
+  out ""
   cur_clk=""
   max_clk=""
   if [ -f "$PP_SCLK" ]; then
@@ -138,25 +170,25 @@ while true; do
   fi
 
   if [ -n "$cur_clk" ] && [ -n "$max_clk" ]; then
-    echo -e "Clock:       ${BOLD}$cur_clk MHz${RESET} (max $max_clk MHz)"
+    out "Clock:       ${BOLD}$cur_clk MHz${RESET} (max $max_clk MHz)"
   elif [ -n "$cur_clk" ]; then
-    echo -e "Clock:       ${BOLD}$cur_clk MHz${RESET}"
+    out "Clock:       ${BOLD}$cur_clk MHz${RESET}"
   fi
 
   if [ -n "$busy" ]; then
-    echo -e "GPU-Load:    ${BOLD}$busy %${RESET}"
+    out "GPU-Load:    ${BOLD}$busy %${RESET}"
   fi
 
   if [ -n "$edge" ]; then
-    echo -e "Edge Temp:   $edge °C"
+    out "Edge Temp:   $edge °C"
   fi
 
   if [ -n "$hot" ]; then
-    echo -e "Hotspot:     ${temp_color}$hot °C${RESET}"
+    out "Hotspot:     ${temp_color}$hot °C${RESET}"
   fi
 
   if [ -n "$vram" ]; then
-    echo -e "VRAM Temp:   $vram °C"
+    out "VRAM Temp:   $vram °C"
   fi
 
   if [ -n "$pwr" ]; then
@@ -164,16 +196,15 @@ while true; do
     if [ -n "$pwr_cap" ]; then
       line="$line (Cap: $pwr_cap W)"
     fi
-    echo -e "$line"
+    out "$line"
   fi
 
-  echo
-  echo -e "Throttle:    ${throttle_color}${BOLD}$throttle${RESET}"
-  echo
-  echo "Strg+C zum Beenden."
+  out ""
+  out "Throttle:    ${throttle_color}${BOLD}$throttle${RESET}"
+  out ""
+  out "Strg+C zum Beenden."
 
-  # Rest des Bildschirms löschen (alte Zeilen weg)
-  printf '\033[J'
+  render
 
   sleep 1
 done
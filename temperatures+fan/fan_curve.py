@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Software-Lüfterkurven für hwmon-PWM-Kanäle.
+
+Jeder PWM-Kanal bekommt eine Temperaturquelle (beliebiger hwmon-temp*-
+Sensor) und entweder eine stückweise lineare Kurve oder einen PID-Regler
+auf eine Zieltemperatur. Dazu:
+
+- Hysterese: fällt die Temperatur, wird erst nachgeregelt, wenn sie um
+  mehr als `hysteresis` °C unter den Punkt gefallen ist, der zuletzt
+  hochgeregelt hat (kein Pendeln im Leerlauf).
+- Rampen: `ramp_up`/`ramp_down` in PWM-Schritten pro Sekunde, z.B.
+  schnell hoch, langsam runter.
+- Fehlt der Temperaturwert, geht der Kanal auf `max_pwm`.
+
+Die Regelschleife läuft in einem eigenen Thread mit festen Deadlines
+(kein Drift, kein sleep(period)-Jitter). Geschrieben wird nur, wenn sich
+der PWM-Wert ändert.
+
+Konfiguration (JSON), siehe fan_curve.example.json:
+
+    {
+      "interval": 0.5,
+      "channels": {
+        "1": {"source": "k10temp/Tctl",
+              "points": [[40, 60], [60, 110], [75, 200], [85, 255]],
+              "hysteresis": 3, "ramp_up": 100, "ramp_down": 10},
+        "5": {"source": "nct6798/SYSTIN", "mode": "pid", "target": 45,
+              "kp": 8, "ki": 0.5, "kd": 0, "min_pwm": 120}
+      }
+    }
+
+Quelle: "chip/label", "chip/tempN" oder ein absoluter Pfad zu temp*_input.
+
+Ohne TUI (Startzustand wird beim Beenden wiederhergestellt):
+
+    sudo ./fan_curve.py fan_curve.example.json
+    sudo ./fanctl_tui.py --curve fan_curve.example.json
+"""
+import argparse
+import json
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from sysfs_sampler import SysfsSampler, write_int as sysfs_write_int  # noqa: E402
+
+from temp_monitor_tui import find_temp_sensors, read_file  # noqa: E402
+
+DEFAULT_INTERVAL = 0.5  # Sekunden
+MIN_INTERVAL = 0.05
+
+PWM_MAX = 255
+PWM_ENABLE_MANUAL = 1
+
+
+class CurveConfigError(ValueError):
+    pass
+
+
+class ChannelConfig(NamedTuple):
+    pwm: int
+    source: str
+    mode: str  # "curve" oder "pid"
+    points: Tuple[Tuple[float, float], ...]
+    hysteresis: float
+    ramp_up: float  # PWM-Schritte pro Sekunde
+    ramp_down: float
+    min_pwm: int
+    max_pwm: int
+    target: float  # nur PID
+    kp: float
+    ki: float
+    kd: float
+
+
+def _channel_config(pwm: int, raw: dict) -> ChannelConfig:
+    if not isinstance(raw, dict):
+        raise CurveConfigError(f"pwm{pwm}: Eintrag muss ein Objekt sein")
+    try:
+        return _parse_channel(pwm, raw)
+    except CurveConfigError:
+        raise
+    except (TypeError, ValueError) as e:
+        # z.B. "min_pwm": "hoch" oder points ohne [Temperatur, PWM]-Paare
+        raise CurveConfigError(f"pwm{pwm}: ungültiger Wert ({e})")
+
+
+def _parse_channel(pwm: int, raw: dict) -> ChannelConfig:
+    mode = raw.get("mode", "curve")
+    if mode not in ("curve", "pid"):
+        raise CurveConfigError(f"pwm{pwm}: unbekannter mode {mode!r}")
+    if "source" not in raw:
+        raise CurveConfigError(f"pwm{pwm}: source fehlt")
+
+    points = tuple(sorted((float(t), float(p)) for t, p in raw.get("points", ())))
+    if mode == "curve":
+        if not points:
+            raise CurveConfigError(f"pwm{pwm}: points fehlt")
+        if any(not 0 <= p <= PWM_MAX for _, p in points):
+            raise CurveConfigError(f"pwm{pwm}: PWM-Werte in points müssen 0..{PWM_MAX} sein")
+    elif "target" not in raw:
+        raise CurveConfigError(f"pwm{pwm}: target fehlt (mode pid)")
+
+    min_pwm = int(raw.get("min_pwm", 0))
+    max_pwm = int(raw.get("max_pwm", PWM_MAX))
+    if not 0 <= min_pwm <= max_pwm <= PWM_MAX:
+        raise CurveConfigError(f"pwm{pwm}: es muss 0 <= min_pwm <= max_pwm <= {PWM_MAX} gelten")
+
+    return ChannelConfig(
+        pwm=pwm,
+        source=str(raw["source"]),
+        mode=mode,
+        points=points,
+        hysteresis=float(raw.get("hysteresis", 2.0)),
+        ramp_up=float(raw.get("ramp_up", 255.0)),
+        ramp_down=float(raw.get("ramp_down", 20.0)),
+        min_pwm=min_pwm,
+        max_pwm=max_pwm,
+        target=float(raw.get("target", 0.0)),
+        kp=float(raw.get("kp", 8.0)),
+        ki=float(raw.get("ki", 0.5)),
+        kd=float(raw.get("kd", 0.0)),
+    )
+
+
+def load_config(path: str) -> Tuple[float, List[ChannelConfig]]:
+    """(Intervall, Kanäle) aus einer JSON-Datei."""
+    try:
+        with open(path, "r") as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        raise CurveConfigError(f"{path}: {e}")
+
+    if not isinstance(raw, dict) or not isinstance(raw.get("channels", {}), dict):
+        raise CurveConfigError(f"{path}: erwartet ein Objekt mit channels {{\"pwmN\": {{...}}}}")
+    try:
+        interval = float(raw.get("interval", DEFAULT_INTERVAL))
+    except (TypeError, ValueError):
+        raise CurveConfigError(f"interval: keine Zahl ({raw.get('interval')!r})")
+    if interval < MIN_INTERVAL:
+        raise CurveConfigError(f"interval muss >= {MIN_INTERVAL} s sein")
+    numbered = []
+    for key, ch in raw.get("channels", {}).items():
+        m = re.fullmatch(r"(?:pwm)?(\d+)", key)
+        if m is None:
+            raise CurveConfigError(f"{path}: Kanal {key!r} – Schlüssel müssen N oder pwmN sein")
+        numbered.append((int(m.group(1)), ch))
+    channels = [_channel_config(pwm, ch) for pwm, ch in sorted(numbered, key=lambda kv: kv[0])]
+    if not channels:
+        raise CurveConfigError(f"{path}: keine channels konfiguriert")
+    return interval, channels
+
+
+def resolve_source(spec: str) -> str:
+    """'chip/label', 'chip/tempN' oder Pfad → Pfad zu temp*_input."""
+    if spec.startswith("/"):
+        return spec
+    chip, _, name = spec.partition("/")
+    for _category, hwmon_name, hwmon_dir, temps in find_temp_sensors():
+        if hwmon_name != chip:
+            continue
+        for idx in temps:
+            label = read_file(os.path.join(hwmon_dir, f"temp{idx}_label"))
+            if name in (label, f"temp{idx}"):
+                return os.path.join(hwmon_dir, f"temp{idx}_input")
+    raise CurveConfigError(f"Temperaturquelle {spec!r} nicht gefunden")
+
+
+# --- Regelung ---------------------------------------------------------------
+
+
+def interpolate(points: Sequence[Tuple[float, float]], x: float) -> float:
+    """Stückweise linear, außerhalb der Stützstellen konstant."""
+    if x <= points[0][0]:
+        return points[0][1]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if x <= x1:
+            if x1 == x0:
+                return y1
+            return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+    return points[-1][1]
+
+
+class PidController:
+    """
+    PID auf die Temperatur: Fehler = Ist - Soll, positiver Fehler → mehr PWM.
+    D-Anteil auf die Messung (kein Sprung bei Sollwertänderung), der
+    I-Anteil wird auf den Ausgabebereich begrenzt (Anti-Windup).
+    """
+
+    def __init__(self, target: float, kp: float, ki: float, kd: float, out_min: float, out_max: float):
+        self.target = target
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.out_min, self.out_max = out_min, out_max
+        self.integral = out_min
+        self._last_temp: Optional[float] = None
+
+    def update(self, temp: float, dt: float) -> float:
+        err = temp - self.target
+        self.integral = min(max(self.integral + self.ki * err * dt, self.out_min), self.out_max)
+        deriv = 0.0
+        if self._last_temp is not None and dt > 0:
+            deriv = (temp - self._last_temp) / dt
+        self._last_temp = temp
+        out = self.kp * err + self.integral + self.kd * deriv
+        return min(max(out, self.out_min), self.out_max)
+
+
+class OperatingPoint(NamedTuple):
+    pwm: int  # Kanalnummer
+    source: str
+    mode: str
+    active: bool
+    temp: Optional[float]  # gemessen, °C
+    t_eff: Optional[float]  # nach Hysterese
+    target: Optional[float]  # Sollwert aus Kurve/PID vor der Rampe
+    output: Optional[int]  # geschriebener PWM-Wert
+
+
+class ChannelControl:
+    """Zustand eines geregelten Kanals: Hysterese, Rampe, PID."""
+
+    def __init__(self, cfg: ChannelConfig, pwm_path: str, enable_path: str, source_path: str):
+        self.cfg = cfg
+        self.pwm_path = pwm_path
+        self.enable_path = enable_path
+        self.source_path = source_path
+        self.active = True
+        self.temp: Optional[float] = None
+        self.t_eff: Optional[float] = None
+        self.target: Optional[float] = None
+        self.out: Optional[float] = None  # als float, damit langsame Rampen nicht auf 0 runden
+        self.written: Optional[int] = None
+        self.pid = (
+            PidController(cfg.target, cfg.kp, cfg.ki, cfg.kd, cfg.min_pwm, cfg.max_pwm)
+            if cfg.mode == "pid"
+            else None
+        )
+
+    def _hysteresis(self, temp: float) -> float:
+        if self.t_eff is None or temp >= self.t_eff:
+            self.t_eff = temp
+        elif self.t_eff - temp > self.cfg.hysteresis:
+            self.t_eff = temp + self.cfg.hysteresis
+        return self.t_eff
+
+    def update(self, temp: Optional[float], dt: float) -> int:
+        """Neuer PWM-Wert für die gemessene Temperatur (None = Sensor weg)."""
+        cfg = self.cfg
+        self.temp = temp
+        if temp is None:
+            # Failsafe: ohne Messwert voll aufdrehen, ohne Rampe
+            self.target = self.out = float(cfg.max_pwm)
+            return cfg.max_pwm
+
+        if self.pid is not None:
+            self.t_eff = temp
+            target = self.pid.update(temp, dt)
+        else:
+            target = interpolate(cfg.points, self._hysteresis(temp))
+        target = min(max(target, cfg.min_pwm), cfg.max_pwm)
+        self.target = target
+
+        if self.out is None:
+            self.out = target
+        elif target > self.out:
+            self.out = min(target, self.out + cfg.ramp_up * dt)
+        else:
+            self.out = max(target, self.out - cfg.ramp_down * dt)
+        return int(round(self.out))
+
+    def point(self) -> OperatingPoint:
+        return OperatingPoint(
+            self.cfg.pwm, self.cfg.source, self.cfg.mode, self.active,
+            self.temp, self.t_eff, self.target, self.written,
+        )
+
+
+class FanCurveEngine:
+    """
+    Regelt alle Kanäle in einem Daemon-Thread mit festem Takt.
+    Zum Start wird pwmN_enable auf manuell gesetzt; das Zurücksetzen
+    (restore) ist Sache des Aufrufers, nach stop().
+    """
+
+    def __init__(
+        self,
+        controls: List[ChannelControl],
+        interval: float = DEFAULT_INTERVAL,
+        write_int: Callable[[str, int], bool] = sysfs_write_int,
+    ):
+        self.controls = controls
+        self.interval = interval
+        self.write_int = write_int
+        self.ticks = 0
+        self.overruns = 0
+        self.max_jitter = 0.0  # größte Verspätung eines Ticks, Sekunden
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def control(self, pwm: int) -> Optional[ChannelControl]:
+        for c in self.controls:
+            if c.cfg.pwm == pwm:
+                return c
+        return None
+
+    def set_active(self, pwm: int, active: bool) -> None:
+        c = self.control(pwm)
+        if c is None:
+            return
+        # beim Wiedereinschalten ab dem aktuellen pwmN-Wert weiterrampen
+        # (notfalls dem zuletzt geschriebenen), nicht auf den Sollwert springen
+        current = snapshot([c.pwm_path]).get(c.pwm_path) if active else None
+        with self._lock:
+            c.active = active
+            if active:
+                start = current if current is not None else c.written
+                c.out = float(start) if start is not None else None
+            c.written = None
+
+    def start(self) -> "FanCurveEngine":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="fan-curve", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _tick(self, sampler: SysfsSampler, dt: float) -> None:
+        with self._lock:
+            for c in self.controls:
+                if not c.active:
+                    continue
+                raw = sampler.read_int(c.source_path)
+                value = c.update(raw / 1000.0 if raw is not None else None, dt)
+                if value == c.written:
+                    continue  # den langsamen Super-I/O-Chip nicht unnötig beschreiben
+                if c.written is None:
+                    self.write_int(c.enable_path, PWM_ENABLE_MANUAL)
+                if self.write_int(c.pwm_path, value):
+                    c.written = value
+                else:
+                    self.errors += 1
+            self.ticks += 1
+
+    def _run(self) -> None:
+        sampler = SysfsSampler()
+        period = self.interval
+        next_t = time.monotonic()
+        last = next_t
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                self.max_jitter = max(self.max_jitter, now - next_t)
+                self._tick(sampler, now - last if self.ticks else 0.0)
+                last = now
+                next_t += period
+                delay = next_t - time.monotonic()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    missed = int(-delay / period)
+                    self.overruns += missed
+                    next_t += missed * period
+        finally:
+            sampler.close()
+
+    def status(self) -> List[OperatingPoint]:
+        with self._lock:
+            return [c.point() for c in self.controls]
+
+
+def build_engine(
+    path: str,
+    hwmon_dir: str,
+    write_int: Callable[[str, int], bool] = sysfs_write_int,
+) -> FanCurveEngine:
+    """Konfiguration laden, Quellen auflösen, Engine (noch nicht gestartet) bauen."""
+    interval, configs = load_config(path)
+    controls = []
+    for cfg in configs:
+        pwm_path = os.path.join(hwmon_dir, f"pwm{cfg.pwm}")
+        if not os.path.exists(pwm_path):
+            raise CurveConfigError(f"{pwm_path} existiert nicht")
+        controls.append(
+            ChannelControl(cfg, pwm_path, f"{pwm_path}_enable", resolve_source(cfg.source))
+        )
+    return FanCurveEngine(controls, interval, write_int)
+
+
+def render_curve(cfg: ChannelConfig, point: OperatingPoint, width: int, height: int) -> List[str]:
+    """
+    Kurve als Textgrafik (height Zeilen, width Spalten) mit dem aktuellen
+    Arbeitspunkt als "●". Bei PID: Sollwert als senkrechte Linie.
+    """
+    width = max(10, width)
+    height = max(3, height)
+    if cfg.mode == "curve":
+        t_lo = cfg.points[0][0] - 5
+        t_hi = cfg.points[-1][0] + 5
+    else:
+        t_lo, t_hi = cfg.target - 20, cfg.target + 20
+    grid = [[" "] * width for _ in range(height)]
+
+    def col(t: float) -> int:
+        return min(width - 1, max(0, int(round((t - t_lo) / (t_hi - t_lo) * (width - 1)))))
+
+    def row(p: float) -> int:
+        return height - 1 - min(height - 1, max(0, int(round(p / PWM_MAX * (height - 1)))))
+
+    if cfg.mode == "curve":
+        for x in range(width):
+            t = t_lo + (t_hi - t_lo) * x / (width - 1)
+            grid[row(interpolate(cfg.points, t))][x] = "·"
+    else:
+        for y in range(height):
+            grid[y][col(cfg.target)] = "┊"
+    if point.t_eff is not None and point.output is not None:
+        grid[row(point.output)][col(point.t_eff)] = "●"
+
+    lines = ["".join(r) for r in grid]
+    scale = f"{t_lo:.0f}°C".ljust(width - 6) + f"{t_hi:.0f}°C"
+    return lines + [scale[:width]]
+
+
+# --- ohne TUI -----------------------------------------------------------------
+
+
+def snapshot(paths: Sequence[str]) -> Dict[str, int]:
+    out = {}
+    with SysfsSampler() as sampler:
+        for path in paths:
+            val = sampler.read_int(path)
+            if val is not None:
+                out[path] = val
+    return out
+
+
+def restore(state: Dict[str, int]) -> None:
+    for path, val in state.items():
+        sysfs_write_int(path, val)
+
+
+def format_point(p: OperatingPoint) -> str:
+    temp = f"{p.temp:5.1f}°C" if p.temp is not None else "  ?  °C"
+    target = f"{p.target:5.1f}" if p.target is not None else "  ?  "
+    out = f"{p.output:3d}" if p.output is not None else "  ?"
+    return f"pwm{p.pwm}: {temp} → Soll {target} → PWM {out} ({p.mode}, {p.source})"
+
+
+def main():
+    from fan_discovery import load_setup
+
+    parser = argparse.ArgumentParser(description="Software-Lüfterkurven ohne TUI (Ctrl+C stellt den Startzustand wieder her).")
+    parser.add_argument("config", help="JSON-Konfiguration, siehe fan_curve.example.json")
+    parser.add_argument("--chip", help="hwmon-Chipname der PWM-Kanäle (Standard: Profil/Autoerkennung)")
+    parser.add_argument("--hwmon", help="hwmon-Verzeichnis direkt angeben (überschreibt --chip)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Arbeitspunkte jede Sekunde ausgeben")
+    args = parser.parse_args()
+    hwmon_dir = args.hwmon or load_setup(args.chip).hwmon_dir
+
+    try:
+        engine = build_engine(args.config, hwmon_dir)
+    except CurveConfigError as e:
+        parser.error(str(e))
+
+    paths = []
+    for c in engine.controls:
+        paths += [c.pwm_path, c.enable_path]
+    state = snapshot(paths)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    engine.start()
+    try:
+        while not stop.wait(1.0):
+            if args.verbose:
+                print("  ".join(format_point(p) for p in engine.status()), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.stop()
+        restore(state)
+    print(
+        f"{engine.ticks} Ticks, {engine.overruns} verpasst, max. Verspätung "
+        f"{engine.max_jitter * 1000:.1f} ms, {engine.errors} Schreibfehler. Startzustand wiederhergestellt.",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Findet den Lüfter-Chip (hwmon mit pwmN + fanN_input) über seinen Namen
+statt über die Nummer – hwmonN ist nicht über Bootvorgänge/Kernel stabil.
+
+Optional lernt `pair` die echte Zuordnung pwmN → fanM: jeder PWM-Kanal
+wird kurz verstellt, und es wird beobachtet, welcher fan*_input reagiert.
+Das Ergebnis landet in einem kleinen Profil
+(~/.config/linux-hardware-tools/fans.json), damit die TUIs beim Start nur
+noch die hwmon-Namen lesen müssen.
+
+    ./fan_discovery.py list                  # alle Chips mit PWM-Kanälen
+    sudo ./fan_discovery.py pair --save      # Zuordnung lernen + speichern
+    ./fan_discovery.py resolve               # hwmon-Verzeichnis (für Shell-Skripte)
+    ./fan_discovery.py fan-for 2             # fanM_input zu pwm2
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from sysfs_sampler import SysfsSampler, write_int  # noqa: E402
+
+HWMON_BASE = "/sys/class/hwmon"
+
+# Super-I/O-Chips zuerst, wenn kein Name vorgegeben ist (amdgpu hat auch pwm1)
+PREFERRED_PREFIXES = ("nct", "it8", "f71", "f81", "w83", "asus", "dell", "thinkpad")
+
+# bisheriger fester Wert der Skripte, falls gar nichts gefunden wird
+LEGACY_HWMON_DIR = "/sys/class/hwmon/hwmon2"
+LEGACY_CHANNELS = [1, 2, 5]
+
+PROFILE_VERSION = 1
+
+_PWM = re.compile(r"^pwm(\d+)$")
+_FAN = re.compile(r"^fan(\d+)_input$")
+
+
+class PwmChip(NamedTuple):
+    name: str
+    hwmon_dir: str
+    device: str  # realpath von hwmonN/device, unterscheidet gleichnamige Chips
+    pwms: List[int]
+    fans: List[int]
+
+
+class FanSetup(NamedTuple):
+    """Was die TUIs brauchen: Chip, Kanäle und pwm → fan-Zuordnung."""
+
+    name: str
+    hwmon_dir: str
+    channels: List[int]
+    fan_map: Dict[int, int]
+    source: str  # "profile", "scan" oder "legacy"
+
+    def fan_for(self, pwm: int) -> int:
+        return self.fan_map.get(pwm, pwm)
+
+
+def profile_path() -> str:
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.environ.get("FAN_PROFILE") or os.path.join(base, "linux-hardware-tools", "fans.json")
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _hwmon_entries() -> List[str]:
+    try:
+        return sorted(os.listdir(HWMON_BASE), key=lambda e: int(e[5:]) if e[5:].isdigit() else 0)
+    except OSError:
+        return []
+
+
+def _device(hwmon_dir: str) -> str:
+    return os.path.realpath(os.path.join(hwmon_dir, "device"))
+
+
+def find_pwm_chips() -> List[PwmChip]:
+    """Alle hwmon-Geräte mit mindestens einem pwmN."""
+    chips = []
+    for entry in _hwmon_entries():
+        hwmon_dir = os.path.join(HWMON_BASE, entry)
+        try:
+            files = os.listdir(hwmon_dir)
+        except OSError:
+            continue
+        pwms = sorted(int(m.group(1)) for m in map(_PWM.match, files) if m)
+        if not pwms:
+            continue
+        fans = sorted(int(m.group(1)) for m in map(_FAN.match, files) if m)
+        name = _read(os.path.join(hwmon_dir, "name")) or entry
+        chips.append(PwmChip(name, hwmon_dir, _device(hwmon_dir), pwms, fans))
+    return chips
+
+
+def find_chip_dir(name: str, device: Optional[str] = None) -> Optional[str]:
+    """
+    hwmon-Verzeichnis zum Chipnamen, nur über die name-Dateien (schnell).
+    Bei mehreren gleichnamigen Chips entscheidet device.
+    """
+    matches = []
+    for entry in _hwmon_entries():
+        hwmon_dir = os.path.join(HWMON_BASE, entry)
+        if _read(os.path.join(hwmon_dir, "name")) == name:
+            matches.append(hwmon_dir)
+    if device and len(matches) > 1:
+        for hwmon_dir in matches:
+            if _device(hwmon_dir) == device:
+                return hwmon_dir
+    return matches[0] if matches else None
+
+
+def pick_chip(chips: List[PwmChip], name: Optional[str] = None) -> Optional[PwmChip]:
+    if name:
+        for chip in chips:
+            if chip.name == name:
+                return chip
+        return None
+    for prefix in PREFERRED_PREFIXES:
+        for chip in chips:
+            if chip.name.startswith(prefix):
+                return chip
+    return chips[0] if chips else None
+
+
+# --- Profil -------------------------------------------------------------------
+
+
+def load_profile(path: Optional[str] = None) -> Optional[dict]:
+    path = path or profile_path()
+    try:
+        with open(path, "r") as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if profile.get("version") != PROFILE_VERSION or "chip" not in profile:
+        return None
+    return profile
+
+
+def save_profile(profile: dict, path: Optional[str] = None) -> str:
+    path = path or profile_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(profile, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+    return path
+
+
+def make_profile(chip: PwmChip, channels: List[int], fan_map: Dict[int, int]) -> dict:
+    return {
+        "version": PROFILE_VERSION,
+        "chip": chip.name,
+        "device": chip.device,
+        "channels": channels,
+        "fan_map": {str(k): v for k, v in sorted(fan_map.items())},
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def load_setup(chip_name: Optional[str] = None, use_profile: bool = True) -> FanSetup:
+    """
+    Chip + Kanäle für die TUIs. Reihenfolge: Profil (nur name-Dateien lesen),
+    sonst Scan aller hwmon-Geräte, sonst der alte feste Wert hwmon2/[1, 2, 5].
+    """
+    profile = load_profile() if use_profile else None
+    if profile is not None and chip_name in (None, profile["chip"]):
+        hwmon_dir = find_chip_dir(profile["chip"], profile.get("device"))
+        if hwmon_dir is not None:
+            fan_map = {int(k): int(v) for k, v in profile.get("fan_map", {}).items()}
+            channels = [int(c) for c in profile.get("channels", [])] or sorted(fan_map)
+            return FanSetup(profile["chip"], hwmon_dir, channels, fan_map, "profile")
+
+    chip = pick_chip(find_pwm_chips(), chip_name)
+    if chip is not None:
+        # ohne Pairing: pwmN ↔ fanN, soweit fanN_input existiert
+        fan_map = {p: p for p in chip.pwms if p in chip.fans}
+        return FanSetup(chip.name, chip.hwmon_dir, chip.pwms, fan_map, "scan")
+
+    return FanSetup(chip_name or "?", LEGACY_HWMON_DIR, list(LEGACY_CHANNELS), {}, "legacy")
+
+
+# --- Pairing ------------------------------------------------------------------
+
+
+def _read_fans(sampler: SysfsSampler, chip: PwmChip) -> Dict[int, int]:
+    out = {}
+    for fan in chip.fans:
+        val = sampler.read_int(os.path.join(chip.hwmon_dir, f"fan{fan}_input"))
+        if val is not None:
+            out[fan] = val
+    return out
+
+
+def _average_fans(sampler: SysfsSampler, chip: PwmChip, duration: float) -> Dict[int, float]:
+    sums: Dict[int, float] = {}
+    n = 0
+    t_end = time.monotonic() + duration
+    while True:
+        for fan, val in _read_fans(sampler, chip).items():
+            sums[fan] = sums.get(fan, 0.0) + val
+        n += 1
+        if time.monotonic() >= t_end:
+            break
+        time.sleep(0.25)
+    return {fan: total / n for fan, total in sums.items()}
+
+
+def pair_channels(
+    chip: PwmChip,
+    settle: float = 5.0,
+    min_delta: float = 150.0,
+    log: Callable[[str], None] = print,
+) -> Dict[int, int]:
+    """
+    Lernt pwm → fan: jeder Kanal wird kurz auf 255 gestellt (lief er schon
+    schnell, stattdessen auf 120), der fan*_input mit der größten
+    RPM-Änderung gehört dazu. Braucht root. Der Ausgangszustand aller
+    PWM-Kanäle wird in jedem Fall wiederhergestellt.
+    """
+    sampler = SysfsSampler()
+    state: Dict[str, int] = {}
+    for pwm in chip.pwms:
+        for path in (os.path.join(chip.hwmon_dir, f"pwm{pwm}"), os.path.join(chip.hwmon_dir, f"pwm{pwm}_enable")):
+            val = sampler.read_int(path)
+            if val is not None:
+                state[path] = val
+
+    fan_map: Dict[int, int] = {}
+    try:
+        for pwm in chip.pwms:
+            pwm_file = os.path.join(chip.hwmon_dir, f"pwm{pwm}")
+            enable_file = pwm_file + "_enable"
+            base = _average_fans(sampler, chip, 1.0)
+            cur = sampler.read_int(pwm_file) or 0
+            probe = 255 if cur < 200 else 120  # Richtung mit deutlicher Änderung, möglichst nach oben
+            if not (write_int(enable_file, 1) and write_int(pwm_file, probe)):
+                log(f"pwm{pwm}: Schreiben fehlgeschlagen (root?) – übersprungen")
+                continue
+
+            deltas: Dict[int, float] = {}
+            t_end = time.monotonic() + settle
+            while time.monotonic() < t_end:
+                time.sleep(0.5)
+                now = _read_fans(sampler, chip)
+                deltas = {fan: abs(now[fan] - base.get(fan, now[fan])) for fan in now}
+                # früh abbrechen, sobald ein Lüfter eindeutig reagiert
+                ranked = sorted(deltas.values(), reverse=True)
+                if ranked and ranked[0] >= 2 * min_delta and (len(ranked) == 1 or ranked[0] > 3 * ranked[1]):
+                    break
+
+            for path in (enable_file, pwm_file):
+                if path in state:
+                    write_int(path, state[path])
+
+            ranked = sorted(deltas.items(), key=lambda kv: kv[1], reverse=True)
+            if ranked and ranked[0][1] >= min_delta and (len(ranked) == 1 or ranked[0][1] > 2 * ranked[1][1]):
+                fan_map[pwm] = ranked[0][0]
+                log(f"pwm{pwm} → fan{ranked[0][0]} (Δ {ranked[0][1]:.0f} RPM)")
+            else:
+                log(f"pwm{pwm}: kein eindeutiger Lüfter (Δ max {ranked[0][1] if ranked else 0:.0f} RPM)")
+            # Lüfter zurück auf den alten Wert kommen lassen, bevor der nächste Kanal misst
+            time.sleep(settle / 2)
+    finally:
+        for path, val in state.items():
+            write_int(path, val)
+        sampler.close()
+    return fan_map
+
+
+# --- CLI ----------------------------------------------------------------------
+
+
+def cmd_list(args) -> int:
+    chips = find_pwm_chips()
+    if not chips:
+        print("Kein hwmon-Gerät mit pwmN gefunden.", file=sys.stderr)
+        return 1
+    for chip in chips:
+        pwms = ",".join(map(str, chip.pwms))
+        fans = ",".join(map(str, chip.fans)) or "-"
+        print(f"{chip.name:<12} {chip.hwmon_dir:<28} pwm {pwms:<14} fan {fans}")
+        print(f"{'':<12} {chip.device}")
+    setup = load_setup(args.chip)
+    print(f"\nVerwendet: {setup.name} ({setup.hwmon_dir}), Quelle {setup.source}, Profil {profile_path()}")
+    return 0
+
+
+def cmd_pair(args) -> int:
+    chip = pick_chip(find_pwm_chips(), args.chip)
+    if chip is None:
+        print("Kein passender Chip gefunden.", file=sys.stderr)
+        return 1
+    if hasattr(os, "geteuid") and os.geteuid() != 0:
+        print("Pairing braucht root (schreibt pwmN).", file=sys.stderr)
+        return 1
+    print(f"Pairing auf {chip.name} ({chip.hwmon_dir}), pwm {chip.pwms}, fan {chip.fans}")
+    fan_map = pair_channels(chip, settle=args.settle, min_delta=args.min_delta)
+    channels = [p for p in chip.pwms if p in fan_map] or chip.pwms
+    if args.save:
+        print(f"Profil gespeichert: {save_profile(make_profile(chip, channels, fan_map))}")
+    return 0
+
+
+def cmd_resolve(args) -> int:
+    setup = load_setup(args.chip)
+    if setup.source == "legacy":
+        print(f"Kein Lüfter-Chip gefunden{f' ({args.chip})' if args.chip else ''}.", file=sys.stderr)
+        return 1
+    print(setup.hwmon_dir)
+    return 0
+
+
+def cmd_fan_for(args) -> int:
+    print(load_setup(args.chip).fan_for(args.pwm))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lüfter-Chip und pwm → fan-Zuordnung finden.")
+    parser.add_argument("--chip", help="Chipname (hwmon name), z.B. nct6798")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="alle Chips mit PWM-Kanälen")
+    p_pair = sub.add_parser("pair", help="pwm → fan lernen (root, verstellt jeden Kanal kurz)")
+    p_pair.add_argument("--save", action="store_true", help=f"als Profil speichern ({profile_path()})")
+    p_pair.add_argument("--settle", type=float, default=5.0, help="max. Wartezeit pro Kanal in s (Standard 5)")
+    p_pair.add_argument("--min-delta", type=float, default=150.0, help="min. RPM-Änderung (Standard 150)")
+    sub.add_parser("resolve", help="hwmon-Verzeichnis ausgeben")
+    p_fan = sub.add_parser("fan-for", help="fanM zu pwmN ausgeben")
+    p_fan.add_argument("pwm", type=int)
+    args = parser.parse_args()
+
+    handler = {"list": cmd_list, "pair": cmd_pair, "resolve": cmd_resolve, "fan-for": cmd_fan_for}
+    sys.exit(handler[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,31 @@
 #!/usr/bin/env python3
 import curses
 import os
+import sys
 import time
 from typing import Optional
 
-HWMON_DIR = "/sys/class/hwmon/hwmon2"  # nct6798
-CHANNELS = [1, 2, 5]  # typische Zuordnung: CPU / Case / Pumpe
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from sysfs_sampler import SysfsSampler, write_int as sysfs_write_int  # noqa: E402
+
+from fan_discovery import load_setup  # noqa: E402
+
+SETUP = load_setup()  # Chip per Name (Profil/Scan), siehe fan_discovery.py
+HWMON_DIR = SETUP.hwmon_dir
+CHANNELS = list(SETUP.channels)  # z.B. CPU / Case / Pumpe
 UPDATE_INTERVAL = 0.25  # Sekunden, ca. 4x pro Sekunde
 
 
+# offene Deskriptoren für alle pwm/fan-Attribute (pread statt open/read/close)
+_SAMPLER = SysfsSampler()
+
+
 def read_int(path: str) -> Optional[int]:
-    try:
-        with open(path, "r") as f:
-            return int(f.read().strip())
-    except Exception:
-        return None
+    return _SAMPLER.read_int(path)
 
 
 def write_int(path: str, value: int) -> bool:
-    try:
-        with open(path, "w") as f:
-            f.write(str(value))
-        return True
-    except Exception:
-        return False
+    return sysfs_write_int(path, value)
 
 
 def pwm_path(ch: int) -> str:
@@ -35,7 +37,7 @@ def pwm_enable_path(ch: int) -> str:
 
 
 def fan_input_path(ch: int) -> str:
-    return os.path.join(HWMON_DIR, f"fan{ch}_input")
+    return os.path.join(HWMON_DIR, f"fan{SETUP.fan_for(ch)}_input")
 
 
 def clamp(val: int, lo: int, hi: int) -> int:
@@ -51,7 +53,7 @@ def main(stdscr):
     last_msg = ""
 
     if not os.path.isdir(HWMON_DIR):
-        stdscr.addstr(0, 0, f"{HWMON_DIR} nicht gefunden (nct6798?).")
+        stdscr.addstr(0, 0, f"{HWMON_DIR} nicht gefunden ({SETUP.name}?).")
         stdscr.addstr(1, 0, "Beenden mit q.")
         while True:
             ch = stdscr.getch()
@@ -117,7 +119,7 @@ def main(stdscr):
         last_update = now
 
         stdscr.erase()
-        stdscr.addstr(0, 0, "Fan/Pumpen-Steuerung (nct6798 hwmon2)")
+        stdscr.addstr(0, 0, f"Fan/Pumpen-Steuerung ({SETUP.name} {os.path.basename(HWMON_DIR)})")
         mode_str = "root (Schreiben erlaubt)" if is_root else "nicht-root (nur Lesen, keine PWM-Änderung)"
         stdscr.addstr(1, 0, f"Modus: {mode_str}")
         stdscr.addstr(2, 0, "q: Quit  ↑/↓/TAB: Kanal wählen  ←/→/-/+: PWM  a: Auto/Manuell")
@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+Kennlinie PWM → RPM für Lüfter und Pumpe messen (Ersatz für das
+Durchklicken mit test_pumpen_drehzahl.sh).
+
+Pro Kanal wird von 255 abwärts in Schritten gemessen. Statt fester
+sleeps wird nach jedem Schritt gewartet, bis die Drehzahl eingeschwungen
+ist (Spannweite im Fenster klein, mit Timeout). Bleibt der Lüfter stehen,
+ist die Stall-Schwelle gefunden; danach geht es in feinen Schritten
+wieder hoch, bis er aus dem Stand anläuft (Anlauf-Schwelle). Über die
+laufenden Punkte wird eine quadratische Kurve gefittet.
+
+Thermische Sicherheit: die CPU-Temperatur (oder --temp) wird bei jedem
+Sample gelesen. Mehrere Kanäle laufen nur parallel, solange sie unter
+--parallel-temp liegt; bei --max-temp wird abgebrochen. Kanäle, die gerade
+nicht gemessen werden, stehen auf 255. Der Startzustand aller Kanäle wird
+in jedem Fall (auch bei Abbruch/Ctrl+C/SIGTERM) wiederhergestellt.
+
+Ergebnisse landen als JSON in fan_sweeps/ und lassen sich mit früheren
+Messungen vergleichen (z.B. um eine nachlassende Pumpe zu erkennen):
+
+    sudo ./fan_sweep.py run
+    sudo ./fan_sweep.py run --channels 1,2 --parallel 2 --floor 5=120
+    ./fan_sweep.py show fan_sweeps/sweep_2025-01-01_12-00-00.json
+    ./fan_sweep.py compare alt.json neu.json
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from sysfs_sampler import SysfsSampler, write_int as sysfs_write_int  # noqa: E402
+
+from fan_curve import PWM_ENABLE_MANUAL, PWM_MAX, CurveConfigError, resolve_source, restore, snapshot  # noqa: E402
+from fan_discovery import load_setup  # noqa: E402
+from temp_monitor_tui import find_temp_sensors  # noqa: E402
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT_DIR = os.path.join(SCRIPT_DIR, "fan_sweeps")
+
+SAMPLE_INTERVAL = 0.25  # Sekunden
+SETTLE_WINDOW = 2.0  # so lange muss die Drehzahl ruhig sein
+SETTLE_MIN_WAIT = 1.0  # frühestens nach so vielen Sekunden messen
+SETTLE_TIMEOUT = 20.0  # danach gilt der Punkt als "nicht eingeschwungen"
+SETTLE_TOL_RPM = 25.0
+SETTLE_TOL_REL = 0.02
+STALL_RPM = 60  # darunter steht der Lüfter (manche Tachos melden Reste)
+
+DEFAULT_STEP = 10
+DEFAULT_FINE_STEP = 3
+DEFAULT_MAX_TEMP = 85.0
+DEFAULT_PARALLEL_TEMP = 65.0
+
+DEGRADE_THRESHOLD = 0.10  # -10 % Drehzahl gegenüber der alten Messung
+
+RESULT_VERSION = 1
+
+
+class SweepAborted(RuntimeError):
+    pass
+
+
+class SweepPoint(NamedTuple):
+    pwm: int
+    rpm: float
+    settle_s: float
+    settled: bool
+    phase: str  # "down" oder "up"
+
+
+class SettleDetector:
+    """
+    Eingeschwungen, wenn alle Samples der letzten SETTLE_WINDOW Sekunden
+    innerhalb max(SETTLE_TOL_RPM, SETTLE_TOL_REL * Mittel) liegen. Stillstand
+    (nur Nullen) muss doppelt so lange anhalten – Anlaufen dauert.
+    """
+
+    def __init__(
+        self,
+        window: float = SETTLE_WINDOW,
+        min_wait: float = SETTLE_MIN_WAIT,
+        timeout: float = SETTLE_TIMEOUT,
+    ):
+        self.window = window
+        self.min_wait = min_wait
+        self.timeout = timeout
+        self.samples: Deque[Tuple[float, int]] = deque()
+        self.t_start = 0.0
+
+    def reset(self, now: float) -> None:
+        self.samples.clear()
+        self.t_start = now
+
+    def mean(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(r for _, r in self.samples) / len(self.samples)
+
+    def add(self, now: float, rpm: Optional[int]) -> Optional[bool]:
+        """None: weiter warten, True: eingeschwungen, False: Timeout."""
+        if rpm is not None and now - self.t_start >= self.min_wait:
+            self.samples.append((now, rpm))
+        if not self.samples:
+            return False if now - self.t_start >= self.timeout else None
+
+        stalled = all(r < STALL_RPM for _, r in self.samples)
+        window = self.window * 2 if stalled else self.window
+        while len(self.samples) > 1 and now - self.samples[1][0] >= window:
+            self.samples.popleft()
+        if now - self.samples[0][0] >= window * 0.95:
+            values = [r for _, r in self.samples]
+            if max(values) - min(values) <= max(SETTLE_TOL_RPM, SETTLE_TOL_REL * self.mean()):
+                return True
+        if now - self.t_start >= self.timeout:
+            return False
+        return None
+
+
+class ChannelSweep:
+    """Ablauf für einen Kanal: abwärts bis Stillstand/Floor, dann fein aufwärts bis Anlauf."""
+
+    def __init__(self, pwm: int, fan: int, hwmon_dir: str, step: int, fine_step: int, floor: int = 0):
+        self.pwm = pwm
+        self.fan = fan
+        self.pwm_path = os.path.join(hwmon_dir, f"pwm{pwm}")
+        self.enable_path = f"{self.pwm_path}_enable"
+        self.fan_path = os.path.join(hwmon_dir, f"fan{fan}_input")
+        self.fine_step = fine_step
+        self.floor = floor
+        plan = list(range(PWM_MAX, floor - 1, -step))
+        if plan[-1] != floor:
+            plan.append(floor)
+        self.plan = plan
+        self.phase = "down"
+        self.target: Optional[int] = None
+        self.points: List[SweepPoint] = []
+        self.stall_pwm: Optional[int] = None  # erster PWM-Wert abwärts, bei dem er stand
+        self.start_pwm: Optional[int] = None  # kleinster PWM-Wert, bei dem er aus dem Stand anlief
+        self.detector = SettleDetector()
+
+    @property
+    def done(self) -> bool:
+        return self.phase == "done"
+
+    def min_running_pwm(self) -> Optional[int]:
+        running = [p.pwm for p in self.points if p.phase == "down" and p.rpm >= STALL_RPM]
+        return min(running) if running else None
+
+    def next_target(self) -> Optional[int]:
+        if self.phase == "down":
+            self.target = self.plan.pop(0) if self.plan else None
+        elif self.phase == "up":
+            nxt = (self.target or 0) + self.fine_step
+            self.target = nxt if nxt <= PWM_MAX else None
+        else:
+            self.target = None
+        if self.target is None:
+            self.phase = "done"
+        return self.target
+
+    def finish_point(self, rpm: float, settle_s: float, settled: bool) -> None:
+        self.points.append(SweepPoint(self.target, round(rpm, 1), round(settle_s, 2), settled, self.phase))
+        if self.phase == "down" and rpm < STALL_RPM:
+            self.stall_pwm = self.target
+            self.phase = "up"
+        elif self.phase == "up" and rpm >= STALL_RPM:
+            self.start_pwm = self.target
+            self.phase = "done"
+
+
+# --- Temperatur ---------------------------------------------------------------
+
+
+def default_temp_paths() -> List[str]:
+    """temp*_input aller CPU-Sensoren (k10temp, coretemp, ...)."""
+    paths = []
+    for category, _name, hwmon_dir, temps in find_temp_sensors():
+        if category == "CPU":
+            paths += [os.path.join(hwmon_dir, f"temp{idx}_input") for idx in temps]
+    return paths
+
+
+def max_temp(sampler: SysfsSampler, paths: Sequence[str]) -> Optional[float]:
+    vals = [v for v in sampler.read_ints(paths) if v is not None]
+    return max(vals) / 1000.0 if vals else None
+
+
+# --- Ablauf -------------------------------------------------------------------
+
+
+def run_sweeps(
+    sweeps: List[ChannelSweep],
+    temp_paths: Sequence[str],
+    parallel: int = 1,
+    max_temp_c: float = DEFAULT_MAX_TEMP,
+    parallel_temp_c: float = DEFAULT_PARALLEL_TEMP,
+    write_int: Callable[[str, int], bool] = sysfs_write_int,
+    stop: Optional[threading.Event] = None,
+    log: Callable[[str], None] = print,
+) -> Optional[float]:
+    """
+    Misst alle Kanäle, höchstens `parallel` gleichzeitig. Gibt die höchste
+    gesehene Temperatur zurück. Das Wiederherstellen ist Sache des Aufrufers.
+    """
+    if not temp_paths and parallel > 1:
+        log("Keine Temperatursensoren: Kanäle werden nacheinander gemessen.")
+        parallel = 1
+
+    # alle Kanäle auf manuell + volle Kühlung, bevor irgendetwas runtergeht
+    for s in sweeps:
+        if not (write_int(s.enable_path, PWM_ENABLE_MANUAL) and write_int(s.pwm_path, PWM_MAX)):
+            raise SweepAborted(f"pwm{s.pwm}: Schreiben fehlgeschlagen (root?)")
+
+    pending = list(sweeps)
+    active: List[ChannelSweep] = []
+    peak_temp = float("-inf")
+    sampler = SysfsSampler()
+    try:
+        next_t = time.monotonic()
+        while pending or active:
+            if stop is not None and stop.is_set():
+                raise SweepAborted("abgebrochen (Signal)")
+            now = time.monotonic()
+
+            temp = max_temp(sampler, temp_paths) if temp_paths else None
+            if temp is not None:
+                peak_temp = max(peak_temp, temp)
+                if temp >= max_temp_c:
+                    raise SweepAborted(f"Temperatur {temp:.1f}°C ≥ {max_temp_c:g}°C")
+            allowed = parallel if temp is not None and temp < parallel_temp_c else 1
+
+            while pending and len(active) < allowed:
+                s = pending.pop(0)
+                write_int(s.pwm_path, s.next_target())
+                s.detector.reset(now)
+                active.append(s)
+                log(f"pwm{s.pwm} (fan{s.fan}): Messung startet")
+
+            for s in list(active):
+                state = s.detector.add(now, sampler.read_int(s.fan_path))
+                if state is None:
+                    continue
+                s.finish_point(s.detector.mean(), now - s.detector.t_start, state)
+                p = s.points[-1]
+                log(
+                    f"pwm{s.pwm}: {p.pwm:3d} → {p.rpm:6.0f} RPM ({p.settle_s:4.1f} s"
+                    f"{'' if p.settled else ', nicht eingeschwungen'})"
+                )
+                target = s.next_target() if not s.done else None
+                if target is None:
+                    # fertig: bis zum Restore volle Kühlung
+                    write_int(s.pwm_path, PWM_MAX)
+                    active.remove(s)
+                    log(f"pwm{s.pwm}: fertig, Stall {s.stall_pwm}, Anlauf {s.start_pwm}")
+                else:
+                    write_int(s.pwm_path, target)
+                    s.detector.reset(now)
+
+            next_t += SAMPLE_INTERVAL
+            delay = next_t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_t = time.monotonic()
+    finally:
+        sampler.close()
+    return peak_temp if peak_temp != float("-inf") else None
+
+
+# --- Fit ----------------------------------------------------------------------
+
+
+class CurveFit(NamedTuple):
+    coeffs: Tuple[float, float, float]  # rpm = a + b·pwm + c·pwm²
+    r2: float
+    pwm_min: int  # Gültigkeitsbereich (laufende Messpunkte)
+    pwm_max: int
+
+    def rpm(self, pwm: float) -> float:
+        a, b, c = self.coeffs
+        return a + b * pwm + c * pwm * pwm
+
+    def pwm_for_rpm(self, rpm: float) -> Optional[int]:
+        """Kleinster PWM-Wert im Gültigkeitsbereich, der rpm erreicht (für Kurven-Tuning)."""
+        for pwm in range(self.pwm_min, self.pwm_max + 1):
+            if self.rpm(pwm) >= rpm:
+                return pwm
+        return None
+
+
+def _solve3(m: List[List[float]], v: List[float]) -> Optional[List[float]]:
+    """3×3-Gleichungssystem, Gauß mit Pivotsuche."""
+    a = [row[:] + [rhs] for row, rhs in zip(m, v)]
+    for col in range(3):
+        pivot = max(range(col, 3), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < 1e-12:
+            return None
+        a[col], a[pivot] = a[pivot], a[col]
+        for r in range(3):
+            if r != col:
+                f = a[r][col] / a[col][col]
+                for k in range(col, 4):
+                    a[r][k] -= f * a[col][k]
+    return [a[i][3] / a[i][i] for i in range(3)]
+
+
+def fit_curve(points: Sequence[SweepPoint]) -> Optional[CurveFit]:
+    """Quadratischer Least-Squares-Fit über die laufenden Punkte der Abwärtsmessung."""
+    pts = [(p.pwm, p.rpm) for p in points if p.phase == "down" and p.rpm >= STALL_RPM]
+    if len(pts) < 3:
+        return None
+    # Normalgleichungen mit x = pwm/255 (besser konditioniert)
+    sx = [0.0] * 5
+    sxy = [0.0] * 3
+    for pwm, rpm in pts:
+        x = pwm / PWM_MAX
+        xp = 1.0
+        for k in range(5):
+            if k < 3:
+                sxy[k] += xp * rpm
+            sx[k] += xp
+            xp *= x
+    sol = _solve3([[sx[i + j] for j in range(3)] for i in range(3)], sxy)
+    if sol is None:
+        return None
+    coeffs = (sol[0], sol[1] / PWM_MAX, sol[2] / (PWM_MAX * PWM_MAX))
+    fit = CurveFit(coeffs, 0.0, min(p for p, _ in pts), max(p for p, _ in pts))
+    mean = sum(r for _, r in pts) / len(pts)
+    ss_tot = sum((r - mean) ** 2 for _, r in pts)
+    ss_res = sum((r - fit.rpm(p)) ** 2 for p, r in pts)
+    return fit._replace(r2=1.0 - ss_res / ss_tot if ss_tot > 0 else 1.0)
+
+
+# --- Ergebnisse ---------------------------------------------------------------
+
+
+def sweep_result(s: ChannelSweep) -> dict:
+    fit = fit_curve(s.points)
+    return {
+        "fan": s.fan,
+        "floor": s.floor,
+        "points": [list(p) for p in s.points],
+        "stall_pwm": s.stall_pwm,
+        "start_pwm": s.start_pwm,
+        "min_running_pwm": s.min_running_pwm(),
+        "max_rpm": max((p.rpm for p in s.points), default=None),
+        "fit": None if fit is None else {
+            "coeffs": list(fit.coeffs), "r2": fit.r2, "pwm_min": fit.pwm_min, "pwm_max": fit.pwm_max,
+        },
+    }
+
+
+def load_result(path: str) -> dict:
+    with open(path, "r") as f:
+        result = json.load(f)
+    if result.get("version") != RESULT_VERSION:
+        raise ValueError(f"{path}: unbekannte Version {result.get('version')!r}")
+    return result
+
+
+def result_fit(channel: dict) -> Optional[CurveFit]:
+    raw = channel.get("fit")
+    if not raw:
+        return None
+    return CurveFit(tuple(raw["coeffs"]), raw["r2"], raw["pwm_min"], raw["pwm_max"])
+
+
+def print_result(result: dict) -> None:
+    state = " (ABGEBROCHEN)" if result.get("aborted") else ""
+    print(f"{result['chip']} {result['hwmon_dir']}, {result['created']}{state}")
+    for pwm, ch in sorted(result["channels"].items(), key=lambda kv: int(kv[0])):
+        fit = result_fit(ch)
+        fit_str = "kein Fit" if fit is None else (
+            f"Fit {fit.rpm(fit.pwm_min):.0f}–{fit.rpm(fit.pwm_max):.0f} RPM "
+            f"(PWM {fit.pwm_min}–{fit.pwm_max}), R² {fit.r2:.3f}"
+        )
+        max_rpm = f"{ch['max_rpm']:.0f}" if ch["max_rpm"] is not None else "?"
+        print(
+            f"  pwm{pwm} → fan{ch['fan']}: max {max_rpm} RPM, "
+            f"Stall {ch['stall_pwm'] if ch['stall_pwm'] is not None else '-'}, "
+            f"Anlauf {ch['start_pwm'] if ch['start_pwm'] is not None else '-'}, {fit_str}"
+        )
+        line = "  ".join(f"{p[0]}:{p[1]:.0f}" for p in ch["points"] if p[4] == "down")
+        print(f"    {line}")
+
+
+class ChannelComparison(NamedTuple):
+    pwm: int
+    max_rpm_change: Optional[float]  # relativ, -0.1 = 10 % langsamer
+    curve_change: Optional[float]  # mittlere relative Abweichung der Fits im gemeinsamen Bereich
+    stall_shift: Optional[int]
+    degraded: bool
+
+
+def _rel(new: Optional[float], old: Optional[float]) -> Optional[float]:
+    if new is None or not old:
+        return None
+    return (new - old) / old
+
+
+def compare_results(old: dict, new: dict, threshold: float = DEGRADE_THRESHOLD) -> List[ChannelComparison]:
+    out = []
+    for key in sorted(set(old["channels"]) & set(new["channels"]), key=int):
+        o, n = old["channels"][key], new["channels"][key]
+        max_change = _rel(n["max_rpm"], o["max_rpm"])
+        curve_change = None
+        fo, fn = result_fit(o), result_fit(n)
+        if fo is not None and fn is not None:
+            lo, hi = max(fo.pwm_min, fn.pwm_min), min(fo.pwm_max, fn.pwm_max)
+            rel = [_rel(fn.rpm(p), fo.rpm(p)) for p in range(lo, hi + 1, 5) if fo.rpm(p) > 0]
+            rel = [r for r in rel if r is not None]
+            if rel:
+                curve_change = sum(rel) / len(rel)
+        stall_shift = None
+        if o["stall_pwm"] is not None and n["stall_pwm"] is not None:
+            stall_shift = n["stall_pwm"] - o["stall_pwm"]
+        degraded = any(c is not None and c <= -threshold for c in (max_change, curve_change))
+        out.append(ChannelComparison(int(key), max_change, curve_change, stall_shift, degraded))
+    return out
+
+
+# --- CLI ----------------------------------------------------------------------
+
+
+def parse_channels(text: str) -> List[int]:
+    return [int(c) for c in text.split(",") if c.strip()]
+
+
+def parse_floor(items: Sequence[str]) -> Dict[int, int]:
+    out = {}
+    for item in items:
+        ch, _, val = item.partition("=")
+        out[int(ch)] = max(0, min(PWM_MAX, int(val)))
+    return out
+
+
+def cmd_run(args) -> int:
+    setup = load_setup(args.chip)
+    if not os.path.isdir(setup.hwmon_dir):
+        print(f"{setup.hwmon_dir} nicht gefunden ({setup.name}?).", file=sys.stderr)
+        return 1
+    if hasattr(os, "geteuid") and os.geteuid() != 0:
+        print("Die Messung braucht root (schreibt pwmN).", file=sys.stderr)
+        return 1
+    channels = parse_channels(args.channels) if args.channels else setup.channels
+    floors = parse_floor(args.floor)
+    try:
+        temp_paths = [resolve_source(t) for t in args.temp] if args.temp else default_temp_paths()
+    except CurveConfigError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    if not temp_paths:
+        print("WARNUNG: keine Temperatursensoren, kein thermischer Abbruch möglich.", file=sys.stderr)
+
+    sweeps = [
+        ChannelSweep(ch, setup.fan_for(ch), setup.hwmon_dir, args.step, args.fine_step, floors.get(ch, 0))
+        for ch in channels
+    ]
+    paths = []
+    for s in sweeps:
+        paths += [s.pwm_path, s.enable_path]
+    state = snapshot(paths)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    aborted = None
+    peak_temp = None
+    t0 = time.monotonic()
+    try:
+        peak_temp = run_sweeps(sweeps, temp_paths, args.parallel, args.max_temp, args.parallel_temp, stop=stop)
+    except SweepAborted as e:
+        aborted = str(e)
+    except KeyboardInterrupt:
+        aborted = "abgebrochen (Ctrl+C)"
+    finally:
+        restore(state)
+    print(f"Startzustand wiederhergestellt ({time.monotonic() - t0:.0f} s).", file=sys.stderr)
+    if aborted:
+        print(f"ABBRUCH: {aborted}", file=sys.stderr)
+
+    result = {
+        "version": RESULT_VERSION,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "chip": setup.name,
+        "hwmon_dir": setup.hwmon_dir,
+        "aborted": aborted,
+        "max_temp_c": peak_temp,
+        "channels": {str(s.pwm): sweep_result(s) for s in sweeps if s.points},
+    }
+    out = args.out or os.path.join(DEFAULT_OUT_DIR, f"sweep_{time.strftime('%Y-%m-%d_%H-%M-%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(result, f, indent=2)
+        f.write("\n")
+    print_result(result)
+    print(f"Gespeichert: {out}")
+
+    if args.compare:
+        return print_comparison(load_result(args.compare), result, args.threshold)
+    return 1 if aborted else 0
+
+
+def print_comparison(old: dict, new: dict, threshold: float) -> int:
+    def pct(v: Optional[float]) -> str:
+        return f"{v * 100:+6.1f}%" if v is not None else "     ?"
+
+    print(f"Vergleich {old['created']} → {new['created']}")
+    degraded = False
+    for c in compare_results(old, new, threshold):
+        shift = f"{c.stall_shift:+d}" if c.stall_shift is not None else "?"
+        flag = "  SCHWÄCHER" if c.degraded else ""
+        print(f"  pwm{c.pwm}: max_rpm {pct(c.max_rpm_change)}  Kurve {pct(c.curve_change)}  Stall {shift}{flag}")
+        degraded |= c.degraded
+    return 1 if degraded else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PWM → RPM-Kennlinien messen und vergleichen.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Kanäle messen (root, Startzustand wird wiederhergestellt)")
+    p_run.add_argument("--chip", help="hwmon-Chipname (Standard: Profil/Autoerkennung)")
+    p_run.add_argument("--channels", help="Kanäle, z.B. 1,2,5 (Standard: alle aus dem Profil)")
+    p_run.add_argument("--step", type=int, default=DEFAULT_STEP, help=f"PWM-Schritt abwärts (Standard {DEFAULT_STEP})")
+    p_run.add_argument("--fine-step", type=int, default=DEFAULT_FINE_STEP,
+                       help=f"PWM-Schritt bei der Anlaufsuche (Standard {DEFAULT_FINE_STEP})")
+    p_run.add_argument("--floor", action="append", default=[], metavar="CH=PWM",
+                       help="Kanal nie unter PWM fahren (z.B. Pumpe: 5=120), mehrfach möglich")
+    p_run.add_argument("--parallel", type=int, default=1, help="max. Kanäle gleichzeitig (Standard 1)")
+    p_run.add_argument("--temp", action="append", default=[], metavar="CHIP/LABEL",
+                       help="Temperaturquelle für die Sicherheit (Standard: alle CPU-Sensoren)")
+    p_run.add_argument("--max-temp", type=float, default=DEFAULT_MAX_TEMP,
+                       help=f"Abbruch ab dieser Temperatur (Standard {DEFAULT_MAX_TEMP:g}°C)")
+    p_run.add_argument("--parallel-temp", type=float, default=DEFAULT_PARALLEL_TEMP,
+                       help=f"parallel nur unterhalb (Standard {DEFAULT_PARALLEL_TEMP:g}°C)")
+    p_run.add_argument("--out", help="Ergebnis-JSON (Standard: fan_sweeps/sweep_<Zeit>.json)")
+    p_run.add_argument("--compare", metavar="ALT.json", help="danach mit früherer Messung vergleichen")
+    p_run.add_argument("--threshold", type=float, default=DEGRADE_THRESHOLD,
+                       help="Drehzahlverlust, ab dem ein Kanal als schwächer gilt (Standard 0.10)")
+
+    p_show = sub.add_parser("show", help="Messung anzeigen")
+    p_show.add_argument("file")
+
+    p_cmp = sub.add_parser("compare", help="zwei Messungen vergleichen (Exit 1, wenn ein Kanal schwächer ist)")
+    p_cmp.add_argument("old")
+    p_cmp.add_argument("new")
+    p_cmp.add_argument("--threshold", type=float, default=DEGRADE_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if args.parallel < 1 or args.step < 1 or args.fine_step < 1:
+            parser.error("--parallel, --step und --fine-step müssen ≥ 1 sein")
+        sys.exit(cmd_run(args))
+    try:
+        if args.command == "show":
+            print_result(load_result(args.file))
+            sys.exit(0)
+        sys.exit(print_comparison(load_result(args.old), load_result(args.new), args.threshold))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
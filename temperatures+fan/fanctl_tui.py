@@ -1,31 +1,60 @@
 #!/usr/bin/env python3
+import argparse
 import curses
 import os
+import selectors
+import signal
+import sys
 import time
-from typing import Optional, Dict
+from typing import Dict, NamedTuple, Optional
 
-HWMON_DIR = "/sys/class/hwmon/hwmon2"  # nct6798 auf deinem B550I
-CHANNELS = [1, 2, 5]  # typische Zuordnung: CPU / Case / Pumpe
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from sensor_recorder import ReplaySampler, open_replay  # noqa: E402
+from sysfs_sampler import SysfsSampler, write_int as sysfs_write_int  # noqa: E402
+from tui_render import Frame, FrameRenderer  # noqa: E402
 
-# Leerlauf-Update-Intervall (wenn keine Eingabe erfolgt)
+from fan_curve import CurveConfigError, FanCurveEngine, OperatingPoint, build_engine, render_curve  # noqa: E402
+from fan_discovery import FanSetup, load_setup  # noqa: E402
+
+# Chip über seinen Namen finden (Profil von fan_discovery.py pair, sonst Scan),
+# nicht mehr fest hwmon2 – die Nummer ändert sich je nach Ladereihenfolge
+SETUP: FanSetup = load_setup()
+HWMON_DIR = SETUP.hwmon_dir
+CHANNELS = list(SETUP.channels)  # z.B. CPU / Case / Pumpe
+
+# Messwerte (pwm/enable/fan_input) werden nur in diesem Takt gelesen –
+# der Super-I/O-Chip hängt am langsamen LPC-Bus
 UPDATE_INTERVAL = 0.3  # Sekunden (~3x pro Sekunde)
+# gedrückt gehaltene Pfeiltasten: höchstens ein pwmN-Schreibzugriff pro Tick
+WRITE_INTERVAL = 0.1  # Sekunden
+
+
+# offene Deskriptoren für alle pwm/fan-Attribute (pread statt open/read/close)
+_SAMPLER = SysfsSampler()
+
+# --replay: Werte aus einer Aufnahme (sensor_recorder), Schreiben gesperrt
+_REPLAY: Optional[ReplaySampler] = None
 
 
 def read_int(path: str) -> Optional[int]:
-    try:
-        with open(path, "r") as f:
-            return int(f.read().strip())
-    except Exception:
-        return None
+    return _SAMPLER.read_int(path)
 
 
 def write_int(path: str, value: int) -> bool:
-    try:
-        with open(path, "w") as f:
-            f.write(str(value))
-        return True
-    except Exception:
+    if _REPLAY is not None:
         return False
+    return sysfs_write_int(path, value)
+
+
+def start_replay(replay: ReplaySampler) -> None:
+    global _SAMPLER, _REPLAY, HWMON_DIR
+    _SAMPLER.close()
+    _SAMPLER = _REPLAY = replay
+    # aufgenommene Pfade verwenden, auch wenn der Chip heute eine andere hwmon-Nummer hat
+    for c in replay.recording.channels:
+        if c.kind == "pwm" and c.device == SETUP.name:
+            HWMON_DIR = os.path.dirname(c.path)
+            break
 
 
 def pwm_path(ch: int) -> str:
@@ -37,7 +66,7 @@ def pwm_enable_path(ch: int) -> str:
 
 
 def fan_input_path(ch: int) -> str:
-    return os.path.join(HWMON_DIR, f"fan{ch}_input")
+    return os.path.join(HWMON_DIR, f"fan{SETUP.fan_for(ch)}_input")
 
 
 def clamp(val: int, lo: int, hi: int) -> int:
@@ -83,180 +112,367 @@ def restore_initial_state(state: Dict[str, int]) -> None:
 # ------------------------------------------------------------------------
 
 
-def main(stdscr, initial_state: Dict[str, int]):
-    curses.curs_set(0)
-    stdscr.nodelay(True)
-    stdscr.timeout(50)  # alle 50 ms auf Eingaben prüfen
+def curve_off(engine: Optional[FanCurveEngine], ch: int) -> str:
+    """Manuelle Eingabe auf einem Kurven-Kanal schaltet dessen Kurve ab."""
+    c = engine.control(ch) if engine is not None else None
+    if c is None or not c.active:
+        return ""
+    engine.set_active(ch, False)
+    return f"Kurve für pwm{ch} aus (manuell), c schaltet sie wieder ein. "
 
-    is_root = hasattr(os, "geteuid") and os.geteuid() == 0
-    last_msg = ""
 
-    if not os.path.isdir(HWMON_DIR):
-        stdscr.addstr(0, 0, f"{HWMON_DIR} nicht gefunden (nct6798?).")
-        stdscr.addstr(1, 0, "Beenden mit q oder ESC.")
-        while True:
-            ch = stdscr.getch()
-            if ch in (ord("q"), ord("Q"), 27):
-                return
-
-    selected_idx = 0
-    last_update = 0.0
-    force_refresh = True  # beim Start einmal zeichnen
-
-    while True:
-        key = stdscr.getch()
-        now = time.time()
-
-        if key != -1:
-            # jede Eingabe → sofort neu zeichnen
-            if key in (ord("q"), ord("Q")):
-                break
-
-            # ESC → sofort Restore + Exit
-            elif key == 27:
-                if is_root and initial_state:
-                    restore_initial_state(initial_state)
-                break
-
-            # Tab oder Cursor hoch/runter: Kanal wechseln
-            elif key == 9:
-                selected_idx = (selected_idx + 1) % len(CHANNELS)
-                force_refresh = True
-            elif hasattr(curses, "KEY_BTAB") and key == curses.KEY_BTAB:
-                selected_idx = (selected_idx - 1) % len(CHANNELS)
-                force_refresh = True
-            elif key == curses.KEY_UP:
-                selected_idx = (selected_idx - 1) % len(CHANNELS)
-                force_refresh = True
-            elif key == curses.KEY_DOWN:
-                selected_idx = (selected_idx + 1) % len(CHANNELS)
-                force_refresh = True
-
-            # Links/Rechts bzw. - / +: PWM-Wert ändern
-            elif key in (curses.KEY_LEFT, ord("-")):
-                ch = CHANNELS[selected_idx]
-                pv = read_int(pwm_path(ch)) or 0
-                if is_root:
-                    ok_en = write_int(pwm_enable_path(ch), 1)
-                    ok_pwm = write_int(pwm_path(ch), clamp(pv - 8, 0, 255))
-                    if not (ok_en and ok_pwm):
-                        last_msg = f"Fehler beim Schreiben auf pwm{ch} (Rechte?)"
-                    else:
-                        last_msg = ""
-                else:
-                    last_msg = "Keine root-Rechte: PWM-Änderungen werden ignoriert."
-                force_refresh = True
-
-            elif key in (curses.KEY_RIGHT, ord("+"), ord("=")):
-                ch = CHANNELS[selected_idx]
-                pv = read_int(pwm_path(ch)) or 0
-                if is_root:
-                    ok_en = write_int(pwm_enable_path(ch), 1)
-                    ok_pwm = write_int(pwm_path(ch), clamp(pv + 8, 0, 255))
-                    if not (ok_en and ok_pwm):
-                        last_msg = f"Fehler beim Schreiben auf pwm{ch} (Rechte?)"
-                    else:
-                        last_msg = ""
-                else:
-                    last_msg = "Keine root-Rechte: PWM-Änderungen werden ignoriert."
-                force_refresh = True
-
-            elif key in (ord("a"), ord("A")):
-                # Auto/Manuell umschalten
-                ch = CHANNELS[selected_idx]
-                en_path = pwm_enable_path(ch)
-                cur = read_int(en_path)
-                if is_root:
-                    if cur == 1:
-                        if not write_int(en_path, 2):  # Auto
-                            last_msg = f"Fehler beim Setzen von pwm{ch}_enable auf 2"
-                        else:
-                            last_msg = ""
-                    else:
-                        if not write_int(en_path, 1):  # Manuell
-                            last_msg = f"Fehler beim Setzen von pwm{ch}_enable auf 1"
-                        else:
-                            last_msg = ""
-                else:
-                    last_msg = "Keine root-Rechte: Mode-Änderungen werden ignoriert."
-                force_refresh = True
-
-            elif key in (ord("r"), ord("R")):
-                # manueller Reset auf Startzustand
-                if is_root and initial_state:
-                    restore_initial_state(initial_state)
-                    last_msg = "Ursprüngliche Mainboard-Einstellungen wiederhergestellt."
-                elif not is_root:
-                    last_msg = "Keine root-Rechte: Restore nicht möglich."
-                force_refresh = True
-
-        # Zeichnen nur, wenn
-        #  - Eingabe war (force_refresh), oder
-        #  - genug Zeit seit letztem Update vergangen (Idle-Refresh)
-        if not force_refresh and (now - last_update) < UPDATE_INTERVAL:
-            continue
-
-        last_update = now
-        force_refresh = False
-
-        # --- Anzeige aktualisieren ---
-        stdscr.erase()
-        stdscr.addstr(0, 0, "Fan/Pumpen-Steuerung (nct6798 hwmon2)")
-        mode_str = "root (Schreiben erlaubt)" if is_root else "nicht-root (nur Lesen, keine PWM-Änderung)"
-        stdscr.addstr(1, 0, f"Modus: {mode_str}")
-        stdscr.addstr(
-            2,
-            0,
-            "q/ESC: Quit  ↑/↓/TAB: Kanal  ←/→/-/+: PWM  a: Auto/Manuell  r: Reset auf Startzustand",
-        )
-        stdscr.addstr(
-            3,
-            0,
-            "Navigation & Änderungen: sofortige Anzeige, im Idle langsamer Refresh.",
-        )
-        stdscr.addstr(
-            4,
-            0,
-            "Beim Beenden werden die ursprünglichen Mainboard-Werte automatisch wiederhergestellt.",
-        )
+class ChannelValues(NamedTuple):
+    pwm: Optional[int]
+    enable: Optional[int]
+    rpm: Optional[int]
+
+
+def sample_channels() -> Dict[int, ChannelValues]:
+    """Ein Sample aller Kanäle (einmal pro Tick, nicht pro Tastendruck)."""
+    out = {}
+    for ch in CHANNELS:
+        pwm_val, en_val, rpm = _SAMPLER.read_ints((pwm_path(ch), pwm_enable_path(ch), fan_input_path(ch)))
+        out[ch] = ChannelValues(pwm_val, en_val, rpm)
+    return out
+
+
+class UiState:
+    """
+    Zustand der Ereignisschleife: letzte Messwerte, ausstehende PWM-Ziele
+    (werden pro Tick zusammengefasst geschrieben) und ob neu gezeichnet
+    werden muss.
+    """
+
+    def __init__(self):
+        self.selected_idx = 0
+        self.values: Dict[int, ChannelValues] = {}
+        self.pending: Dict[int, int] = {}  # Kanal → PWM-Ziel, noch nicht geschrieben
+        self.points: Dict[int, OperatingPoint] = {}
+        self.last_msg = ""
+        self.dirty = True  # beim Start einmal zeichnen
+
+    @property
+    def channel(self) -> int:
+        return CHANNELS[self.selected_idx]
+
+    def pwm_target(self, ch: int) -> int:
+        if ch in self.pending:
+            return self.pending[ch]
+        pv = self.values.get(ch)
+        return pv.pwm if pv is not None and pv.pwm is not None else 0
+
+    def sample(self, engine: Optional[FanCurveEngine]) -> None:
+        values = sample_channels()
+        points = {p.pwm: p for p in engine.status()} if engine is not None else {}
+        if values != self.values or points != self.points or _REPLAY is not None:
+            self.values = values
+            self.points = points
+            self.dirty = True
+
+    def flush(self) -> None:
+        """Alle ausstehenden PWM-Ziele schreiben – ein Schreibzugriff pro Kanal und Tick."""
+        for ch, target in self.pending.items():
+            pv = self.values.get(ch, ChannelValues(None, None, None))
+            ok = True
+            if pv.enable != 1:
+                ok = write_int(pwm_enable_path(ch), 1)
+            ok = ok and write_int(pwm_path(ch), target)
+            if ok:
+                # Anzeige sofort aktualisieren, ohne den Chip erneut zu lesen
+                self.values[ch] = pv._replace(pwm=target, enable=1)
+            else:
+                self.last_msg = f"Fehler beim Schreiben auf pwm{ch} (Rechte?)"
+        self.pending.clear()
+        self.dirty = True
+
+
+def handle_key(
+    key: int,
+    state: UiState,
+    initial_state: Dict[str, int],
+    engine: Optional[FanCurveEngine],
+    is_root: bool,
+) -> bool:
+    """Eine Taste verarbeiten. True → beenden."""
+    state.dirty = True
+    if key in (ord("q"), ord("Q")):
+        return True
+
+    # im Replay: Leertaste/←/→/Bild↑/↓/</> steuern die Wiedergabe
+    if _REPLAY is not None and _REPLAY.handle_key(key):
+        state.sample(engine)
+        return False
+
+    # ESC → sofort Restore + Exit
+    if key == 27:
+        state.pending.clear()
+        if engine is not None:
+            engine.stop()  # sonst überschreibt die Kurve den Restore sofort
+        if is_root and initial_state:
+            restore_initial_state(initial_state)
+        return True
+
+    if not CHANNELS:
+        # keine PWM-Kanäle gefunden: nur q/ESC
+        return False
 
-        if last_msg:
-            stdscr.addstr(5, 0, f"Status: {last_msg}")
+    # Tab oder Cursor hoch/runter: Kanal wechseln
+    if key in (9, curses.KEY_DOWN):
+        state.selected_idx = (state.selected_idx + 1) % len(CHANNELS)
+    elif key == curses.KEY_UP or (hasattr(curses, "KEY_BTAB") and key == curses.KEY_BTAB):
+        state.selected_idx = (state.selected_idx - 1) % len(CHANNELS)
+
+    # Links/Rechts bzw. - / +: PWM-Ziel ändern, geschrieben wird beim nächsten Tick
+    elif key in (curses.KEY_LEFT, ord("-"), curses.KEY_RIGHT, ord("+"), ord("=")):
+        ch = state.channel
+        if not is_root:
+            state.last_msg = "Keine root-Rechte: PWM-Änderungen werden ignoriert."
+            return False
+        state.last_msg = curve_off(engine, ch)
+        step = -8 if key in (curses.KEY_LEFT, ord("-")) else 8
+        state.pending[ch] = clamp(state.pwm_target(ch) + step, 0, 255)
+
+    elif key in (ord("a"), ord("A")):
+        # Auto/Manuell umschalten (selten, sofort schreiben)
+        ch = state.channel
+        if not is_root:
+            state.last_msg = "Keine root-Rechte: Mode-Änderungen werden ignoriert."
+            return False
+        note = curve_off(engine, ch)
+        state.pending.pop(ch, None)
+        cur = state.values.get(ch, ChannelValues(None, None, None))
+        new = 2 if cur.enable == 1 else 1  # 2 = Auto, 1 = Manuell
+        if write_int(pwm_enable_path(ch), new):
+            state.values[ch] = cur._replace(enable=new)
+            state.last_msg = note
         else:
-            stdscr.addstr(5, 0, "Status: OK")
-
-        row = 7
-        for idx, ch in enumerate(CHANNELS):
-            fan_rpm = read_int(fan_input_path(ch))
-            pwm_val = read_int(pwm_path(ch))
-            en_val = read_int(pwm_enable_path(ch))
-
-            sel_marker = ">" if idx == selected_idx else " "
-            mode = {
-                0: "OFF/unk",
-                1: "MANUAL",
-                2: "AUTO",
-                3: "AUTO_HWP",
-            }.get(en_val, str(en_val) if en_val is not None else "?")
-
-            line = (
-                f"{sel_marker} Kanal pwm{ch}: "
-                f"PWM={pwm_val if pwm_val is not None else '?':>3} "
-                f"Mode={mode:<8} "
-                f"RPM={fan_rpm if fan_rpm is not None else '?'}"
-            )
-            stdscr.addstr(row, 0, line)
-            row += 1
-
-        stdscr.refresh()
+            state.last_msg = f"Fehler beim Setzen von pwm{ch}_enable auf {new}"
+
+    elif key in (ord("c"), ord("C")):
+        # Kurve des Kanals ein/aus
+        ch = state.channel
+        c = engine.control(ch) if engine is not None else None
+        if c is None:
+            state.last_msg = f"Keine Kurve für pwm{ch} konfiguriert (--curve)."
+        else:
+            engine.set_active(ch, not c.active)
+            state.last_msg = f"Kurve für pwm{ch} {'an' if c.active else 'aus'}."
+
+    elif key in (ord("r"), ord("R")):
+        # manueller Reset auf Startzustand (Kurven aus, sonst regeln sie sofort weiter)
+        state.pending.clear()
+        if engine is not None:
+            for c in engine.controls:
+                engine.set_active(c.cfg.pwm, False)
+        if is_root and initial_state:
+            restore_initial_state(initial_state)
+            state.last_msg = "Ursprüngliche Mainboard-Einstellungen wiederhergestellt."
+            state.sample(engine)
+        elif not is_root:
+            state.last_msg = "Keine root-Rechte: Restore nicht möglich."
+    return False
+
+
+def build_frame(state: UiState, engine: Optional[FanCurveEngine], is_root: bool, max_y: int, max_x: int) -> Frame:
+    frame = Frame()
+    frame.add(0, 0, f"Fan/Pumpen-Steuerung ({SETUP.name} {os.path.basename(HWMON_DIR)})")
+    if _REPLAY is not None:
+        mode_str = _REPLAY.status()
+    elif is_root:
+        mode_str = "root (Schreiben erlaubt)"
+    else:
+        mode_str = "nicht-root (nur Lesen, keine PWM-Änderung)"
+    frame.lines(1, [
+        f"Modus: {mode_str}",
+        "q/ESC: Quit  ↑/↓/TAB: Kanal  ←/→/-/+: PWM  a: Auto/Manuell  r: Reset auf Startzustand"
+        + ("  c: Kurve an/aus" if engine is not None else ""),
+        f"PWM-Änderungen werden alle {WRITE_INTERVAL * 1000:.0f} ms gesammelt geschrieben, "
+        f"Messwerte alle {UPDATE_INTERVAL * 1000:.0f} ms.",
+        "Beim Beenden werden die ursprünglichen Mainboard-Werte automatisch wiederhergestellt.",
+    ])
+
+    if state.last_msg:
+        frame.add(5, 0, f"Status: {state.last_msg}")
+    elif engine is not None and engine.errors:
+        frame.add(5, 0, f"Status: Kurve – {engine.errors} Schreibfehler auf pwm (root?)")
+    elif _REPLAY is not None:
+        frame.add(5, 0, "Replay: Leertaste Pause, ←/→ ±10 s, Bild↑/↓ ±5 min, </> Tempo")
+    else:
+        frame.add(5, 0, "Status: OK")
+
+    row = 7
+    for idx, ch in enumerate(CHANNELS):
+        vals = state.values.get(ch, ChannelValues(None, None, None))
+        pwm_val = state.pending.get(ch, vals.pwm)
+
+        sel_marker = ">" if idx == state.selected_idx else " "
+        mode = {
+            0: "OFF/unk",
+            1: "MANUAL",
+            2: "AUTO",
+            3: "AUTO_HWP",
+        }.get(vals.enable, str(vals.enable) if vals.enable is not None else "?")
+
+        line = (
+            f"{sel_marker} Kanal pwm{ch}: "
+            f"PWM={pwm_val if pwm_val is not None else '?':>3} "
+            f"Mode={mode:<8} "
+            f"RPM={vals.rpm if vals.rpm is not None else '?'}"
+        )
+        p = state.points.get(ch)
+        if p is not None and not p.active:
+            line += "  Kurve aus"
+        elif p is not None:
+            temp = f"{p.temp:.1f}°C" if p.temp is not None else "?°C"
+            target = f"{p.target:.0f}" if p.target is not None else "?"
+            line += f"  Kurve: {temp} → Soll {target} ({p.source})"
+        frame.add(row, 0, line)
+        row += 1
+
+    # Kurve des ausgewählten Kanals mit Arbeitspunkt
+    p = state.points.get(state.channel) if CHANNELS else None
+    plot_h = min(10, max_y - row - 3)
+    if p is not None and plot_h >= 3:
+        cfg = engine.control(p.pwm).cfg
+        row += 1
+        frame.add(row, 0, f"pwm{p.pwm} ({cfg.mode}, ● = Arbeitspunkt, PWM 0..255 von unten nach oben)")
+        frame.lines(row + 1, render_curve(cfg, p, min(60, max_x - 3), plot_h), col=2)
+    return frame
+
+
+def main(stdscr, initial_state: Dict[str, int], engine: Optional[FanCurveEngine] = None):
+    """
+    Ereignisschleife mit selectors: gewartet wird auf stdin oder den
+    nächsten Termin (Sample-Tick bzw. ausstehender Schreib-Tick). Ohne
+    Eingabe wacht der Prozess nur alle UPDATE_INTERVAL Sekunden auf,
+    gezeichnet wird nur, wenn sich etwas geändert hat.
+    """
+    curses.curs_set(0)
+    is_root = _REPLAY is None and hasattr(os, "geteuid") and os.geteuid() == 0
+
+    renderer = FrameRenderer(stdscr)  # nur geänderte Zellen, auf die Fenstergröße beschnitten
+
+    if _REPLAY is None and not os.path.isdir(HWMON_DIR):
+        frame = Frame()
+        frame.lines(0, [f"{HWMON_DIR} nicht gefunden ({SETUP.name}?).", "Beenden mit q oder ESC."])
+        renderer.render(frame)
+        while stdscr.getch() not in (ord("q"), ord("Q"), 27):
+            pass
+        return
+
+    stdscr.nodelay(True)  # getch() nur nach select(), dann alles Gepufferte abholen
+    sel = selectors.DefaultSelector()
+    sel.register(sys.stdin.fileno(), selectors.EVENT_READ)
+
+    # KEY_RESIZE liefert ncurses nur aus getch(); ohne Tastendruck käme ein
+    # Fenster-Resize erst mit der nächsten Taste an. SIGWINCH weckt deshalb
+    # select() über eine Pipe (set_wakeup_fd), das Neuzeichnen passiert unten.
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    resized = []
+    old_winch = signal.signal(signal.SIGWINCH, lambda signum, frame: resized.append(True))
+    old_wakeup = signal.set_wakeup_fd(wake_w)
+    sel.register(wake_r, selectors.EVENT_READ)
+
+    state = UiState()
+    state.sample(engine)
+    next_sample = time.monotonic() + UPDATE_INTERVAL
+    next_write = 0.0  # frühester Zeitpunkt für den nächsten gesammelten Schreibzugriff
+
+    try:
+        while True:
+            if state.dirty:
+                max_y, max_x = stdscr.getmaxyx()
+                renderer.render(build_frame(state, engine, is_root, max_y, max_x))
+                state.dirty = False
+
+            deadline = next_sample
+            if state.pending:
+                deadline = min(deadline, next_write)
+            timeout = max(0.0, deadline - time.monotonic())
+
+            for sel_key, _events in sel.select(timeout):
+                if sel_key.fd == wake_r:
+                    try:
+                        os.read(wake_r, 64)
+                    except BlockingIOError:
+                        pass
+                    continue
+                while True:
+                    key = stdscr.getch()
+                    if key == -1:
+                        break
+                    if key == curses.KEY_RESIZE:
+                        resized.append(True)
+                        continue
+                    if handle_key(key, state, initial_state, engine, is_root):
+                        return
+
+            if resized:
+                resized.clear()
+                size = os.get_terminal_size(sys.__stdout__.fileno())
+                curses.resizeterm(size.lines, size.columns)
+                renderer.invalidate()
+                state.dirty = True
+
+            now = time.monotonic()
+            if state.pending and now >= next_write:
+                state.flush()
+                next_write = now + WRITE_INTERVAL
+            if now >= next_sample:
+                state.sample(engine)
+                next_sample += UPDATE_INTERVAL
+                if next_sample <= now:  # z.B. nach Suspend nicht nachholen
+                    next_sample = now + UPDATE_INTERVAL
+    finally:
+        signal.set_wakeup_fd(old_wakeup)
+        # None: Handler aus C (ncurses), von Python aus nicht wiederherstellbar
+        signal.signal(signal.SIGWINCH, old_winch if old_winch is not None else signal.SIG_DFL)
+        sel.close()
+        os.close(wake_r)
+        os.close(wake_w)
 
 
 if __name__ == "__main__":
-    # Zustand beim Start merken
-    initial_state = snapshot_initial_state()
+    parser = argparse.ArgumentParser(description="Fan/Pumpen-Steuerung über hwmon-PWM.")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="Aufnahme von common/sensor_recorder.py abspielen (nur Anzeige)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Abspieltempo für --replay (Standard 1.0)")
+    parser.add_argument("--curve", metavar="CONFIG",
+                        help="Lüfterkurven aus JSON regeln lassen (siehe fan_curve.example.json)")
+    parser.add_argument("--chip", help=f"hwmon-Chipname statt Profil/Autoerkennung (aktuell {SETUP.name})")
+    args = parser.parse_args()
+    if args.chip and args.chip != SETUP.name:
+        SETUP = load_setup(args.chip)
+        HWMON_DIR = SETUP.hwmon_dir
+        CHANNELS[:] = SETUP.channels
+    if args.replay and args.curve:
+        parser.error("--curve und --replay schließen sich aus")
+    engine = None
+    if args.curve:
+        try:
+            engine = build_engine(args.curve, HWMON_DIR, write_int)
+        except CurveConfigError as e:
+            parser.error(str(e))
+        # geregelte Kanäle immer anzeigen und im Snapshot sichern
+        CHANNELS.extend(c.cfg.pwm for c in engine.controls if c.cfg.pwm not in CHANNELS)
+    if args.replay:
+        try:
+            start_replay(open_replay(args.replay, args.speed))
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    # Zustand beim Start merken (im Replay gibt es nichts zu sichern)
+    initial_state = snapshot_initial_state() if _REPLAY is None else {}
     try:
-        curses.wrapper(main, initial_state)
+        if engine is not None:
+            engine.start()
+        curses.wrapper(main, initial_state, engine)
     finally:
+        if engine is not None:
+            engine.stop()
         # Egal wie das Programm endet: ursprüngliche Werte wiederherstellen
         if initial_state:
             restore_initial_state(initial_state)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Sensor-Agent: stellt Temperaturen (Erkennung wie temp_monitor_tui) und den
+Lüfter-/PWM-Zustand (Chip wie fanctl_tui, siehe fan_discovery) über einen
+TCP- oder Unix-Socket bereit, damit sensor_dashboard.py viele Rechner
+gleichzeitig anzeigen kann, ohne per SSH auf jeden einzeln zu gehen.
+
+Nur lesend, root ist nicht nötig.
+
+Protokoll: JSON-Lines (ein Objekt pro Zeile, UTF-8), Version 1.
+
+    {"type": "hello", "v": 1, "host": "...", "interval": 1.0, "gen": 3,
+     "channels": [["CPU", "k10temp", "Tctl", "temp"],
+                  ["Fan", "nct6798", "pwm1", "pwm"], ...]}
+    {"type": "full", "gen": 3, "seq": 17, "t": 1700000000.0, "v": [45.1, 120, ...]}
+    {"type": "delta", "gen": 3, "seq": 18, "t": 1700000001.0, "d": [[0, 45.3], [5, 1210]]}
+
+Die Kanal-ID ist der Index in "channels". Nach dem Verbinden kommen hello
+und full, danach pro Takt nur ein delta mit den geänderten Werten (leer
+als Lebenszeichen). Temperaturen sind auf 0.1 °C gerundet, damit
+Rauschen in der letzten Stelle keine Deltas erzeugt. Ändern sich die
+Kanäle (Hotplug, Modul geladen), steigt gen und es kommt ein neues hello
++ full. Sieht ein Client eine Lücke in seq, schickt er {"type": "resync"}
+und bekommt ein full. Kommt ein Client nicht hinterher (Sendepuffer voll),
+werden Deltas verworfen und er bekommt später wieder ein full.
+
+    ./sensor_agent.py                          # 127.0.0.1:8765
+    ./sensor_agent.py --listen 0.0.0.0:8765    # im LAN erreichbar
+    ./sensor_agent.py --unix /run/sensor_agent.sock
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from fan_discovery import load_setup
+from temp_monitor_tui import SensorIndex
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 8765
+DEFAULT_INTERVAL = 1.0  # Sekunden
+MAX_WRITE_BUFFER = 64 * 1024  # darüber gilt ein Client als zu langsam
+
+
+class ChannelDef(NamedTuple):
+    category: str  # "CPU", "GPU", ... (temp_monitor_tui.detect_category) oder "Fan"
+    chip: str
+    label: str
+    kind: str  # "temp" (°C), "pwm" (0–255), "mode" (pwmN_enable), "rpm"
+    path: str
+
+
+def encode(msg: dict) -> bytes:
+    return json.dumps(msg, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def parse_address(text: str) -> Tuple[str, object]:
+    """'host:port', ':port', 'unix:/pfad' oder '/pfad' → ("tcp", (host, port)) / ("unix", pfad)."""
+    if text.startswith("unix:"):
+        return "unix", text[5:]
+    if text.startswith("/"):
+        return "unix", text
+    host, sep, port = text.rpartition(":")
+    if not sep:
+        host, port = text, str(DEFAULT_PORT)
+    return "tcp", (host.strip("[]") or "127.0.0.1", int(port))
+
+
+class Client:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.need_full = True  # hello + full beim nächsten Takt
+
+    def congested(self) -> bool:
+        return self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER
+
+
+class SensorAgent:
+    """
+    Liest alle Kanäle einmal pro Takt über den SysfsSampler des
+    SensorIndex (einer für alle Clients; ein Rescan schließt ihn), berechnet das Delta einmal und schickt dieselbe Zeile an alle Clients,
+    die auf dem aktuellen Stand sind.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, host: Optional[str] = None, chip: Optional[str] = None):
+        self.interval = interval
+        self.host = host or socket.gethostname()
+        self.chip = chip
+        self.index = SensorIndex()
+        self.clients: List[Client] = []
+        self.gen = 0
+        self.seq = 0
+        self.t = 0.0
+        self.channels: List[ChannelDef] = []
+        self.values: List[Optional[float]] = []
+        self.sent_deltas = 0
+        self.sent_changes = 0
+        self._build_channels()
+
+    def _build_channels(self) -> None:
+        channels = []
+        for dev in self.index.devices:
+            for ch in dev.channels:
+                channels.append(ChannelDef(dev.category, dev.hwmon_name, ch.label, "temp", ch.input_path))
+        setup = load_setup(self.chip)
+        if setup.source != "legacy":
+            for pwm in setup.channels:
+                base = os.path.join(setup.hwmon_dir, f"pwm{pwm}")
+                fan = setup.fan_for(pwm)
+                channels.append(ChannelDef("Fan", setup.name, f"pwm{pwm}", "pwm", base))
+                channels.append(ChannelDef("Fan", setup.name, f"pwm{pwm}", "mode", f"{base}_enable"))
+                channels.append(ChannelDef("Fan", setup.name, f"fan{fan}", "rpm",
+                                           os.path.join(setup.hwmon_dir, f"fan{fan}_input")))
+        self.channels = channels
+        self.values = [None] * len(channels)
+        self.gen += 1
+
+    def sample(self) -> List[Optional[float]]:
+        raw = self.index.sampler.read_ints([c.path for c in self.channels])
+        out: List[Optional[float]] = []
+        for c, val in zip(self.channels, raw):
+            if val is None:
+                # Kanal weg (Gerät entfernt, Modul entladen) → nächster Tick scannt neu
+                if not os.path.exists(c.path):
+                    self.index.mark_dirty()
+                out.append(None)
+            elif c.kind == "temp":
+                out.append(round(val / 1000.0, 1))
+            else:
+                out.append(val)
+        return out
+
+    def hello(self) -> dict:
+        return {
+            "type": "hello",
+            "v": PROTOCOL_VERSION,
+            "host": self.host,
+            "interval": self.interval,
+            "gen": self.gen,
+            "channels": [[c.category, c.chip, c.label, c.kind] for c in self.channels],
+        }
+
+    def full(self) -> dict:
+        return {"type": "full", "gen": self.gen, "seq": self.seq, "t": self.t, "v": self.values}
+
+    def tick(self) -> None:
+        if self.index.refresh_if_changed():
+            self._build_channels()
+            for client in self.clients:
+                client.need_full = True
+
+        new = self.sample()
+        delta = [[i, v] for i, (old, v) in enumerate(zip(self.values, new)) if v != old]
+        self.values = new
+        self.seq += 1
+        self.t = round(time.time(), 3)
+
+        line = None
+        for client in list(self.clients):
+            if client.writer.is_closing():
+                continue
+            if client.congested():
+                client.need_full = True
+                continue
+            if client.need_full:
+                client.writer.write(encode(self.hello()) + encode(self.full()))
+                client.need_full = False
+                continue
+            if line is None:
+                line = encode({"type": "delta", "gen": self.gen, "seq": self.seq, "t": self.t, "d": delta})
+                self.sent_deltas += 1
+                self.sent_changes += len(delta)
+            client.writer.write(line)
+
+    async def run(self) -> None:
+        """Takt mit festen Deadlines (kein Drift)."""
+        loop = asyncio.get_running_loop()
+        next_t = loop.time()
+        while True:
+            self.tick()
+            next_t += self.interval
+            delay = next_t - loop.time()
+            if delay < 0:
+                next_t = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = Client(writer)
+        self.clients.append(client)
+        # sofort hello + full, nicht erst beim nächsten Takt
+        writer.write(encode(self.hello()) + encode(self.full()))
+        client.need_full = False
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    continue
+                if msg.get("type") == "resync":
+                    client.need_full = True
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.clients.remove(client)
+            writer.close()
+
+    def close(self) -> None:
+        self.index.close()
+
+
+async def serve(agent: SensorAgent, kind: str, addr) -> None:
+    agent.values = agent.sample()
+    agent.t = round(time.time(), 3)
+    if kind == "unix":
+        if os.path.exists(addr):
+            os.unlink(addr)  # alter Socket von einem abgebrochenen Lauf
+        server = await asyncio.start_unix_server(agent.handle_client, path=addr)
+    else:
+        server = await asyncio.start_server(agent.handle_client, host=addr[0], port=addr[1])
+    where = addr if kind == "unix" else f"{addr[0]}:{addr[1]}"
+    print(f"sensor_agent: {agent.host}, {len(agent.channels)} Kanäle, {where}, alle {agent.interval:g} s",
+          file=sys.stderr)
+    async with server:
+        await agent.run()
+
+
+def _sigterm(*_):
+    raise KeyboardInterrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sensorwerte (Temperaturen, Lüfter/PWM) per Socket bereitstellen.")
+    parser.add_argument("--listen", default=f"127.0.0.1:{DEFAULT_PORT}",
+                        help=f"TCP-Adresse HOST:PORT (Standard 127.0.0.1:{DEFAULT_PORT})")
+    parser.add_argument("--unix", metavar="PFAD", help="Unix-Socket statt TCP")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"Takt in Sekunden (Standard {DEFAULT_INTERVAL:g})")
+    parser.add_argument("--name", help="Hostname im Dashboard (Standard: gethostname())")
+    parser.add_argument("--chip", help="hwmon-Chipname der Lüfter (Standard: Profil/Autoerkennung)")
+    args = parser.parse_args()
+    if args.interval <= 0:
+        parser.error("--interval muss > 0 sein")
+
+    kind, addr = ("unix", args.unix) if args.unix else parse_address(args.listen)
+    agent = SensorAgent(args.interval, args.name, args.chip)
+    signal.signal(signal.SIGTERM, _sigterm)
+    try:
+        asyncio.run(serve(agent, kind, addr))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.close()
+        if kind == "unix" and os.path.exists(addr):
+            os.unlink(addr)
+        print(f"{agent.sent_deltas} Deltas mit {agent.sent_changes} geänderten Werten gesendet.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Dashboard für viele Rechner: verbindet sich per asyncio gleichzeitig mit
+beliebig vielen sensor_agent.py (TCP oder Unix-Socket) und zeigt pro
+Rechner die heißesten Sensoren je Kategorie und alle Lüfter/PWM-Kanäle.
+
+Getrennte Agents werden mit wachsendem Abstand (1 → 10 s) neu verbunden;
+Rechner, von denen länger als 3 Takte nichts kam, werden als "veraltet"
+markiert.
+
+    ./sensor_dashboard.py box1:8765 box2:8765 unix:/run/sensor_agent.sock
+    ./sensor_dashboard.py --plain :8765 :8766       # Text statt curses
+    ./sensor_dashboard.py --once :8765 :8766        # einmal ausgeben, Exit 1 falls ein Agent fehlt
+
+Im curses-Modus: ↑/↓ wählen einen Rechner, Enter/d klappt alle seine
+Sensoren auf, q beendet.
+"""
+import argparse
+import asyncio
+import curses
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from tui_render import Frame, FrameRenderer  # noqa: E402
+
+from sensor_agent import PROTOCOL_VERSION, encode, parse_address  # noqa: E402
+
+RECONNECT_MIN = 1.0
+RECONNECT_MAX = 10.0
+STALE_INTERVALS = 3  # so viele Takte ohne Nachricht → veraltet
+RENDER_INTERVAL = 0.5
+
+CATEGORY_ORDER = ["CPU", "CPU/SoC", "GPU", "Mainboard", "Sonstiges"]
+MODE_NAMES = {0: "off", 1: "man", 2: "auto", 3: "hwp"}
+
+
+class AgentState:
+    """Zustand eines Agents, wie er aus hello/full/delta rekonstruiert wird."""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.host = address
+        self.interval = 1.0
+        self.gen: Optional[int] = None
+        self.seq: Optional[int] = None
+        self.channels: List[list] = []
+        self.values: List[Optional[float]] = []
+        self.connected = False
+        self.synced = False  # full für die aktuelle gen empfangen
+        self.error = ""
+        self.last_rx = 0.0  # monotonic
+        self.messages = 0
+        self.resyncs = 0
+
+    def apply(self, msg: dict) -> bool:
+        """Nachricht anwenden. False → Lücke erkannt, resync nötig."""
+        self.last_rx = time.monotonic()
+        self.messages += 1
+        kind = msg.get("type")
+        if kind == "hello":
+            if msg.get("v") != PROTOCOL_VERSION:
+                raise ValueError(f"Protokollversion {msg.get('v')!r} statt {PROTOCOL_VERSION}")
+            self.host = msg.get("host", self.address)
+            self.interval = float(msg.get("interval", 1.0))
+            self.gen = msg["gen"]
+            self.channels = msg["channels"]
+            self.values = [None] * len(self.channels)
+            self.synced = False
+        elif kind == "full":
+            if msg["gen"] != self.gen or len(msg["v"]) != len(self.channels):
+                return False
+            self.values = list(msg["v"])
+            self.seq = msg["seq"]
+            self.synced = True
+        elif kind == "delta":
+            if not self.synced:
+                return True  # full ist schon angefordert oder kommt gleich
+            if msg["gen"] != self.gen or msg["seq"] != self.seq + 1:
+                self.synced = False
+                return False
+            for idx, val in msg["d"]:
+                self.values[idx] = val
+            self.seq = msg["seq"]
+        return True
+
+    def stale(self) -> bool:
+        return time.monotonic() - self.last_rx > STALE_INTERVALS * self.interval
+
+    def status(self) -> str:
+        if not self.connected:
+            return f"getrennt ({self.error})" if self.error else "verbinde…"
+        if not self.synced:
+            return "synchronisiere…"
+        if self.stale():
+            return f"veraltet ({time.monotonic() - self.last_rx:.0f} s)"
+        return "ok"
+
+    def max_by_category(self) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for (category, _chip, _label, kind), val in zip(self.channels, self.values):
+            if kind == "temp" and val is not None:
+                out[category] = max(out.get(category, val), val)
+        return out
+
+    def fans(self) -> List[str]:
+        """'pwm1 120 man 1350' pro Kanal (pwm, mode, rpm kommen in dieser Reihenfolge)."""
+        by_label: Dict[str, Dict[str, Optional[float]]] = defaultdict(dict)
+        order: List[str] = []
+        last_pwm = None
+        for (category, _chip, label, kind), val in zip(self.channels, self.values):
+            if category != "Fan":
+                continue
+            if kind in ("pwm", "mode"):
+                last_pwm = label
+                if label not in by_label:
+                    order.append(label)
+            by_label[last_pwm][kind] = val
+        out = []
+        for label in order:
+            v = by_label[label]
+            pwm = "?" if v.get("pwm") is None else f"{v['pwm']:.0f}"
+            mode = MODE_NAMES.get(v.get("mode"), "?")
+            rpm = "?" if v.get("rpm") is None else f"{v['rpm']:.0f}"
+            out.append(f"{label} {pwm:>3} {mode} {rpm:>5}rpm")
+        return out
+
+    def details(self) -> List[str]:
+        lines = []
+        for (category, chip, label, kind), val in zip(self.channels, self.values):
+            if kind != "temp":
+                continue
+            shown = "?" if val is None else f"{val:5.1f}°C"
+            lines.append(f"{category:<10} {chip:<12} {label:<16.16} {shown:>8}")
+        return lines
+
+
+async def follow(state: AgentState) -> None:
+    """Verbindung zu einem Agent halten (mit Reconnect), Nachrichten anwenden."""
+    kind, addr = parse_address(state.address)
+    delay = RECONNECT_MIN
+    while True:
+        writer = None
+        try:
+            if kind == "unix":
+                reader, writer = await asyncio.open_unix_connection(addr)
+            else:
+                reader, writer = await asyncio.open_connection(addr[0], addr[1])
+            state.connected = True
+            state.error = ""
+            delay = RECONNECT_MIN
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("Agent hat die Verbindung beendet")
+                if not state.apply(json.loads(line)):
+                    state.resyncs += 1
+                    writer.write(encode({"type": "resync"}))
+        except (OSError, ValueError, KeyError) as e:
+            state.error = getattr(e, "strerror", None) or str(e) or type(e).__name__
+        finally:
+            state.connected = False
+            state.synced = False
+            if writer is not None:
+                writer.close()
+        await asyncio.sleep(delay)
+        delay = min(RECONNECT_MAX, delay * 2)
+
+
+def summary_lines(state: AgentState) -> List[str]:
+    temps = state.max_by_category()
+    temp_str = "  ".join(f"{cat} {temps[cat]:5.1f}°C" for cat in CATEGORY_ORDER if cat in temps)
+    lines = [f"{state.host:<16.16} {state.status():<22.22} {temp_str}"]
+    fans = state.fans()
+    if fans:
+        lines.append(" " * 17 + " | ".join(fans))
+    return lines
+
+
+def render_plain(states: List[AgentState]) -> str:
+    out = [time.strftime("%H:%M:%S") + f"  {sum(s.synced for s in states)}/{len(states)} Agents"]
+    for state in states:
+        out.extend(summary_lines(state))
+    return "\n".join(out)
+
+
+async def run_plain(states: List[AgentState], interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        print(render_plain(states) + "\n", flush=True)
+
+
+async def run_once(states: List[AgentState], timeout: float) -> int:
+    t_end = time.monotonic() + timeout
+    while time.monotonic() < t_end and not all(s.synced for s in states):
+        await asyncio.sleep(0.05)
+    print(render_plain(states))
+    return 0 if all(s.synced for s in states) else 1
+
+
+async def run_curses(stdscr, states: List[AgentState]) -> None:
+    curses.curs_set(0)
+    stdscr.nodelay(True)
+    renderer = FrameRenderer(stdscr)  # nur geänderte Zellen statt erase() pro Tick
+    selected = 0
+    expanded = set()
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    quit_flag = False
+
+    def on_key() -> None:
+        nonlocal selected, quit_flag
+        while True:
+            key = stdscr.getch()
+            if key == -1:
+                break
+            if key in (ord("q"), ord("Q"), 27):
+                quit_flag = True
+            elif key == curses.KEY_RESIZE:
+                renderer.invalidate()
+            elif key == curses.KEY_UP:
+                selected = (selected - 1) % len(states)
+            elif key == curses.KEY_DOWN:
+                selected = (selected + 1) % len(states)
+            elif key in (10, 13, curses.KEY_ENTER, ord("d"), ord("D")):
+                expanded.symmetric_difference_update({selected})
+        wake.set()
+
+    loop.add_reader(sys.stdin.fileno(), on_key)
+    try:
+        while not quit_flag:
+            max_y, _max_x = stdscr.getmaxyx()
+            lines = [
+                f"Sensor-Dashboard – {sum(s.synced for s in states)}/{len(states)} Agents verbunden"
+                f"   ↑/↓: Rechner  Enter/d: Details  q: Quit",
+                "",
+            ]
+            for idx, state in enumerate(states):
+                block = summary_lines(state)
+                block[0] = (">" if idx == selected else " ") + block[0]
+                block[1:] = [" " + b for b in block[1:]]
+                lines.extend(block)
+                if idx in expanded:
+                    lines.extend("     " + d for d in state.details())
+            frame = Frame()
+            frame.lines(0, lines[: max_y - 1])
+            renderer.render(frame)
+            wake.clear()
+            try:
+                await asyncio.wait_for(wake.wait(), RENDER_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        loop.remove_reader(sys.stdin.fileno())
+
+
+async def dashboard(args, stdscr=None) -> int:
+    states = [AgentState(a) for a in args.agents]
+    tasks = [asyncio.create_task(follow(s)) for s in states]
+    try:
+        if args.once:
+            return await run_once(states, args.timeout)
+        if args.plain:
+            await run_plain(states, args.interval)
+        else:
+            await run_curses(stdscr, states)
+        return 0
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temperaturen und Lüfter vieler Rechner (sensor_agent.py) anzeigen.")
+    parser.add_argument("agents", nargs="+", help="HOST:PORT, :PORT (localhost) oder unix:/PFAD")
+    parser.add_argument("--plain", action="store_true", help="Text-Ausgabe statt curses")
+    parser.add_argument("--interval", type=float, default=2.0, help="Ausgabeintervall für --plain (Standard 2 s)")
+    parser.add_argument("--once", action="store_true", help="einmal ausgeben, sobald alle Agents synchron sind")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Wartezeit für --once (Standard 5 s)")
+    args = parser.parse_args()
+
+    try:
+        if args.once or args.plain:
+            sys.exit(asyncio.run(dashboard(args)))
+        curses.wrapper(lambda stdscr: asyncio.run(dashboard(args, stdscr)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,22 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-# Zeigt aktuelle Drehzahl(en) und PWM-Werte für nct6798 (hwmon2).
+# Zeigt aktuelle Drehzahl(en) und PWM-Werte für den Lüfter-Chip.
 # Kein sudo nötig, da nur gelesen wird.
+#
+# Der Chip kommt aus fan_discovery.py (Profil bzw. Suche über den Namen,
+# nicht über die hwmon-Nummer) – derselbe wie in den TUIs.
+# Anderer Chip: FAN_CHIP=it8688 ./status_pumpen_drehzahl.sh
 
-HWMON_DIR="/sys/class/hwmon/hwmon2"   # nct6798 laut vorheriger Ausgabe
-
-if [ ! -d "$HWMON_DIR" ]; then
-  echo "$HWMON_DIR nicht gefunden (nct6798 nicht geladen?)." >&2
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+# Chip wie bei den TUIs: Profil bzw. Suche aus fan_discovery.py
+if ! HWMON_DIR="$(python3 "$SCRIPT_DIR/fan_discovery.py" ${FAN_CHIP:+--chip "$FAN_CHIP"} resolve)"; then
+  echo "Verfügbare Chips: ./fan_discovery.py list" >&2
   exit 1
 fi
+CHIP="$(cat "$HWMON_DIR/name")"
 
-echo "=== Aktuelle Lüfter-/Pumpen-Werte (nct6798) ==="
+echo "=== Aktuelle Lüfter-/Pumpen-Werte ($CHIP, $HWMON_DIR) ==="
 
 # Zeige alle fan*_input
 for f in "$HWMON_DIR"/fan*_input; do
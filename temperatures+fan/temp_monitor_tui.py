@@ -1,12 +1,26 @@
 #!/usr/bin/env python3
+import argparse
 import curses
 import os
+import socket
+import sys
 import time
 from collections import defaultdict
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, NamedTuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from sensor_recorder import Recording, ReplaySampler, open_replay  # noqa: E402
+from sysfs_sampler import SysfsSampler  # noqa: E402
+from tui_render import Frame, FrameRenderer  # noqa: E402
 
 HWMON_BASE = "/sys/class/hwmon"
 
+# Fallback, falls kein uevent-Socket verfügbar ist: so oft wird die Liste
+# der hwmon-Einträge auf Änderungen geprüft (ein listdir, kein Vollscan).
+RESCAN_CHECK_INTERVAL = 5.0  # Sekunden
+
+NETLINK_KOBJECT_UEVENT = 15
+
 
 def read_file(path: str) -> Optional[str]:
     try:
@@ -30,25 +44,6 @@ def list_temp_channels(hwmon_dir: str) -> List[int]:
     return sorted(indices)
 
 
-def read_temp(hwmon_dir: str, idx: int) -> Tuple[str, Optional[float]]:
-    label_path = os.path.join(hwmon_dir, f"temp{idx}_label")
-    input_path = os.path.join(hwmon_dir, f"temp{idx}_input")
-
-    label = read_file(label_path) or f"temp{idx}"
-
-    raw = read_file(input_path)
-    if raw is None:
-        return label, None
-
-    try:
-        # Werte sind in Milligrad Celsius
-        value_c = int(raw) / 1000.0
-    except ValueError:
-        return label, None
-
-    return label, value_c
-
-
 def detect_category(hwmon_name: str) -> str:
     name = hwmon_name.lower()
     if "amdgpu" in name or name.startswith("nvidia") or "gpu" in name:
@@ -62,6 +57,19 @@ def detect_category(hwmon_name: str) -> str:
     return "Sonstiges"
 
 
+class TempChannel(NamedTuple):
+    idx: int
+    label: str
+    input_path: str
+
+
+class HwmonDevice(NamedTuple):
+    category: str
+    hwmon_name: str
+    hwmon_dir: str
+    channels: List[TempChannel]
+
+
 def find_temp_sensors():
     sensors = []
     if not os.path.isdir(HWMON_BASE):
@@ -79,87 +87,259 @@ def find_temp_sensors():
     return sensors
 
 
-def main(stdscr):
-    curses.curs_set(0)
-    stdscr.nodelay(True)
-    stdscr.timeout(200)
-
-    last_update = 0.0
-
-    while True:
-        key = stdscr.getch()
-        if key in (ord("q"), ord("Q")):
-            break
-
-        now = time.time()
-        if now - last_update < 1.0:
+def devices_from_recording(recording: Recording) -> List[HwmonDevice]:
+    """temp*-Kanäle einer Aufnahme (sensor_recorder) als HwmonDevice-Liste."""
+    devices: List[HwmonDevice] = []
+    by_dir = {}
+    for ch in recording.channels:
+        if ch.kind != "temp":
             continue
-        last_update = now
+        hwmon_dir, fname = os.path.split(ch.path)
+        idx = int(fname[4:].split("_", 1)[0])
+        dev = by_dir.get(hwmon_dir)
+        if dev is None:
+            dev = HwmonDevice(detect_category(ch.device), ch.device, hwmon_dir, [])
+            by_dir[hwmon_dir] = dev
+            devices.append(dev)
+        dev.channels.append(TempChannel(idx, ch.label, ch.path))
+    return devices
+
+
+def open_uevent_socket() -> Optional[socket.socket]:
+    """
+    Öffnet einen Netlink-Socket für Kernel-uevents (wie `udevadm monitor -k`).
+    Kein root nötig. Gibt None zurück, wenn das System das nicht erlaubt.
+    """
+    try:
+        sock = socket.socket(
+            socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT
+        )
+        sock.bind((0, 1))  # Multicast-Gruppe 1 = Kernel-Events
+        sock.setblocking(False)
+        return sock
+    except (AttributeError, OSError):
+        return None
 
-        max_y, max_x = stdscr.getmaxyx()
-        sensors = find_temp_sensors()
 
-        stdscr.erase()
-        stdscr.addstr(0, 0, "Temperatur-Übersicht CPU / GPU / Mainboard"[: max_x - 1])
-        stdscr.addstr(1, 0, f"Quelle: {HWMON_BASE}/*"[: max_x - 1])
-        stdscr.addstr(
-            2, 0, "Aktualisierung ca. 1x pro Sekunde, q: Quit"[: max_x - 1]
+class SensorIndex:
+    """
+    Einmal aufgebauter Index aller temp*-Kanäle unter HWMON_BASE.
+
+    Namen, Labels und Kategorien werden nur beim (Re-)Scan gelesen.
+    Pro Tick werden danach nur noch die temp*_input-Dateien gelesen, über
+    dauerhaft offene Deskriptoren (SysfsSampler, pread).
+    Neu gescannt wird bei hwmon-uevents (Hotplug, Modul geladen/entladen),
+    wenn sich die Einträge unter HWMON_BASE ändern, wenn ein Kanal
+    verschwindet oder explizit per rescan().
+
+    Mit replay kommen Kanäle und Werte aus einer Aufnahme statt aus sysfs.
+    """
+
+    def __init__(self, replay: Optional[ReplaySampler] = None):
+        self.devices: List[HwmonDevice] = []
+        self.scan_count = 0
+        self.replay = replay
+        self._entries: Tuple[str, ...] = ()
+        self._dirty = False
+        self._last_check = 0.0
+        self._uevent_sock = open_uevent_socket() if replay is None else None
+        self.sampler = replay if replay is not None else SysfsSampler()
+        self.rescan()
+
+    def _list_entries(self) -> Tuple[str, ...]:
+        try:
+            return tuple(sorted(os.listdir(HWMON_BASE)))
+        except OSError:
+            return ()
+
+    def rescan(self) -> None:
+        # alte Deskriptoren schließen, hwmonN kann jetzt ein anderes Gerät sein
+        self.sampler.close()
+        if self.replay is not None:
+            self.devices = devices_from_recording(self.replay.recording)
+            self.scan_count += 1
+            return
+        devices = []
+        for category, hwmon_name, hwmon_dir, temps in find_temp_sensors():
+            channels = []
+            for idx in temps:
+                label_path = os.path.join(hwmon_dir, f"temp{idx}_label")
+                label = read_file(label_path) or f"temp{idx}"
+                input_path = os.path.join(hwmon_dir, f"temp{idx}_input")
+                channels.append(TempChannel(idx, label, input_path))
+            devices.append(HwmonDevice(category, hwmon_name, hwmon_dir, channels))
+
+        self.devices = devices
+        self._entries = self._list_entries()
+        self._dirty = False
+        self._last_check = time.monotonic()
+        self.scan_count += 1
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def _drain_uevents(self) -> bool:
+        changed = False
+        while True:
+            try:
+                msg = self._uevent_sock.recv(8192)
+            except BlockingIOError:
+                return changed
+            except OSError:
+                # Socket kaputt → auf listdir-Polling zurückfallen
+                self._uevent_sock.close()
+                self._uevent_sock = None
+                return True
+            if b"SUBSYSTEM=hwmon" in msg or b"/hwmon" in msg:
+                changed = True
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Günstige Änderungsprüfung, einmal pro Tick aufrufen.
+        Gibt True zurück, wenn neu gescannt wurde.
+        """
+        if self.replay is not None:
+            return False
+        if self._uevent_sock is not None:
+            if self._drain_uevents():
+                self._dirty = True
+        else:
+            now = time.monotonic()
+            if now - self._last_check >= RESCAN_CHECK_INTERVAL:
+                self._last_check = now
+                if self._list_entries() != self._entries:
+                    self._dirty = True
+
+        if self._dirty:
+            self.rescan()
+            return True
+        return False
+
+    def read_value(self, channel: TempChannel) -> Optional[float]:
+        raw = self.sampler.read_int(channel.input_path)
+        if raw is None:
+            # Kanal weg (z.B. Gerät entfernt) → beim nächsten Tick neu scannen
+            if self.replay is None and not os.path.exists(channel.input_path):
+                self._dirty = True
+            return None
+        # Werte sind in Milligrad Celsius
+        return raw / 1000.0
+
+    def close(self) -> None:
+        self.sampler.close()
+        if self._uevent_sock is not None:
+            self._uevent_sock.close()
+            self._uevent_sock = None
+
+
+def build_frame(index: SensorIndex, max_y: int) -> Frame:
+    frame = Frame()
+    frame.add(0, 0, "Temperatur-Übersicht CPU / GPU / Mainboard")
+    if index.replay is not None:
+        frame.add(1, 0, index.replay.status())
+        status = "Leertaste: Pause  ←/→: ±10 s  Bild↑/↓: ±5 min  </>: Tempo  q: Quit"
+    else:
+        frame.add(1, 0, f"Quelle: {HWMON_BASE}/*")
+        status = (
+            "Aktualisierung ca. 1x pro Sekunde, r: Neu scannen, q: Quit"
+            f"  (Scans: {index.scan_count})"
         )
+    frame.add(2, 0, status)
 
-        if not sensors:
-            if 4 < max_y:
-                stdscr.addstr(4, 0, "Keine temp*-Sensoren gefunden."[: max_x - 1])
-            stdscr.refresh()
-            continue
+    sensors = index.devices
+    if not sensors:
+        frame.add(4, 0, "Keine temp*-Sensoren gefunden.")
+        return frame
 
-        grouped = defaultdict(list)
-        for category, hwmon_name, hwmon_dir, temps in sensors:
-            grouped[category].append((hwmon_name, hwmon_dir, temps))
+    grouped = defaultdict(list)
+    for dev in sensors:
+        grouped[dev.category].append(dev)
 
-        row = 4
-        order = ["CPU", "CPU/SoC", "GPU", "Mainboard", "Sonstiges"]
-        for category in order:
-            if category not in grouped:
-                continue
+    row = 4
+    order = ["CPU", "CPU/SoC", "GPU", "Mainboard", "Sonstiges"]
+    for category in order:
+        if category not in grouped:
+            continue
+        if row >= max_y - 1:
+            break
+        frame.add(row, 0, f"[{category}]")
+        row += 1
 
+        for dev in grouped[category]:
             if row >= max_y - 1:
                 break
-            stdscr.addstr(row, 0, f"[{category}]"[: max_x - 1])
-            row += 1
-
-            for hwmon_name, hwmon_dir, temps in grouped[category]:
-                if row >= max_y - 1:
-                    break
-                base = os.path.basename(hwmon_dir)
-                stdscr.addstr(row, 0, f"  {hwmon_name} ({base})"[: max_x - 1])
-                row += 1
-                if row >= max_y - 1:
-                    break
-                header = f"    {'Kanal':<8} {'Label':<20} {'Temp [°C]':>10}"
-                stdscr.addstr(row, 0, header[: max_x - 1])
-                row += 1
+            base = os.path.basename(dev.hwmon_dir)
+            row = frame.lines(row, [
+                f"  {dev.hwmon_name} ({base})",
+                f"    {'Kanal':<8} {'Label':<20} {'Temp [°C]':>10}",
+                "    " + "-" * 38,
+            ])
+            for chan in dev.channels:
                 if row >= max_y - 1:
                     break
-                stdscr.addstr(row, 0, ("    " + "-" * 38)[: max_x - 1])
+                value_c = index.read_value(chan)
+                temp_str = "?" if value_c is None else f"{value_c:5.1f}"
+                frame.add(row, 0, f"    temp{chan.idx:<3} {chan.label:<20.20} {temp_str:>10}")
                 row += 1
+            row += 1
+    return frame
 
-                for idx in temps:
-                    if row >= max_y - 1:
-                        break
-                    label, value_c = read_temp(hwmon_dir, idx)
-                    if value_c is None:
-                        temp_str = "?"
-                    else:
-                        temp_str = f"{value_c:5.1f}"
 
-                    line = f"    temp{idx:<3} {label:<20.20} {temp_str:>10}"
-                    stdscr.addstr(row, 0, line[: max_x - 1])
-                    row += 1
+def run_loop(stdscr, index: SensorIndex):
+    renderer = FrameRenderer(stdscr)
+    last_update = 0.0
 
-                row += 1
+    while True:
+        key = stdscr.getch()
+        if key in (ord("q"), ord("Q")):
+            break
+        if key in (ord("r"), ord("R")):
+            index.mark_dirty()
+            last_update = 0.0
+        elif key == curses.KEY_RESIZE:
+            last_update = 0.0
+        elif index.replay is not None and index.replay.handle_key(key):
+            last_update = 0.0
+
+        now = time.time()
+        if now - last_update < 1.0:
+            continue
+        last_update = now
 
-        stdscr.refresh()
+        index.refresh_if_changed()
+        max_y, _max_x = stdscr.getmaxyx()
+        # Layout-Signatur: nach einem Rescan alles neu zeichnen
+        renderer.render(build_frame(index, max_y), layout=index.scan_count)
+
+
+def main(stdscr, replay: Optional[ReplaySampler] = None):
+    curses.curs_set(0)
+    stdscr.nodelay(True)
+    stdscr.timeout(200)
+
+    index = SensorIndex(replay)
+    try:
+        run_loop(stdscr, index)
+    finally:
+        index.close()
 
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    parser = argparse.ArgumentParser(description="Temperatur-Übersicht aller hwmon-Sensoren.")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="Aufnahme von common/sensor_recorder.py abspielen statt live zu lesen")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Abspieltempo für --replay (Standard 1.0)")
+    args = parser.parse_args()
+
+    replay = None
+    if args.replay:
+        try:
+            replay = open_replay(args.replay, args.speed)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    try:
+        curses.wrapper(main, replay)
+    finally:
+        if replay is not None:
+            replay.recording.close()
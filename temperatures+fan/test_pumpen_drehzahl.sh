@@ -2,8 +2,9 @@
 set -euo pipefail
 
 # Einfaches Testskript, um für einen ausgewählten
-# PWM-Kanal am Nuvoton nct6798-Chip die Drehzahländerung
-# zu beobachten.
+# PWM-Kanal am Lüfter-Chip die Drehzahländerung zu
+# beobachten. Der Chip kommt aus fan_discovery.py, wie bei
+# den TUIs (anderer Chip: FAN_CHIP=it8688 sudo ./test_pumpen_drehzahl.sh 2).
 #
 # WICHTIG:
 # - NUR auf dem Kanal benutzen, von dem du sicher bist,
@@ -11,16 +12,28 @@ set -euo pipefail
 # - Im Zweifel vorher im BIOS schauen / Handbuch checken.
 # - Skript mit sudo ausführen, damit Schreibzugriff auf /sys möglich ist.
 #
+# Komplette Kennlinie (alle Kanäle, Stall/Anlauf, Fit): ./fan_sweep.py run
+#
 # Aufrufbeispiele:
 #   sudo ./test_pumpen_drehzahl.sh 2   # testet pwm2
 #   sudo ./test_pumpen_drehzahl.sh 5   # testet pwm5
 
 PWM_CH="${1:-2}"          # Standard: pwm2, kannst du beim Aufruf ändern
-HWMON_DIR="/sys/class/hwmon/hwmon2"   # nct6798 laut sensors/hwmon-Ausgabe
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+
+# Chip wie bei den TUIs: Profil bzw. Suche aus fan_discovery.py
+if ! HWMON_DIR="$(python3 "$SCRIPT_DIR/fan_discovery.py" ${FAN_CHIP:+--chip "$FAN_CHIP"} resolve)"; then
+  echo "Verfügbare Chips: ./fan_discovery.py list" >&2
+  exit 1
+fi
+CHIP="$(cat "$HWMON_DIR/name")"
+
+# pwmN → fanM aus dem Profil (./fan_discovery.py pair --save), sonst gleiche Nummer
+FAN_CH="$(python3 "$SCRIPT_DIR/fan_discovery.py" --chip "$CHIP" fan-for "$PWM_CH" 2>/dev/null || echo "$PWM_CH")"
 
 PWM_PATH="$HWMON_DIR/pwm${PWM_CH}"
 PWM_ENABLE="$HWMON_DIR/pwm${PWM_CH}_enable"
-FAN_INPUT="$HWMON_DIR/fan${PWM_CH}_input"  # häufig gleiche Nummer, ggf. abweichend
+FAN_INPUT="$HWMON_DIR/fan${FAN_CH}_input"
 
 if [ ! -e "$PWM_PATH" ]; then
   echo "PWM-Kanal pwm${PWM_CH} existiert nicht unter $HWMON_DIR." >&2
@@ -31,7 +44,7 @@ fi
 echo "Nutze $PWM_PATH (Kanal ${PWM_CH})" >&2
 
 if [ ! -e "$FAN_INPUT" ]; then
-  echo "WARNUNG: Kein passender fan${PWM_CH}_input gefunden." >&2
+  echo "WARNUNG: Kein passender fan${FAN_CH}_input gefunden." >&2
   echo "Ich zeige stattdessen alle fan*_input-Werte vor jedem Schritt." >&2
   SHOW_ALL_FANS=1
 else
@@ -43,7 +56,7 @@ show_rpm() {
   if [ "$SHOW_ALL_FANS" -eq 1 ]; then
     grep . "$HWMON_DIR"/fan*_input 2>/dev/null || true
   else
-    echo -n "fan${PWM_CH}_input: "
+    echo -n "fan${FAN_CH}_input: "
     cat "$FAN_INPUT" 2>/dev/null || echo "(nicht lesbar)"
   fi
   echo >&2